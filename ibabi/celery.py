@@ -55,6 +55,22 @@ try:
             'task': 'users.tasks.fetch_climate_data.fetch_past_3months_data',
             'schedule': crontab(minute=0, hour='1', day_of_week='mon'),
         },
+        'backfill_activity_buckets_nightly': {
+            'task': 'users.tasks.activity_buckets.backfill_activity_buckets',
+            'schedule': crontab(minute=30, hour='0'),
+        },
+        'reconcile_population_counters_nightly': {
+            'task': 'users.tasks.population.reconcile_population_counters',
+            'schedule': crontab(minute=45, hour='0'),
+        },
+        'reconcile_cell_land_stats_nightly': {
+            'task': 'users.tasks.land_stats.reconcile_cell_land_stats',
+            'schedule': crontab(minute=50, hour='0'),
+        },
+        'rebuild_geo_rollups_nightly': {
+            'task': 'users.tasks.rollups.rebuild_geo_rollups',
+            'schedule': crontab(minute=55, hour='0'),
+        },
     }
 
     print("📅 Celery Beat schedule configured", flush=True)
@@ -1,6 +1,7 @@
 from pathlib import Path
 from datetime import timedelta
 import os
+import sys
 import dj_database_url
 import ssl
 from dotenv import load_dotenv
@@ -148,6 +149,42 @@ CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TIMEZONE = "Africa/Kigali"
 CELERY_ENABLE_UTC = False
 
+# CACHE
+# Web workers, Celery workers and manage.py commands share the dashboard cache and the
+# version counters of the in-memory hierarchy and boundary snapshots through this cache,
+# so it should be shared: Redis at REDIS_CACHE_URL. Without it every process falls back to
+# its own memory cache, which only ever invalidates the process that wrote; the users.W001
+# system check warns about it unless LOCAL_MEMORY_CACHE=True (single-process development).
+REDIS_CACHE_URL = os.environ.get("REDIS_CACHE_URL")
+LOCAL_MEMORY_CACHE = os.environ.get("LOCAL_MEMORY_CACHE") == "True"
+if REDIS_CACHE_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_CACHE_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# Dashboard response cache (see users/utils/dashboard_cache.py)
+DASHBOARD_CACHE_TIMEOUT = int(os.environ.get("DASHBOARD_CACHE_TIMEOUT", 300))
+# Seconds a stale dashboard may still be served while it is rebuilt in the background (0 disables)
+DASHBOARD_CACHE_STALE_WHILE_REVALIDATE = int(os.environ.get("DASHBOARD_CACHE_STALE_WHILE_REVALIDATE", 0))
+# Recent issues embedded in the dashboard; the rest is paged through /api/dashboard/issues/
+DASHBOARD_ISSUES_LIMIT = 20
+DASHBOARD_ISSUES_MAX_LIMIT = 200
+# Threads shared by all requests for computing dashboard sections concurrently (1 runs them inline)
+DASHBOARD_SECTION_WORKERS = int(os.environ.get("DASHBOARD_SECTION_WORKERS", 4))
+
+# Farthest a lat/lon may be from the nearest cell or village centroid to resolve to that cell
+# (see users/utils/geo_index.py)
+CELL_LOOKUP_MAX_DISTANCE_M = int(os.environ.get("CELL_LOOKUP_MAX_DISTANCE_M", 10_000))
+
 # settings.py
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 EMAIL_HOST = os.environ.get('EMAIL_HOST')
@@ -3,7 +3,7 @@ import django
 import json
 
 # Setup Django environment
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'pro_2.settings')  # use your correct settings module here
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ibabi.settings')
 django.setup()
 
 from report.models import Province, District, Sector, Cell, Village
@@ -10,4 +10,10 @@ class ReportConfig(AppConfig):
         # Import signals to ensure they are registered
         import report.signals.notification  # noqa: F401
         import report.signals.inventory  # noqa: F401
+        import report.signals.geo_paths  # noqa: F401
+        import report.signals.map_grid  # noqa: F401
+        import report.signals.population  # noqa: F401
+        import report.signals.land_stats  # noqa: F401
+        import report.signals.rollups  # noqa: F401
+        import report.signals.dashboard_cache  # noqa: F401
         
\ No newline at end of file
@@ -0,0 +1,67 @@
+# Generated by Django 5.2.4 on 2026-10-17 20:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('report', '0033_alter_livestocklocation_status_and_more'),
+        ('users', '0015_alter_cell_uuid'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GeoRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope_key', models.CharField(max_length=40, unique=True)),
+                ('level', models.CharField(choices=[('national', 'National'), ('district', 'District'), ('sector', 'Sector'), ('cell', 'Cell')], max_length=10)),
+                ('lands', models.PositiveIntegerField(default=0)),
+                ('hectares', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('harvest_reports', models.PositiveIntegerField(default=0)),
+                ('harvest_quantity', models.FloatField(default=0)),
+                ('harvest_available_reports', models.PositiveIntegerField(default=0)),
+                ('harvest_available_quantity', models.FloatField(default=0)),
+                ('harvest_sold_reports', models.PositiveIntegerField(default=0)),
+                ('harvest_sold_quantity', models.FloatField(default=0)),
+                ('livestock_locations', models.PositiveIntegerField(default=0)),
+                ('livestock_animals', models.PositiveIntegerField(default=0)),
+                ('livestock_products', models.PositiveIntegerField(default=0)),
+                ('livestock_productions', models.PositiveIntegerField(default=0)),
+                ('livestock_production_quantity', models.FloatField(default=0)),
+                ('livestock_available_productions', models.PositiveIntegerField(default=0)),
+                ('livestock_available_quantity', models.FloatField(default=0)),
+                ('livestock_sold_productions', models.PositiveIntegerField(default=0)),
+                ('livestock_sold_quantity', models.FloatField(default=0)),
+                ('district_inventory_records', models.PositiveIntegerField(default=0)),
+                ('district_inventory_added', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('district_inventory_remaining', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('cell_inventory_records', models.PositiveIntegerField(default=0)),
+                ('cell_inventory_available', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('requests_pending', models.PositiveIntegerField(default=0)),
+                ('requests_approved', models.PositiveIntegerField(default=0)),
+                ('requests_delivered', models.PositiveIntegerField(default=0)),
+                ('requests_rejected', models.PositiveIntegerField(default=0)),
+                ('cell_requests_pending', models.PositiveIntegerField(default=0)),
+                ('cell_requests_approved', models.PositiveIntegerField(default=0)),
+                ('cell_requests_delivered', models.PositiveIntegerField(default=0)),
+                ('cell_requests_rejected', models.PositiveIntegerField(default=0)),
+                ('feedback_count', models.PositiveIntegerField(default=0)),
+                ('feedback_rating_sum', models.PositiveIntegerField(default=0)),
+                ('issues_total', models.PositiveIntegerField(default=0)),
+                ('issues_pending', models.PositiveIntegerField(default=0)),
+                ('issues_resolved', models.PositiveIntegerField(default=0)),
+                ('issues_approved', models.PositiveIntegerField(default=0)),
+                ('issues_with_reply', models.PositiveIntegerField(default=0)),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+                ('cell', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='rollups', to='users.cell')),
+                ('district', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='rollups', to='users.district')),
+                ('sector', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='rollups', to='users.sector')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['level', 'district'], name='report_geor_level_b24e6d_idx'), models.Index(fields=['level', 'sector'], name='report_geor_level_dcb08e_idx')],
+            },
+        ),
+    ]
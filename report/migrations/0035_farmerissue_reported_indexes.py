@@ -0,0 +1,36 @@
+# Generated by Django 5.2.4 on 2026-10-17 20:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('report', '0034_georollup'),
+        ('users', '0015_alter_cell_uuid'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='farmerissue',
+            index=models.Index(fields=['reported_at', 'id'], name='issue_reported_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='farmerissue',
+            index=models.Index(fields=['district', 'reported_at', 'id'], name='issue_district_reported_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='farmerissue',
+            index=models.Index(fields=['sector', 'reported_at', 'id'], name='issue_sector_reported_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='farmerissue',
+            index=models.Index(fields=['cell', 'reported_at', 'id'], name='issue_cell_reported_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='farmerissue',
+            index=models.Index(fields=['farmer', 'reported_at', 'id'], name='issue_farmer_reported_idx'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.4 on 2026-10-17 20:13
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('report', '0035_farmerissue_reported_indexes'),
+        ('users', '0015_alter_cell_uuid'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyActivityBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('harvest_reports', models.PositiveIntegerField(default=0)),
+                ('harvest_quantity', models.FloatField(default=0)),
+                ('livestock_productions', models.PositiveIntegerField(default=0)),
+                ('livestock_production_quantity', models.FloatField(default=0)),
+                ('requests', models.PositiveIntegerField(default=0)),
+                ('requests_quantity', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('issues', models.PositiveIntegerField(default=0)),
+                ('cell', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='activity_buckets', to='users.cell')),
+                ('district', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='activity_buckets', to='users.district')),
+                ('product', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='activity_buckets', to='users.product')),
+                ('sector', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='activity_buckets', to='users.sector')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['cell', 'day'], name='report_dail_cell_id_2ddb61_idx'), models.Index(fields=['sector', 'day'], name='report_dail_sector__385087_idx'), models.Index(fields=['district', 'day'], name='report_dail_distric_f669cd_idx'), models.Index(fields=['day'], name='report_dail_day_208392_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,123 @@
+# Generated by Django 5.2.4 on 2026-10-17 20:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+GEO_FIELDS = ("district", "sector", "cell")
+
+
+def backfill_geo_paths(apps, schema_editor):
+    Land = apps.get_model("report", "Land")
+    LivestockLocation = apps.get_model("report", "LivestockLocation")
+    HarvestReport = apps.get_model("report", "HarvestReport")
+    LivestockProduction = apps.get_model("report", "LivestockProduction")
+    ResourceRequest = apps.get_model("report", "ResourceRequest")
+    ResourceRequestFeedback = apps.get_model("report", "ResourceRequestFeedback")
+    FarmerIssue = apps.get_model("report", "FarmerIssue")
+    FarmerIssueReply = apps.get_model("report", "FarmerIssueReply")
+
+    def copy_from(model, parent_ref):
+        return {
+            field: Subquery(model.objects.filter(pk=OuterRef(parent_ref)).values(field)[:1])
+            for field in GEO_FIELDS
+        }
+
+    HarvestReport.objects.update(**copy_from(Land, "land"))
+    LivestockProduction.objects.update(**copy_from(LivestockLocation, "location"))
+    from_land = copy_from(Land, "land")
+    from_livestock = copy_from(LivestockLocation, "livestock")
+    ResourceRequest.objects.update(**{
+        field: Coalesce(from_land[field], from_livestock[field]) for field in GEO_FIELDS
+    })
+    # Requests first: feedback copies from them
+    ResourceRequestFeedback.objects.update(**copy_from(ResourceRequest, "request"))
+    FarmerIssueReply.objects.update(**copy_from(FarmerIssue, "issue"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('report', '0036_dailyactivitybucket'),
+        ('users', '0015_alter_cell_uuid'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='farmerissuereply',
+            name='cell',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='users.cell'),
+        ),
+        migrations.AddField(
+            model_name='farmerissuereply',
+            name='district',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='users.district'),
+        ),
+        migrations.AddField(
+            model_name='farmerissuereply',
+            name='sector',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='users.sector'),
+        ),
+        migrations.AddField(
+            model_name='harvestreport',
+            name='cell',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='users.cell'),
+        ),
+        migrations.AddField(
+            model_name='harvestreport',
+            name='district',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='users.district'),
+        ),
+        migrations.AddField(
+            model_name='harvestreport',
+            name='sector',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='users.sector'),
+        ),
+        migrations.AddField(
+            model_name='livestockproduction',
+            name='cell',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='users.cell'),
+        ),
+        migrations.AddField(
+            model_name='livestockproduction',
+            name='district',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='users.district'),
+        ),
+        migrations.AddField(
+            model_name='livestockproduction',
+            name='sector',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='users.sector'),
+        ),
+        migrations.AddField(
+            model_name='resourcerequest',
+            name='cell',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='users.cell'),
+        ),
+        migrations.AddField(
+            model_name='resourcerequest',
+            name='district',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='users.district'),
+        ),
+        migrations.AddField(
+            model_name='resourcerequest',
+            name='sector',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='users.sector'),
+        ),
+        migrations.AddField(
+            model_name='resourcerequestfeedback',
+            name='cell',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='users.cell'),
+        ),
+        migrations.AddField(
+            model_name='resourcerequestfeedback',
+            name='district',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='users.district'),
+        ),
+        migrations.AddField(
+            model_name='resourcerequestfeedback',
+            name='sector',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='users.sector'),
+        ),
+        migrations.RunPython(backfill_geo_paths, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.4 on 2026-10-17 20:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('report', '0037_geo_path_columns'),
+        ('users', '0015_alter_cell_uuid'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PopulationCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope_key', models.CharField(max_length=40, unique=True)),
+                ('level', models.CharField(choices=[('national', 'National'), ('district', 'District'), ('sector', 'Sector'), ('cell', 'Cell'), ('village', 'Village')], max_length=10)),
+                ('total_users', models.PositiveIntegerField(default=0)),
+                ('residents', models.PositiveIntegerField(default=0)),
+                ('citizens', models.PositiveIntegerField(default=0)),
+                ('cell_officers', models.PositiveIntegerField(default=0)),
+                ('sector_officers', models.PositiveIntegerField(default=0)),
+                ('district_officers', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('cell', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='population_counters', to='users.cell')),
+                ('district', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='population_counters', to='users.district')),
+                ('sector', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='population_counters', to='users.sector')),
+                ('village', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='population_counters', to='users.village')),
+            ],
+        ),
+    ]
@@ -0,0 +1,85 @@
+# Generated by Django 5.2.4 on 2026-10-17 20:40
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_geo_paths(apps, schema_editor):
+    Village = apps.get_model("users", "Village")
+    Land = apps.get_model("report", "Land")
+    LivestockLocation = apps.get_model("report", "LivestockLocation")
+    FarmerIssue = apps.get_model("report", "FarmerIssue")
+    HarvestReport = apps.get_model("report", "HarvestReport")
+    LivestockProduction = apps.get_model("report", "LivestockProduction")
+    ResourceRequest = apps.get_model("report", "ResourceRequest")
+    ResourceRequestFeedback = apps.get_model("report", "ResourceRequestFeedback")
+    FarmerIssueReply = apps.get_model("report", "FarmerIssueReply")
+
+    def path_of(model, ref):
+        return Subquery(model.objects.filter(pk=OuterRef(ref)).values("geo_path")[:1])
+
+    village_path = Subquery(Village.objects.filter(pk=OuterRef("village")).values("path_code")[:1])
+    for model in (Land, LivestockLocation, FarmerIssue):
+        model.objects.update(geo_path=Coalesce(village_path, Value("")))
+
+    HarvestReport.objects.update(geo_path=Coalesce(path_of(Land, "land"), Value("")))
+    LivestockProduction.objects.update(geo_path=Coalesce(path_of(LivestockLocation, "location"), Value("")))
+    ResourceRequest.objects.update(
+        geo_path=Coalesce(path_of(Land, "land"), path_of(LivestockLocation, "livestock"), Value(""))
+    )
+    # Requests first: feedback copies from them
+    ResourceRequestFeedback.objects.update(geo_path=Coalesce(path_of(ResourceRequest, "request"), Value("")))
+    FarmerIssueReply.objects.update(geo_path=Coalesce(path_of(FarmerIssue, "issue"), Value("")))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('report', '0038_population_counters'),
+        ('users', '0017_path_codes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='farmerissue',
+            name='geo_path',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=14),
+        ),
+        migrations.AddField(
+            model_name='farmerissuereply',
+            name='geo_path',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=14),
+        ),
+        migrations.AddField(
+            model_name='harvestreport',
+            name='geo_path',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=14),
+        ),
+        migrations.AddField(
+            model_name='land',
+            name='geo_path',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=14),
+        ),
+        migrations.AddField(
+            model_name='livestocklocation',
+            name='geo_path',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=14),
+        ),
+        migrations.AddField(
+            model_name='livestockproduction',
+            name='geo_path',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=14),
+        ),
+        migrations.AddField(
+            model_name='resourcerequest',
+            name='geo_path',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=14),
+        ),
+        migrations.AddField(
+            model_name='resourcerequestfeedback',
+            name='geo_path',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=14),
+        ),
+        migrations.RunPython(backfill_geo_paths, migrations.RunPython.noop),
+    ]
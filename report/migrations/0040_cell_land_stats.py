@@ -0,0 +1,24 @@
+# Generated by Django 5.2.4 on 2026-10-17 20:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('report', '0039_geo_path'),
+        ('users', '0017_path_codes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CellLandStats',
+            fields=[
+                ('cell', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='land_stats', serialize=False, to='users.cell')),
+                ('lands', models.PositiveIntegerField(default=0)),
+                ('hectares', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.4 on 2026-10-17 20:51
+
+from django.db import migrations, models
+
+from users.utils.map_grid import grid_key
+
+
+def backfill_grid_keys(apps, schema_editor):
+    for name in ("Land", "LivestockLocation", "FarmerIssue"):
+        model = apps.get_model("report", name)
+        rows = model.objects.filter(latitude__isnull=False, longitude__isnull=False).only("latitude", "longitude")
+        batch = []
+        for row in rows.iterator(chunk_size=2000):
+            row.grid_key = grid_key(row.latitude, row.longitude)
+            batch.append(row)
+            if len(batch) >= 2000:
+                model.objects.bulk_update(batch, ["grid_key"])
+                batch = []
+        model.objects.bulk_update(batch, ["grid_key"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('report', '0040_cell_land_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='farmerissue',
+            name='grid_key',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=18),
+        ),
+        migrations.AddField(
+            model_name='land',
+            name='grid_key',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=18),
+        ),
+        migrations.AddField(
+            model_name='livestocklocation',
+            name='grid_key',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=18),
+        ),
+        migrations.RunPython(backfill_grid_keys, migrations.RunPython.noop),
+    ]
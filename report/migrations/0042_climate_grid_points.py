@@ -0,0 +1,31 @@
+# Generated by Django 5.2.4 on 2026-10-17 21:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('report', '0041_grid_keys'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClimateGridPoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('latitude', models.DecimalField(decimal_places=4, max_digits=7)),
+                ('longitude', models.DecimalField(decimal_places=4, max_digits=7)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'unique_together': {('latitude', 'longitude')},
+            },
+        ),
+        migrations.AddField(
+            model_name='cellclimatedata',
+            name='grid_point',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='cells', to='report.climategridpoint'),
+        ),
+    ]
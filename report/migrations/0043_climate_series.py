@@ -0,0 +1,186 @@
+# Generated by Django 5.2.4 on 2026-10-17 21:03
+
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal, ROUND_HALF_UP
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+# Frozen copies of users/utils/climate_grid.py and the parsers of
+# users/utils/climate_series.py as of this migration, so later edits cannot change it
+PLACES = Decimal("0.0001")
+HOURLY_VARIABLES = {"temperature_2m": "temperature", "precipitation": "precipitation"}
+DAILY_VARIABLES = {
+    "temperature_2m_max": "temperature_max",
+    "temperature_2m_min": "temperature_min",
+    "precipitation_sum": "precipitation_sum",
+}
+
+
+def snap(value, step):
+    units = (Decimal(str(value)) / step).to_integral_value(rounding=ROUND_HALF_UP)
+    return (units * step).quantize(PLACES)
+
+
+def _block_values(payload, block_name, variables, parse_time):
+    block = payload.get(block_name) or {}
+    columns = {field: block.get(variable) or [] for variable, field in variables.items()}
+    return [
+        (parse_time(value), {field: column[i] if i < len(column) else None for field, column in columns.items()})
+        for i, value in enumerate(block.get("time") or [])
+    ]
+
+
+def hourly_values(payload):
+    offset = dt_timezone(timedelta(seconds=payload.get("utc_offset_seconds") or 0))
+
+    def parse_time(value):
+        moment = datetime.fromisoformat(value).replace(tzinfo=offset)
+        return moment if settings.USE_TZ else timezone.make_naive(moment, timezone.get_default_timezone())
+
+    return _block_values(payload, "hourly", HOURLY_VARIABLES, parse_time)
+
+
+def daily_values(payload):
+    return _block_values(payload, "daily", DAILY_VARIABLES, date.fromisoformat)
+
+
+def map_cells(apps):
+    """
+    Maps the cells holding climate documents onto the weather grid (nothing has done it
+    before this migration: 0042 adds the column empty).
+    """
+    CellClimateData = apps.get_model("report", "CellClimateData")
+    ClimateGridPoint = apps.get_model("report", "ClimateGridPoint")
+    step = Decimal(str(getattr(settings, "OPEN_METEO_GRID_STEP", "0.1")))
+
+    rows = CellClimateData.objects.filter(
+        grid_point__isnull=True, cell__latitude__isnull=False, cell__longitude__isnull=False,
+    ).select_related("cell")
+    for data in rows.iterator(chunk_size=500):
+        point, _ = ClimateGridPoint.objects.get_or_create(
+            latitude=snap(data.cell.latitude, step), longitude=snap(data.cell.longitude, step),
+        )
+        CellClimateData.objects.filter(pk=data.pk).update(grid_point=point)
+
+
+def convert_climate_blobs(apps, schema_editor):
+    """
+    Maps the cells onto the weather grid, then moves their JSON documents into the series
+    rows of their grid point (the first cell of each point wins). Cells without
+    coordinates keep nothing; the climate tasks fill them in once they have some.
+    """
+    map_cells(apps)
+    CellClimateData = apps.get_model("report", "CellClimateData")
+    ClimateGridPoint = apps.get_model("report", "ClimateGridPoint")
+    GridHourlyForecast = apps.get_model("report", "GridHourlyForecast")
+    GridDailyClimate = apps.get_model("report", "GridDailyClimate")
+
+    done = set()
+    rows = CellClimateData.objects.filter(grid_point__isnull=False).order_by("grid_point_id", "cell_id")
+    for data in rows.iterator(chunk_size=500):
+        if data.grid_point_id in done:
+            continue
+        done.add(data.grid_point_id)
+        point = ClimateGridPoint.objects.get(pk=data.grid_point_id)
+        for payload in (data.next_24h_forecast, data.past_3_months_data):
+            if payload:
+                point.elevation = payload.get("elevation", point.elevation)
+                point.timezone = payload.get("timezone") or point.timezone
+                point.utc_offset_seconds = payload.get("utc_offset_seconds", point.utc_offset_seconds)
+        if data.next_24h_forecast:
+            GridHourlyForecast.objects.bulk_create([
+                GridHourlyForecast(grid_point=point, time=time, **values)
+                for time, values in hourly_values(data.next_24h_forecast)
+            ], ignore_conflicts=True)
+            point.forecast_fetched_at = data.forecast_fetched_at
+        if data.past_3_months_data:
+            GridDailyClimate.objects.bulk_create([
+                GridDailyClimate(grid_point=point, date=day, **values)
+                for day, values in daily_values(data.past_3_months_data)
+            ], ignore_conflicts=True)
+            point.historical_fetched_at = data.historical_fetched_at
+        point.save()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('report', '0042_climate_grid_points'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='climategridpoint',
+            name='elevation',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='climategridpoint',
+            name='forecast_fetched_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='climategridpoint',
+            name='historical_fetched_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='climategridpoint',
+            name='timezone',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='climategridpoint',
+            name='utc_offset_seconds',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='GridDailyClimate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('temperature_max', models.FloatField(blank=True, help_text='°C at 2 m', null=True)),
+                ('temperature_min', models.FloatField(blank=True, help_text='°C at 2 m', null=True)),
+                ('precipitation_sum', models.FloatField(blank=True, help_text='mm over the day', null=True)),
+                ('grid_point', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily', to='report.climategridpoint')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['date'], name='report_grid_date_424c55_idx')],
+                'unique_together': {('grid_point', 'date')},
+            },
+        ),
+        migrations.CreateModel(
+            name='GridHourlyForecast',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('time', models.DateTimeField()),
+                ('temperature', models.FloatField(blank=True, help_text='°C at 2 m', null=True)),
+                ('precipitation', models.FloatField(blank=True, help_text='mm over the hour', null=True)),
+                ('grid_point', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='hourly', to='report.climategridpoint')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['time'], name='report_grid_time_b59fdb_idx')],
+                'unique_together': {('grid_point', 'time')},
+            },
+        ),
+        migrations.RunPython(convert_climate_blobs, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='cellclimatedata',
+            name='forecast_fetched_at',
+        ),
+        migrations.RemoveField(
+            model_name='cellclimatedata',
+            name='historical_fetched_at',
+        ),
+        migrations.RemoveField(
+            model_name='cellclimatedata',
+            name='next_24h_forecast',
+        ),
+        migrations.RemoveField(
+            model_name='cellclimatedata',
+            name='past_3_months_data',
+        ),
+    ]
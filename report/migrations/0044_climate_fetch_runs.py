@@ -0,0 +1,63 @@
+# Generated by Django 5.2.4 on 2026-10-17 21:11
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('report', '0043_climate_series'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClimateFetchRun',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('kind', models.CharField(choices=[('forecast', '24h forecast'), ('archive', 'Daily archive')], max_length=10)),
+                ('status', models.CharField(choices=[('running', 'Running'), ('complete', 'Complete'), ('partial', 'Partial'), ('failed', 'Failed')], db_index=True, default='running', max_length=10)),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('grid_points', models.PositiveIntegerField(default=0, help_text='Grid points mapped when the run was planned')),
+                ('cells', models.PositiveIntegerField(default=0)),
+                ('points_planned', models.PositiveIntegerField(default=0)),
+                ('points_stored', models.PositiveIntegerField(default=0)),
+                ('cells_covered', models.PositiveIntegerField(default=0)),
+                ('requests', models.PositiveIntegerField(default=0)),
+                ('bytes', models.PositiveBigIntegerField(default=0)),
+                ('rows', models.PositiveIntegerField(default=0)),
+                ('duration_seconds', models.FloatField(blank=True, null=True)),
+                ('summary', models.JSONField(blank=True, default=dict)),
+            ],
+            options={
+                'ordering': ['-started_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ClimateFetchChunk',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('index', models.PositiveIntegerField()),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('params', models.JSONField(default=dict)),
+                ('points', models.JSONField(default=list)),
+                ('planned', models.PositiveIntegerField(default=0)),
+                ('stored', models.PositiveIntegerField(default=0)),
+                ('cells', models.PositiveIntegerField(default=0)),
+                ('rows', models.PositiveIntegerField(default=0)),
+                ('requests', models.PositiveIntegerField(default=0)),
+                ('bytes', models.PositiveBigIntegerField(default=0)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('seconds', models.FloatField(default=0, help_text='Time spent fetching and storing, over every attempt')),
+                ('error', models.TextField(blank=True, default='')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('run', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='chunks', to='report.climatefetchrun')),
+            ],
+            options={
+                'ordering': ['run', 'index'],
+                'unique_together': {('run', 'index')},
+            },
+        ),
+    ]
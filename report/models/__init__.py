@@ -1,4 +1,5 @@
 from .all_reports import *
 from.cell_climate import *
 from .issues import *
-from .resources import *
\ No newline at end of file
+from .resources import *
+from .rollups import *
\ No newline at end of file
@@ -4,6 +4,8 @@ from django.db import models
 from users.models.addresses import Province, District, Sector, Cell, Village
 from users.models.customuser import CustomUser
 from users.models.products import Product
+from report.models.geo import GeoStampedModel, geo_path_field, grid_key_field
+from users.utils.scope import ScopePaths, ScopedQuerySet
 from django.utils import timezone
 class Land(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -17,10 +19,15 @@ class Land(models.Model):
     village = models.ForeignKey(Village, on_delete=models.CASCADE)
     longitude = models.FloatField(blank=True, null=True)
     latitude = models.FloatField(blank=True, null=True)
+    grid_key = grid_key_field()
+    geo_path = geo_path_field()
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     assigned_crop = models.ForeignKey
 
+    scope_paths = ScopePaths(district="district", sector="sector", cell="cell", owner="owner", path="geo_path")
+    objects = ScopedQuerySet.as_manager()
+
     class Meta:
         unique_together = ('upi', 'owner')
 
@@ -28,7 +35,7 @@ class Land(models.Model):
         return f"{self.upi} - {self.size_hectares} ha"
 
 # reports/models.py
-class HarvestReport(models.Model):
+class HarvestReport(GeoStampedModel):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     farmer = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name="harvest_reports")
     land = models.ForeignKey(Land, on_delete=models.CASCADE, related_name="harvest_reports",  default=None)
@@ -65,6 +72,8 @@ class LivestockLocation(models.Model):
     village = models.ForeignKey(Village, on_delete=models.CASCADE)
     longitude = models.FloatField(blank=True, null=True)
     latitude = models.FloatField(blank=True, null=True)
+    grid_key = grid_key_field()
+    geo_path = geo_path_field()
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     status = models.CharField(
@@ -76,8 +85,9 @@ class LivestockLocation(models.Model):
         default="available",
         help_text="Status of the Harvest report", blank=True, null=True
     )
-    
 
+    scope_paths = ScopePaths(district="district", sector="sector", cell="cell", owner="owner", path="geo_path")
+    objects = ScopedQuerySet.as_manager()
 
     def __str__(self):
         return f"Livestock location for {self.owner.full_names} in {self.village.name}"
@@ -86,11 +96,19 @@ class LivestockAnimal(models.Model):
     animal = models.ForeignKey(Product, on_delete=models.CASCADE)  # Animal type
     quantity = models.PositiveIntegerField(default=1)
 
+    scope_paths = ScopePaths(
+        district="livestock_location__district",
+        sector="livestock_location__sector",
+        cell="livestock_location__cell",
+        owner="livestock_location__owner",
+    )
+    objects = ScopedQuerySet.as_manager()
+
     class Meta:
         unique_together = ("livestock_location", "animal")
 
 
-class LivestockProduction(models.Model):
+class LivestockProduction(GeoStampedModel):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     farmer = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name="livestock_productions")
     location = models.ForeignKey(LivestockLocation, on_delete=models.CASCADE, related_name="productions", default=None)
@@ -4,12 +4,138 @@ from users.models.addresses import Province, District, Sector, Cell, Village
 import uuid
 
 
+class ClimateGridPoint(models.Model):
+    """
+    A point of the weather grid the cell centroids are snapped to. Cells snapping to the
+    same point share one fetched forecast and archive (users/utils/climate_grid.py), stored
+    as GridHourlyForecast and GridDailyClimate rows (users/utils/climate_series.py).
+    """
+    latitude = models.DecimalField(max_digits=7, decimal_places=4)
+    longitude = models.DecimalField(max_digits=7, decimal_places=4)
+    # As reported by the provider with the last fetched series
+    elevation = models.FloatField(null=True, blank=True)
+    timezone = models.CharField(max_length=64, blank=True, default="")
+    utc_offset_seconds = models.IntegerField(default=0)
+    forecast_fetched_at = models.DateTimeField(null=True, blank=True)
+    historical_fetched_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ("latitude", "longitude")
+
+    def __str__(self):
+        return f"Grid point {self.latitude}, {self.longitude}"
+
+
+class GridHourlyForecast(models.Model):
+    """
+    One hour of the next-24h forecast of a grid point.
+    """
+    grid_point = models.ForeignKey(ClimateGridPoint, on_delete=models.CASCADE, related_name="hourly")
+    time = models.DateTimeField()
+    temperature = models.FloatField(null=True, blank=True, help_text="°C at 2 m")
+    precipitation = models.FloatField(null=True, blank=True, help_text="mm over the hour")
+
+    class Meta:
+        unique_together = ("grid_point", "time")
+        indexes = [models.Index(fields=["time"])]
+
+
+class GridDailyClimate(models.Model):
+    """
+    One day of the recorded climate of a grid point.
+    """
+    grid_point = models.ForeignKey(ClimateGridPoint, on_delete=models.CASCADE, related_name="daily")
+    date = models.DateField()
+    temperature_max = models.FloatField(null=True, blank=True, help_text="°C at 2 m")
+    temperature_min = models.FloatField(null=True, blank=True, help_text="°C at 2 m")
+    precipitation_sum = models.FloatField(null=True, blank=True, help_text="mm over the day")
+
+    class Meta:
+        unique_together = ("grid_point", "date")
+        indexes = [models.Index(fields=["date"])]
+
+
 class CellClimateData(models.Model):
+    """
+    Links a cell to its weather grid point. The series themselves live on the point; the
+    serializer rebuilds the Open-Meteo shaped `next_24h_forecast` / `past_3_months_data`.
+    """
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     cell = models.OneToOneField(Cell, on_delete=models.CASCADE, related_name="climate_data")
-    next_24h_forecast = models.JSONField(null=True, blank=True)    # e.g., predicted next 24 hours
-    past_3_months_data = models.JSONField(null=True, blank=True)
-      # e.g., past 3 months data
+    grid_point = models.ForeignKey(ClimateGridPoint, on_delete=models.SET_NULL, null=True, blank=True, related_name="cells")
     fetched_at = models.DateTimeField(auto_now=True)
-    historical_fetched_at = models.DateTimeField(null=True, blank=True)
-    forecast_fetched_at = models.DateTimeField(null=True, blank=True)
\ No newline at end of file
+
+
+class ClimateFetchRun(models.Model):
+    """
+    One run of a climate task, split into ClimateFetchChunk subtasks of a few grid points
+    each (users/utils/climate_runs.py). Filled in with coverage and latency once every
+    chunk has finished.
+    """
+    KIND_CHOICES = [
+        ("forecast", "24h forecast"),
+        ("archive", "Daily archive"),
+    ]
+    STATUS_CHOICES = [
+        ("running", "Running"),
+        ("complete", "Complete"),
+        ("partial", "Partial"),
+        ("failed", "Failed"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="running", db_index=True)
+    started_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    grid_points = models.PositiveIntegerField(default=0, help_text="Grid points mapped when the run was planned")
+    cells = models.PositiveIntegerField(default=0)
+    points_planned = models.PositiveIntegerField(default=0)
+    points_stored = models.PositiveIntegerField(default=0)
+    cells_covered = models.PositiveIntegerField(default=0)
+    requests = models.PositiveIntegerField(default=0)
+    bytes = models.PositiveBigIntegerField(default=0)
+    rows = models.PositiveIntegerField(default=0)
+    duration_seconds = models.FloatField(null=True, blank=True)
+    summary = models.JSONField(default=dict, blank=True)
+
+    class Meta:
+        ordering = ["-started_at"]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} run {self.started_at:%Y-%m-%d %H:%M} ({self.status})"
+
+
+class ClimateFetchChunk(models.Model):
+    """
+    A checkpointed slice of a run: the grid points it still has to fetch, shrinking as
+    batches succeed, and what it fetched so far.
+    """
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("done", "Done"),
+        ("failed", "Failed"),
+    ]
+
+    run = models.ForeignKey(ClimateFetchRun, on_delete=models.CASCADE, related_name="chunks")
+    index = models.PositiveIntegerField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="pending")
+    params = models.JSONField(default=dict)
+    # [[grid point id, latitude, longitude, cells mapped to it], ...] not fetched yet
+    points = models.JSONField(default=list)
+    planned = models.PositiveIntegerField(default=0)
+    stored = models.PositiveIntegerField(default=0)
+    cells = models.PositiveIntegerField(default=0)
+    rows = models.PositiveIntegerField(default=0)
+    requests = models.PositiveIntegerField(default=0)
+    bytes = models.PositiveBigIntegerField(default=0)
+    attempts = models.PositiveIntegerField(default=0)
+    seconds = models.FloatField(default=0, help_text="Time spent fetching and storing, over every attempt")
+    error = models.TextField(blank=True, default="")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("run", "index")
+        ordering = ["run", "index"]
@@ -0,0 +1,39 @@
+from django.db import models
+from users.models.addresses import District, Sector, Cell
+from users.utils.map_grid import GRID_LEVEL
+from users.utils.path_codes import MAX_LENGTH as MAX_PATH_LENGTH
+from users.utils.scope import ScopePaths, ScopedQuerySet
+
+
+def geo_path_field():
+    """
+    Path code of the village a row belongs to, for prefix scoping.
+    """
+    return models.CharField(max_length=MAX_PATH_LENGTH, blank=True, default="", db_index=True, editable=False)
+
+
+def grid_key_field():
+    """
+    Quadkey of the map tile holding the row's coordinates, for viewport clustering
+    (see users/utils/map_grid.py); "" when the row has none.
+    """
+    return models.CharField(max_length=GRID_LEVEL, blank=True, default="", db_index=True, editable=False)
+
+
+class GeoStampedModel(models.Model):
+    """
+    Copies of the district/sector/cell a fact row belongs to (through its land, livestock
+    location, request or issue), so scoped queries filter a single indexed column instead
+    of joining. Stamped on save by report/signals/geo_paths.py, with the path code of the
+    village in `geo_path` (see users/utils/path_codes.py).
+    """
+    district = models.ForeignKey(District, on_delete=models.SET_NULL, null=True, blank=True, editable=False, related_name="+")
+    sector = models.ForeignKey(Sector, on_delete=models.SET_NULL, null=True, blank=True, editable=False, related_name="+")
+    cell = models.ForeignKey(Cell, on_delete=models.SET_NULL, null=True, blank=True, editable=False, related_name="+")
+    geo_path = geo_path_field()
+
+    scope_paths = ScopePaths(district="district", sector="sector", cell="cell", owner="farmer", path="geo_path")
+    objects = ScopedQuerySet.as_manager()
+
+    class Meta:
+        abstract = True
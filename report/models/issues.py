@@ -4,6 +4,8 @@ import uuid
 from django.db import models
 from users.models.customuser import CustomUser
 from users.models.addresses import Province, District, Sector, Cell, Village
+from report.models.geo import GeoStampedModel, geo_path_field, grid_key_field
+from users.utils.scope import ScopePaths, ScopedQuerySet
 
 class FarmerIssue(models.Model):
     ISSUE_TYPES = [
@@ -20,6 +22,7 @@ class FarmerIssue(models.Model):
     photo = models.ImageField(upload_to="issues/photos/", blank=True, null=True)
     latitude = models.DecimalField(max_digits=9, decimal_places=6, blank=True, null=True)
     longitude = models.DecimalField(max_digits=9, decimal_places=6, blank=True, null=True)
+    grid_key = grid_key_field()
     reported_at = models.DateTimeField(auto_now_add=True)
 
     province = models.ForeignKey(Province, on_delete=models.CASCADE)
@@ -27,19 +30,37 @@ class FarmerIssue(models.Model):
     sector = models.ForeignKey(Sector, on_delete=models.CASCADE)
     cell = models.ForeignKey(Cell, on_delete=models.CASCADE)
     village = models.ForeignKey(Village, on_delete=models.CASCADE)
+    geo_path = geo_path_field()
 
     status = models.CharField(max_length=50, default="Pending")  
 
+    # Scoped by the FK columns rather than geo_path: the issues feed pages through the
+    # (district|sector|cell, reported_at, id) indexes below
+    scope_paths = ScopePaths(district="district", sector="sector", cell="cell", owner="farmer")
+    objects = ScopedQuerySet.as_manager()
+
+    class Meta:
+        # Keyset pagination of the dashboard issues feed (newest first), per scope
+        indexes = [
+            models.Index(fields=["reported_at", "id"], name="issue_reported_idx"),
+            models.Index(fields=["district", "reported_at", "id"], name="issue_district_reported_idx"),
+            models.Index(fields=["sector", "reported_at", "id"], name="issue_sector_reported_idx"),
+            models.Index(fields=["cell", "reported_at", "id"], name="issue_cell_reported_idx"),
+            models.Index(fields=["farmer", "reported_at", "id"], name="issue_farmer_reported_idx"),
+        ]
+
     def __str__(self):
         return f"{self.issue_type} - {self.farmer.full_names}"
     
-class FarmerIssueReply(models.Model):
+class FarmerIssueReply(GeoStampedModel):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     issue = models.ForeignKey(FarmerIssue, on_delete=models.CASCADE, related_name='replies')
     responder = models.ForeignKey(CustomUser, on_delete=models.CASCADE)  # admin or agronomist
     message = models.TextField()
     replied_at = models.DateTimeField(auto_now_add=True)
 
+    scope_paths = ScopePaths(district="district", sector="sector", cell="cell", owner="issue__farmer", path="geo_path")
+
     def __str__(self):
         return f"Reply by {self.responder.full_names} on {self.issue.id}"
 
@@ -5,12 +5,21 @@ from users.models.customuser import CustomUser
 from users.models.addresses import District, Province, Sector, Cell
 from users.models.products import Product, ProductPrice, RecommendedQuantity
 from report.models import Land, LivestockLocation
+from report.models.geo import GeoStampedModel
+from users.utils.scope import ScopePaths, ScopedQuerySet
 from decimal import Decimal
+from django.db.models import DecimalField, ExpressionWrapper, Sum
+from django.db.models.functions import Cast, Coalesce
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 import uuid
 from django.db import models
 
+def remaining_field():
+    # Wide enough for a PositiveBigIntegerField quantity_added minus 2-decimal allocations
+    return DecimalField(max_digits=22, decimal_places=2)
+
+
 class SeasonalCropPlan(models.Model):
     SEASON_CHOICES = [
         ("A", "Season A"),
@@ -26,6 +35,9 @@ class SeasonalCropPlan(models.Model):
     set_by = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name="set_seasonal_crops")
     created_at = models.DateTimeField(auto_now_add=True)
 
+    scope_paths = ScopePaths(district="cell__sector__district", sector="cell__sector", cell="cell")
+    objects = ScopedQuerySet.as_manager()
+
     class Meta:
         unique_together = ("cell", "season", "year")
         ordering = ["-year", "season"]
@@ -34,6 +46,56 @@ class SeasonalCropPlan(models.Model):
         return f"{self.get_season_display()} {self.year} - {self.crop.name} ({self.cell.name})"
 
 
+def district_remaining_expression():
+    """
+    quantity_added - quantity_at_cell as a SQL expression (see DistrictInventory.quantity_remaining).
+    """
+    return ExpressionWrapper(
+        Cast("quantity_added", remaining_field()) - Coalesce("quantity_at_cell", Decimal(0)),
+        output_field=remaining_field(),
+    )
+
+
+def farmer_remaining_expression():
+    """
+    quantity_added - quantity_allocated - quantity_deducted as a SQL expression
+    (see FarmerInventory.quantity_remaining).
+    """
+    return ExpressionWrapper(
+        Cast("quantity_added", remaining_field())
+        - Coalesce("quantity_allocated", Decimal(0))
+        - Coalesce("quantity_deducted", Decimal(0)),
+        output_field=remaining_field(),
+    )
+
+
+class InventoryQuerySet(ScopedQuerySet):
+    """
+    Exposes quantity_remaining to the database so sums, filters and ordering stay in SQL.
+    The annotation is named `remaining` because quantity_remaining is a model property.
+    """
+    remaining_expression = None
+
+    def with_remaining(self):
+        return self.annotate(remaining=self.remaining_expression())
+
+    def low_stock(self, threshold):
+        return self.with_remaining().filter(remaining__lte=threshold)
+
+    def remaining_total(self):
+        return self.aggregate(
+            total=Coalesce(Sum(self.remaining_expression()), Decimal(0), output_field=remaining_field())
+        )["total"]
+
+
+class DistrictInventoryQuerySet(InventoryQuerySet):
+    remaining_expression = staticmethod(district_remaining_expression)
+
+
+class FarmerInventoryQuerySet(InventoryQuerySet):
+    remaining_expression = staticmethod(farmer_remaining_expression)
+
+
 class DistrictInventory(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     district = models.ForeignKey(District, on_delete=models.CASCADE, related_name="inventories")
@@ -47,6 +109,9 @@ class DistrictInventory(models.Model):
     
     updated_at = models.DateTimeField(auto_now=True)
 
+    scope_paths = ScopePaths(district="district", public=True)
+    objects = DistrictInventoryQuerySet.as_manager()
+
     def __str__(self):
         return f"{self.product.name} - {self.district.name}"
 
@@ -68,30 +133,27 @@ class CellInventory(models.Model):
     quantity_available = models.DecimalField(max_digits=12, decimal_places=2, default=0)
     updated_at = models.DateTimeField(auto_now=True)
 
+    scope_paths = ScopePaths(district="district", sector="sector", cell="cell", public=True)
+    objects = ScopedQuerySet.as_manager()
+
     def __str__(self):
         return f"{self.product.name} - {self.cell.name} (Sector: {self.sector.name}, District: {self.district.name})"
 
     def calculate_quantity_available(self):
         """
         Calculate quantity_available based on:
-        - Total hectares of registered farmers' lands in this cell
+        - Total hectares of registered farmers' lands in this cell (CellLandStats)
         - Recommended quantity per hectare for the product
         - If product matches planned crop in cell, use recommended quantity, else zero
         """
-        lands = self.cell.land_set.filter(owner__isnull=False)
-        total_hectares = sum([land.size_hectares for land in lands if land.size_hectares])
+        from users.utils import land_stats
 
-        recommended = RecommendedQuantity.objects.filter(
-            product=self.product,
-            crop_name=self.product.name
-        ).first()
-
-        if not recommended or total_hectares == 0:
+        allocation = land_stats.allocation(self.cell, self.product)
+        if allocation.per_hectare is None or allocation.hectares == 0:
             return Decimal('0.00')
 
-        planned_crop = getattr(self.cell, 'planned_crop', None)
-        if planned_crop and planned_crop == self.product:
-            return Decimal(total_hectares) * recommended.quantity_per_hectare
+        if allocation.planned:
+            return allocation.recommended
 
         return Decimal('0.00')
 
@@ -116,12 +178,14 @@ class FarmerInventory(models.Model):
     
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = FarmerInventoryQuerySet.as_manager()
+
     def __str__(self):
         return f"{self.farmer.full_names} - {self.product.name}"
 
     @property
     def quantity_remaining(self):
-        return float(self.quantity_added) - float(self.quantity_allocated or 0) - float(self.quantity_deducted or 0)
+        return Decimal(self.quantity_added) - (self.quantity_allocated or Decimal(0)) - (self.quantity_deducted or Decimal(0))
     
     def deduct(self, amount):
         if amount > self.quantity_remaining:
@@ -150,26 +214,22 @@ class CellResourceRequest(models.Model):
     delivery_date = models.DateTimeField(null=True, blank=True)
     comment = models.TextField(blank=True, null=True)
 
+    scope_paths = ScopePaths(district="cell__sector__district", sector="cell__sector", cell="cell", public=True)
+    objects = ScopedQuerySet.as_manager()
+
     def clean(self):
     # Validation rules enforcing requested limits
-        lands = self.cell.land_set.filter(owner__isnull=False)
-        total_hectares = sum([land.size_hectares for land in lands if land.size_hectares])
+        from users.utils import land_stats
+
+        allocation = land_stats.allocation(self.cell, self.product)
         requested_qty = self.quantity_requested or Decimal(0)
 
         # ✅ Skip all validations if total land < 100
-        if total_hectares < 1000:
+        if allocation.hectares < 1000:
             return  
 
-        recommended = RecommendedQuantity.objects.filter(
-            product=self.product,
-            crop_name=self.product.name
-        ).first()
-
-        planned_crop = getattr(self.cell, 'planned_crop', None)
-
-        recommended_amount = Decimal(0)
-        if recommended and total_hectares:
-            recommended_amount = Decimal(total_hectares) * recommended.quantity_per_hectare
+        recommended = allocation.per_hectare is not None
+        recommended_amount = allocation.recommended
 
         district_inventory = DistrictInventory.objects.filter(
             district=self.cell.sector.district,
@@ -177,7 +237,7 @@ class CellResourceRequest(models.Model):
         ).first()
         district_qty = Decimal(district_inventory.quantity_remaining) if district_inventory else Decimal(0)
 
-        if planned_crop and planned_crop == self.product:
+        if allocation.planned:
             max_allowed = recommended_amount * Decimal('1.5')
             if requested_qty > max_allowed:
                 raise ValidationError(
@@ -257,7 +317,7 @@ from django.core.exceptions import ValidationError
 from decimal import Decimal
 from django.utils import timezone
 
-class ResourceRequest(models.Model):
+class ResourceRequest(GeoStampedModel):
     STATUS_CHOICES = [
         ("pending", "Pending"),
         ("approved", "Approved"),
@@ -354,7 +414,7 @@ class ResourceRequest(models.Model):
         target = self.land or self.livestock
         return f"{self.product.name} request by {self.farmer.email} ({self.status}) on {target}"
 
-class ResourceRequestFeedback(models.Model):
+class ResourceRequestFeedback(GeoStampedModel):
     request = models.OneToOneField(ResourceRequest, on_delete=models.CASCADE, related_name="feedback")
     farmer = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
     rating = models.IntegerField()  # 1 to 5 stars
@@ -372,6 +432,9 @@ class LandSeasonalAssignment(models.Model):
     auto_assigned = models.BooleanField(default=True)  # if the farmer changes crop, set this to False
     assigned_at = models.DateTimeField(auto_now_add=True)
 
+    scope_paths = ScopePaths(district="land__district", sector="land__sector", cell="land__cell", owner="land__owner")
+    objects = ScopedQuerySet.as_manager()
+
     class Meta:
         unique_together = ("land", "seasonal_plan")
 
@@ -0,0 +1,183 @@
+from django.db import models
+from users.models.addresses import District, Sector, Cell, Village
+from users.models.products import Product
+from users.utils.scope import ScopePaths, ScopedQuerySet
+
+
+class GeoRollup(models.Model):
+    """
+    Precomputed dashboard totals for one geographic scope.
+    One row per cell, sector, district and one national row, keyed by `scope_key`
+    ("cell:12", "sector:4", "district:2", "national").
+    """
+    LEVEL_CHOICES = [
+        ("national", "National"),
+        ("district", "District"),
+        ("sector", "Sector"),
+        ("cell", "Cell"),
+    ]
+
+    scope_key = models.CharField(max_length=40, unique=True)
+    level = models.CharField(max_length=10, choices=LEVEL_CHOICES)
+    district = models.ForeignKey(District, on_delete=models.CASCADE, null=True, blank=True, related_name="rollups")
+    sector = models.ForeignKey(Sector, on_delete=models.CASCADE, null=True, blank=True, related_name="rollups")
+    cell = models.ForeignKey(Cell, on_delete=models.CASCADE, null=True, blank=True, related_name="rollups")
+
+    # Lands
+    lands = models.PositiveIntegerField(default=0)
+    hectares = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    # Harvest reports
+    harvest_reports = models.PositiveIntegerField(default=0)
+    harvest_quantity = models.FloatField(default=0)
+    harvest_available_reports = models.PositiveIntegerField(default=0)
+    harvest_available_quantity = models.FloatField(default=0)
+    harvest_sold_reports = models.PositiveIntegerField(default=0)
+    harvest_sold_quantity = models.FloatField(default=0)
+
+    # Livestock
+    livestock_locations = models.PositiveIntegerField(default=0)
+    livestock_animals = models.PositiveIntegerField(default=0)
+    livestock_products = models.PositiveIntegerField(default=0)
+    livestock_productions = models.PositiveIntegerField(default=0)
+    livestock_production_quantity = models.FloatField(default=0)
+    livestock_available_productions = models.PositiveIntegerField(default=0)
+    livestock_available_quantity = models.FloatField(default=0)
+    livestock_sold_productions = models.PositiveIntegerField(default=0)
+    livestock_sold_quantity = models.FloatField(default=0)
+
+    # Inventories
+    district_inventory_records = models.PositiveIntegerField(default=0)
+    district_inventory_added = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    district_inventory_remaining = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    cell_inventory_records = models.PositiveIntegerField(default=0)
+    cell_inventory_available = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+
+    # Farmer resource requests
+    requests_pending = models.PositiveIntegerField(default=0)
+    requests_approved = models.PositiveIntegerField(default=0)
+    requests_delivered = models.PositiveIntegerField(default=0)
+    requests_rejected = models.PositiveIntegerField(default=0)
+
+    # Cell resource requests
+    cell_requests_pending = models.PositiveIntegerField(default=0)
+    cell_requests_approved = models.PositiveIntegerField(default=0)
+    cell_requests_delivered = models.PositiveIntegerField(default=0)
+    cell_requests_rejected = models.PositiveIntegerField(default=0)
+
+    # Feedback
+    feedback_count = models.PositiveIntegerField(default=0)
+    feedback_rating_sum = models.PositiveIntegerField(default=0)
+
+    # Farmer issues
+    issues_total = models.PositiveIntegerField(default=0)
+    issues_pending = models.PositiveIntegerField(default=0)
+    issues_resolved = models.PositiveIntegerField(default=0)
+    issues_approved = models.PositiveIntegerField(default=0)
+    issues_with_reply = models.PositiveIntegerField(default=0)
+
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["level", "district"]),
+            models.Index(fields=["level", "sector"]),
+        ]
+
+    def __str__(self):
+        return f"Rollup {self.scope_key}"
+
+    @staticmethod
+    def key_for(level, pk=None):
+        return "national" if level == "national" else f"{level}:{pk}"
+
+
+
+class PopulationCounter(models.Model):
+    """
+    Users living in or responsible for one geography, read by the dashboard user counts.
+    One row per village, cell, sector, district and one national row, keyed like GeoRollup
+    ("village:7", "cell:12", ..., "national").
+
+    Residents own land or a livestock location in the area. Officers are counted when the
+    area they manage contains the geography or lies inside it, so a cell counts its own
+    officer plus the sector and district officers above it. The national row counts every
+    account by user level. Maintained incrementally by report/signals/population.py and
+    reconciled nightly by users/utils/population.py.
+    """
+    LEVEL_CHOICES = [
+        ("national", "National"),
+        ("district", "District"),
+        ("sector", "Sector"),
+        ("cell", "Cell"),
+        ("village", "Village"),
+    ]
+
+    scope_key = models.CharField(max_length=40, unique=True)
+    level = models.CharField(max_length=10, choices=LEVEL_CHOICES)
+    district = models.ForeignKey(District, on_delete=models.CASCADE, null=True, blank=True, related_name="population_counters")
+    sector = models.ForeignKey(Sector, on_delete=models.CASCADE, null=True, blank=True, related_name="population_counters")
+    cell = models.ForeignKey(Cell, on_delete=models.CASCADE, null=True, blank=True, related_name="population_counters")
+    village = models.ForeignKey(Village, on_delete=models.CASCADE, null=True, blank=True, related_name="population_counters")
+
+    total_users = models.PositiveIntegerField(default=0)
+    residents = models.PositiveIntegerField(default=0)
+    citizens = models.PositiveIntegerField(default=0)
+    cell_officers = models.PositiveIntegerField(default=0)
+    sector_officers = models.PositiveIntegerField(default=0)
+    district_officers = models.PositiveIntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Population {self.scope_key}: {self.total_users}"
+
+
+class DailyActivityBucket(models.Model):
+    """
+    Per-day activity of one cell and product, the source of the dashboard trend charts.
+    Issues carry no product and are bucketed with product=NULL. Sector and district are
+    copied from the cell so any scope filters on a single indexed column.
+    """
+    day = models.DateField()
+    district = models.ForeignKey(District, on_delete=models.CASCADE, related_name="activity_buckets")
+    sector = models.ForeignKey(Sector, on_delete=models.CASCADE, related_name="activity_buckets")
+    cell = models.ForeignKey(Cell, on_delete=models.CASCADE, related_name="activity_buckets")
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, null=True, blank=True, related_name="activity_buckets")
+
+    harvest_reports = models.PositiveIntegerField(default=0)
+    harvest_quantity = models.FloatField(default=0)
+    livestock_productions = models.PositiveIntegerField(default=0)
+    livestock_production_quantity = models.FloatField(default=0)
+    requests = models.PositiveIntegerField(default=0)
+    requests_quantity = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    issues = models.PositiveIntegerField(default=0)
+
+    scope_paths = ScopePaths(district="district", sector="sector", cell="cell")
+    objects = ScopedQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["cell", "day"]),
+            models.Index(fields=["sector", "day"]),
+            models.Index(fields=["district", "day"]),
+            models.Index(fields=["day"]),
+        ]
+
+    def __str__(self):
+        return f"Activity {self.day} cell:{self.cell_id} product:{self.product_id}"
+
+
+class CellLandStats(models.Model):
+    """
+    Registered land of one cell, read by the cell quota and recommendation math instead of
+    summing its Land rows. Maintained inside every Land write by report/signals/land_stats.py
+    and reconciled nightly by users/utils/land_stats.py.
+    """
+    cell = models.OneToOneField(Cell, on_delete=models.CASCADE, primary_key=True, related_name="land_stats")
+    lands = models.PositiveIntegerField(default=0)
+    hectares = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Cell {self.cell_id}: {self.lands} lands, {self.hectares} ha"
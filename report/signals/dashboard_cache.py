@@ -0,0 +1,160 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from report.models import (
+    GeoRollup,
+    Land,
+    HarvestReport,
+    LivestockLocation,
+    LivestockAnimal,
+    LivestockProduction,
+    DistrictInventory,
+    CellInventory,
+    CellResourceRequest,
+    ResourceRequest,
+    ResourceRequestFeedback,
+    FarmerIssue,
+    FarmerIssueReply,
+)
+from report.signals.rollups import affected_cells
+from users.models.addresses import District, Sector, Cell
+from users.models.customuser import CustomUser
+from users.models.products import Product
+from users.utils import dashboard_cache, population
+
+
+# -------------------------------
+# Helper Functions
+# -------------------------------
+def affected_owner(instance):
+    """
+    Returns the id of the citizen whose own dashboard depends on `instance`, or None.
+    """
+    if isinstance(instance, (Land, LivestockLocation)):
+        return instance.owner_id
+    if isinstance(instance, (HarvestReport, LivestockProduction, ResourceRequest, ResourceRequestFeedback, FarmerIssue)):
+        return instance.farmer_id
+    if isinstance(instance, LivestockAnimal):
+        return LivestockLocation.objects.filter(pk=instance.livestock_location_id).values_list("owner_id", flat=True).first()
+    if isinstance(instance, FarmerIssueReply):
+        return FarmerIssue.objects.filter(pk=instance.issue_id).values_list("farmer_id", flat=True).first()
+    return None
+
+
+# -------------------------------
+# CELL-LEVEL FACTS
+# -------------------------------
+@receiver(post_save, sender=Land)
+@receiver(post_save, sender=HarvestReport)
+@receiver(post_save, sender=LivestockLocation)
+@receiver(post_save, sender=LivestockAnimal)
+@receiver(post_save, sender=LivestockProduction)
+@receiver(post_save, sender=ResourceRequest)
+@receiver(post_save, sender=ResourceRequestFeedback)
+@receiver(post_save, sender=FarmerIssue)
+@receiver(post_save, sender=FarmerIssueReply)
+@receiver(post_delete, sender=Land)
+@receiver(post_delete, sender=HarvestReport)
+@receiver(post_delete, sender=LivestockLocation)
+@receiver(post_delete, sender=LivestockAnimal)
+@receiver(post_delete, sender=LivestockProduction)
+@receiver(post_delete, sender=ResourceRequest)
+@receiver(post_delete, sender=ResourceRequestFeedback)
+@receiver(post_delete, sender=FarmerIssue)
+@receiver(post_delete, sender=FarmerIssueReply)
+def invalidate_fact_dashboards(sender, instance, **kwargs):
+    # Both the cell a moved row left and the one it moved to
+    cell_ids = affected_cells(instance)
+    owner_id = affected_owner(instance)
+
+    def invalidate():
+        dashboard_cache.invalidate_cells(cell_ids)
+        dashboard_cache.invalidate_owners([owner_id])
+
+    transaction.on_commit(invalidate)
+
+
+# -------------------------------
+# INVENTORIES & CELL REQUESTS
+# -------------------------------
+# Citizens see these sections unscoped, so they also outdate every citizen dashboard
+@receiver(post_save, sender=CellInventory)
+@receiver(post_save, sender=CellResourceRequest)
+@receiver(post_delete, sender=CellInventory)
+@receiver(post_delete, sender=CellResourceRequest)
+def invalidate_cell_inventory_dashboards(sender, instance, **kwargs):
+    cell_id = instance.cell_id
+
+    def invalidate():
+        dashboard_cache.invalidate_cells([cell_id])
+        dashboard_cache.invalidate(dashboard_cache.CITIZENS)
+
+    transaction.on_commit(invalidate)
+
+
+@receiver(post_save, sender=DistrictInventory)
+@receiver(post_delete, sender=DistrictInventory)
+def invalidate_district_inventory_dashboards(sender, instance, **kwargs):
+    district_id = instance.district_id
+
+    def invalidate():
+        dashboard_cache.invalidate_districts([district_id])
+        dashboard_cache.invalidate(dashboard_cache.CITIZENS)
+
+    transaction.on_commit(invalidate)
+
+
+# -------------------------------
+# SEASONAL PLANS & CATALOG
+# -------------------------------
+@receiver(post_save, sender=Cell)
+def invalidate_seasonal_plan_dashboards(sender, instance, **kwargs):
+    cell_id = instance.pk
+    transaction.on_commit(lambda: dashboard_cache.invalidate_cells([cell_id]))
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def invalidate_product_dashboards(sender, instance, **kwargs):
+    transaction.on_commit(lambda: dashboard_cache.invalidate(dashboard_cache.GLOBAL))
+
+
+# -------------------------------
+# USER COUNTS
+# -------------------------------
+# The counters are kept by report/signals/population.py, whose pre_save hooks remember the
+# level and officer a save replaces
+NATIONAL = GeoRollup.key_for("national")
+
+
+@receiver(post_save, sender=CustomUser)
+def invalidate_user_count_dashboards(sender, instance, created, **kwargs):
+    if created:
+        transaction.on_commit(lambda: dashboard_cache.invalidate(NATIONAL))
+        return
+    old_level = getattr(instance, "_population_level", None)
+    if old_level is None or old_level == instance.user_level:
+        return
+    # The national totals, and the citizen counts of every area the user lives in
+    district_ids = population.districts_of_resident(instance.pk)
+
+    def invalidate():
+        dashboard_cache.invalidate(NATIONAL)
+        dashboard_cache.invalidate_district_areas(district_ids)
+
+    transaction.on_commit(invalidate)
+
+
+@receiver(post_delete, sender=CustomUser)
+def invalidate_deleted_user_dashboards(sender, instance, **kwargs):
+    transaction.on_commit(lambda: dashboard_cache.invalidate(NATIONAL))
+
+
+@receiver(post_save, sender=District)
+@receiver(post_save, sender=Sector)
+def invalidate_officer_count_dashboards(sender, instance, **kwargs):
+    field = "district_officer_id" if sender is District else "sector_officer_id"
+    if getattr(instance, field) == getattr(instance, "_population_officer", None):
+        return
+    district_id = instance.pk if sender is District else instance.district_id
+    transaction.on_commit(lambda: dashboard_cache.invalidate_district_areas([district_id]))
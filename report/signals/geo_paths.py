@@ -0,0 +1,222 @@
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save
+from django.dispatch import receiver
+from users.models.addresses import Province, District, Sector, Cell, Village
+from users.utils import activity, dashboard_cache, land_stats, path_codes, population, rollups
+from report.models import (
+    Land,
+    HarvestReport,
+    LivestockLocation,
+    LivestockProduction,
+    ResourceRequest,
+    ResourceRequestFeedback,
+    FarmerIssue,
+    FarmerIssueReply,
+)
+from report.signals.rollups import BUCKET_DATE_FIELDS
+
+GEO_FIELDS = ("district_id", "sector_id", "cell_id", "geo_path")
+# Depth of a path code -> the geography it ends with, and the fact column pointing at it
+CODE_LEVELS = ((District, "district_id"), (Sector, "sector_id"), (Cell, "cell_id"))
+# Geographies whose move changes the district/sector/cell columns of the facts below them
+RESTAMPED_LEVELS = {Sector: 2, Cell: 3, Village: 3}
+# Models whose rows carry the path code of their village
+PATH_MODELS = (
+    Land, LivestockLocation, FarmerIssue,
+    HarvestReport, LivestockProduction, ResourceRequest, ResourceRequestFeedback, FarmerIssueReply,
+)
+
+
+# -------------------------------
+# Helper Functions
+# -------------------------------
+def _geo_of(model, pk):
+    if not pk:
+        return None
+    return model.objects.filter(pk=pk).values(*GEO_FIELDS).first()
+
+
+def _stamp(instance, geo):
+    for field in GEO_FIELDS:
+        setattr(instance, field, geo[field] if geo else None)
+    instance.geo_path = instance.geo_path or ""
+
+
+def leaf_path(village_id, cell_id):
+    """
+    Path code of a village, or of the cell when the row has no village.
+    """
+    if village_id:
+        code = Village.objects.filter(pk=village_id).values_list("path_code", flat=True).first()
+    else:
+        code = Cell.objects.filter(pk=cell_id).values_list("path_code", flat=True).first() if cell_id else None
+    return code or ""
+
+
+def geo_source(instance):
+    """
+    Returns the district/sector/cell ids a fact row inherits, or None.
+    """
+    if isinstance(instance, HarvestReport):
+        return _geo_of(Land, instance.land_id)
+    if isinstance(instance, LivestockProduction):
+        return _geo_of(LivestockLocation, instance.location_id)
+    if isinstance(instance, ResourceRequest):
+        return _geo_of(Land, instance.land_id) or _geo_of(LivestockLocation, instance.livestock_id)
+    if isinstance(instance, ResourceRequestFeedback):
+        return _geo_of(ResourceRequest, instance.request_id)
+    if isinstance(instance, FarmerIssueReply):
+        return _geo_of(FarmerIssue, instance.issue_id)
+    return None
+
+
+# -------------------------------
+# STAMP ON WRITE
+# -------------------------------
+@receiver(pre_save, sender=HarvestReport)
+@receiver(pre_save, sender=LivestockProduction)
+@receiver(pre_save, sender=ResourceRequest)
+@receiver(pre_save, sender=ResourceRequestFeedback)
+@receiver(pre_save, sender=FarmerIssueReply)
+def stamp_geo_path(sender, instance, **kwargs):
+    _stamp(instance, geo_source(instance))
+
+
+@receiver(pre_save, sender=Land)
+@receiver(pre_save, sender=LivestockLocation)
+@receiver(pre_save, sender=FarmerIssue)
+def stamp_leaf_path(sender, instance, **kwargs):
+    instance.geo_path = leaf_path(instance.village_id, instance.cell_id)
+
+
+# -------------------------------
+# PROPAGATE LOCATION CHANGES
+# -------------------------------
+def _restamp(instance, querysets):
+    """
+    Copies the geography of `instance` onto the rows of `querysets` that do not have it yet.
+    QuerySet.update() sends no post_save, so the aggregates of the cells the rows left and
+    joined (GeoRollup, activity buckets, dashboard cache) are refreshed here.
+    """
+    geo = {field: getattr(instance, field) for field in GEO_FIELDS}
+    cells, buckets = set(), set()
+    for qs in querysets:
+        stale = qs.exclude(**geo)
+        date_field = BUCKET_DATE_FIELDS.get(qs.model)
+        rows = list(stale.values_list("cell_id", date_field or "cell_id"))
+        if not rows:
+            continue
+        stale.update(**geo)
+        for cell_id, moment in rows:
+            cells.update((cell_id, geo["cell_id"]))
+            if date_field and moment:
+                buckets.update(((cell_id, moment.date()), (geo["cell_id"], moment.date())))
+    cells.discard(None)
+    buckets = {(cell_id, day) for cell_id, day in buckets if cell_id}
+    if not cells:
+        return
+
+    def refresh():
+        rollups.refresh_cells(cells)
+        dashboard_cache.invalidate_cells(cells)
+        for cell_id, day in buckets:
+            activity.refresh_buckets(cell_id, day)
+
+    transaction.on_commit(refresh)
+
+
+@receiver(post_save, sender=Land)
+def propagate_land_geo(sender, instance, created, **kwargs):
+    if created:
+        return
+    _restamp(instance, [
+        HarvestReport.objects.filter(land=instance),
+        ResourceRequest.objects.filter(land=instance),
+        ResourceRequestFeedback.objects.filter(request__land=instance),
+    ])
+
+
+@receiver(post_save, sender=LivestockLocation)
+def propagate_livestock_geo(sender, instance, created, **kwargs):
+    if created:
+        return
+    _restamp(instance, [
+        LivestockProduction.objects.filter(location=instance),
+        ResourceRequest.objects.filter(land__isnull=True, livestock=instance),
+        ResourceRequestFeedback.objects.filter(request__land__isnull=True, request__livestock=instance),
+    ])
+
+
+@receiver(post_save, sender=FarmerIssue)
+def propagate_issue_geo(sender, instance, created, **kwargs):
+    if created:
+        return
+    _restamp(instance, [FarmerIssueReply.objects.filter(issue=instance)])
+
+
+@receiver(post_save, sender=Province)
+@receiver(post_save, sender=District)
+@receiver(post_save, sender=Sector)
+@receiver(post_save, sender=Cell)
+@receiver(post_save, sender=Village)
+def move_fact_paths(sender, instance, **kwargs):
+    """
+    A geography moved under another parent: its path code changed (users/signals/hierarchy.py),
+    so does the geo_path of every row below it. A moved sector, cell or village also changes
+    the district/sector/cell columns of those rows, which are restamped.
+    """
+    previous = getattr(instance, "_previous_path_code", None)
+    if not previous:
+        return
+    for model in PATH_MODELS:
+        path_codes.rewrite_prefix(model.objects.all(), "geo_path", previous, instance.path_code)
+    if sender in RESTAMPED_LEVELS:
+        _restamp_moved(instance, previous)
+
+
+def _areas_of(code, depth):
+    """
+    Returns {"district_id", "sector_id", "cell_id"} of the geographies named by the first
+    `depth` levels below the province of a path code.
+    """
+    segments = code.split(path_codes.SEPARATOR)
+    areas = {}
+    for level, (model, field) in enumerate(CODE_LEVELS[:depth], start=2):
+        prefix = path_codes.SEPARATOR.join(segments[:level])
+        areas[field] = model.objects.filter(path_code=prefix).values_list("id", flat=True).first()
+    return areas
+
+
+def _restamp_moved(instance, previous):
+    """
+    Copies the new district/sector/cell of a moved geography onto the fact rows below it.
+    QuerySet.update() sends no post_save, and residents move along with the geography, so
+    the aggregates of the areas it left and joined are refreshed explicitly: GeoRollup,
+    activity buckets, cell land stats, population counters and the dashboard cache.
+    """
+    depth = RESTAMPED_LEVELS[type(instance)]
+    before, after = _areas_of(previous, depth), _areas_of(instance.path_code, depth)
+    rows = path_codes.range_q("geo_path", instance.path_code)
+    for model in PATH_MODELS:
+        model.objects.filter(rows).exclude(**after).update(**after)
+
+    if isinstance(instance, Sector):
+        cells = set(Cell.objects.filter(sector=instance).values_list("id", flat=True))
+    else:
+        cells = {before.get("cell_id"), after["cell_id"]} - {None}
+    sectors = {before.get("sector_id"), after["sector_id"]} - {None}
+    districts = {before.get("district_id"), after["district_id"]} - {None}
+
+    def refresh():
+        rollups.refresh_cells(cells)
+        rollups.refresh_sectors(sectors)
+        rollups.refresh_districts(districts)
+        activity.refresh_cells(cells)
+        if isinstance(instance, Village):
+            # Lands follow their village to another cell
+            for cell_id in cells:
+                land_stats.refresh_cell(cell_id)
+        population.reconcile(districts)
+        dashboard_cache.invalidate_district_areas(districts)
+
+    transaction.on_commit(refresh)
@@ -0,0 +1,33 @@
+from decimal import Decimal
+
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from report.models import Land
+from users.utils import land_stats
+
+
+def _holding(cell_id, size_hectares):
+    return cell_id, Decimal(str(size_hectares or 0))
+
+
+@receiver(pre_save, sender=Land)
+def remember_land(sender, instance, **kwargs):
+    instance._land_stats_before = None
+    if instance._state.adding:
+        return
+    row = Land.objects.filter(pk=instance.pk).values("cell_id", "size_hectares").first()
+    if row:
+        instance._land_stats_before = _holding(row["cell_id"], row["size_hectares"])
+
+
+@receiver(post_save, sender=Land)
+def count_land(sender, instance, **kwargs):
+    land_stats.record_land_change(
+        getattr(instance, "_land_stats_before", None),
+        _holding(instance.cell_id, instance.size_hectares),
+    )
+
+
+@receiver(post_delete, sender=Land)
+def uncount_land(sender, instance, **kwargs):
+    land_stats.record_land_change(_holding(instance.cell_id, instance.size_hectares), None)
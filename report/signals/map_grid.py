@@ -0,0 +1,14 @@
+from django.db.models.signals import pre_save
+from django.dispatch import receiver
+from report.models import Land, LivestockLocation, FarmerIssue
+from users.utils import map_grid
+
+
+# -------------------------------
+# STAMP ON WRITE
+# -------------------------------
+@receiver(pre_save, sender=Land)
+@receiver(pre_save, sender=LivestockLocation)
+@receiver(pre_save, sender=FarmerIssue)
+def stamp_grid_key(sender, instance, **kwargs):
+    instance.grid_key = map_grid.grid_key(instance.latitude, instance.longitude)
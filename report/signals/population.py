@@ -0,0 +1,99 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from report.models import Land, LivestockLocation
+from users.models.addresses import District, Sector, Cell
+from users.models.customuser import CustomUser
+from users.utils import population
+
+GEO_COLUMNS = [f"{level}_id" for level in population.LEVELS]
+
+
+# -------------------------------
+# LAND & LIVESTOCK OWNERSHIP
+# -------------------------------
+@receiver(pre_save, sender=Land)
+@receiver(pre_save, sender=LivestockLocation)
+def remember_holding(sender, instance, **kwargs):
+    instance._population_before = None
+    if instance._state.adding:
+        return
+    row = sender.objects.filter(pk=instance.pk).values("owner_id", *GEO_COLUMNS).first()
+    if row:
+        instance._population_before = (row["owner_id"], {level: row[f"{level}_id"] for level in population.LEVELS})
+
+
+@receiver(post_save, sender=Land)
+@receiver(post_save, sender=LivestockLocation)
+def count_holding(sender, instance, **kwargs):
+    population.record_holding_change(
+        getattr(instance, "_population_before", None),
+        (instance.owner_id, population.chain_of(instance)),
+    )
+
+
+@receiver(post_delete, sender=Land)
+@receiver(post_delete, sender=LivestockLocation)
+def uncount_holding(sender, instance, **kwargs):
+    population.record_holding_change((instance.owner_id, population.chain_of(instance)), None)
+
+
+# -------------------------------
+# USER LEVELS
+# -------------------------------
+@receiver(pre_save, sender=CustomUser)
+def remember_user_level(sender, instance, update_fields=None, **kwargs):
+    instance._population_level = None
+    if instance._state.adding or (update_fields is not None and "user_level" not in update_fields):
+        return
+    instance._population_level = CustomUser.objects.filter(pk=instance.pk).values_list("user_level", flat=True).first()
+
+
+@receiver(post_save, sender=CustomUser)
+def count_user_level(sender, instance, created, **kwargs):
+    if created:
+        population.record_user_level_change(instance.pk, None, instance.user_level)
+        return
+    old_level = getattr(instance, "_population_level", None)
+    if old_level is None or old_level == instance.user_level:
+        return
+    population.record_user_level_change(instance.pk, old_level, instance.user_level)
+    # Citizen counts of every area the user lives in
+    for district_id in population.districts_of_resident(instance.pk):
+        population.refresh_district(district_id)
+
+
+@receiver(post_delete, sender=CustomUser)
+def uncount_user(sender, instance, **kwargs):
+    population.record_user_level_change(instance.pk, instance.user_level, None)
+
+
+# -------------------------------
+# OFFICER ASSIGNMENTS
+# -------------------------------
+OFFICER_FIELDS = {District: "district_officer_id", Sector: "sector_officer_id", Cell: "cell_officer_id"}
+
+
+def _district_of(instance):
+    if isinstance(instance, District):
+        return instance.pk
+    if isinstance(instance, Sector):
+        return instance.district_id
+    return Sector.objects.filter(pk=instance.sector_id).values_list("district_id", flat=True).first()
+
+
+@receiver(pre_save, sender=District)
+@receiver(pre_save, sender=Sector)
+@receiver(pre_save, sender=Cell)
+def remember_officer(sender, instance, **kwargs):
+    field = OFFICER_FIELDS[sender]
+    instance._population_officer = None
+    if not instance._state.adding:
+        instance._population_officer = sender.objects.filter(pk=instance.pk).values_list(field, flat=True).first()
+
+
+@receiver(post_save, sender=District)
+@receiver(post_save, sender=Sector)
+@receiver(post_save, sender=Cell)
+def recount_officers(sender, instance, **kwargs):
+    if getattr(instance, OFFICER_FIELDS[sender]) != getattr(instance, "_population_officer", None):
+        population.refresh_district(_district_of(instance))
@@ -0,0 +1,158 @@
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from report.models import (
+    Land,
+    HarvestReport,
+    LivestockLocation,
+    LivestockAnimal,
+    LivestockProduction,
+    DistrictInventory,
+    CellInventory,
+    CellResourceRequest,
+    ResourceRequest,
+    ResourceRequestFeedback,
+    FarmerIssue,
+    FarmerIssueReply,
+)
+from report.models.geo import GeoStampedModel
+from users.utils import rollups, activity
+
+
+# -------------------------------
+# Helper Functions
+# -------------------------------
+def _cell_of_location(location_id):
+    return LivestockLocation.objects.filter(pk=location_id).values_list("cell_id", flat=True).first()
+
+
+BUCKET_DATE_FIELDS = {
+    HarvestReport: "report_date",
+    LivestockProduction: "report_date",
+    ResourceRequest: "request_date",
+    FarmerIssue: "reported_at",
+}
+
+
+def previous_state(sender, instance):
+    """
+    (cell, bucket date) an existing row is stored with, read before it is saved;
+    (None, None) for new rows. The date is None for models without activity buckets.
+    """
+    if instance._state.adding or instance.pk is None:
+        return None, None
+    path = "livestock_location__cell" if sender is LivestockAnimal else "cell"
+    date_field = BUCKET_DATE_FIELDS.get(sender)
+    row = sender.objects.filter(pk=instance.pk).values_list(path, date_field or path).first()
+    if row is None:
+        return None, None
+    return row[0], row[1] if date_field else None
+
+
+def affected_cells(instance):
+    """
+    The cell of `instance` and, when the save moved it, the cell it left.
+    """
+    return {cell_id for cell_id in (affected_cell(instance), getattr(instance, "_cell_before", None)) if cell_id}
+
+
+def affected_cell(instance):
+    """
+    Returns the cell whose rollup row depends on `instance`, or None.
+    """
+    # Reports and requests are stamped with their cell before saving (report/signals/geo_paths.py)
+    if isinstance(instance, (Land, LivestockLocation, CellInventory, CellResourceRequest, FarmerIssue, GeoStampedModel)):
+        return instance.cell_id
+    if isinstance(instance, LivestockAnimal):
+        return _cell_of_location(instance.livestock_location_id)
+    return None
+
+
+# -------------------------------
+# CELL-LEVEL FACTS
+# -------------------------------
+@receiver(pre_save, sender=Land)
+@receiver(pre_save, sender=HarvestReport)
+@receiver(pre_save, sender=LivestockLocation)
+@receiver(pre_save, sender=LivestockAnimal)
+@receiver(pre_save, sender=LivestockProduction)
+@receiver(pre_save, sender=CellInventory)
+@receiver(pre_save, sender=ResourceRequest)
+@receiver(pre_save, sender=CellResourceRequest)
+@receiver(pre_save, sender=ResourceRequestFeedback)
+@receiver(pre_save, sender=FarmerIssue)
+@receiver(pre_save, sender=FarmerIssueReply)
+def remember_cell(sender, instance, **kwargs):
+    instance._cell_before, instance._moment_before = previous_state(sender, instance)
+
+
+@receiver(post_save, sender=Land)
+@receiver(post_save, sender=HarvestReport)
+@receiver(post_save, sender=LivestockLocation)
+@receiver(post_save, sender=LivestockAnimal)
+@receiver(post_save, sender=LivestockProduction)
+@receiver(post_save, sender=CellInventory)
+@receiver(post_save, sender=ResourceRequest)
+@receiver(post_save, sender=CellResourceRequest)
+@receiver(post_save, sender=ResourceRequestFeedback)
+@receiver(post_save, sender=FarmerIssue)
+@receiver(post_save, sender=FarmerIssueReply)
+@receiver(post_delete, sender=Land)
+@receiver(post_delete, sender=HarvestReport)
+@receiver(post_delete, sender=LivestockLocation)
+@receiver(post_delete, sender=LivestockAnimal)
+@receiver(post_delete, sender=LivestockProduction)
+@receiver(post_delete, sender=CellInventory)
+@receiver(post_delete, sender=ResourceRequest)
+@receiver(post_delete, sender=CellResourceRequest)
+@receiver(post_delete, sender=ResourceRequestFeedback)
+@receiver(post_delete, sender=FarmerIssue)
+@receiver(post_delete, sender=FarmerIssueReply)
+def refresh_cell_rollup(sender, instance, **kwargs):
+    # Moving a land or livestock location also moves its reports and requests out of the
+    # cell it left (report/signals/geo_paths.py), so both cells are recomputed
+    cell_ids = affected_cells(instance)
+    if cell_ids:
+        transaction.on_commit(lambda: rollups.refresh_cells(cell_ids))
+
+
+# -------------------------------
+# DISTRICT INVENTORY
+# -------------------------------
+@receiver(post_save, sender=DistrictInventory)
+@receiver(post_delete, sender=DistrictInventory)
+def refresh_district_rollup(sender, instance, **kwargs):
+    district_id = instance.district_id
+    if district_id:
+        transaction.on_commit(lambda: rollups.refresh_districts([district_id]))
+
+
+# -------------------------------
+# DAILY ACTIVITY BUCKETS
+# -------------------------------
+@receiver(post_save, sender=HarvestReport)
+@receiver(post_save, sender=LivestockProduction)
+@receiver(post_save, sender=ResourceRequest)
+@receiver(post_save, sender=FarmerIssue)
+@receiver(post_delete, sender=HarvestReport)
+@receiver(post_delete, sender=LivestockProduction)
+@receiver(post_delete, sender=ResourceRequest)
+@receiver(post_delete, sender=FarmerIssue)
+def refresh_activity_bucket(sender, instance, **kwargs):
+    # A (cell, day) bucket holds every product, so a product change refreshes one bucket;
+    # a date or cell change also refreshes the one the row left
+    states = {
+        (cell_id, moment.date())
+        for cell_id, moment in [
+            (affected_cell(instance), getattr(instance, BUCKET_DATE_FIELDS[sender])),
+            (getattr(instance, "_cell_before", None), getattr(instance, "_moment_before", None)),
+        ]
+        if cell_id and moment
+    }
+
+    def refresh():
+        for cell_id, day in states:
+            activity.refresh_buckets(cell_id, day)
+
+    if states:
+        transaction.on_commit(refresh)
@@ -8,6 +8,8 @@ class UserConfig(AppConfig):
     def ready(self):
         import users.signals.account_notifications
         import users.signals.otp_notification
+        import users.signals.hierarchy  # noqa: F401
+        import users.checks  # noqa: F401
         from users.signals.pasword_reset_success import notify_password_reset
         from users.signals.otp_login import send_login_otp_notification
     
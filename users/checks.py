@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.core.checks import Warning, register
+
+from users.utils import hierarchy
+
+
+@register()
+def shared_cache_check(app_configs, **kwargs):
+    """
+    Warns when the default cache is local to each process: the dashboard cache and the
+    hierarchy/boundary snapshots are then only invalidated in the process that wrote.
+    """
+    if hierarchy.is_shared() or getattr(settings, "LOCAL_MEMORY_CACHE", False):
+        return []
+    return [
+        Warning(
+            "The default cache is local to each process, so dashboards and the hierarchy "
+            "and boundary snapshots go stale in every other web or Celery worker.",
+            hint="Set REDIS_CACHE_URL to a Redis shared by every process, or "
+                 "LOCAL_MEMORY_CACHE=True for single-process development.",
+            id="users.W001",
+        )
+    ]
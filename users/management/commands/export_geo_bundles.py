@@ -0,0 +1,27 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from users.utils import geo_bundles
+
+
+class Command(BaseCommand):
+    help = "Bake the administrative hierarchy, centroids and boundaries into one offline bundle per district"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--district", type=int, action="append", dest="districts", help="District id (repeatable); all districts by default")
+        parser.add_argument(
+            "--tolerance", type=float, default=0,
+            help="Extra Douglas-Peucker tolerance in degrees applied to the imported boundaries",
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        try:
+            stats = geo_bundles.export(district_ids=options["districts"], tolerance=options["tolerance"])
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Exported geo bundles in {elapsed:.2f}s: {stats['written']} written ({stats['bytes'] / 1024:.1f} KiB), "
+            f"{stats['unchanged']} unchanged, {stats['removed']} removed, {stats['deleted']} retired files deleted"
+        ))
@@ -0,0 +1,51 @@
+import json
+import time
+from django.core.management.base import BaseCommand, CommandError
+from users.utils import boundaries, hierarchy
+
+
+class Command(BaseCommand):
+    help = "Import geoBoundaries ADM4 (cell) / ADM5 (village) GeoJSON files as simplified boundary polygons"
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="+", help="GeoJSON FeatureCollection files on local disk")
+        parser.add_argument(
+            "--tolerance", type=float, default=boundaries.DEFAULT_TOLERANCE,
+            help="Douglas-Peucker tolerance in degrees (0 keeps every vertex)",
+        )
+        parser.add_argument("--level", choices=["cell", "village"], help="Override the level read from shapeType")
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        for path in options["paths"]:
+            try:
+                with open(path, encoding="utf-8") as fh:
+                    collection = json.load(fh)
+            except (OSError, ValueError) as exc:
+                raise CommandError(f"Cannot read {path}: {exc}")
+
+            try:
+                stats = boundaries.import_features(
+                    collection.get("features", []), tolerance=options["tolerance"], level=options["level"],
+                )
+            except ValueError as exc:
+                raise CommandError(f"{path}: {exc}")
+
+            kept = stats["vertices"] / stats["source_vertices"] * 100 if stats["source_vertices"] else 0
+            self.stdout.write(
+                f"{path}: {stats['imported']} boundaries, {stats['matched']} matched, "
+                f"{stats['unmatched']} unmatched; kept {stats['vertices']} of {stats['source_vertices']} vertices ({kept:.0f}%)"
+            )
+            if stats["unmatched"]:
+                self.stdout.write(self.style.WARNING(
+                    f"{stats['unmatched']} boundaries did not match a cell/village by name and centroid and are not used for lookups"
+                ))
+
+        if not hierarchy.is_shared():
+            self.stdout.write(self.style.WARNING(
+                "The cache is local to this process: running web processes keep serving the old "
+                "boundaries until they are restarted."
+            ))
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(f"Imported boundaries in {elapsed:.2f}s"))
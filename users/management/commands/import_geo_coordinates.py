@@ -0,0 +1,69 @@
+import csv
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from users.utils import geo_import, hierarchy
+
+DEFAULT_FILES = ["province.csv", "district.csv", "sector.csv", "cells_cords.csv", "villages_cords.csv", "geo_corrections.csv"]
+
+
+class Command(BaseCommand):
+    help = "Import province/district/sector/cell/village centroids from geoBoundaries CSV files in bulk"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "paths", nargs="*",
+            help=f"CSV files with X, Y, shapeName, shapeType (and optional parents) columns; default: {', '.join(DEFAULT_FILES)}",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="Match and report without writing")
+        parser.add_argument("--only-missing", action="store_true", help="Keep coordinates that are already set")
+        parser.add_argument(
+            "--margin-km", type=float, default=0.5,
+            help="How much nearer the best of several same-name candidates must be to be picked",
+        )
+        parser.add_argument("--batch-size", type=int, default=250, help="Rows per bulk_update query")
+        parser.add_argument("--report", help="Write the unmatched/ambiguous/duplicate rows to this CSV file")
+
+    def handle(self, *args, **options):
+        paths = options["paths"] or [str(settings.BASE_DIR / name) for name in DEFAULT_FILES]
+        started = time.monotonic()
+        try:
+            reports = geo_import.run(
+                paths,
+                dry_run=options["dry_run"],
+                only_missing=options["only_missing"],
+                margin_km=options["margin_km"],
+                batch_size=options["batch_size"],
+            )
+        except (OSError, KeyError, ValueError) as exc:
+            raise CommandError(f"Cannot import coordinates: {exc}")
+        elapsed = time.monotonic() - started
+
+        problems = []
+        for level, report in reports.items():
+            outcomes = ", ".join(f"{report.outcomes[name]} {name}" for name in geo_import.OUTCOMES if report.outcomes[name])
+            self.stdout.write(
+                f"{level}: {report.rows} rows ({outcomes}); {report.updated} updated, {report.unchanged} unchanged"
+            )
+            problems += report.problems
+
+        for level, name, outcome, candidates, lat, lon in problems[:20]:
+            self.stdout.write(self.style.WARNING(f"  {outcome}: {level[:-1]} '{name}' ({candidates} candidates) at {lat}, {lon}"))
+        if len(problems) > 20:
+            self.stdout.write(self.style.WARNING(f"  ... and {len(problems) - 20} more"))
+
+        if options["report"]:
+            with open(options["report"], "w", newline="", encoding="utf-8") as fh:
+                writer = csv.writer(fh)
+                writer.writerow(["level", "name", "outcome", "candidates", "latitude", "longitude"])
+                writer.writerows(problems)
+            self.stdout.write(f"Wrote {len(problems)} rows to {options['report']}")
+
+        if not options["dry_run"] and not hierarchy.is_shared():
+            self.stdout.write(self.style.WARNING(
+                "The cache is local to this process: running web processes keep serving the old "
+                "coordinates until they are restarted."
+            ))
+
+        verb = "Matched" if options["dry_run"] else "Imported"
+        self.stdout.write(self.style.SUCCESS(f"{verb} coordinates in {elapsed:.2f}s{' (dry run)' if options['dry_run'] else ''}"))
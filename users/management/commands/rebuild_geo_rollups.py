@@ -0,0 +1,25 @@
+import time
+from django.core.management.base import BaseCommand
+from report.models import GeoRollup
+from users.utils.rollups import rebuild_all
+
+
+class Command(BaseCommand):
+    help = "Rebuild the per-cell, per-sector, per-district and national dashboard rollups from the fact tables"
+
+    def handle(self, *args, **options):
+        self.stdout.write("Rebuilding geo rollups...")
+        started = time.monotonic()
+        if not rebuild_all():
+            self.stdout.write(self.style.WARNING("Another rebuild is running; nothing done."))
+            return
+        elapsed = time.monotonic() - started
+
+        counts = {
+            level: GeoRollup.objects.filter(level=level).count()
+            for level, _ in GeoRollup.LEVEL_CHOICES
+        }
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt rollups in {elapsed:.2f}s: "
+            + ", ".join(f"{count} {level}" for level, count in counts.items())
+        ))
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.4 on 2026-10-17 20:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0015_alter_cell_uuid'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Boundary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('shape_id', models.CharField(help_text='geoBoundaries shapeID', max_length=64, unique=True)),
+                ('level', models.CharField(choices=[('cell', 'Cell'), ('village', 'Village')], db_index=True, max_length=10)),
+                ('name', models.CharField(max_length=100)),
+                ('min_lon', models.FloatField()),
+                ('min_lat', models.FloatField()),
+                ('max_lon', models.FloatField()),
+                ('max_lat', models.FloatField()),
+                ('polygons', models.JSONField()),
+                ('vertices', models.PositiveIntegerField(default=0, help_text='Vertices kept after simplification')),
+                ('source_vertices', models.PositiveIntegerField(default=0, help_text='Vertices in the imported file')),
+                ('imported_at', models.DateTimeField(auto_now=True)),
+                ('cell', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='boundaries', to='users.cell')),
+                ('village', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='boundaries', to='users.village')),
+            ],
+        ),
+    ]
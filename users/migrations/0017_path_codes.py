@@ -0,0 +1,59 @@
+# Generated by Django 5.2.4 on 2026-10-17 20:40
+
+from django.db import migrations, models
+
+LEVELS = [("Province", None), ("District", "province"), ("Sector", "district"), ("Cell", "sector"), ("Village", "cell")]
+
+
+def assign_path_codes(apps, schema_editor):
+    # Segments in id order under each parent, as users/utils/path_codes.py assigns new rows
+    parent_codes = {None: ""}
+    for model_name, parent in LEVELS:
+        model = apps.get_model("users", model_name)
+        ordinals, codes, rows = {}, {}, []
+        for row in model.objects.order_by("id"):
+            parent_id = getattr(row, f"{parent}_id") if parent else None
+            ordinals[parent_id] = ordinals.get(parent_id, 0) + 1
+            prefix = parent_codes.get(parent_id, "")
+            segment = str(ordinals[parent_id]).zfill(2)
+            row.path_code = f"{prefix}.{segment}" if prefix else segment
+            codes[row.pk] = row.path_code
+            rows.append(row)
+        model.objects.bulk_update(rows, ["path_code"], batch_size=500)
+        parent_codes = codes
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0016_boundaries'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cell',
+            name='path_code',
+            field=models.CharField(blank=True, editable=False, max_length=14, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name='district',
+            name='path_code',
+            field=models.CharField(blank=True, editable=False, max_length=14, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name='province',
+            name='path_code',
+            field=models.CharField(blank=True, editable=False, max_length=14, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name='sector',
+            name='path_code',
+            field=models.CharField(blank=True, editable=False, max_length=14, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name='village',
+            name='path_code',
+            field=models.CharField(blank=True, editable=False, max_length=14, null=True, unique=True),
+        ),
+        migrations.RunPython(assign_path_codes, migrations.RunPython.noop),
+    ]
@@ -1,10 +1,13 @@
 from django.db import models
 from users.models import CustomUser  
+from users.utils.path_codes import MAX_LENGTH as MAX_PATH_LENGTH
 
 class Province(models.Model):
     name = models.CharField(max_length=100)
     latitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
     longitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
+    # Materialized path, e.g. "02.05.07" (see users/utils/path_codes.py)
+    path_code = models.CharField(max_length=MAX_PATH_LENGTH, unique=True, null=True, blank=True, editable=False)
 
     def __str__(self):
         return self.name
@@ -15,6 +18,8 @@ class District(models.Model):
     province = models.ForeignKey(Province, on_delete=models.CASCADE, related_name='districts')
     latitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
     longitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
+    # Materialized path, e.g. "02.05.07" (see users/utils/path_codes.py)
+    path_code = models.CharField(max_length=MAX_PATH_LENGTH, unique=True, null=True, blank=True, editable=False)
 
    
     district_officer = models.OneToOneField(
@@ -35,6 +40,8 @@ class Sector(models.Model):
     district = models.ForeignKey(District, on_delete=models.CASCADE, related_name='sectors')
     latitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
     longitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
+    # Materialized path, e.g. "02.05.07" (see users/utils/path_codes.py)
+    path_code = models.CharField(max_length=MAX_PATH_LENGTH, unique=True, null=True, blank=True, editable=False)
 
     sector_officer = models.OneToOneField(
         CustomUser,
@@ -54,6 +61,7 @@ import uuid
 from django.utils import timezone
 
 from users.models.products import Product
+from users.utils.scope import ScopePaths, ScopedQuerySet
 
 
 class Cell(models.Model):
@@ -65,6 +73,8 @@ class Cell(models.Model):
 
     latitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
     longitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
+    # Materialized path, e.g. "02.05.07" (see users/utils/path_codes.py)
+    path_code = models.CharField(max_length=MAX_PATH_LENGTH, unique=True, null=True, blank=True, editable=False)
 
     hectares = models.DecimalField(
         max_digits=10, decimal_places=2,
@@ -107,6 +117,9 @@ class Cell(models.Model):
         help_text="Optional planned livestock type for the season"
     )
 
+    scope_paths = ScopePaths(district="sector__district", sector="sector", cell="id", path="path_code")
+    objects = ScopedQuerySet.as_manager()
+
     def __str__(self):
         return f"{self.name} - Season {self.season or 'N/A'} {self.season_year}"
 
@@ -148,6 +161,40 @@ class Village(models.Model):
     cell = models.ForeignKey(Cell, on_delete=models.CASCADE, related_name='villages')
     latitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
     longitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
+    # Materialized path, e.g. "02.05.07" (see users/utils/path_codes.py)
+    path_code = models.CharField(max_length=MAX_PATH_LENGTH, unique=True, null=True, blank=True, editable=False)
 
     def __str__(self):
         return self.name
+
+
+class Boundary(models.Model):
+    """
+    Simplified administrative boundary polygon of a cell (geoBoundaries ADM4) or village
+    (ADM5), imported with `manage.py import_boundaries`. Village boundaries also point at
+    their cell. Point lookups go through users/utils/boundaries.py.
+    """
+    LEVEL_CHOICES = [
+        ("cell", "Cell"),
+        ("village", "Village"),
+    ]
+
+    shape_id = models.CharField(max_length=64, unique=True, help_text="geoBoundaries shapeID")
+    level = models.CharField(max_length=10, choices=LEVEL_CHOICES, db_index=True)
+    name = models.CharField(max_length=100)
+    cell = models.ForeignKey(Cell, on_delete=models.CASCADE, null=True, blank=True, related_name='boundaries')
+    village = models.ForeignKey(Village, on_delete=models.CASCADE, null=True, blank=True, related_name='boundaries')
+
+    # Bounding box, in degrees
+    min_lon = models.FloatField()
+    min_lat = models.FloatField()
+    max_lon = models.FloatField()
+    max_lat = models.FloatField()
+    # [polygon, ...], each polygon a list of rings of [lon, lat] pairs; the first ring is the shell
+    polygons = models.JSONField()
+    vertices = models.PositiveIntegerField(default=0, help_text="Vertices kept after simplification")
+    source_vertices = models.PositiveIntegerField(default=0, help_text="Vertices in the imported file")
+    imported_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.get_level_display()} boundary: {self.name}"
@@ -5,7 +5,7 @@ from django.core.validators import RegexValidator, URLValidator
 from django.utils import timezone
 from users.models.customuser import CustomUser
 from users.models.userprofile import UserProfile
-from users.models.addresses import Province, District, Sector, Cell, Village
+from users.serializer.location import LocationSerializerMixin
 
 logger = logging.getLogger(__name__)
 
@@ -53,7 +53,10 @@ def _normalize_rwandan_phone(value: str) -> str:
     return normalized
 
 
-class UserProfileSerializer(serializers.ModelSerializer):
+class UserProfileSerializer(LocationSerializerMixin, serializers.ModelSerializer):
+    # Profiles may be saved before the citizen picks a location
+    location_required = False
+
     website = serializers.URLField(
         required=False,
         allow_blank=True,
@@ -79,29 +82,7 @@ class UserProfileSerializer(serializers.ModelSerializer):
 
     def validate(self, data):
         logger.debug(f"Validating profile relationships: {data}")
-        province = data.get("province")
-        district = data.get("district")
-        sector = data.get("sector")
-        cell = data.get("cell")
-        village = data.get("village")
-
-        if district and province and district.province != province:
-            logger.error("District/province mismatch")
-            raise serializers.ValidationError({"district": "Selected district does not belong to the selected province."})
-
-        if sector and district and sector.district != district:
-            logger.error("Sector/district mismatch")
-            raise serializers.ValidationError({"sector": "Selected sector does not belong to the selected district."})
-
-        if cell and sector and cell.sector != sector:
-            logger.error("Cell/sector mismatch")
-            raise serializers.ValidationError({"cell": "Selected cell does not belong to the selected sector."})
-
-        if village and cell and village.cell != cell:
-            logger.error("Village/cell mismatch")
-            raise serializers.ValidationError({"village": "Selected village does not belong to the selected cell."})
-
-        return data
+        return super().validate(data)
 
 
 class CitizenRegistrationSerializer(serializers.ModelSerializer):
@@ -1,15 +1,23 @@
 from rest_framework import serializers
 from report.models import CellClimateData, Cell
+from users.utils import climate_series
 
 class CellClimateDataSerializer(serializers.ModelSerializer):
+    """
+    A cell's climate, rebuilt in the Open-Meteo response shape from the series of its
+    weather grid point (users/utils/climate_series.py).
+    """
     cell_id = serializers.IntegerField(source='cell.id', read_only=True)
     cell_name = serializers.CharField(source='cell.name', read_only=True)
     latitude = serializers.FloatField(source='cell.latitude', read_only=True)
     longitude = serializers.FloatField(source='cell.longitude', read_only=True)
+    next_24h_forecast = serializers.SerializerMethodField()
+    forecast_fetched_at = serializers.DateTimeField(source='grid_point.forecast_fetched_at', read_only=True, default=None)
+    past_3_months_data = serializers.SerializerMethodField()
+    historical_fetched_at = serializers.DateTimeField(source='grid_point.historical_fetched_at', read_only=True, default=None)
 
     class Meta:
         model = CellClimateData
-        # Dynamically include all fields in the model
         fields = [
             'cell_id', 'cell_name', 'latitude', 'longitude',
             'next_24h_forecast',
@@ -18,3 +26,9 @@ class CellClimateDataSerializer(serializers.ModelSerializer):
             'historical_fetched_at',
         ]
         read_only_fields = fields
+
+    def get_next_24h_forecast(self, obj):
+        return climate_series.forecast_document(obj.grid_point) if obj.grid_point_id else None
+
+    def get_past_3_months_data(self, obj):
+        return climate_series.archive_document(obj.grid_point) if obj.grid_point_id else None
@@ -1,6 +1,6 @@
 from rest_framework import serializers
-from users.models.addresses import Province, District, Sector, Cell, Village
 from report.models import FarmerIssue, FarmerIssueReply
+from users.serializer.location import LocationSerializerMixin
 
 ALLOWED_STATUS = ['RESOLVED', 'APPROVED', 'PENDING']
 
@@ -24,13 +24,8 @@ class FarmerIssueReplySerializer(serializers.ModelSerializer):
 
         return reply
 
-class FarmerIssueSerializer(serializers.ModelSerializer):
+class FarmerIssueSerializer(LocationSerializerMixin, serializers.ModelSerializer):
     farmer = serializers.PrimaryKeyRelatedField(read_only=True)
-    province = serializers.PrimaryKeyRelatedField(queryset=Province.objects.all())
-    district = serializers.PrimaryKeyRelatedField(queryset=District.objects.all())
-    sector = serializers.PrimaryKeyRelatedField(queryset=Sector.objects.all())
-    cell = serializers.PrimaryKeyRelatedField(queryset=Cell.objects.all())
-    village = serializers.PrimaryKeyRelatedField(queryset=Village.objects.all())
 
     farmer_name = serializers.CharField(source="farmer.full_names", read_only=True)
     latitude = serializers.SerializerMethodField()
@@ -68,29 +63,6 @@ class FarmerIssueSerializer(serializers.ModelSerializer):
 
         return FarmerIssueReplySerializer(replies_qs, many=True).data
 
-    def validate(self, data):
-        errors = {}
-
-        province = data.get('province')
-        district = data.get('district')
-        sector = data.get('sector')
-        cell = data.get('cell')
-        village = data.get('village')
-
-        if province and district and district.province_id != province.id:
-            errors['district'] = ["District does not belong to the selected Province."]
-        if district and sector and sector.district_id != district.id:
-            errors['sector'] = ["Sector does not belong to the selected District."]
-        if sector and cell and cell.sector_id != sector.id:
-            errors['cell'] = ["Cell does not belong to the selected Sector."]
-        if cell and village and village.cell_id != cell.id:
-            errors['village'] = ["Village does not belong to the selected Cell."]
-
-        if errors:
-            raise serializers.ValidationError(errors)
-
-        return data
-
     def get_latitude(self, obj):
         return obj.latitude if obj.latitude is not None else getattr(obj.cell, 'latitude', None)
 
@@ -4,12 +4,12 @@ from rest_framework import serializers
 from report.models import Land, HarvestReport, LivestockLocation, LivestockAnimal
 from users.models import CustomUser, Product
 from django.db import transaction
-from users.models.addresses import Province, District, Sector, Cell, Village
+from users.serializer.location import LocationSerializerMixin
 
 # Create a dedicated logger for serializers
 logger = logging.getLogger("serializers_debug")
 
-class LandSerializer(serializers.ModelSerializer):
+class LandSerializer(LocationSerializerMixin, serializers.ModelSerializer):
     owner_name = serializers.CharField(source='owner.full_names', read_only=True)
     province_name = serializers.CharField(source='province.name', read_only=True)
     district_name = serializers.CharField(source='district.name', read_only=True)
@@ -87,7 +87,7 @@ class LivestockProductSerializer(serializers.Serializer):
     quantity = serializers.IntegerField(min_value=1)
 
 
-class LivestockLocationSerializer(serializers.ModelSerializer):
+class LivestockLocationSerializer(LocationSerializerMixin, serializers.ModelSerializer):
     upi = serializers.CharField(required=True)  # Make UPI required
 
     livestock_animals = serializers.ListSerializer(
@@ -103,13 +103,6 @@ class LivestockLocationSerializer(serializers.ModelSerializer):
     sector_name = serializers.CharField(source="sector.name", read_only=True)
     cell_name = serializers.CharField(source="cell.name", read_only=True)
     village_name = serializers.CharField(source="village.name", read_only=True)
-    
-
-    province = serializers.PrimaryKeyRelatedField(queryset=Province.objects.all())
-    district = serializers.PrimaryKeyRelatedField(queryset=District.objects.all())
-    sector = serializers.PrimaryKeyRelatedField(queryset=Sector.objects.all())
-    cell = serializers.PrimaryKeyRelatedField(queryset=Cell.objects.all())
-    village = serializers.PrimaryKeyRelatedField(queryset=Village.objects.all())
 
     animals = serializers.SerializerMethodField()
 
@@ -143,8 +136,8 @@ class LivestockLocationSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         animals_data = validated_data.pop("livestock_animals", [])
 
-        # Ensure required fields including UPI
-        required_fields = ["upi", "province", "district", "sector", "cell", "village"]
+        # Ensure UPI is present; the location was checked and filled in by validate()
+        required_fields = ["upi"]
         for field in required_fields:
             if field not in validated_data or validated_data[field] in [None, ""]:
                 raise serializers.ValidationError({field: "This field is required."})
@@ -0,0 +1,116 @@
+"""
+Location fields shared by the write serializers (lands, livestock, issues, profiles).
+
+The province/district/sector/cell/village ids are checked against the in-memory hierarchy
+snapshot (users/utils/hierarchy.py) instead of one PrimaryKeyRelatedField query per level
+(the database is only asked about ids the snapshot does not know),
+and the levels above the most specific one sent are filled in from it, so a client may
+send just the village:
+
+    {"village": 5123}  ->  province_id, district_id, sector_id, cell_id, village_id
+
+Validated ids are stored as `<level>_id`, which model constructors and save() accept as is.
+"""
+from rest_framework import serializers
+
+from users.utils import hierarchy
+
+LOCATION_FIELDS = ("province", "district", "sector", "cell", "village")
+
+
+class HierarchyIdField(serializers.Field):
+    """
+    Primary key of one hierarchy level, looked up in the hierarchy snapshot.
+    """
+    default_error_messages = {
+        "does_not_exist": 'Invalid pk "{pk_value}" - object does not exist.',
+        "incorrect_type": "Incorrect type. Expected pk value, received {data_type}.",
+    }
+
+    def __init__(self, level, **kwargs):
+        self.level = level
+        kwargs.setdefault("source", f"{level[:-1]}_id")
+        kwargs.setdefault("required", False)
+        kwargs.setdefault("allow_null", True)
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        if isinstance(data, bool):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        try:
+            pk = int(data)
+        except (TypeError, ValueError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        if hierarchy.current().entry(self.level, pk) is None:
+            # The snapshot may predate the row (a bump lost, or not seen yet): ask the
+            # database before failing, and reload the snapshot when it has the row
+            model = hierarchy.LEVELS[self.level][0]
+            if not model.objects.filter(pk=pk).exists():
+                self.fail("does_not_exist", pk_value=data)
+            hierarchy.bump()
+            if hierarchy.current().entry(self.level, pk) is None:
+                self.fail("does_not_exist", pk_value=data)
+        return pk
+
+    def to_representation(self, value):
+        return value
+
+
+def resolve_location(sent, *, instance=None, required=True):
+    """
+    Checks the ids in `sent` ({"cell": 12, "village": 5123, ...}) as one chain and returns
+    all of them as {"<level>_id": pk}, filled in from the most specific one. On updates the
+    instance's ids below that level take part in the check, so moving a record to another
+    cell without a village of that cell fails. Raises ValidationError keyed by field name.
+    """
+    sent = {name: pk for name, pk in sent.items() if pk is not None}
+    if instance is not None and sent:
+        deepest = max(LOCATION_FIELDS.index(name) for name in sent)
+        for name in LOCATION_FIELDS[deepest + 1:]:
+            pk = getattr(instance, f"{name}_id", None)
+            if pk is not None:
+                sent[name] = pk
+    if not sent:
+        return {}
+
+    leaf = max(sent, key=LOCATION_FIELDS.index)
+    if required and leaf != "village":
+        raise serializers.ValidationError({"village": ["This field is required."]})
+
+    lineage = hierarchy.current().lineage(f"{leaf}s", sent[leaf])
+    errors = {}
+    for position, name in enumerate(LOCATION_FIELDS[:-1]):
+        if name in sent and lineage.get(name, {}).get("id") != sent[name]:
+            child = LOCATION_FIELDS[position + 1]
+            errors.setdefault(child, [f"{child.title()} does not belong to the selected {name.title()}."])
+    if errors:
+        raise serializers.ValidationError(errors)
+    return {f"{name}_id": entry["id"] for name, entry in lineage.items()}
+
+
+class LocationSerializerMixin(serializers.Serializer):
+    """
+    Declares the five location fields and validates them together. With
+    `location_required` a village is mandatory and no level may be cleared.
+    """
+    location_required = True
+
+    province = HierarchyIdField("provinces")
+    district = HierarchyIdField("districts")
+    sector = HierarchyIdField("sectors")
+    cell = HierarchyIdField("cells")
+    village = HierarchyIdField("villages")
+
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        sent = {name: attrs[f"{name}_id"] for name in LOCATION_FIELDS if f"{name}_id" in attrs}
+
+        if self.location_required:
+            cleared = [name for name, pk in sent.items() if pk is None]
+            if cleared:
+                raise serializers.ValidationError({name: ["This field may not be null."] for name in cleared})
+            if not sent and self.instance is None:
+                raise serializers.ValidationError({"village": ["This field is required."]})
+
+        attrs.update(resolve_location(sent, instance=self.instance, required=self.location_required))
+        return attrs
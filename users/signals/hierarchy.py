@@ -0,0 +1,68 @@
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from users.models.addresses import Province, District, Sector, Cell, Village
+from users.utils import hierarchy, path_codes
+
+LEVEL_MODELS = [Province, District, Sector, Cell, Village]
+
+
+def _unchanged(sender, instance):
+    """
+    True when the saved row is already in this process's snapshot with the same name,
+    parent and centroid, e.g. a cell saved for an officer or season change.
+    """
+    snapshot = hierarchy.loaded()
+    if snapshot is None or snapshot.version != hierarchy.version():
+        return False
+    level = hierarchy.MODEL_LEVELS[sender]
+    return snapshot.entry(level, instance.pk) == hierarchy.identity(level, instance)
+
+
+# -------------------------------
+# PATH CODES
+# -------------------------------
+@receiver(pre_save, sender=Province)
+@receiver(pre_save, sender=District)
+@receiver(pre_save, sender=Sector)
+@receiver(pre_save, sender=Cell)
+@receiver(pre_save, sender=Village)
+def assign_path_code(sender, instance, **kwargs):
+    # Read by the post_save hooks here and in report/signals/geo_paths.py
+    instance._previous_path_code = path_codes.assign(instance)
+
+
+@receiver(post_save, sender=Province)
+@receiver(post_save, sender=District)
+@receiver(post_save, sender=Sector)
+@receiver(post_save, sender=Cell)
+@receiver(post_save, sender=Village)
+def move_descendant_path_codes(sender, instance, **kwargs):
+    previous = getattr(instance, "_previous_path_code", None)
+    if not previous:
+        return
+    for model in LEVEL_MODELS[LEVEL_MODELS.index(sender) + 1:]:
+        path_codes.rewrite_prefix(model.objects.all(), "path_code", previous, instance.path_code)
+
+
+# -------------------------------
+# SNAPSHOT VERSION
+# -------------------------------
+@receiver(post_save, sender=Province)
+@receiver(post_save, sender=District)
+@receiver(post_save, sender=Sector)
+@receiver(post_save, sender=Cell)
+@receiver(post_save, sender=Village)
+def bump_hierarchy_on_save(sender, instance, created, **kwargs):
+    if not created and _unchanged(sender, instance):
+        return
+    transaction.on_commit(hierarchy.bump)
+
+
+@receiver(post_delete, sender=Province)
+@receiver(post_delete, sender=District)
+@receiver(post_delete, sender=Sector)
+@receiver(post_delete, sender=Cell)
+@receiver(post_delete, sender=Village)
+def bump_hierarchy_on_delete(sender, instance, **kwargs):
+    transaction.on_commit(hierarchy.bump)
@@ -1 +1,6 @@
-from users.tasks.fetch_climate_data import fetch_24h_forecast, fetch_past_3months_data 
\ No newline at end of file
+from users.tasks.fetch_climate_data import fetch_24h_forecast, fetch_past_3months_data, fetch_climate_chunk, summarize_climate_run
+from users.tasks.activity_buckets import backfill_activity_buckets
+from users.tasks.population import reconcile_population_counters
+from users.tasks.land_stats import reconcile_cell_land_stats
+from users.tasks.dashboard_cache import refresh_dashboard_cache
+from users.tasks.rollups import rebuild_geo_rollups
@@ -0,0 +1,15 @@
+from celery import shared_task
+from users.utils import activity
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def backfill_activity_buckets(days=3):
+    """
+    Nightly safety net for the incremental bucket refresh: recomputes the last `days` days.
+    """
+    count = activity.backfill_recent(days)
+    logger.info(f"[ActivityBuckets] Recomputed {count} buckets for the last {days} day(s).")
+    return count
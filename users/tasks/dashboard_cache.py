@@ -0,0 +1,27 @@
+from celery import shared_task
+from users.models.customuser import CustomUser
+from users.utils import dashboard_cache
+from users.utils.scope import resolve_scope
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def refresh_dashboard_cache(user_id, sections=None):
+    """
+    Rebuilds the cached dashboard of the scope `user_id` belongs to (stale-while-revalidate).
+    """
+    from users.views.views.dashbord import RoleAwareDashboard, DASHBOARD_SECTIONS
+
+    sections = tuple(sections or DASHBOARD_SECTIONS)
+
+    user = CustomUser.objects.filter(id=user_id).first()
+    if user is None:
+        logger.warning(f"[DashboardCache] User {user_id} not found, skipping refresh.")
+        return
+
+    view = RoleAwareDashboard()
+    scope = resolve_scope(user)
+    dashboard_cache.store(scope, lambda s: view.build_payload(s, sections), variant=",".join(sections))
+    logger.info(f"[DashboardCache] Refreshed dashboard for {dashboard_cache.scope_key(scope)}")
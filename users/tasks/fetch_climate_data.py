@@ -1,104 +1,95 @@
-import requests
 from datetime import date, timedelta
-from django.utils import timezone
-from celery import shared_task
-from users.models.addresses import Cell
-from report.models import CellClimateData
+from celery import chord, shared_task
+from report.models import ClimateFetchChunk, ClimateFetchRun
+from users.utils import climate_grid, climate_runs, climate_series, open_meteo
 import logging
 
 logger = logging.getLogger(__name__)
 
-OPEN_METEO_ARCHIVE_URL = "https://archive-api.open-meteo.com/v1/archive"
-OPEN_METEO_FORECAST_URL = "https://api.open-meteo.com/v1/forecast"
+CHUNK_BACKOFF = 30  # seconds before a chunk's first retry, doubled on each one
 
 
-@shared_task(bind=True, max_retries=3)
-def fetch_24h_forecast(self):
+def _dispatch(kind, build_requests):
+    """
+    Starts (or resumes) a run of `kind` and fans its chunks out as a chord whose callback
+    summarizes the run (users/utils/climate_runs.py).
+    """
+    run, chunk_ids, state = climate_runs.start(kind, build_requests)
+    if state != "running":
+        if chunk_ids:
+            chord([fetch_climate_chunk.si(chunk_id) for chunk_id in chunk_ids])(summarize_climate_run.si(str(run.pk)))
+        else:
+            climate_runs.finish(run)
+    return {"run": str(run.pk), "state": state, "chunks": len(chunk_ids)}
+
+
+def _forecast_requests():
+    groups = climate_grid.sync()
+    return [(open_meteo.FORECAST_PARAMS, list(groups))], groups
+
+
+def _archive_requests():
+    groups = climate_grid.sync()
+    today = date.today()
+    keep_from = today - timedelta(days=climate_series.RETENTION_DAYS)
+    ranges = climate_series.missing_ranges(groups, keep_from, today)
+    return [
+        ({**open_meteo.ARCHIVE_PARAMS, "start_date": first.isoformat(), "end_date": today.isoformat()}, point_ids)
+        for first, point_ids in sorted(ranges.items())
+    ], groups
+
+
+@shared_task
+def fetch_24h_forecast():
     """
     Fetches next 24 hours forecast for all cells.
-    Scheduled: every 1 hour via Celery Beat.
-    Stores in `next_24h_forecast` JSON field in CellClimateData.
+    Scheduled via Celery Beat.
+    Stores hourly GridHourlyForecast rows per weather grid point, in chunks fetched by
+    fetch_climate_chunk.
     """
-    cells = Cell.objects.all()
-    logger.info(f"Starting 24h forecast fetch for {cells.count()} cells...")
-
-    for i, cell in enumerate(cells, start=1):
-        lat, lon = cell.latitude, cell.longitude
-        if not lat or not lon:
-            logger.warning(f"[{i}/{cells.count()}] Skipping {cell.name} - Missing coordinates")
-            continue
-
-        try:
-            params = {
-                "latitude": lat,
-                "longitude": lon,
-                "hourly": "temperature_2m,precipitation",
-                "forecast_days": 1,
-                "timezone": "auto"
-            }
-            resp = requests.get(OPEN_METEO_FORECAST_URL, params=params, timeout=15)
-            resp.raise_for_status()
-            forecast_data = resp.json()
-
-            CellClimateData.objects.update_or_create(
-                cell=cell,
-                defaults={
-                    "next_24h_forecast": forecast_data,
-                    "forecast_fetched_at": timezone.now()
-                }
-            )
-            logger.info(f"[{i}/{cells.count()}] ✅ 24h forecast updated for cell {cell.name}")
-
-        except requests.RequestException as e:
-            logger.error(f"[{i}/{cells.count()}] 🌐 Network/API error for cell {cell.name}: {e}")
-            self.retry(countdown=60)
-        except Exception as e:
-            logger.error(f"[{i}/{cells.count()}] ❌ Unexpected error for cell {cell.name}: {e}")
-
-
-@shared_task(bind=True, max_retries=2)
-def fetch_past_3months_data(self):
+    return _dispatch("forecast", _forecast_requests)
+
+
+@shared_task
+def fetch_past_3months_data():
     """
-    Fetches past 3 months climate data for all cells.
+    Brings the past 3 months of daily climate of every grid point up to date.
     Scheduled: weekly via Celery Beat.
-    Stores in `past_3_months_data` JSON field in CellClimateData.
+    Only the days missing since each point's last complete day are requested
+    (climate_series.missing_ranges); the summary trims rows older than the retention
+    window and reports the requests and bytes saved against re-downloading it.
     """
-    today = date.today()
-    start_date = today - timedelta(days=90)
-    end_date = today
-    cells = Cell.objects.all()
-    logger.info(f"Starting past 3 months data fetch for {cells.count()} cells...")
-
-    for i, cell in enumerate(cells, start=1):
-        lat, lon = cell.latitude, cell.longitude
-        if not lat or not lon:
-            logger.warning(f"[{i}/{cells.count()}] Skipping {cell.name} - Missing coordinates")
-            continue
-
-        try:
-            params = {
-                "latitude": lat,
-                "longitude": lon,
-                "start_date": start_date.isoformat(),
-                "end_date": end_date.isoformat(),
-                "daily": "temperature_2m_max,temperature_2m_min,precipitation_sum",
-                "timezone": "auto"
-            }
-            resp = requests.get(OPEN_METEO_ARCHIVE_URL, params=params, timeout=20)
-            resp.raise_for_status()
-            historical_data = resp.json()
-
-            CellClimateData.objects.update_or_create(
-                cell=cell,
-                defaults={
-                    "past_3_months_data": historical_data,
-                    "historical_fetched_at": timezone.now()
-                }
-            )
-            logger.info(f"[{i}/{cells.count()}] ✅ Past 3 months data updated for cell {cell.name}")
-
-        except requests.RequestException as e:
-            logger.error(f"[{i}/{cells.count()}] 🌐 Network/API error for cell {cell.name}: {e}")
-            self.retry(countdown=120)
-        except Exception as e:
-            logger.error(f"[{i}/{cells.count()}] ❌ Unexpected error for cell {cell.name}: {e}")
+    return _dispatch("archive", _archive_requests)
+
+
+@shared_task(bind=True, max_retries=3)
+def fetch_climate_chunk(self, chunk_id):
+    """
+    Fetches one chunk of a climate run. Retried on its own, with exponential backoff, while
+    some of its grid points failed; each attempt only requests those. Once the retries are
+    spent the chunk is marked failed and the task returns, so the run still gets summarized.
+    """
+    chunk = ClimateFetchChunk.objects.select_related("run").get(pk=chunk_id)
+    if chunk.status == "done":
+        return chunk_id
+
+    error = None
+    try:
+        if climate_runs.execute(chunk):
+            return chunk_id
+    except Exception as exc:
+        logger.exception(f"Chunk {chunk.index} of climate run {chunk.run_id} failed")
+        error = exc
+
+    if self.request.retries < self.max_retries:
+        raise self.retry(countdown=CHUNK_BACKOFF * 2 ** self.request.retries)
+    climate_runs.give_up(chunk, error)
+    return chunk_id
+
+
+@shared_task
+def summarize_climate_run(run_id):
+    """
+    Chord callback of a climate run: records its coverage and latency.
+    """
+    return climate_runs.finish(ClimateFetchRun.objects.get(pk=run_id))
@@ -0,0 +1,15 @@
+from celery import shared_task
+from users.utils import land_stats
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def reconcile_cell_land_stats():
+    """
+    Nightly safety net for the incremental cell land stats: rebuilds them exactly.
+    """
+    drifted = land_stats.reconcile()
+    logger.info(f"[CellLandStats] Reconciled, {drifted} row(s) had drifted.")
+    return drifted
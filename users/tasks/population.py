@@ -0,0 +1,15 @@
+from celery import shared_task
+from users.utils import population
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def reconcile_population_counters(district_ids=None):
+    """
+    Nightly safety net for the incremental population counters: rebuilds them exactly.
+    """
+    drifted = population.reconcile(district_ids)
+    logger.info(f"[PopulationCounters] Reconciled, {drifted} row(s) had drifted.")
+    return drifted
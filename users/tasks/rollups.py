@@ -0,0 +1,16 @@
+from celery import shared_task
+from users.utils import rollups
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def rebuild_geo_rollups():
+    """
+    Nightly safety net for the incremental dashboard rollups, and their first build after
+    a deploy: rebuilds them from the fact tables unless a rebuild is already running.
+    """
+    rebuilt = rollups.rebuild_all()
+    logger.info(f"[GeoRollups] {'Rebuilt' if rebuilt else 'Skipped, a rebuild is already running'}.")
+    return rebuilt
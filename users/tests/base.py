@@ -0,0 +1,102 @@
+"""
+Shared fixtures, layered so each test module creates only what its feature reads:
+
+    GeographyMixin       a two-district geography, a district officer and a citizen
+    HoldingsMixin        + the citizen's land in each district and livestock in the first
+    DashboardDataMixin   + reports, productions, requests and issues on those holdings
+"""
+from decimal import Decimal
+
+from users.models import CustomUser, Product
+from users.models.addresses import Province, District, Sector, Cell, Village
+from report.models import (
+    Land,
+    HarvestReport,
+    LivestockLocation,
+    LivestockAnimal,
+    LivestockProduction,
+    ResourceRequest,
+    ResourceRequestFeedback,
+    FarmerIssue,
+    FarmerIssueReply,
+)
+
+
+class GeographyMixin:
+    """
+    One province with two districts of one sector, cell and village each (both villages
+    are called Amahoro), the officer of the first district and a citizen.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.province = Province.objects.create(name="Kigali")
+        cls.district = District.objects.create(name="Gasabo", province=cls.province)
+        cls.other_district = District.objects.create(name="Huye", province=cls.province)
+        cls.sector = Sector.objects.create(name="Remera", district=cls.district)
+        cls.other_sector = Sector.objects.create(name="Ngoma", district=cls.other_district)
+        cls.cell = Cell.objects.create(name="Rukiri", sector=cls.sector)
+        cls.other_cell = Cell.objects.create(name="Matyazo", sector=cls.other_sector)
+        cls.village = Village.objects.create(name="Amahoro", cell=cls.cell)
+        cls.other_village = Village.objects.create(name="Amahoro", cell=cls.other_cell)
+
+        cls.officer = CustomUser.objects.create_user(
+            email="officer@example.com", full_names="District Officer",
+            national_id="1000000000000001", password="Officer123!", user_level="district_officer",
+        )
+        cls.district.district_officer = cls.officer
+        cls.district.save()
+        cls.farmer = CustomUser.objects.create_user(
+            email="farmer@example.com", full_names="Farmer One",
+            national_id="1000000000000002", password="Farmer123!", user_level="citizen",
+        )
+
+
+class HoldingsMixin(GeographyMixin):
+    """
+    The citizen's land in each district (2.5 ha in the first) and three cows in the first.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.maize = Product.objects.create(name="Maize", category="crops", unit="kg")
+        cls.cow = Product.objects.create(name="Cow", category="livestock", unit="head")
+
+        cls.location = dict(province=cls.province, district=cls.district, sector=cls.sector, cell=cls.cell, village=cls.village)
+        cls.land = Land.objects.create(owner=cls.farmer, upi="1/01/01/01/1", size_hectares=Decimal("2.50"), **cls.location)
+        cls.other_land = Land.objects.create(
+            owner=cls.farmer, upi="1/02/01/01/2", size_hectares=Decimal("1.00"),
+            province=cls.province, district=cls.other_district, sector=cls.other_sector,
+            cell=cls.other_cell, village=cls.other_village,
+        )
+        cls.livestock = LivestockLocation.objects.create(owner=cls.farmer, upi="L-1", **cls.location)
+        LivestockAnimal.objects.create(livestock_location=cls.livestock, animal=cls.cow, quantity=3)
+
+
+class DashboardDataMixin(HoldingsMixin):
+    """
+    Facts on the citizen's holdings: three harvest reports (100 available and 40 sold in
+    the first district, 5 sold in the other), a livestock production, a resource request
+    with feedback and two issues, the first with two replies.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        HarvestReport.objects.create(farmer=cls.farmer, land=cls.land, product=cls.maize, quantity=100, status="available")
+        HarvestReport.objects.create(farmer=cls.farmer, land=cls.land, product=cls.maize, quantity=40, status="sold")
+        HarvestReport.objects.create(farmer=cls.farmer, land=cls.other_land, product=cls.maize, quantity=5, status="sold")
+
+        LivestockProduction.objects.create(farmer=cls.farmer, location=cls.livestock, product=cls.cow, quantity=12.5, status="available")
+
+        request = ResourceRequest.objects.create(
+            farmer=cls.farmer, land=cls.land, product=cls.maize, quantity_requested=Decimal("10"), status="pending",
+        )
+        ResourceRequestFeedback.objects.create(request=request, farmer=cls.farmer, rating=4)
+
+        issue = FarmerIssue.objects.create(farmer=cls.farmer, issue_type="pests", description="Aphids", status="Pending", **cls.location)
+        FarmerIssue.objects.create(farmer=cls.farmer, issue_type="drought", description="Dry", status="Resolved", **cls.location)
+        FarmerIssueReply.objects.create(issue=issue, responder=cls.officer, message="On our way")
+        FarmerIssueReply.objects.create(issue=issue, responder=cls.officer, message="Spray tomorrow")
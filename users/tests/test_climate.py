@@ -0,0 +1,254 @@
+import json
+import threading
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from users.models.addresses import Cell
+from users.utils import climate_grid, climate_runs, climate_series, hierarchy, open_meteo
+from users.tasks.fetch_climate_data import fetch_24h_forecast, fetch_past_3months_data
+from users.serializer.climate_data import CellClimateDataSerializer
+from report.models import (
+    CellClimateData,
+    ClimateFetchChunk,
+    ClimateFetchRun,
+    ClimateGridPoint,
+    GridDailyClimate,
+    GridHourlyForecast,
+)
+from users.tests.base import GeographyMixin
+
+
+class _OpenMeteoStub(BaseHTTPRequestHandler):
+    """
+    Answers multi-location requests like Open-Meteo: one object per coordinate, a bare
+    object for a single one. The first request to /flaky gets a 503, /storm answers 503
+    to every batch holding latitude -2.1.
+    """
+    requests = []
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        type(self).requests.append((url.path, query))
+        if url.path == "/flaky" and len([r for r in type(self).requests if r[0] == "/flaky"]) == 1:
+            self.send_response(503)
+            self.end_headers()
+            return
+        if url.path == "/storm" and "-2.100000" in query["latitude"][0].split(","):
+            self.send_response(503)
+            self.end_headers()
+            return
+        latitudes, longitudes = query["latitude"][0].split(","), query["longitude"][0].split(",")
+        locations = [
+            {
+                "latitude": float(lat), "longitude": float(lon), "utc_offset_seconds": 7200, "timezone": "Africa/Kigali",
+                "hourly": {"time": ["2026-10-17T00:00"], "temperature_2m": [20.5], "precipitation": [0.1]},
+            }
+            for lat, lon in zip(latitudes, longitudes)
+        ]
+        if "daily" in query:
+            first, last = date.fromisoformat(query["start_date"][0]), date.fromisoformat(query["end_date"][0])
+            days = [(first + timedelta(days=n)).isoformat() for n in range((last - first).days + 1)]
+            for location in locations:
+                del location["hourly"]
+                location["daily"] = {
+                    "time": days, "temperature_2m_max": [26.0] * len(days),
+                    "temperature_2m_min": [15.0] * len(days), "precipitation_sum": [1.0] * len(days),
+                }
+        body = json.dumps(locations if len(locations) > 1 else locations[0]).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class ClimateFetchTests(GeographyMixin, TestCase):
+
+    def setUp(self):
+        cache.clear()
+        hierarchy.reset()
+        _OpenMeteoStub.requests = []
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _OpenMeteoStub)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.base = f"http://127.0.0.1:{server.server_port}"
+
+        self.cells = [self.cell, self.other_cell] + [
+            Cell.objects.create(name=f"Cell {n}", sector=self.sector) for n in range(3)
+        ]
+        # The first three share the 0.1 degree grid point (-1.9, 30.0)
+        coordinates = [("-1.90", "30.00"), ("-1.91", "30.01"), ("-1.92", "30.04"), ("-1.95", "30.30"), ("-2.05", "30.50")]
+        for cell, (lat, lon) in zip(self.cells, coordinates):
+            Cell.objects.filter(pk=cell.pk).update(latitude=Decimal(lat), longitude=Decimal(lon))
+
+    def _run(self, task):
+        """
+        Runs a climate task with its chord applied eagerly, chunk by chunk; returns the run.
+        """
+        with mock.patch("users.tasks.fetch_climate_data.chord") as chord:
+            dispatched = task()
+        if chord.called:
+            for signature in chord.call_args.args[0]:
+                signature.apply()
+            chord.return_value.call_args.args[0].apply()
+        return ClimateFetchRun.objects.get(pk=dispatched["run"])
+
+    def test_grid_points_are_fetched_in_multi_location_batches_and_fanned_out(self):
+        with override_settings(OPEN_METEO_FORECAST_URL=f"{self.base}/flaky"), \
+                mock.patch.object(open_meteo, "BATCH_SIZE", 2), mock.patch.object(open_meteo, "BACKOFF", 0):
+            run = self._run(fetch_24h_forecast)
+
+        # 3 grid points in batches of up to 2, the first request retried after the 503
+        self.assertEqual(
+            (run.status, run.grid_points, run.points_stored, run.cells_covered, run.rows, run.requests),
+            ("complete", 3, 3, 5, 3, 3),
+        )
+        self.assertEqual((run.summary["chunks"], run.summary["coverage"], run.summary["attempts"]), (1, 1.0, 1))
+        self.assertEqual(sorted(len(query["latitude"][0].split(",")) for _, query in _OpenMeteoStub.requests[1:]), [1, 2])
+        self.assertEqual(_OpenMeteoStub.requests[0][1]["hourly"], ["temperature_2m,precipitation"])
+
+        self.assertEqual(GridHourlyForecast.objects.count(), 3)
+        data = CellClimateData.objects.select_related("grid_point").get(cell=self.other_cell)
+        self.assertEqual(data.grid_point, CellClimateData.objects.get(cell=self.cell).grid_point)
+        forecast = CellClimateDataSerializer(data).data["next_24h_forecast"]
+        self.assertEqual((forecast["latitude"], forecast["longitude"], forecast["timezone"]), (-1.9, 30.0, "Africa/Kigali"))
+        self.assertEqual(forecast["hourly"], {"time": ["2026-10-17T00:00"], "temperature_2m": [20.5], "precipitation": [0.1]})
+        self.assertIsNotNone(data.grid_point.forecast_fetched_at)
+
+    def test_daily_series_are_sliced_and_summarised_per_area(self):
+        point_of = {(lat, lon): point_id for point_id, (lat, lon, _) in climate_grid.sync().items()}
+
+        def archive(rain):
+            return {"utc_offset_seconds": 7200, "daily": {
+                "time": ["2026-10-01", "2026-10-02", "2026-10-03"],
+                "temperature_2m_max": [26.0, 27.0, 28.0], "temperature_2m_min": [14.0, 15.0, 16.0], "precipitation_sum": rain,
+            }}
+
+        rows = climate_series.store_archive({
+            point_of[(-1.9, 30.0)]: archive([1.0, 2.0, 3.0]),
+            point_of[(-2.0, 30.3)]: archive([9.0, 0.0, 0.0]),
+            point_of[(-2.1, 30.5)]: archive([0.0, 0.0, 5.0]),
+        })
+        # Outside the retention window
+        trimmed = climate_series.trim_archive(date(2026, 10, 2))
+        self.assertEqual((rows, trimmed, GridDailyClimate.objects.count()), (9, 3, 6))
+
+        response = self.client.get("/api/climate/summary/", {"start": "2026-10-01", "end": "2026-10-31"}).json()
+        self.assertEqual(
+            [(area["name"], area["cells"], area["days"], area["precipitation_mm"], area["temperature_max_avg"]) for area in response["areas"]],
+            # Remera: cells on (-1.9, 30.0) twice, (-2.0, 30.3) and (-2.1, 30.5): (5 + 5 + 0 + 5) / 4
+            [("Remera", 4, 2, 3.8, 27.5), ("Ngoma", 1, 2, 5.0, 27.5)],
+        )
+        response = self.client.get("/api/climate/summary/", {"group_by": "cell", "district_id": self.other_district.pk, "start": "2026-10-01"}).json()
+        self.assertEqual([area["id"] for area in response["areas"]], [self.other_cell.pk])
+
+        series = self.client.get("/api/climate/daily/", {"cell_id": self.cell.pk, "start": "2026-10-03", "end": "2026-10-03"}).json()["series"]
+        self.assertEqual((series["daily"]["time"], series["daily"]["precipitation_sum"]), (["2026-10-03"], [3.0]))
+        self.assertEqual(self.client.get("/api/climate/summary/", {"group_by": "village"}).status_code, 400)
+        self.assertEqual(self.client.get("/api/climate/daily/", {"cell_id": self.cell.pk, "start": "10/03"}).status_code, 400)
+
+    def test_grid_mapping_follows_coordinate_changes(self):
+        groups = climate_grid.sync()
+        self.assertEqual(
+            sorted((lat, lon, len(cells)) for lat, lon, cells in groups.values()),
+            [(-2.1, 30.5, 1), (-2.0, 30.3, 1), (-1.9, 30.0, 3)],
+        )
+        Cell.objects.filter(pk=self.cells[4].pk).update(latitude=Decimal("-1.93"), longitude=Decimal("30.02"))
+        # update() bumps no hierarchy version: the mapping reads the cells from the database
+        Cell.objects.filter(pk=self.cells[3].pk).update(latitude=None, longitude=None)
+
+        groups = climate_grid.sync()
+        self.assertEqual([(lat, lon, len(cells)) for lat, lon, cells in groups.values()], [(-1.9, 30.0, 4)])
+        self.assertEqual(ClimateGridPoint.objects.count(), 1)
+        self.assertIsNone(CellClimateData.objects.get(cell=self.cells[3]).grid_point)
+
+    def test_historical_fetch_only_requests_the_missing_days(self):
+        point_of = {(lat, lon): point_id for point_id, (lat, lon, _) in climate_grid.sync().items()}
+        a, b, c = point_of[(-1.9, 30.0)], point_of[(-2.0, 30.3)], point_of[(-2.1, 30.5)]
+        today = date.today()
+        keep_from = today - timedelta(days=climate_series.RETENTION_DAYS)
+
+        def day(point, days_ago, rain=1.0):
+            return GridDailyClimate(grid_point_id=point, date=today - timedelta(days=days_ago), temperature_max=25.0, precipitation_sum=rain)
+
+        GridDailyClimate.objects.bulk_create([day(a, 8), day(a, 7), day(b, 8), day(b, 7), day(b, 95)])
+        # Published but not yet filled in by the archive: fetched again
+        GridDailyClimate.objects.create(grid_point_id=b, date=today - timedelta(days=6))
+        self.assertEqual(climate_series.missing_ranges([a, b, c], keep_from, today), {today - timedelta(days=6): [a, b], keep_from: [c]})
+
+        GridDailyClimate.objects.bulk_create([day(c, 8), day(c, 7)])
+        with override_settings(OPEN_METEO_ARCHIVE_URL=f"{self.base}/archive"):
+            run = self._run(fetch_past_3months_data)
+
+        (_, query), = _OpenMeteoStub.requests
+        self.assertEqual((query["start_date"], query["end_date"]), ([(today - timedelta(days=6)).isoformat()], [today.isoformat()]))
+        self.assertEqual(len(query["latitude"][0].split(",")), 3)
+        self.assertEqual((run.points_stored, run.rows, run.requests), (3, 21, 1))
+        self.assertEqual(
+            {key: run.summary[key] for key in ("requests_saved", "trimmed", "days_fetched", "days_saved")},
+            {"requests_saved": 0, "trimmed": 1, "days_fetched": 21, "days_saved": 273 - 21},
+        )
+        self.assertEqual(run.summary["bytes_saved"], round(run.bytes * 252 / 21))
+        self.assertEqual(GridDailyClimate.objects.get(grid_point_id=b, date=today - timedelta(days=6)).precipitation_sum, 1.0)
+        self.assertEqual(GridDailyClimate.objects.filter(grid_point_id=b).count(), 9)
+
+        # Up to date: nothing left to request
+        _OpenMeteoStub.requests = []
+        with override_settings(OPEN_METEO_ARCHIVE_URL=f"{self.base}/archive"):
+            run = self._run(fetch_past_3months_data)
+        self.assertEqual(
+            (_OpenMeteoStub.requests, run.status, run.requests, run.summary["days_fetched"], run.summary["bytes_saved"]),
+            ([], "complete", 0, 0, None),
+        )
+
+    def test_failing_chunk_is_retried_on_its_own_and_the_run_summarised(self):
+        with override_settings(OPEN_METEO_FORECAST_URL=f"{self.base}/storm"), mock.patch.object(climate_runs, "CHUNK_SIZE", 2), \
+                mock.patch.object(open_meteo, "ATTEMPTS", 1):
+            run = self._run(fetch_24h_forecast)
+
+        done, failed = run.chunks.all()
+        # The chunk holding (-2.1, 30.5) ran once and then on each of its 3 retries
+        self.assertEqual((done.status, done.attempts, done.stored, done.cells), ("done", 1, 2, 4))
+        self.assertEqual((failed.status, failed.attempts, failed.stored, [point[1:] for point in failed.points]), ("failed", 4, 0, [[-2.1, 30.5, 1]]))
+        self.assertEqual((run.status, run.points_planned, run.points_stored, run.requests), ("partial", 3, 2, 5))
+        self.assertEqual(
+            {key: run.summary[key] for key in ("chunks", "chunks_failed", "attempts", "coverage", "cell_coverage")},
+            {"chunks": 2, "chunks_failed": 1, "attempts": 5, "coverage": 0.6667, "cell_coverage": 0.8},
+        )
+        self.assertIsNotNone(run.summary["chunk_seconds_max"])
+        self.assertEqual(GridHourlyForecast.objects.count(), 2)
+
+    def test_stalled_run_resumes_only_its_unfinished_chunks(self):
+        with override_settings(OPEN_METEO_FORECAST_URL=f"{self.base}/forecast"), mock.patch.object(climate_runs, "CHUNK_SIZE", 2):
+            with mock.patch("users.tasks.fetch_climate_data.chord") as chord:
+                dispatched = fetch_24h_forecast()
+                first, second = ClimateFetchChunk.objects.filter(run_id=dispatched["run"])
+                self.assertEqual(len(chord.call_args.args[0]), 2)
+                # The worker dies after the first chunk
+                climate_runs.execute(first)
+
+                self.assertEqual(fetch_24h_forecast(), {"run": dispatched["run"], "state": "running", "chunks": 0})
+                ClimateFetchChunk.objects.update(updated_at=datetime.now() - climate_runs.STALE_AFTER)
+                _OpenMeteoStub.requests = []
+                run = self._run(fetch_24h_forecast)
+
+        # Same run, only the second chunk fetched again
+        self.assertEqual((str(run.pk), ClimateFetchRun.objects.count(), len(_OpenMeteoStub.requests)), (dispatched["run"], 1, 1))
+        self.assertEqual((run.status, run.points_stored, run.cells_covered, run.summary["chunks"]), ("complete", 3, 5, 2))
+
+    def test_failed_batches_are_reported_without_losing_the_others(self):
+        outcome = open_meteo.fetch(f"{self.base}/forecast", open_meteo.FORECAST_PARAMS, open_meteo.cell_points(), batch_size=3)
+        self.assertEqual((len(outcome.results), outcome.failed), (5, []))
+
+        outcome = open_meteo.fetch("http://127.0.0.1:9/forecast", {}, [(self.cell.pk, -1.9, 30.0)], attempts=2, backoff=0)
+        self.assertEqual((outcome.results, outcome.failed, outcome.requests), ({}, [self.cell.pk], 2))
@@ -0,0 +1,213 @@
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+
+from users.utils.aggregation import build_section
+from users.utils import activity
+from users.views.views import dashb
+from report.models import DailyActivityBucket, DistrictInventory, FarmerInventory, HarvestReport, FarmerIssue
+from users.tests.base import DashboardDataMixin, HoldingsMixin
+
+
+class BuildSectionTests(DashboardDataMixin, TestCase):
+
+    def test_totals_sums_and_status_breakdown_in_one_query(self):
+        with self.assertNumQueries(1):
+            section = build_section(HarvestReport.objects.filter(land__district=self.district), quantity_field="quantity")
+
+        self.assertEqual(section["total"], 2)
+        self.assertEqual(section["total_quantity"], 140.0)
+        self.assertEqual(section["status_counts"], {"sold": 1, "available": 1})
+        self.assertCountEqual(section["by_status"], [
+            {"status": "available", "count": 1, "quantity": 100.0},
+            {"status": "sold", "count": 1, "quantity": 40.0},
+        ])
+
+    def test_distinct_counts_survive_reverse_joins(self):
+        from django.db.models import Count, Q
+
+        section = build_section(
+            FarmerIssue.objects.all(), statuses=["pending", "resolved"], iexact=True, distinct=True,
+            extra={"with_reply": Count("pk", filter=Q(replies__isnull=False), distinct=True)},
+        )
+
+        self.assertEqual(section["total"], 2)
+        self.assertEqual(section["status_counts"], {"pending": 1, "resolved": 1})
+        self.assertEqual(section["with_reply"], 1)
+
+
+class InventoryRemainingTests(HoldingsMixin, TestCase):
+
+    def test_remaining_is_computed_in_sql_with_decimal_semantics(self):
+        DistrictInventory.objects.create(district=self.district, product=self.maize, quantity_added=10, quantity_at_cell=Decimal("3.30"))
+        DistrictInventory.objects.create(district=self.district, product=self.cow, quantity_added=5, quantity_at_cell=Decimal("4.90"))
+        FarmerInventory.objects.create(
+            farmer=self.farmer, product=self.maize, quantity_added=1,
+            quantity_allocated=Decimal("0.70"), quantity_deducted=Decimal("0.20"),
+        )
+
+        with self.assertNumQueries(1):
+            self.assertEqual(DistrictInventory.objects.remaining_total(), Decimal("6.80"))
+        # SQLite hands back unquantized decimals; PostgreSQL numeric is exact
+        cents = Decimal("0.01")
+        low = DistrictInventory.objects.low_stock(Decimal("1"))
+        self.assertEqual([inv.remaining.quantize(cents) for inv in low], [Decimal("0.10")])
+        self.assertEqual(
+            [inv.product_id for inv in DistrictInventory.objects.with_remaining().order_by("remaining")],
+            [self.cow.pk, self.maize.pk],
+        )
+
+        inventory = FarmerInventory.objects.with_remaining().get()
+        self.assertEqual(inventory.remaining.quantize(cents), Decimal("0.10"))
+        self.assertEqual(inventory.quantity_remaining, Decimal("0.10"))
+
+
+class DashboardSectionsTests(DashboardDataMixin, TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.farmer)
+
+    def test_only_requested_sections_are_computed(self):
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/dashboard/", {"sections": "harvest_reports,land"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("resource_requests", response.data)
+        self.assertEqual(response.data["land"]["total_parcels"], 2)
+        self.assertEqual(list(response.data["section_timings_ms"]), ["land", "harvest_reports"])
+        # A different selection is cached separately
+        self.assertEqual(self.client.get("/api/dashboard/", {"sections": "land"}).data["cache"]["status"], "miss")
+
+    def test_unknown_section_is_rejected(self):
+        response = self.client.get("/api/dashboard/", {"sections": "land,weather"})
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(DASHBOARD_SECTION_WORKERS=4)
+    def test_sections_run_inline_inside_a_transaction(self):
+        # TestCase wraps every test in a transaction, which worker threads could not see
+        response = self.client.get("/api/dashboard/")
+        self.assertEqual(response.data["harvest_reports"]["total"], 3)
+
+
+class DashboardQueryBudgetTests(DashboardDataMixin, TestCase):
+    # Each fact table is scanned once per request; raise these only with a reason.
+    CITIZEN_QUERY_BUDGET = 13
+    DASHB_QUERY_BUDGET = 15  # includes resolving the officer's district
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def test_citizen_dashboard_query_budget(self):
+        self.client.force_authenticate(self.farmer)
+        with self.assertNumQueries(self.CITIZEN_QUERY_BUDGET):
+            response = self.client.get("/api/dashboard/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["harvest_reports"]["total"], 3)
+        self.assertEqual(response.data["harvest_reports"]["total_quantity"], 145.0)
+        self.assertEqual(response.data["farmer_issues"]["reply_counts"], {"with_reply": 1, "without_reply": 1})
+        self.assertEqual(response.data["resource_requests"]["feedback"]["avg_rating"], 4.0)
+
+    def test_dashb_dashboard_query_budget(self):
+        request = APIRequestFactory().get("/dashboard/")
+        force_authenticate(request, user=self.officer)
+        with self.assertNumQueries(self.DASHB_QUERY_BUDGET):
+            response = dashb.RoleAwareDashboard.as_view()(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["harvest_reports"]["total"], 2)
+        self.assertEqual(response.data["land"]["total_parcels"], 1)
+        self.assertEqual(response.data["user_counts"], {
+            "total_users": 2, "citizens": 1, "cell_officers": 0, "sector_officers": 0, "district_officers": 1,
+        })
+
+
+@override_settings(DASHBOARD_ISSUES_LIMIT=2)
+class DashboardIssuesPaginationTests(DashboardDataMixin, TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.farmer)
+        location = dict(province=self.province, district=self.district, sector=self.sector, cell=self.cell, village=self.village)
+        for i in range(3):
+            FarmerIssue.objects.create(farmer=self.farmer, issue_type="other", description=f"Issue {i}", **location)
+
+    def test_dashboard_embeds_recent_slice_and_cursor_walks_the_rest(self):
+        dashboard = self.client.get("/api/dashboard/").data["farmer_issues"]
+        self.assertEqual(dashboard["total_issues"], 5)
+        seen = [row["id"] for row in dashboard["issues_details"]]
+        cursor = dashboard["issues_next_cursor"]
+        self.assertEqual(len(seen), 2)
+
+        while cursor:
+            page = self.client.get("/api/dashboard/issues/", {"cursor": cursor, "limit": 2}).data
+            seen += [row["id"] for row in page["results"]]
+            cursor = page["next_cursor"]
+
+        expected = list(FarmerIssue.objects.order_by("-reported_at", "-id").values_list("id", flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get("/api/dashboard/issues/", {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, 400)
+        # Valid base64 JSON, but not a list of values
+        for value in (1, {"a": 1}, [1, 2]):
+            cursor = base64.urlsafe_b64encode(json.dumps(value).encode()).decode()
+            self.assertEqual(self.client.get("/api/dashboard/issues/", {"cursor": cursor}).status_code, 400)
+
+
+class DashboardTimeseriesTests(DashboardDataMixin, TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        # Spread this district's harvests over two seasons: 2025A (Sep-Jan) and 2025B (Feb-Jun)
+        reports = HarvestReport.objects.filter(land=self.land).order_by("quantity")
+        HarvestReport.objects.filter(pk=reports[0].pk).update(report_date=datetime(2026, 1, 10, 8))
+        HarvestReport.objects.filter(pk=reports[1].pk).update(report_date=datetime(2026, 3, 2, 8))
+        activity.backfill()
+
+    def test_buckets_roll_up_by_month_and_season_for_the_scope(self):
+        self.client.force_authenticate(self.officer)
+        params = {"start": "2026-01-01", "end": "2026-06-30"}
+
+        months = self.client.get("/api/dashboard/timeseries/", {**params, "interval": "month"}).data["series"]
+        self.assertEqual([(str(row["period"]), row["harvest_quantity"]) for row in months], [
+            ("2026-01-01", 40.0), ("2026-03-01", 100.0),
+        ])
+
+        seasons = self.client.get("/api/dashboard/timeseries/", {**params, "interval": "season"}).data["series"]
+        self.assertEqual([(row["period"], row["harvest_reports"]) for row in seasons], [("2025A", 1), ("2026B", 1)])
+
+    def test_writes_refresh_their_bucket(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            HarvestReport.objects.create(farmer=self.farmer, land=self.land, product=self.maize, quantity=7)
+
+        today = DailyActivityBucket.objects.get(cell=self.cell, product=self.maize, day=datetime.now().date())
+        self.assertEqual(today.harvest_quantity, 7.0)
+
+        # Moving a report to another day empties the bucket it left
+        report = HarvestReport.objects.get(quantity=100)
+        with self.captureOnCommitCallbacks(execute=True):
+            report.report_date = datetime(2026, 3, 9, 8)
+            report.save()
+        self.assertFalse(DailyActivityBucket.objects.filter(cell=self.cell, day=date(2026, 3, 2)).exists())
+        self.assertEqual(DailyActivityBucket.objects.get(cell=self.cell, day=date(2026, 3, 9)).harvest_quantity, 100.0)
+
+    def test_bad_product_is_rejected(self):
+        self.client.force_authenticate(self.officer)
+        self.assertEqual(self.client.get("/api/dashboard/timeseries/", {"product": "abc"}).status_code, 400)
+        response = self.client.get("/api/dashboard/timeseries/", {"product": str(self.maize.pk), "interval": "day"})
+        self.assertEqual(response.status_code, 200)
+
+    def test_citizens_are_refused(self):
+        self.client.force_authenticate(self.farmer)
+        self.assertEqual(self.client.get("/api/dashboard/timeseries/").status_code, 403)
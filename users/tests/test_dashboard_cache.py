@@ -0,0 +1,104 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from users.checks import shared_cache_check
+from users.models import CustomUser
+from users.tasks.dashboard_cache import refresh_dashboard_cache
+from users.views.views.dashbord import DASHBOARD_SECTIONS
+from report.models import HarvestReport
+from users.tests.base import DashboardDataMixin
+
+
+class DashboardCacheTests(DashboardDataMixin, TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def test_second_request_is_served_from_cache(self):
+        self.client.force_authenticate(self.officer)
+        first = self.client.get("/api/dashboard/")
+        with self.assertNumQueries(0):
+            second = self.client.get("/api/dashboard/")
+
+        self.assertEqual(first.data["cache"]["status"], "miss")
+        self.assertEqual(second.data["cache"]["status"], "hit")
+        self.assertIn("Age", second)
+        self.assertEqual(second.data["harvest_reports"], first.data["harvest_reports"])
+
+    def test_write_invalidates_only_the_affected_geography(self):
+        self.client.force_authenticate(self.officer)
+        self.client.get("/api/dashboard/")
+
+        # A report in another district leaves this district's entry alone
+        with self.captureOnCommitCallbacks(execute=True):
+            HarvestReport.objects.create(farmer=self.farmer, land=self.other_land, product=self.maize, quantity=1)
+        self.assertEqual(self.client.get("/api/dashboard/").data["cache"]["status"], "hit")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            HarvestReport.objects.create(farmer=self.farmer, land=self.land, product=self.maize, quantity=1)
+        response = self.client.get("/api/dashboard/")
+        self.assertEqual(response.data["cache"]["status"], "miss")
+        self.assertEqual(response.data["harvest_reports"]["total"], 3)
+
+    def test_user_and_move_writes_invalidate_every_scope_they_change(self):
+        admin = CustomUser.objects.create_user(
+            email="admin@example.com", full_names="Admin", national_id="1000000000000009",
+            password="Admin123!", user_level="super_admin",
+        )
+
+        def status(user):
+            self.client.force_authenticate(user)
+            return self.client.get("/api/dashboard/", {"sections": "user_counts"}).data["cache"]["status"]
+
+        status(admin), status(self.officer)
+        with mock.patch("users.signals.account_notifications.send_account_created_email"), self.captureOnCommitCallbacks(execute=True):
+            CustomUser.objects.create_user(
+                email="new@example.com", full_names="New", national_id="1000000000000010",
+                password="Farmer123!", user_level="citizen",
+            )
+        self.assertEqual((status(admin), status(self.officer)), ("miss", "hit"))
+
+        # The farmer holds land in the officer's district: its citizen count drops
+        with self.captureOnCommitCallbacks(execute=True):
+            self.farmer.user_level = "cell_officer"
+            self.farmer.save()
+        self.assertEqual((status(admin), status(self.officer)), ("miss", "miss"))
+
+        # A land moving out of the district outdates the district it left
+        with self.captureOnCommitCallbacks(execute=True):
+            self.land.district, self.land.sector, self.land.cell, self.land.village = (
+                self.other_district, self.other_sector, self.other_cell, self.other_village,
+            )
+            self.land.save()
+        self.assertEqual(status(self.officer), "miss")
+
+    @override_settings(DASHBOARD_CACHE_STALE_WHILE_REVALIDATE=60)
+    def test_stale_entry_is_served_while_revalidating(self):
+        self.client.force_authenticate(self.farmer)
+        self.client.get("/api/dashboard/")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            HarvestReport.objects.create(farmer=self.farmer, land=self.land, product=self.maize, quantity=1)
+
+        with mock.patch.object(refresh_dashboard_cache, "delay") as delay:
+            stale = self.client.get("/api/dashboard/")
+            self.client.get("/api/dashboard/")
+        self.assertEqual(stale.data["cache"]["status"], "stale")
+        self.assertEqual(stale.data["harvest_reports"]["total"], 3)
+        delay.assert_called_once_with(self.farmer.pk, DASHBOARD_SECTIONS)
+
+        refresh_dashboard_cache(self.farmer.pk)
+        fresh = self.client.get("/api/dashboard/")
+        self.assertEqual(fresh.data["cache"]["status"], "hit")
+        self.assertEqual(fresh.data["harvest_reports"]["total"], 4)
+
+    def test_a_process_local_cache_is_a_warning_not_an_error(self):
+        local = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+        with override_settings(CACHES=local, LOCAL_MEMORY_CACHE=False):
+            self.assertEqual([warning.id for warning in shared_cache_check(None)], ["users.W001"])
+        with override_settings(CACHES=local, LOCAL_MEMORY_CACHE=True):
+            self.assertEqual(shared_cache_check(None), [])
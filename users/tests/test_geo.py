@@ -0,0 +1,256 @@
+import gzip
+import json
+import os
+import random
+import tempfile
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from users.models.addresses import Cell, Village, Boundary
+from users.utils import boundaries, geo_bundles, geo_index, hierarchy, map_grid
+from report.models import FarmerIssue
+from users.tests.base import DashboardDataMixin, GeographyMixin
+
+
+class GeoIndexTests(GeographyMixin, TestCase):
+
+    def test_grid_matches_a_brute_force_scan(self):
+        rng = random.Random(7)
+        points = [(rng.uniform(-2.8, -1.0), rng.uniform(28.8, 30.9), n) for n in range(500)]
+        index = geo_index.GridIndex(points)
+        for _ in range(200):
+            lat, lon = rng.uniform(-3.0, -0.8), rng.uniform(28.6, 31.1)
+            expected = min(points, key=lambda p: geo_index.haversine_m(lat, lon, p[0], p[1]))
+            payload, distance = index.nearest(lat, lon)
+            self.assertAlmostEqual(distance, geo_index.haversine_m(lat, lon, expected[0], expected[1]), delta=1.0)
+        self.assertIsNone(index.nearest(0.0, 0.0, max_distance_m=10_000))
+        self.assertIsNone(geo_index.GridIndex([]).nearest(-1.9, 30.0))
+
+    def test_far_and_invalid_points_stop_at_the_distance_limit(self):
+        index = geo_index.GridIndex([(-1.944, 30.061, 1), (-2.6, 29.7, 2)])
+        for lat, lon in [(45.0, 30.0), (90.0, 180.0), (1e4, -1e4)]:
+            with mock.patch.object(index, "_ring", wraps=index._ring) as ring:
+                self.assertIsNone(index.nearest(lat, lon, max_distance_m=10_000))
+            self.assertLess(ring.call_count, 10)
+        self.assertEqual(index.nearest(45.0, 30.0)[0], 1)
+        self.assertIsNone(index.nearest(float("nan"), 30.0))
+
+        for lat, lon in [("nan", "30"), ("inf", "30"), ("91", "30"), ("-1.9", "181")]:
+            self.assertEqual(self.client.get("/api/ajax/locate/", {"lat": lat, "lon": lon}).status_code, 400)
+            self.assertEqual(self.client.get("/api/cell-climates/1/", {"lat": lat, "lon": lon}).status_code, 400)
+
+    def test_climate_lookup_resolves_the_nearest_cell_and_follows_coordinate_edits(self):
+        cache.clear()
+        hierarchy.reset()
+        Cell.objects.filter(pk=self.cell.pk).update(latitude=Decimal("-1.944000"), longitude=Decimal("30.061000"))
+        Village.objects.filter(pk=self.other_village.pk).update(latitude=Decimal("-1.950000"), longitude=Decimal("30.070000"))
+
+        cell_id, distance = geo_index.nearest_cell(-1.9452, 30.0621)
+        self.assertEqual(cell_id, self.cell.pk)
+        self.assertLess(distance, 200)
+        # ~1 km from the nearest centroid: the old bounding-box lookup found nothing
+        self.assertEqual(geo_index.nearest_cell(-1.9525, 30.0770)[0], self.other_cell.pk)
+        self.assertIsNone(geo_index.nearest_cell(-2.5, 29.5))
+
+        self.other_cell.latitude, self.other_cell.longitude = Decimal("-1.952500"), Decimal("30.077000")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.other_cell.save()
+        self.assertEqual(geo_index.nearest_cell(-1.9525, 30.0770)[1], 0.0)
+
+
+def _square(min_lon, min_lat, max_lon, max_lat, steps=10):
+    """
+    A closed square ring with `steps` collinear points per side.
+    """
+    corners = [(min_lon, min_lat), (max_lon, min_lat), (max_lon, max_lat), (min_lon, max_lat), (min_lon, min_lat)]
+    ring = []
+    for (x1, y1), (x2, y2) in zip(corners, corners[1:]):
+        ring += [[x1 + (x2 - x1) * i / steps, y1 + (y2 - y1) * i / steps] for i in range(steps)]
+    return ring + [ring[0]]
+
+
+class BoundaryTests(GeographyMixin, TestCase):
+
+    def test_geometry_helpers(self):
+        ring = _square(0, 0, 1, 1)
+        simplified = boundaries.simplify_ring(ring, 0.001)
+        self.assertEqual(len(simplified), 5)
+        self.assertEqual(simplified[0], simplified[-1])
+
+        donut = [[_square(0, 0, 4, 4), _square(1, 1, 3, 3)]]
+        self.assertTrue(boundaries.point_in_polygons(0.5, 0.5, donut))
+        self.assertFalse(boundaries.point_in_polygons(2, 2, donut))
+
+        rng = random.Random(3)
+        boxes = []
+        for n in range(300):
+            x, y = rng.uniform(0, 10), rng.uniform(0, 10)
+            boxes.append(((x, y, x + rng.uniform(0, 1), y + rng.uniform(0, 1)), n))
+        tree = boundaries.STRTree(boxes)
+        for _ in range(100):
+            x, y = rng.uniform(0, 11), rng.uniform(0, 11)
+            expected = {n for (x1, y1, x2, y2), n in boxes if x1 <= x <= x2 and y1 <= y <= y2}
+            self.assertEqual(set(tree.query(x, y)), expected)
+
+    def test_imported_polygons_resolve_points_to_villages_and_cells(self):
+        cache.clear()
+        hierarchy.reset()
+        boundaries.reset()
+        for model, pk, lon in ((Cell, self.cell.pk, 30.05), (Cell, self.other_cell.pk, 30.15),
+                               (Village, self.village.pk, 30.05), (Village, self.other_village.pk, 30.15)):
+            model.objects.filter(pk=pk).update(latitude=Decimal("-1.95"), longitude=Decimal(str(lon)))
+
+        def feature(name, shape_id, shape_type, ring):
+            return {
+                "type": "Feature",
+                "properties": {"shapeName": name, "shapeID": shape_id, "shapeType": shape_type},
+                "geometry": {"type": "Polygon", "coordinates": [ring]},
+            }
+
+        collection = {"type": "FeatureCollection", "features": [
+            feature("Rukiri", "C1", "ADM4", _square(30.0, -2.0, 30.1, -1.9)),
+            feature("Matyazo", "C2", "ADM4", _square(30.1, -2.0, 30.2, -1.9)),
+            # Both villages are called Amahoro: told apart by the centroid they contain
+            feature("Amahoro", "V1", "ADM5", _square(30.04, -1.96, 30.06, -1.94)),
+            feature("Amahoro", "V2", "ADM5", _square(30.14, -1.96, 30.16, -1.94)),
+        ]}
+        with tempfile.NamedTemporaryFile("w", suffix=".geojson", delete=False) as fh:
+            json.dump(collection, fh)
+        self.addCleanup(os.remove, fh.name)
+        out = StringIO()
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("import_boundaries", fh.name, stdout=out)
+        self.assertIn("4 boundaries, 4 matched, 0 unmatched; kept 20 of 164 vertices", out.getvalue())
+        self.assertEqual(Boundary.objects.get(shape_id="V2").village_id, self.other_village.pk)
+
+        self.assertEqual(boundaries.locate(-1.955, 30.155), boundaries.Location(self.other_cell.pk, self.other_village.pk))
+        response = self.client.get("/api/ajax/locate/", {"lat": -1.91, "lon": 30.19}).json()
+        self.assertEqual((response["method"], response["cell"]["id"], response["village"]), ("polygon", self.other_cell.pk, None))
+        self.assertEqual(response["district"], {"id": self.other_district.pk, "name": "Huye"})
+
+        # Outside every polygon: nearest centroid
+        response = self.client.get("/api/ajax/locate/", {"lat": -1.89, "lon": 30.15}).json()
+        self.assertEqual((response["method"], response["cell"]["id"]), ("centroid", self.other_cell.pk))
+        self.assertEqual(self.client.get("/api/ajax/locate/", {"lat": "x", "lon": 1}).status_code, 400)
+
+        # A re-import reaches the index through the counter bumped once it has committed
+        collection["features"][1] = feature("Matyazo", "C2", "ADM4", _square(30.1, -2.0, 30.2, -1.85))
+        with open(fh.name, "w") as handle:
+            json.dump(collection, handle)
+        with self.captureOnCommitCallbacks() as callbacks:
+            call_command("import_boundaries", fh.name, stdout=StringIO())
+        self.assertIsNone(boundaries.locate(-1.89, 30.15))
+        for callback in callbacks:
+            callback()
+        self.assertEqual(boundaries.locate(-1.89, 30.15), boundaries.Location(self.other_cell.pk, None))
+
+
+class GeoBundleTests(GeographyMixin, TestCase):
+
+    def setUp(self):
+        cache.clear()
+        hierarchy.reset()
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=media.name))
+        self.media = media.name
+
+    def export(self):
+        out = StringIO()
+        call_command("export_geo_bundles", stdout=out)
+        return out.getvalue()
+
+    def test_bundles_only_change_for_the_district_that_changed(self):
+        Village.objects.filter(pk=self.village.pk).update(latitude=Decimal("-1.944000"), longitude=Decimal("30.061000"))
+        Boundary.objects.create(
+            shape_id="C1", level="cell", name="Rukiri", cell=self.cell,
+            min_lon=30.0, min_lat=-2.0, max_lon=30.1, max_lat=-1.9, polygons=[[_square(30.0, -2.0, 30.1, -1.9)]],
+        )
+        self.assertIn("2 written", self.export())
+
+        manifest = self.client.get("/api/geo/bundles/").json()
+        entry = manifest["districts"][str(self.district.pk)]
+        with gzip.open(os.path.join(self.media, entry["path"])) as fh:
+            bundle = json.load(fh)
+        self.assertEqual(bundle["district"]["province"], {"id": self.province.pk, "name": "Kigali"})
+        self.assertEqual(bundle["villages"], [[self.village.pk, "Amahoro", self.cell.pk, -1944000, 30061000]])
+        (level, cell_id, [[ring]]), = bundle["boundaries"]
+        self.assertEqual((level, cell_id), ("cell", self.cell.pk))
+        self.assertEqual(geo_bundles.decode_ring(ring), [[round(x, 5), round(y, 5)] for x, y in _square(30.0, -2.0, 30.1, -1.9)])
+
+        status = self.client.get("/api/geo/bundles/", {"district": self.district.pk, "hash": entry["hash"]}).json()
+        self.assertTrue(status["current"])
+
+        # A rename in the other district leaves this bundle and its hash alone
+        with self.captureOnCommitCallbacks(execute=True):
+            Cell.objects.filter(pk=self.other_cell.pk).update(name="Matyazo II")
+            hierarchy.bump()
+        self.assertIn("1 written", self.export())
+        self.assertTrue(self.client.get("/api/geo/bundles/", {"district": self.district.pk, "hash": entry["hash"]}).json()["current"])
+        other = manifest["districts"][str(self.other_district.pk)]
+        status = self.client.get("/api/geo/bundles/", {"district": self.other_district.pk, "hash": other["hash"]}).json()
+        self.assertFalse(status["current"])
+        self.assertEqual(self.client.get("/api/geo/bundles/", {"district": 999}).status_code, 404)
+
+        # The replaced bundle outlives the manifests that may still be cached with it
+        self.assertTrue(os.path.exists(os.path.join(self.media, other["path"])))
+        self.assertEqual(geo_bundles.read_manifest()["retired"], [other["path"]])
+        out = self.export()
+        self.assertIn("0 written", out)
+        self.assertIn("1 retired files deleted", out)
+        self.assertFalse(os.path.exists(os.path.join(self.media, other["path"])))
+
+    def test_manifest_is_cached_for_a_short_time_only(self):
+        self.export()
+        with mock.patch.object(geo_bundles.cache, "set", wraps=geo_bundles.cache.set) as cache_set:
+            cache.delete(geo_bundles.MANIFEST_KEY)
+            self.assertEqual(self.client.get("/api/geo/bundles/").status_code, 200)
+        cache_set.assert_called_once_with(geo_bundles.MANIFEST_KEY, mock.ANY, timeout=geo_bundles.MANIFEST_TTL)
+
+
+class MapClustersTests(DashboardDataMixin, TestCase):
+    RWANDA = "28.8,-2.9,30.9,-1.0"
+
+    def setUp(self):
+        self.client = APIClient()
+        for land, (lat, lon) in ((self.land, (-1.95, 30.06)), (self.other_land, (-2.6, 29.74))):
+            land.latitude, land.longitude = lat, lon
+            land.save()
+        for issue, offset in zip(FarmerIssue.objects.order_by("issue_type"), (0, Decimal("0.0002"))):
+            issue.latitude, issue.longitude = Decimal("-1.95") - offset, Decimal("30.06") + offset
+            issue.save()
+
+    def clusters(self, user, **params):
+        self.client.force_authenticate(user)
+        return self.client.get("/api/map/clusters/", {"bbox": self.RWANDA, "zoom": 8, **params})
+
+    def test_grid_keys_are_stamped_on_save(self):
+        self.land.refresh_from_db()
+        self.assertEqual(self.land.grid_key, map_grid.quadkey(-1.95, 30.06))
+        self.assertTrue(self.land.grid_key.startswith(map_grid.quadkey(-1.95, 30.06, level=11)))
+        self.assertEqual(self.livestock.grid_key, "")
+
+    def test_clusters_respect_scope_and_viewport(self):
+        layers = self.clusters(self.officer).data["layers"]
+        self.assertEqual([(c["count"], c["hectares"]) for c in layers["lands"]], [(1, Decimal("2.50"))])
+        self.assertEqual(layers["livestock"], [])
+        [issues] = layers["issues"]
+        self.assertEqual((issues["count"], issues["issue_types"]), (2, {"drought": 1, "pests": 1}))
+        self.assertAlmostEqual(issues["latitude"], -1.9501)
+
+        # The owner sees both lands, one cluster each at this zoom
+        lands = self.clusters(self.farmer, layers="lands").data["layers"]["lands"]
+        self.assertEqual(sorted(c["count"] for c in lands), [1, 1])
+        self.assertEqual(self.clusters(self.farmer, zoom=2, layers="lands").data["layers"]["lands"][0]["count"], 2)
+        kigali = self.clusters(self.farmer, bbox="29.9,-2.1,30.3,-1.8", layers="lands").data["layers"]["lands"]
+        self.assertEqual([c["hectares"] for c in kigali], [Decimal("2.50")])
+
+    def test_bad_parameters(self):
+        self.assertEqual(self.clusters(self.officer, bbox="30,-1,29,-2").status_code, 400)
+        self.assertEqual(self.clusters(self.officer, layers="lands,roads").status_code, 400)
@@ -0,0 +1,214 @@
+import csv
+import os
+import tempfile
+from decimal import Decimal
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from users.models.addresses import Sector, Cell, Village
+from users.utils import hierarchy, place_search
+from users.serializer.citizen_register import UserProfileSerializer
+from users.serializer.issues import FarmerIssueSerializer
+from report.models import FarmerIssue
+from users.tests.base import DashboardDataMixin, GeographyMixin
+
+
+class HierarchySnapshotTests(GeographyMixin, TestCase):
+
+    def setUp(self):
+        cache.clear()
+        hierarchy.reset()
+
+    def test_dropdowns_are_served_from_memory_and_revalidate_by_version(self):
+        first = self.client.get("/api/ajax/get-sectors/", {"district_id": self.district.pk})
+        self.assertEqual(first.json(), {"sectors": [{"id": self.sector.pk, "name": "Remera"}]})
+
+        with self.assertNumQueries(0):
+            cells = self.client.get("/api/ajax/get-cells/", {"sector_id": "not-a-number"})
+            unchanged = self.client.get(
+                "/api/ajax/get-sectors/", {"district_id": self.district.pk}, HTTP_IF_NONE_MATCH=first["ETag"]
+            )
+        self.assertEqual(cells.json(), {"cells": []})
+        self.assertEqual(unchanged.status_code, 304)
+
+        # Saving a cell without renaming or moving it keeps the version
+        with self.captureOnCommitCallbacks(execute=True):
+            self.cell.save()
+        self.assertEqual(self.client.get("/api/ajax/hierarchy/")["ETag"], first["ETag"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Sector.objects.create(name="Kacyiru", district=self.district)
+        changed = self.client.get(
+            "/api/ajax/get-sectors/", {"district_id": self.district.pk}, HTTP_IF_NONE_MATCH=first["ETag"]
+        )
+        self.assertEqual(changed.status_code, 200)
+        self.assertEqual([row["name"] for row in changed.json()["sectors"]], ["Remera", "Kacyiru"])
+
+        bundle = self.client.get("/api/ajax/hierarchy/").json()
+        self.assertEqual(bundle["version"], hierarchy.version())
+        self.assertEqual(changed["ETag"], '"hierarchy-%s"' % bundle["version"])
+        self.assertIn(
+            {"id": self.village.pk, "name": "Amahoro", "cell_id": self.cell.pk, "latitude": None, "longitude": None},
+            bundle["villages"],
+        )
+
+
+class LocationValidationTests(DashboardDataMixin, TestCase):
+
+    def setUp(self):
+        cache.clear()
+        hierarchy.reset()
+        hierarchy.current()
+
+    def test_village_alone_fills_in_the_chain_without_queries(self):
+        serializer = FarmerIssueSerializer(data={"issue_type": "pests", "description": "Aphids", "village": str(self.village.pk)})
+        with self.assertNumQueries(0):
+            self.assertTrue(serializer.is_valid(), serializer.errors)
+        self.assertEqual(
+            {key: value for key, value in serializer.validated_data.items() if key.endswith("_id")},
+            {"province_id": self.province.pk, "district_id": self.district.pk, "sector_id": self.sector.pk,
+             "cell_id": self.cell.pk, "village_id": self.village.pk},
+        )
+        issue = serializer.save(farmer=self.farmer)
+        self.assertEqual((issue.cell, issue.village), (self.cell, self.village))
+        self.assertEqual(FarmerIssueSerializer(issue).data["district"], self.district.pk)
+
+    def test_inconsistent_or_missing_levels_are_rejected(self):
+        def errors(data, serializer_class=FarmerIssueSerializer, **kwargs):
+            serializer = serializer_class(data={"issue_type": "pests", "description": "x", **data}, **kwargs)
+            self.assertFalse(serializer.is_valid())
+            return serializer.errors
+
+        self.assertEqual(
+            errors({"cell": self.other_cell.pk, "village": self.village.pk}),
+            {"village": ["Village does not belong to the selected Cell."]},
+        )
+        self.assertEqual(
+            errors({"district": self.other_district.pk, "village": self.village.pk}),
+            {"sector": ["Sector does not belong to the selected District."]},
+        )
+        self.assertEqual(errors({"sector": self.sector.pk}), {"village": ["This field is required."]})
+        self.assertEqual(errors({})["village"], ["This field is required."])
+        self.assertIn("does not exist", str(errors({"village": 999999})["village"]))
+
+        # Moving an issue to another cell keeps its village in the check
+        self.assertEqual(
+            errors({"cell": self.other_cell.pk}, instance=FarmerIssue.objects.first(), partial=True),
+            {"village": ["Village does not belong to the selected Cell."]},
+        )
+
+    def test_ids_missing_from_a_stale_snapshot_are_checked_in_the_database(self):
+        # Created without its bump reaching this process (the on_commit hook does not run here)
+        village = Village.objects.create(name="Ubumwe", cell=self.other_cell)
+        self.assertIsNone(hierarchy.current().entry("villages", village.pk))
+
+        serializer = FarmerIssueSerializer(data={"issue_type": "pests", "description": "Aphids", "village": village.pk})
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        self.assertEqual(serializer.validated_data["cell_id"], self.other_cell.pk)
+        self.assertIsNotNone(hierarchy.current().entry("villages", village.pk))
+
+    def test_profile_location_is_optional_but_consistent(self):
+        self.assertTrue(UserProfileSerializer(data={}).is_valid())
+        serializer = UserProfileSerializer(data={"village": self.other_village.pk})
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        self.assertEqual(serializer.validated_data["district_id"], self.other_district.pk)
+        serializer = UserProfileSerializer(data={"sector": self.sector.pk, "cell": self.other_cell.pk})
+        self.assertEqual(serializer.is_valid(), False)
+        self.assertEqual(serializer.errors, {"cell": ["Cell does not belong to the selected Sector."]})
+
+
+class PlaceSearchTests(GeographyMixin, TestCase):
+
+    def setUp(self):
+        cache.clear()
+        hierarchy.reset()
+        place_search.reset()
+
+    def test_ranked_results_carry_qualified_paths(self):
+        Village.objects.create(name="Amahoro-Ruguru", cell=self.cell)
+
+        results = place_search.search("amahoro")
+        self.assertEqual(
+            [(place["level"], place["path"]) for place in results],
+            [
+                ("village", "Amahoro, Rukiri, Remera, Gasabo, Kigali"),
+                ("village", "Amahoro, Matyazo, Ngoma, Huye, Kigali"),
+                ("village", "Amahoro-Ruguru, Rukiri, Remera, Gasabo, Kigali"),
+            ],
+        )
+        self.assertEqual(results[0]["lineage"]["district"], {"id": self.district.pk, "name": "Gasabo"})
+        self.assertEqual([place["name"] for place in place_search.search("ruguru")], ["Amahoro-Ruguru"])
+        self.assertEqual([place["name"] for place in place_search.search("gasbo")], ["Gasabo"])
+        self.assertEqual([place["level"] for place in place_search.search("r")], ["sector", "cell"])
+
+    def test_renames_reindex_only_the_changed_rows(self):
+        place_search.search("remera")
+        index = place_search._index
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Sector.objects.filter(pk=self.sector.pk).update(name="Kimironko")
+            hierarchy.bump()
+        self.assertEqual(place_search.search("remera"), [])
+        self.assertEqual(place_search.search("amahoro")[0]["path"], "Amahoro, Rukiri, Kimironko, Gasabo, Kigali")
+        # The renamed sector took one new slot in a copy swapped in for the index, which
+        # searches still running on the old one never see change under them
+        self.assertIsNot(place_search._index, index)
+        self.assertEqual(len(place_search._index.keys), len(index.keys) + 1)
+        self.assertEqual([key for key, _, _ in index.search("remera")], [("sectors", self.sector.pk)])
+        self.assertEqual(place_search._index.sync(hierarchy.current()), 0)
+
+    def test_endpoint(self):
+        response = self.client.get("/api/places/search/", {"q": "amahoro", "level": "village", "limit": 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [place["id"] for place in response.json()["results"]], [self.village.pk]
+        )
+        self.assertEqual(self.client.get("/api/places/search/", {"q": ""}).json()["results"], [])
+        self.assertEqual(self.client.get("/api/places/search/", {"q": "x", "level": "country"}).status_code, 400)
+
+
+class GeoCoordinateImportTests(GeographyMixin, TestCase):
+
+    def write_csv(self, rows):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False, newline="") as fh:
+            writer = csv.writer(fh)
+            writer.writerow(["X", "Y", "shapeName", "shapeType", "parents"])
+            writer.writerows(rows)
+        self.addCleanup(os.remove, fh.name)
+        return fh.name
+
+    def test_same_name_villages_are_told_apart_by_their_cell(self):
+        cache.clear()
+        hierarchy.reset()
+        path = self.write_csv([
+            [30.05, -1.95, "Rukiri", "ADM4", ""],
+            [30.15, -1.95, "Matyazo", "ADM4", ""],
+            [30.151, -1.951, "Amahoro", "ADM5", ""],
+            [30.051, -1.951, "Amahoro", "ADM5", ""],
+            [30.0, -2.0, "Nowhere", "ADM5", ""],
+            # Pinned by its parents: wins over the name-only row above
+            [30.052, -1.952, "Amahoro", "ADM5", "Rukiri/Remera"],
+        ])
+
+        out = StringIO()
+        call_command("import_geo_coordinates", path, "--dry-run", stdout=out)
+        self.assertIn("villages: 4 rows (1 matched, 1 resolved, 1 unmatched, 1 duplicate); 2 updated", out.getvalue())
+        self.assertIsNone(Village.objects.get(pk=self.village.pk).latitude)
+
+        self.assertNotIn("local to this process", out.getvalue())
+
+        version = hierarchy.version()
+        out = StringIO()
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("import_geo_coordinates", path, stdout=out)
+        self.assertEqual(hierarchy.version(), version + 1)
+        # The test cache is process-local: the bump could not reach other processes
+        self.assertIn("local to this process", out.getvalue())
+        with override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.redis.RedisCache"}}):
+            self.assertTrue(hierarchy.is_shared())
+        self.assertEqual(Village.objects.get(pk=self.village.pk).longitude, Decimal("30.052000"))
+        self.assertEqual(Village.objects.get(pk=self.other_village.pk).longitude, Decimal("30.151000"))
+        self.assertEqual(Cell.objects.get(pk=self.other_cell.pk).latitude, Decimal("-1.950000"))
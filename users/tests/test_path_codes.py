@@ -0,0 +1,149 @@
+import re
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+
+from users.models.addresses import Village
+from users.utils import activity, dashboard_cache, land_stats, population, rollups
+from users.utils.scope import resolve_scope
+from report.signals.geo_paths import _restamp
+from report.models import (
+    DailyActivityBucket,
+    GeoRollup,
+    Land,
+    HarvestReport,
+    LivestockProduction,
+    ResourceRequest,
+    ResourceRequestFeedback,
+    FarmerIssueReply,
+)
+from users.tests.base import DashboardDataMixin
+
+
+class PathCodeTests(DashboardDataMixin, TestCase):
+
+    def test_codes_follow_the_hierarchy_and_facts_carry_their_village_code(self):
+        self.assertEqual(
+            [self.province.path_code, self.other_district.path_code, self.other_cell.path_code, self.village.path_code],
+            ["01", "01.02", "01.02.01.01", "01.01.01.01.01"],
+        )
+        self.assertEqual(HarvestReport.objects.get(quantity=5).geo_path, "01.02.01.01.01")
+        self.assertEqual(FarmerIssueReply.objects.values_list("geo_path", flat=True).distinct().get(), "01.01.01.01.01")
+
+        scope = resolve_scope(self.officer)
+        reports = HarvestReport.objects.for_scope(scope)
+        self.assertIn("geo_path", str(reports.query))
+        self.assertEqual(reports.count(), 2)
+
+    def test_subtree_filters_do_not_depend_on_the_collation(self):
+        # Locale collations (e.g. en_US.UTF-8) weigh letters and digits before punctuation,
+        # so "01.01/" sorts before "01.01.01.01.01": shadow the fact table with such a column
+        def locale_order(a, b):
+            key_a, key_b = (re.sub(r"\W", "", a), a), (re.sub(r"\W", "", b), b)
+            return (key_a > key_b) - (key_a < key_b)
+
+        table = HarvestReport._meta.db_table
+        connection.ensure_connection()
+        connection.connection.create_collation("locale_order", locale_order)
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT sql FROM main.sqlite_master WHERE name = %s", [table])
+            ddl = re.sub(r' REFERENCES "\w+" \("\w+"\)( DEFERRABLE INITIALLY DEFERRED)?', "", cursor.fetchone()[0])
+            ddl = re.sub(r'("geo_path" varchar\(\d+\))', r"\1 COLLATE locale_order", ddl)
+            cursor.execute(ddl.replace("CREATE TABLE", "CREATE TEMP TABLE", 1))
+            cursor.execute(f'INSERT INTO temp."{table}" SELECT * FROM main."{table}"')
+        try:
+            scope = resolve_scope(self.officer)
+            self.assertEqual(HarvestReport.objects.for_scope(scope).count(), 2)
+            self.assertEqual(HarvestReport.objects.filter(geo_path__lt=self.district.path_code + "/").count(), 0)
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute(f'DROP TABLE temp."{table}"')
+
+    def test_moving_a_cell_rewrites_the_codes_and_columns_below_it(self):
+        rollups.rebuild_all()
+        population.reconcile()
+        officer_scope = resolve_scope(self.officer)
+        cache.clear()
+        dashboard_cache.store(officer_scope, lambda scope: {"stale": True})
+
+        self.other_cell.sector = self.sector
+        with self.captureOnCommitCallbacks(execute=True):
+            self.other_cell.save()
+
+        self.other_village.refresh_from_db()
+        self.assertEqual(self.other_village.path_code, "01.01.01.02.01")
+        report = HarvestReport.objects.get(quantity=5)
+        self.assertEqual(report.geo_path, "01.01.01.02.01")
+        self.assertEqual((report.district_id, report.sector_id, report.cell_id), (self.district.pk, self.sector.pk, self.other_cell.pk))
+        self.assertEqual(Land.objects.get(pk=self.other_land.pk).district_id, self.district.pk)
+        self.assertEqual(HarvestReport.objects.for_user(self.officer).count(), 3)
+        self.assertEqual(HarvestReport.objects.filter(district=self.district).count(), 3)
+
+        # The aggregates follow: same as rebuilt from scratch
+        rows = lambda: dict(GeoRollup.objects.values_list("scope_key", "harvest_reports"))
+        incremental = rows()
+        self.assertEqual(incremental[GeoRollup.key_for("district", self.district.pk)], 3)
+        rollups.rebuild_all()
+        self.assertEqual(incremental, rows())
+        self.assertEqual(population.reconcile(), 0)
+        self.assertEqual(
+            set(DailyActivityBucket.objects.filter(cell=self.other_cell).values_list("district_id", flat=True)),
+            {self.district.pk},
+        )
+        self.assertEqual(dashboard_cache.fetch(officer_scope, lambda scope: {})[1]["status"], "miss")
+
+        Village.objects.create(name="Ubumwe", cell=self.other_cell)
+        self.assertEqual(Village.objects.get(name="Ubumwe").path_code, "01.01.01.02.02")
+
+    def test_moving_a_village_moves_its_lands_to_the_new_cell(self):
+        self.other_village.cell = self.cell
+        with self.captureOnCommitCallbacks(execute=True):
+            self.other_village.save()
+
+        land = Land.objects.get(pk=self.other_land.pk)
+        self.assertEqual((land.district_id, land.cell_id), (self.district.pk, self.cell.pk))
+        self.assertEqual(HarvestReport.objects.get(quantity=5).cell_id, self.cell.pk)
+        self.assertEqual(land_stats.reconcile(), 0)
+
+
+class GeoPathStampTests(DashboardDataMixin, TestCase):
+
+    def test_facts_are_stamped_with_their_geography(self):
+        report = HarvestReport.objects.get(land=self.other_land)
+        self.assertEqual((report.district_id, report.sector_id, report.cell_id),
+                         (self.other_district.pk, self.other_sector.pk, self.other_cell.pk))
+        self.assertEqual(LivestockProduction.objects.get().cell_id, self.cell.pk)
+        self.assertEqual(ResourceRequestFeedback.objects.get().cell_id, self.cell.pk)
+        self.assertEqual(set(FarmerIssueReply.objects.values_list("district_id", flat=True)), {self.district.pk})
+
+    def test_moving_land_restamps_its_facts(self):
+        self.land.district, self.land.sector, self.land.cell = self.other_district, self.other_sector, self.other_cell
+        self.land.save()
+
+        self.assertEqual(HarvestReport.objects.filter(cell=self.other_cell).count(), 3)
+        self.assertEqual(ResourceRequest.objects.get().district_id, self.other_district.pk)
+        self.assertEqual(ResourceRequestFeedback.objects.get().sector_id, self.other_sector.pk)
+
+    def test_restamped_facts_refresh_the_aggregates_of_both_cells(self):
+        rollups.rebuild_all()
+        activity.backfill()
+        day = LivestockProduction.objects.get().report_date.date()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.livestock.district, self.livestock.sector, self.livestock.cell, self.livestock.village = (
+                self.other_district, self.other_sector, self.other_cell, self.other_village,
+            )
+            self.livestock.save()
+
+        self.assertEqual(LivestockProduction.objects.get().cell_id, self.other_cell.pk)
+        productions = dict(GeoRollup.objects.filter(level="cell").values_list("cell_id", "livestock_productions"))
+        self.assertEqual((productions[self.cell.pk], productions[self.other_cell.pk]), (0, 1))
+        self.assertEqual(
+            list(DailyActivityBucket.objects.filter(day=day, livestock_productions=1).values_list("cell_id", flat=True)),
+            [self.other_cell.pk],
+        )
+
+        # Rows already carrying the geography are left alone
+        with self.captureOnCommitCallbacks() as callbacks:
+            _restamp(self.livestock, [LivestockProduction.objects.filter(location=self.livestock)])
+        self.assertEqual(callbacks, [])
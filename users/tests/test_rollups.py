@@ -0,0 +1,184 @@
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from users.models import CustomUser
+from users.models.products import RecommendedQuantity
+from users.models.addresses import Sector, Cell
+from users.utils import land_stats, population, rollups
+from users.tasks.rollups import rebuild_geo_rollups
+from users.views.views.dashbord import STAT_SECTIONS
+from report.models import (
+    CellInventory,
+    CellLandStats,
+    PopulationCounter,
+    DistrictInventory,
+    GeoRollup,
+    Land,
+    HarvestReport,
+    LivestockProduction,
+)
+from users.tests.base import DashboardDataMixin, HoldingsMixin
+
+
+class GeoRollupTests(DashboardDataMixin, TestCase):
+
+    def rows(self):
+        return {
+            row.pop("scope_key"): row
+            for row in GeoRollup.objects.values("scope_key", *rollups.METRIC_FIELDS)
+        }
+
+    def test_incremental_refreshes_match_a_full_rebuild(self):
+        # As after deploying: facts exist, the table is empty. Writes leave it to the rebuild.
+        self.assertFalse(GeoRollup.objects.exists())
+        with self.captureOnCommitCallbacks(execute=True):
+            HarvestReport.objects.create(farmer=self.farmer, land=self.other_land, product=self.maize, quantity=7, status="sold")
+        self.assertFalse(GeoRollup.objects.exists())
+
+        # A second rebuild does not start while one holds the lock
+        cache.add(rollups.REBUILD_LOCK_KEY, True)
+        self.assertFalse(rebuild_geo_rollups())
+        self.assertFalse(GeoRollup.objects.exists())
+        cache.delete(rollups.REBUILD_LOCK_KEY)
+        self.assertTrue(rebuild_geo_rollups())
+        national = GeoRollup.objects.get(scope_key=GeoRollup.key_for("national"))
+        self.assertEqual((national.lands, national.harvest_reports), (2, 4))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            # The land and its reports and request move to the other district
+            self.land.district, self.land.sector, self.land.cell, self.land.village = (
+                self.other_district, self.other_sector, self.other_cell, self.other_village,
+            )
+            self.land.save()
+            HarvestReport.objects.filter(quantity=5).get().delete()
+            LivestockProduction.objects.create(farmer=self.farmer, location=self.livestock, product=self.cow, quantity=2, status="sold")
+            DistrictInventory.objects.create(district=self.district, product=self.maize, quantity_added=Decimal("20"))
+        incremental = self.rows()
+
+        rollups.rebuild_all()
+        self.assertEqual(incremental, self.rows())
+        self.assertEqual(incremental[GeoRollup.key_for("cell", self.cell.pk)]["lands"], 0)
+        self.assertEqual(incremental[GeoRollup.key_for("district", self.other_district.pk)]["harvest_reports"], 3)
+
+    def test_officers_read_the_rollup_once_it_is_built(self):
+        client = APIClient()
+        client.force_authenticate(self.officer)
+        cache.clear()
+        # Not built yet: live counts
+        self.assertEqual(client.get("/api/dashboard/", {"sections": "land"}).data["land"]["total_parcels"], 1)
+
+        rollups.rebuild_all()
+        GeoRollup.objects.filter(scope_key=GeoRollup.key_for("district", self.district.pk)).update(lands=7)
+        cache.clear()
+        self.assertEqual(client.get("/api/dashboard/", {"sections": "land"}).data["land"]["total_parcels"], 7)
+
+    def test_sector_officers_get_the_same_payload_from_the_rollup_as_live(self):
+        sector_officer = CustomUser.objects.create_user(
+            email="sector@example.com", full_names="Sector Officer",
+            national_id="1000000000000009", password="Officer123!", user_level="sector_officer",
+        )
+        Sector.objects.filter(pk=self.sector.pk).update(sector_officer=sector_officer)
+        DistrictInventory.objects.create(district=self.district, product=self.maize, quantity_added=Decimal("20"))
+        client = APIClient()
+        client.force_authenticate(sector_officer)
+        stats = lambda: {name: client.get("/api/dashboard/").data[name] for name in STAT_SECTIONS}
+
+        cache.clear()
+        live = stats()
+        rollups.rebuild_all()
+        cache.clear()
+        self.assertEqual(stats(), live)
+        self.assertEqual(live["inventories"]["district"]["records"], 1)
+
+
+class PopulationCounterTests(HoldingsMixin, TestCase):
+
+    def counts(self, key):
+        return PopulationCounter.objects.filter(scope_key=key).values(
+            "total_users", "residents", "citizens", "cell_officers", "district_officers"
+        ).get()
+
+    def test_writes_keep_counters_in_step_with_a_full_rebuild(self):
+        population.reconcile()
+        neighbour = CustomUser.objects.create_user(
+            email="neighbour@example.com", full_names="Neighbour",
+            national_id="1000000000000004", password="Farmer123!", user_level="citizen",
+        )
+        location = dict(province=self.province, district=self.district, sector=self.sector, cell=self.cell, village=self.village)
+        land = Land.objects.create(owner=neighbour, upi="1/01/01/01/9", size_hectares=Decimal("1"), **location)
+        self.assertEqual(self.counts(f"cell:{self.cell.pk}"), {
+            "total_users": 3, "residents": 2, "citizens": 2, "cell_officers": 0, "district_officers": 1,
+        })
+
+        # Second parcel in the same cell does not count the farmer twice
+        Land.objects.create(owner=neighbour, upi="1/01/01/01/10", size_hectares=Decimal("1"), **location)
+        self.assertEqual(self.counts(f"district:{self.district.pk}")["residents"], 2)
+
+        land.district, land.sector, land.cell, land.village = (
+            self.other_district, self.other_sector, self.other_cell, self.other_village,
+        )
+        land.save()
+        Land.objects.filter(owner=neighbour, upi="1/01/01/01/10").delete()
+        self.assertEqual(self.counts(f"district:{self.district.pk}")["residents"], 1)
+        self.assertEqual(self.counts(f"village:{self.other_village.pk}")["citizens"], 2)
+
+        neighbour.user_level = "cell_officer"
+        neighbour.save()
+        self.other_cell.cell_officer = neighbour
+        self.other_cell.save()
+        other_cell = self.counts(f"cell:{self.other_cell.pk}")
+        self.assertEqual((other_cell["cell_officers"], other_cell["citizens"]), (1, 1))
+        self.assertEqual(self.counts("national")["cell_officers"], 1)
+
+        self.assertEqual(population.reconcile(), 0)
+
+
+class CellLandStatsTests(HoldingsMixin, TestCase):
+
+    def stats(self, cell):
+        stats = CellLandStats.objects.filter(cell=cell).first()
+        return (stats.lands, stats.hectares) if stats else None
+
+    def test_land_writes_move_counts_and_hectares(self):
+        self.assertEqual(self.stats(self.cell), (1, Decimal("2.50")))
+
+        land = Land.objects.create(
+            owner=self.farmer, upi="1/01/01/01/3", size_hectares=Decimal("0.75"),
+            province=self.province, district=self.district, sector=self.sector, cell=self.cell, village=self.village,
+        )
+        self.assertEqual(self.stats(self.cell), (2, Decimal("3.25")))
+
+        land.size_hectares = Decimal("1.25")
+        land.save()
+        self.assertEqual(self.stats(self.cell), (2, Decimal("3.75")))
+
+        land.district, land.sector, land.cell, land.village = self.other_district, self.other_sector, self.other_cell, self.other_village
+        land.save()
+        self.assertEqual(self.stats(self.cell), (1, Decimal("2.50")))
+        self.assertEqual(self.stats(self.other_cell), (2, Decimal("2.25")))
+
+        land.delete()
+        self.assertEqual(self.stats(self.other_cell), (1, Decimal("1.00")))
+        self.assertEqual(land_stats.reconcile(), 0)
+
+    def test_quota_math_reads_the_stats(self):
+        RecommendedQuantity.objects.create(product=self.maize, crop_name="Maize", quantity_per_hectare=Decimal("20"))
+        Cell.objects.filter(pk=self.cell.pk).update(planned_crop=self.maize)
+        cell = Cell.objects.get(pk=self.cell.pk)
+        inventory = CellInventory(cell=cell, sector=self.sector, district=self.district, product=self.maize)
+
+        CellLandStats.objects.filter(cell=cell).update(hectares=Decimal("10"))
+        with self.assertNumQueries(2):
+            self.assertEqual(inventory.calculate_quantity_available(), Decimal("200"))
+        inventory.product = self.cow
+        self.assertEqual(inventory.calculate_quantity_available(), Decimal("0.00"))
+
+        self.assertEqual(land_stats.reconcile(), 1)
+        self.assertEqual(land_stats.allocation(cell, self.maize).recommended, Decimal("50"))
+
+        # Cells without a row yet are computed on first read
+        CellLandStats.objects.all().delete()
+        self.assertEqual(land_stats.stats_for(self.other_cell.pk).hectares, Decimal("1.00"))
@@ -0,0 +1,109 @@
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from users.models import CustomUser
+from users.models.addresses import District, Cell
+from users.utils.scope import resolve_scope, in_scope
+from report.models import (
+    CellInventory,
+    CellResourceRequest,
+    DistrictInventory,
+    Land,
+    HarvestReport,
+    LivestockAnimal,
+    FarmerIssueReply,
+)
+from users.tests.base import DashboardDataMixin
+
+
+class ScopeTests(DashboardDataMixin, TestCase):
+
+    def setUp(self):
+        self.cell_officer = CustomUser.objects.create_user(
+            email="cell@example.com", full_names="Cell Officer",
+            national_id="1000000000000003", password="Officer123!", user_level="cell_officer",
+        )
+        Cell.objects.filter(pk=self.cell.pk).update(cell_officer=self.cell_officer)
+
+    def test_scope_resolves_in_one_query_and_is_cached(self):
+        with self.assertNumQueries(1):
+            scope = resolve_scope(self.cell_officer)
+            self.assertEqual(scope["district"], self.district)
+            self.assertIs(resolve_scope(self.cell_officer), scope)
+        self.assertEqual(scope["label"], "Cell: Rukiri")
+
+    def test_models_are_scoped_through_their_declared_paths(self):
+        scope = resolve_scope(self.cell_officer)
+        self.assertEqual(HarvestReport.objects.for_scope(scope).count(), 2)
+        self.assertEqual(LivestockAnimal.objects.for_scope(scope).count(), 1)
+        self.assertEqual(FarmerIssueReply.objects.for_scope(scope).count(), 2)
+        self.assertEqual(list(Cell.objects.for_scope(scope)), [self.cell])
+        self.assertTrue(in_scope(self.land, scope))
+        self.assertFalse(in_scope(self.other_land, scope))
+
+    def test_citizens_see_their_own_rows_and_only_the_dashboard_sees_inventories(self):
+        DistrictInventory.objects.create(district=self.other_district, product=self.maize, quantity_added=10)
+        CellInventory.objects.create(
+            district=self.district, sector=self.sector, cell=self.cell, product=self.maize, quantity_available=4,
+        )
+        CellResourceRequest.objects.create(cell=Cell.objects.get(pk=self.cell.pk), product=self.maize, quantity_requested=2)
+        scope = resolve_scope(self.farmer)
+        self.assertEqual(HarvestReport.objects.for_scope(scope).count(), 3)
+        self.assertEqual(FarmerIssueReply.objects.for_scope(scope).count(), 2)
+        self.assertFalse(DistrictInventory.objects.for_scope(scope).exists())
+        self.assertEqual(DistrictInventory.objects.for_scope(scope, public=True).count(), 1)
+        self.assertFalse(Cell.objects.for_scope(scope).exists())
+
+        client = APIClient()
+        client.force_authenticate(self.farmer)
+        self.assertEqual(client.get("/api/cell-inventory/").json(), [])
+        self.assertEqual(client.get("/api/cell-resource-requests/").json(), [])
+        self.assertEqual(client.get("/api/district-inventory/").status_code, 403)
+        # The role-aware dashboard keeps showing them national totals
+        cache.clear()
+        inventories = client.get("/api/dashboard/", {"sections": "inventories"}).data["inventories"]
+        self.assertEqual(inventories["district"]["records"], 1)
+        self.assertEqual(inventories["cell"]["records"], 1)
+
+        client.force_authenticate(self.cell_officer)
+        self.assertEqual(client.get("/api/district-inventory/").json(), [])
+        self.assertEqual(len(client.get("/api/cell-inventory/").json()), 1)
+
+    def test_unassigned_officers_see_nothing_but_what_they_own(self):
+        Cell.objects.filter(pk=self.cell.pk).update(cell_officer=None)
+        Land.objects.filter(pk=self.other_land.pk).update(owner=self.cell_officer)
+        self.cell_officer.refresh_from_db()
+
+        scope = resolve_scope(self.cell_officer)
+        self.assertEqual(scope["label"], "Unassigned cell")
+        self.assertFalse(HarvestReport.objects.for_scope(scope).exists())
+        self.assertEqual(list(Land.objects.for_scope(scope, include_owned=True)), [self.other_land])
+
+        # Not everything, as the resource request and harvest endpoints used to return
+        client = APIClient()
+        client.force_authenticate(self.cell_officer)
+        self.assertEqual(client.get("/api/resource-requests/").json(), [])
+        self.assertEqual(client.get("/api/resource-request-feedbacks/").json(), [])
+        self.assertEqual(client.get("/api/harvest-reports/").json(), [])
+        self.assertEqual([land["id"] for land in client.get("/api/lands/").json()], [str(self.other_land.pk)])
+
+    def test_officers_see_their_jurisdiction_plus_their_own_lands_and_its_feedback_only(self):
+        Land.objects.filter(pk=self.other_land.pk).update(owner=self.officer)
+        client = APIClient()
+        client.force_authenticate(self.officer)
+        lands = {land["id"] for land in client.get("/api/lands/").json()}
+        self.assertEqual(lands, {str(self.land.pk), str(self.other_land.pk)})
+        self.assertEqual(client.get(f"/api/lands/{self.other_land.pk}/").status_code, 200)
+        self.assertEqual(len(client.get("/api/resource-request-feedbacks/").json()), 1)
+
+        other_officer = CustomUser.objects.create_user(
+            email="huye@example.com", full_names="Huye Officer",
+            national_id="1000000000000004", password="Officer123!", user_level="district_officer",
+        )
+        District.objects.filter(pk=self.other_district.pk).update(district_officer=other_officer)
+        client.force_authenticate(other_officer)
+        # Feedback on requests outside their district is no longer listed to every officer
+        self.assertEqual(client.get("/api/resource-request-feedbacks/").json(), [])
+        self.assertEqual({land["id"] for land in client.get("/api/lands/").json()}, {str(self.other_land.pk)})
+        self.assertEqual(client.get(f"/api/lands/{self.land.pk}/").status_code, 404)
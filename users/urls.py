@@ -28,7 +28,7 @@ from .views.views.resources import (
     ResourceRequestFeedbackViewSet,
 )
 from users.views.views.profile import MeViewSet
-from users.views.views.adresses import get_districts, get_sectors, get_cells, get_villages, get_provinces, get_available_districts, get_available_cells
+from users.views.views.adresses import get_districts, get_sectors, get_cells, get_villages, get_provinces, get_available_districts, get_available_cells, get_hierarchy, locate_point, search_places, geo_bundle_status
 from users.views.views.land import LandViewSet, LivestockLocationViewSet
 from users.views.views.season_plan import CellSeasonPlanViewSet
 from users.views.views.approval import ResourceRequestStatusViewSet
@@ -37,8 +37,9 @@ from users.views.views.reply import  CellResourceRequestViewSet
 from rest_framework.routers import DefaultRouter
 from users.views.views.issues import FarmerIssueViewSet
 from users.views.views.notifications import NotificationViewSet
-from users.views.views.dashbord import RoleAwareDashboard
-from users.views.views.cell_climate import CellClimateDataViewSet
+from users.views.views.dashbord import RoleAwareDashboard, DashboardIssuesView, DashboardTimeseriesView
+from users.views.views.map import MapClustersView
+from users.views.views.cell_climate import CellClimateDataViewSet, CellClimateSeriesView, ClimateAreaSummaryView
 from users.views.views.ai_data import AIDataViewSet
 from users.views.api_views.citizen_logout import LogoutView
 from users.views.views.farmer_inventory import FarmerInventoryViewSet
@@ -88,11 +89,20 @@ urlpatterns = [
     path('auth/password-reset/', ResetPasswordView.as_view(), name='reset-password'),
     path('auth/password-change/', AuthenticatedChangePasswordView.as_view(), name='change-password'),
     path("dashboard/", RoleAwareDashboard.as_view(), name="dashboard"),
+    path("dashboard/issues/", DashboardIssuesView.as_view(), name="dashboard-issues"),
+    path("dashboard/timeseries/", DashboardTimeseriesView.as_view(), name="dashboard-timeseries"),
+    path("map/clusters/", MapClustersView.as_view(), name="map-clusters"),
+    path("climate/daily/", CellClimateSeriesView.as_view(), name="climate-daily"),
+    path("climate/summary/", ClimateAreaSummaryView.as_view(), name="climate-summary"),
     path('ajax/get-districts/', get_districts, name='get_districts'),
     path('ajax/get-sectors/', get_sectors, name='get_sectors'),
     path('ajax/get-provinces/', get_provinces, name='get_provinces'),
     path('ajax/get-cells/', get_cells, name='get_cells'),
     path('ajax/get-villages/', get_villages, name='get_villages'),
+    path('ajax/hierarchy/', get_hierarchy, name='get_hierarchy'),
+    path('ajax/locate/', locate_point, name='locate_point'),
+    path('places/search/', search_places, name='search_places'),
+    path('geo/bundles/', geo_bundle_status, name='geo_bundle_status'),
     path('ajax/get-available-districts/', get_available_districts, name='get_available_districts'),
     path('ajax/get-available-cells/', get_available_cells, name='get_available_cells'),
     path('logout/', LogoutView.as_view(), name='logout'),  # Logout endpoint
@@ -0,0 +1,190 @@
+"""
+Maintenance and querying of the DailyActivityBucket table behind /dashboard/timeseries/.
+
+Buckets are recomputed per (cell, day) from the fact tables: incrementally after each
+write (report/signals/rollups.py) and nightly for recent days (backfill_activity_buckets).
+"""
+import logging
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, DecimalField, FloatField, Q, Sum
+from django.db.models.functions import Coalesce, TruncDate, TruncMonth, TruncWeek
+
+from users.models.addresses import Cell
+from report.models import (
+    HarvestReport,
+    LivestockProduction,
+    ResourceRequest,
+    FarmerIssue,
+    DailyActivityBucket,
+)
+
+logger = logging.getLogger(__name__)
+
+BUCKET_METRICS = [
+    "harvest_reports",
+    "harvest_quantity",
+    "livestock_productions",
+    "livestock_production_quantity",
+    "requests",
+    "requests_quantity",
+    "issues",
+]
+
+INTERVALS = ("day", "week", "month", "season")
+
+
+def _float_sum(field):
+    return Coalesce(Sum(field), 0.0, output_field=FloatField())
+
+
+def _sources():
+    """
+    (queryset, date field, cell path, product path, aggregates) for every bucketed fact table.
+    """
+    return [
+        (HarvestReport.objects.all(), "report_date", "cell", "product", {
+            "harvest_reports": Count("id"),
+            "harvest_quantity": _float_sum("quantity"),
+        }),
+        (LivestockProduction.objects.all(), "report_date", "cell", "product", {
+            "livestock_productions": Count("id"),
+            "livestock_production_quantity": _float_sum("quantity"),
+        }),
+        (ResourceRequest.objects.all(), "request_date", "cell", "product", {
+            "requests": Count("id"),
+            "requests_quantity": Coalesce(
+                Sum("quantity_requested"), Decimal(0), output_field=DecimalField(max_digits=16, decimal_places=2)
+            ),
+        }),
+        (FarmerIssue.objects.all(), "reported_at", "cell", None, {
+            "issues": Count("id"),
+        }),
+    ]
+
+
+def compute_buckets(*, start=None, end=None, cell_ids=None, days=None):
+    """
+    Returns {(day, cell_id, product_id): {metric: value}} computed from the fact tables,
+    limited to [start, end] and/or the given cells and days.
+    """
+    buckets = defaultdict(lambda: {name: 0 for name in BUCKET_METRICS})
+
+    for qs, date_field, cell_path, product_path, aggregates in _sources():
+        qs = qs.annotate(bucket_day=TruncDate(date_field))
+        if start:
+            qs = qs.filter(bucket_day__gte=start)
+        if end:
+            qs = qs.filter(bucket_day__lte=end)
+        if days is not None:
+            qs = qs.filter(bucket_day__in=days)
+        if cell_ids is not None:
+            qs = qs.filter(**{f"{cell_path}__in": cell_ids})
+
+        group = ["bucket_day", cell_path] + ([product_path] if product_path else [])
+        for row in qs.values(*group).order_by().annotate(**aggregates):
+            cell_id = row.pop(cell_path)
+            if cell_id is None:
+                continue
+            key = (row.pop("bucket_day"), cell_id, row.pop(product_path) if product_path else None)
+            buckets[key].update(row)
+    return buckets
+
+
+def _replace(buckets, existing):
+    cells = dict(
+        (c["id"], c) for c in Cell.objects.filter(id__in={cell_id for _, cell_id, _ in buckets})
+        .values("id", "sector_id", "sector__district_id")
+    )
+    with transaction.atomic():
+        existing.delete()
+        DailyActivityBucket.objects.bulk_create([
+            DailyActivityBucket(
+                day=day, cell_id=cell_id, product_id=product_id,
+                sector_id=cells[cell_id]["sector_id"], district_id=cells[cell_id]["sector__district_id"],
+                **values,
+            )
+            for (day, cell_id, product_id), values in buckets.items()
+            if cell_id in cells
+        ], batch_size=1000)
+
+
+def refresh_buckets(cell_id, day):
+    """
+    Recomputes the buckets of one cell and day, after a write to one of its facts.
+    """
+    if not cell_id or not day:
+        return
+    buckets = compute_buckets(cell_ids=[cell_id], days=[day])
+    _replace(buckets, DailyActivityBucket.objects.filter(cell_id=cell_id, day=day))
+
+
+def refresh_cells(cell_ids):
+    """
+    Recomputes every bucket of the given cells, e.g. after they moved to another sector.
+    """
+    cell_ids = [cell_id for cell_id in cell_ids if cell_id]
+    if not cell_ids:
+        return
+    buckets = compute_buckets(cell_ids=cell_ids)
+    _replace(buckets, DailyActivityBucket.objects.filter(cell_id__in=cell_ids))
+
+
+def backfill(start=None, end=None):
+    """
+    Recomputes every bucket in [start, end] (the whole history when both are None).
+    """
+    buckets = compute_buckets(start=start, end=end)
+    existing = DailyActivityBucket.objects.all()
+    if start:
+        existing = existing.filter(day__gte=start)
+    if end:
+        existing = existing.filter(day__lte=end)
+    _replace(buckets, existing)
+    logger.info("Backfilled %s activity buckets (%s to %s)", len(buckets), start or "start", end or "today")
+    return len(buckets)
+
+
+def backfill_recent(days):
+    today = date.today()
+    return backfill(start=today - timedelta(days=days - 1), end=today)
+
+
+# -------------------------------
+# Querying
+# -------------------------------
+def season_of(day):
+    """
+    Returns the agricultural season label of a date, e.g. "2025A" (see Cell.get_current_season).
+    """
+    return f"{Cell.get_current_season_year(day)}{Cell.get_current_season(day)}"
+
+
+def rollup_series(qs, interval):
+    """
+    Sums a DailyActivityBucket queryset per day, week, month or season.
+    Seasons are folded from monthly sums, since every month falls in exactly one season.
+    """
+    sums = {name: Sum(name) for name in BUCKET_METRICS}
+    trunc = {"day": None, "week": TruncWeek("day"), "month": TruncMonth("day"), "season": TruncMonth("day")}[interval]
+    period = "day" if trunc is None else "period"
+    if trunc is not None:
+        qs = qs.annotate(period=trunc)
+    rows = list(qs.values(period).order_by(period).annotate(**sums))
+
+    if interval != "season":
+        return [
+            {"period": row.pop(period), **{name: row[name] or 0 for name in BUCKET_METRICS}}
+            for row in rows
+        ]
+
+    seasons = {}
+    for row in rows:
+        label = season_of(row["period"])
+        totals = seasons.setdefault(label, {"period": label, "starts": row["period"], **{name: 0 for name in BUCKET_METRICS}})
+        for name in BUCKET_METRICS:
+            totals[name] += row[name] or 0
+    return list(seasons.values())
@@ -0,0 +1,68 @@
+from django.db.models import Count, FloatField, Q, Sum
+from django.db.models.functions import Coalesce
+
+
+def _status_choices(qs, status_field):
+    field = qs.model._meta.get_field(status_field)
+    return [value for value, _ in (field.choices or [])]
+
+
+def build_section(qs, *, statuses=None, quantity_field=None, status_field="status",
+                  iexact=False, distinct=False, extra=None):
+    """
+    Computes a dashboard section (total, optional quantity sum and per-status breakdown)
+    with a single aggregate() over `qs`, using filter=Q(...) conditional aggregates.
+
+    - statuses:       statuses to break down; defaults to the choices of `status_field`
+    - quantity_field: field summed overall and per status (as float)
+    - iexact:         match statuses case-insensitively (free-text status columns)
+    - distinct:       count distinct rows, needed when `extra` aggregates join a reverse relation
+    - extra:          additional named aggregates evaluated in the same query
+
+    Returns:
+        {
+            "total": n,
+            "total_quantity": q,                 # only with quantity_field
+            "by_status": [{"status": s, "count": n, "quantity": q}, ...],   # non-empty statuses
+            "status_counts": {s: n, ...},        # every requested status
+            **extra results,
+        }
+    """
+    if statuses is None:
+        statuses = _status_choices(qs, status_field)
+
+    def quantity_sum(**kwargs):
+        return Coalesce(Sum(quantity_field, **kwargs), 0.0, output_field=FloatField())
+
+    aggregates = {"total": Count("pk", distinct=distinct)}
+    if quantity_field:
+        aggregates["total_quantity"] = quantity_sum()
+
+    for status in statuses:
+        lookup = Q(**{f"{status_field}__iexact" if iexact else status_field: status})
+        aggregates[f"{status}__count"] = Count("pk", filter=lookup, distinct=distinct)
+        if quantity_field:
+            aggregates[f"{status}__quantity"] = quantity_sum(filter=lookup)
+
+    aggregates.update(extra or {})
+    row = qs.aggregate(**aggregates)
+
+    section = {"total": row.pop("total")}
+    if quantity_field:
+        section["total_quantity"] = row.pop("total_quantity")
+
+    by_status = []
+    status_counts = {}
+    for status in statuses:
+        count = row.pop(f"{status}__count")
+        status_counts[status] = count
+        entry = {"status": status, "count": count}
+        if quantity_field:
+            entry["quantity"] = row.pop(f"{status}__quantity")
+        if count:
+            by_status.append(entry)
+
+    section["by_status"] = by_status
+    section["status_counts"] = status_counts
+    section.update(row)
+    return section
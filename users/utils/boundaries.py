@@ -0,0 +1,374 @@
+"""
+Point-in-polygon lookup of the cell and village containing a GPS point.
+
+Boundaries are imported from geoBoundaries ADM4 (cell) / ADM5 (village) GeoJSON files with
+`manage.py import_boundaries`, simplified with Douglas-Peucker and stored in the Boundary
+table. Each process keeps a BoundaryIndex in memory: an STR-packed R-tree over the
+bounding boxes narrows a point down to a few candidate polygons, which are then tested
+with ray casting. The index is versioned by a counter in the shared cache, bumped by the
+importer, like the hierarchy snapshot (users/utils/hierarchy.py).
+
+    location = boundaries.locate(-1.944, 30.061)
+    if location:
+        location.cell_id, location.village_id
+"""
+import logging
+import threading
+import time
+from collections import namedtuple
+
+from django.core.cache import cache
+from django.db import transaction
+
+from users.models.addresses import Boundary
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = "boundaries:version"
+# About 11 m at the equator
+DEFAULT_TOLERANCE = 0.0001
+
+Location = namedtuple("Location", ["cell_id", "village_id"])
+
+
+# -------------------------------
+# Geometry
+# -------------------------------
+def _segment_distance2(point, start, end):
+    (px, py), (ax, ay), (bx, by) = point, start, end
+    dx, dy = bx - ax, by - ay
+    if dx == 0 and dy == 0:
+        return (px - ax) ** 2 + (py - ay) ** 2
+    t = max(0.0, min(1.0, ((px - ax) * dx + (py - ay) * dy) / (dx * dx + dy * dy)))
+    return (px - ax - t * dx) ** 2 + (py - ay - t * dy) ** 2
+
+
+def simplify_line(points, tolerance):
+    """
+    Douglas-Peucker simplification of a list of (x, y) points, keeping both ends.
+    """
+    if len(points) < 3 or tolerance <= 0:
+        return list(points)
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    tolerance2 = tolerance * tolerance
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        farthest, farthest_d2 = None, tolerance2
+        for i in range(first + 1, last):
+            d2 = _segment_distance2(points[i], points[first], points[last])
+            if d2 > farthest_d2:
+                farthest, farthest_d2 = i, d2
+        if farthest is not None:
+            keep[farthest] = True
+            stack.append((first, farthest))
+            stack.append((farthest, last))
+    return [point for point, kept in zip(points, keep) if kept]
+
+
+def simplify_ring(ring, tolerance):
+    """
+    Simplifies a closed ring, keeping it closed with at least 4 points (a triangle). Rings
+    that would collapse are returned unchanged.
+    """
+    ring = [tuple(point[:2]) for point in ring]
+    if ring and ring[0] != ring[-1]:
+        ring.append(ring[0])
+    if len(ring) <= 4:
+        return ring
+    # Split at the point farthest from the start, so the closed ring has two distinct ends
+    start = ring[0]
+    split = max(range(len(ring)), key=lambda i: (ring[i][0] - start[0]) ** 2 + (ring[i][1] - start[1]) ** 2)
+    simplified = simplify_line(ring[:split + 1], tolerance)[:-1] + simplify_line(ring[split:], tolerance)
+    return simplified if len(simplified) >= 4 else ring
+
+
+def geometry_polygons(geometry):
+    """
+    Returns the rings of a GeoJSON Polygon/MultiPolygon geometry as [polygon, ...].
+    """
+    if geometry["type"] == "Polygon":
+        return [geometry["coordinates"]]
+    if geometry["type"] == "MultiPolygon":
+        return list(geometry["coordinates"])
+    raise ValueError(f"Unsupported geometry type {geometry['type']}")
+
+
+def bounding_box(polygons):
+    xs = [x for polygon in polygons for x, _ in polygon[0]]
+    ys = [y for polygon in polygons for _, y in polygon[0]]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def point_in_ring(x, y, ring):
+    inside = False
+    x1, y1 = ring[-1]
+    for x2, y2 in ring:
+        if (y1 > y) != (y2 > y) and x < (x2 - x1) * (y - y1) / (y2 - y1) + x1:
+            inside = not inside
+        x1, y1 = x2, y2
+    return inside
+
+
+def point_in_polygons(x, y, polygons):
+    """
+    True when (x, y) lies in the shell and outside the holes of one of the polygons.
+    """
+    for shell, *holes in polygons:
+        if point_in_ring(x, y, shell) and not any(point_in_ring(x, y, hole) for hole in holes):
+            return True
+    return False
+
+
+# -------------------------------
+# R-tree
+# -------------------------------
+class STRTree:
+    """
+    Static R-tree over (bbox, item) entries, packed with Sort-Tile-Recursive. A bbox is
+    (min_x, min_y, max_x, max_y). Immutable once built.
+    """
+
+    def __init__(self, entries, capacity=16):
+        self.capacity = capacity
+        self.size = len(entries)
+        self.root = None
+        if not entries:
+            return
+        # Nodes are (bbox, children, leaf); leaf children are the (bbox, item) entries
+        nodes = self._pack(list(entries), leaf=True)
+        while len(nodes) > 1:
+            nodes = self._pack(nodes, leaf=False)
+        self.root = nodes[0]
+
+    def __len__(self):
+        return self.size
+
+    @staticmethod
+    def _union(boxes):
+        return (
+            min(box[0] for box in boxes), min(box[1] for box in boxes),
+            max(box[2] for box in boxes), max(box[3] for box in boxes),
+        )
+
+    def _pack(self, nodes, leaf):
+        """
+        Groups nodes into parents of `capacity` children: sorted into vertical slices by x
+        center, then into runs by y center within each slice.
+        """
+        count = len(nodes)
+        parents_needed = -(-count // self.capacity)
+        slices = max(1, round(parents_needed ** 0.5))
+        per_slice = -(-count // slices)
+        by_x = sorted(nodes, key=lambda node: node[0][0] + node[0][2])
+        parents = []
+        for s in range(0, count, per_slice):
+            vertical = sorted(by_x[s:s + per_slice], key=lambda node: node[0][1] + node[0][3])
+            for r in range(0, len(vertical), self.capacity):
+                children = vertical[r:r + self.capacity]
+                parents.append((self._union([child[0] for child in children]), children, leaf))
+        return parents
+
+    def query(self, x, y):
+        """
+        Yields the items whose bbox contains (x, y).
+        """
+        if self.root is None:
+            return
+        stack = [self.root]
+        while stack:
+            bbox, children, leaf = stack.pop()
+            if not (bbox[0] <= x <= bbox[2] and bbox[1] <= y <= bbox[3]):
+                continue
+            if leaf:
+                for child_bbox, item in children:
+                    if child_bbox[0] <= x <= child_bbox[2] and child_bbox[1] <= y <= child_bbox[3]:
+                        yield item
+            else:
+                stack.extend(children)
+
+
+# -------------------------------
+# Import
+# -------------------------------
+SHAPE_LEVELS = {"ADM4": "cell", "ADM5": "village"}
+
+
+def _candidates(level):
+    """
+    {lowercased name: [(id, cell_id, lat, lon), ...]} of the cells or villages in the hierarchy.
+    """
+    from users.utils import hierarchy
+
+    snapshot = hierarchy.current()
+    candidates = {}
+    for row in snapshot.rows[f"{level}s"]:
+        cell_id = row["id"] if level == "cell" else row["cell_id"]
+        candidates.setdefault(row["name"].strip().lower(), []).append(
+            (row["id"], cell_id, row["latitude"], row["longitude"])
+        )
+    return candidates
+
+
+def match_feature(name, polygons, candidates):
+    """
+    Picks the cell/village a boundary belongs to among the rows sharing its name: the one
+    whose centroid lies inside it, else the one whose centroid lies in its bounding box and
+    is nearest to the box center. Returns (id, cell_id) or None.
+    """
+    rows = [row for row in candidates.get(name.strip().lower(), []) if row[2] is not None and row[3] is not None]
+    inside = [row for row in rows if point_in_polygons(row[3], row[2], polygons)]
+    if len(inside) == 1:
+        return inside[0][:2]
+    min_x, min_y, max_x, max_y = bounding_box(polygons)
+    center_x, center_y = (min_x + max_x) / 2, (min_y + max_y) / 2
+    boxed = inside or [row for row in rows if min_x <= row[3] <= max_x and min_y <= row[2] <= max_y]
+    if not boxed:
+        return None
+    best = min(boxed, key=lambda row: (row[3] - center_x) ** 2 + (row[2] - center_y) ** 2)
+    return best[:2]
+
+
+def import_features(features, tolerance=DEFAULT_TOLERANCE, level=None):
+    """
+    Stores the simplified polygons of GeoJSON features, replacing boundaries with the same
+    shapeID, and returns counts: imported, matched, unmatched, source_vertices, vertices.
+    The level comes from each feature's shapeType unless given.
+    """
+    stats = {"imported": 0, "matched": 0, "unmatched": 0, "source_vertices": 0, "vertices": 0}
+    candidates = {}
+    boundaries = []
+    for feature in features:
+        properties = feature.get("properties") or {}
+        feature_level = level or SHAPE_LEVELS.get(properties.get("shapeType"))
+        if feature_level not in ("cell", "village"):
+            raise ValueError(f"Cannot tell the level of feature {properties.get('shapeID')}; pass --level.")
+        if feature_level not in candidates:
+            candidates[feature_level] = _candidates(feature_level)
+
+        source = [[[tuple(point[:2]) for point in ring] for ring in polygon] for polygon in geometry_polygons(feature["geometry"])]
+        simplified = [[simplify_ring(ring, tolerance) for ring in polygon] for polygon in source]
+        name = properties.get("shapeName") or ""
+        match = match_feature(name, source, candidates[feature_level])
+        min_lon, min_lat, max_lon, max_lat = bounding_box(simplified)
+        source_vertices = sum(len(ring) for polygon in source for ring in polygon)
+        vertices = sum(len(ring) for polygon in simplified for ring in polygon)
+
+        boundaries.append(Boundary(
+            shape_id=properties.get("shapeID") or f"{feature_level}:{name}:{len(boundaries)}",
+            level=feature_level,
+            name=name,
+            village_id=match[0] if match and feature_level == "village" else None,
+            cell_id=match[1] if match else None,
+            min_lon=min_lon, min_lat=min_lat, max_lon=max_lon, max_lat=max_lat,
+            polygons=[[[list(point) for point in ring] for ring in polygon] for polygon in simplified],
+            vertices=vertices,
+            source_vertices=source_vertices,
+        ))
+        stats["imported"] += 1
+        stats["matched" if match else "unmatched"] += 1
+        stats["source_vertices"] += source_vertices
+        stats["vertices"] += vertices
+
+    with transaction.atomic():
+        Boundary.objects.filter(shape_id__in=[b.shape_id for b in boundaries]).delete()
+        Boundary.objects.bulk_create(boundaries, batch_size=500)
+        transaction.on_commit(bump)
+    return stats
+
+
+# -------------------------------
+# Index
+# -------------------------------
+class BoundaryIndex:
+    """
+    In-memory R-trees of the village and cell boundaries linked to the hierarchy.
+    """
+
+    def __init__(self, rows, version=None):
+        self.version = version
+        trees = {"village": [], "cell": []}
+        for row in rows:
+            polygons = tuple(
+                tuple(tuple((x, y) for x, y in ring) for ring in polygon) for polygon in row["polygons"]
+            )
+            bbox = (row["min_lon"], row["min_lat"], row["max_lon"], row["max_lat"])
+            trees[row["level"]].append((bbox, (Location(row["cell_id"], row["village_id"]), polygons)))
+        self.villages = STRTree(trees["village"])
+        self.cells = STRTree(trees["cell"])
+
+    def __len__(self):
+        return len(self.villages) + len(self.cells)
+
+    def locate(self, lat, lon):
+        """
+        Returns the Location of the village containing (lat, lon), else of the cell
+        containing it (village_id None), else None.
+        """
+        for tree in (self.villages, self.cells):
+            for location, polygons in tree.query(lon, lat):
+                if point_in_polygons(lon, lat, polygons):
+                    return location
+        return None
+
+
+def load(at_version=None):
+    rows = (
+        Boundary.objects.filter(cell__isnull=False)
+        .values("level", "cell_id", "village_id", "min_lon", "min_lat", "max_lon", "max_lat", "polygons")
+        .iterator(chunk_size=500)
+    )
+    index = BoundaryIndex(rows, version=at_version)
+    logger.info("Loaded boundary index v%s (%s polygons)", at_version, len(index))
+    return index
+
+
+_lock = threading.Lock()
+_index = None
+
+
+def version():
+    value = cache.get(VERSION_KEY)
+    if value is None:
+        cache.add(VERSION_KEY, int(time.time()), timeout=None)
+        value = cache.get(VERSION_KEY)
+    return value
+
+
+def bump():
+    """
+    Marks every loaded boundary index as outdated.
+    """
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.add(VERSION_KEY, int(time.time()), timeout=None)
+
+
+def current():
+    """
+    Returns this process's boundary index, reloading it when the version counter moved.
+    """
+    global _index
+    at_version = version()
+    index = _index
+    if index is not None and index.version == at_version:
+        return index
+    with _lock:
+        if _index is None or _index.version != at_version:
+            _index = load(at_version)
+        return _index
+
+
+def reset():
+    global _index
+    with _lock:
+        _index = None
+
+
+def locate(lat, lon):
+    """
+    Returns the Location (cell_id, village_id) whose boundary contains (lat, lon), or None.
+    """
+    return current().locate(float(lat), float(lon))
@@ -0,0 +1,79 @@
+"""
+Mapping of the cells onto the weather grid, so neighbouring cells share one download.
+
+Open-Meteo's models are several kilometres wide, so most cells of a sector resolve to the
+same model grid point. Each cell centroid is snapped to a regular grid of `grid_step()`
+degrees (OPEN_METEO_GRID_STEP, 0.1 by default, the finest resolution of the models behind
+the forecast and the archive), the points are stored as ClimateGridPoint rows and the
+cell -> point mapping as CellClimateData.grid_point. The climate tasks fetch each point
+once and copy the payload to every cell mapped to it.
+
+    groups = climate_grid.sync()
+    for point_id, (latitude, longitude, cell_ids) in groups.items():
+        ...
+"""
+import logging
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.conf import settings
+from django.db import transaction
+
+from report.models import CellClimateData, ClimateGridPoint
+from users.utils import open_meteo
+
+logger = logging.getLogger(__name__)
+
+GRID_STEP = Decimal("0.1")
+PLACES = Decimal("0.0001")
+
+
+def grid_step():
+    return Decimal(str(getattr(settings, "OPEN_METEO_GRID_STEP", GRID_STEP)))
+
+
+def snap(value, step):
+    """
+    Rounds a coordinate to the nearest multiple of `step`, halves away from zero.
+    """
+    units = (Decimal(str(value)) / step).to_integral_value(rounding=ROUND_HALF_UP)
+    return (units * step).quantize(PLACES)
+
+
+def sync(points=None, step=None):
+    """
+    Maps every cell with coordinates (open_meteo.cell_points() by default) to its grid
+    point: creates the missing points, rewrites only the mappings that moved and deletes
+    the points no cell uses any more. Returns {point_id: (latitude, longitude, [cell_ids])}.
+    """
+    step = step or grid_step()
+    points = open_meteo.cell_points() if points is None else points
+    wanted = {cell_id: (snap(lat, step), snap(lon, step)) for cell_id, lat, lon in points}
+
+    with transaction.atomic():
+        ClimateGridPoint.objects.bulk_create(
+            [ClimateGridPoint(latitude=lat, longitude=lon) for lat, lon in set(wanted.values())],
+            ignore_conflicts=True,
+        )
+        point_ids = {
+            (lat.quantize(PLACES), lon.quantize(PLACES)): pk
+            for pk, lat, lon in ClimateGridPoint.objects.values_list("id", "latitude", "longitude")
+        }
+        current = dict(CellClimateData.objects.values_list("cell_id", "grid_point_id"))
+        moved = [
+            CellClimateData(cell_id=cell_id, grid_point_id=point_ids[coordinates])
+            for cell_id, coordinates in wanted.items()
+            if current.get(cell_id) != point_ids[coordinates]
+        ]
+        CellClimateData.objects.bulk_create(
+            moved, batch_size=500, update_conflicts=True, unique_fields=["cell"], update_fields=["grid_point"],
+        )
+        # Cells that lost their coordinates, then points left without cells
+        CellClimateData.objects.filter(grid_point__isnull=False).exclude(cell_id__in=list(wanted)).update(grid_point=None)
+        ClimateGridPoint.objects.filter(cells__isnull=True).delete()
+
+    groups = {}
+    for cell_id, coordinates in wanted.items():
+        point_id = point_ids[coordinates]
+        groups.setdefault(point_id, (float(coordinates[0]), float(coordinates[1]), []))[2].append(cell_id)
+    logger.info("Mapped %s cells onto %s grid points (%s remapped)", len(wanted), len(groups), len(moved))
+    return groups
@@ -0,0 +1,204 @@
+"""
+Chunked, resumable runs of the climate tasks.
+
+A run is planned as ClimateFetchChunk rows of at most CHUNK_SIZE grid points, each fetched
+by its own Celery subtask; the subtasks form a chord whose callback fills in the run's
+coverage and latency (finish()). A chunk is its own checkpoint: `points` only keeps the
+grid points still to fetch, so a retry or a resumed run requests just those, and a failing
+chunk is retried on its own without holding up or repeating the others.
+
+    run, chunk_ids, state = climate_runs.start("forecast", build_requests)
+
+When a task starts while a run of the same kind is unfinished, that run is left alone
+while its chunks keep moving, and resumed (its unfinished chunks dispatched again) once
+nothing happened in it for STALE_AFTER, e.g. after a worker was lost.
+"""
+import logging
+import math
+import statistics
+import time
+from datetime import date, timedelta
+
+from django.db import transaction
+from django.db.models import Count, Max, Q, Sum
+from django.utils import timezone
+
+from report.models import ClimateFetchChunk, ClimateFetchRun
+from users.utils import climate_series, open_meteo
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 100            # grid points per subtask: two Open-Meteo batches
+STALE_AFTER = timedelta(hours=1)
+
+# kind -> (url, store)
+KINDS = {
+    "forecast": (open_meteo.forecast_url, climate_series.store_forecast),
+    "archive": (open_meteo.archive_url, climate_series.store_archive),
+}
+
+
+# -------------------------------
+# Planning
+# -------------------------------
+def plan(kind, requests, groups):
+    """
+    Creates a run and its chunks. `requests` is [(params, point_ids)], `groups` the grid
+    mapping of climate_grid.sync().
+    """
+    run = ClimateFetchRun.objects.create(
+        kind=kind, grid_points=len(groups), cells=sum(len(cell_ids) for _, _, cell_ids in groups.values()),
+    )
+    chunks = []
+    for params, point_ids in requests:
+        for i in range(0, len(point_ids), CHUNK_SIZE):
+            points = [
+                [point_id, groups[point_id][0], groups[point_id][1], len(groups[point_id][2])]
+                for point_id in point_ids[i:i + CHUNK_SIZE]
+            ]
+            chunks.append(ClimateFetchChunk(run=run, index=len(chunks), params=params, points=points, planned=len(points)))
+    ClimateFetchChunk.objects.bulk_create(chunks)
+    run.points_planned = sum(chunk.planned for chunk in chunks)
+    run.save(update_fields=["points_planned"])
+    logger.info("Planned %s run %s: %s grid points in %s chunks", kind, run.pk, run.points_planned, len(chunks))
+    return run
+
+
+def start(kind, build_requests):
+    """
+    Returns (run, ids of the chunks to dispatch, state), state being "planned" for a new
+    run, "resumed" for a stalled one or "running" when a run is still in progress (nothing
+    to dispatch). `build_requests()` returns the (requests, groups) of plan() and is only
+    called for a new run.
+    """
+    unfinished = ClimateFetchRun.objects.filter(kind=kind, status="running").first()
+    if unfinished:
+        last_activity = unfinished.chunks.aggregate(last=Max("updated_at"))["last"] or unfinished.started_at
+        if timezone.now() - last_activity < STALE_AFTER:
+            logger.info("%s run %s is still in progress, not starting another", kind, unfinished.pk)
+            return unfinished, [], "running"
+        chunk_ids = list(unfinished.chunks.exclude(status="done").values_list("pk", flat=True))
+        # A touch, so the next start sees the resumed run as active
+        unfinished.chunks.filter(pk__in=chunk_ids).update(status="pending", updated_at=timezone.now())
+        logger.info("Resuming %s run %s: %s unfinished chunks", kind, unfinished.pk, len(chunk_ids))
+        return unfinished, chunk_ids, "resumed"
+
+    run = plan(kind, *build_requests())
+    return run, list(run.chunks.values_list("pk", flat=True)), "planned"
+
+
+# -------------------------------
+# Chunks
+# -------------------------------
+def execute(chunk):
+    """
+    Fetches the chunk's remaining grid points, stores what came back and checkpoints the
+    chunk with the points that failed. Returns True when nothing is left to fetch.
+    """
+    url, store = KINDS[chunk.run.kind]
+    started = time.monotonic()
+    remaining = {point[0]: point for point in chunk.points}
+    outcome = open_meteo.fetch(url(), chunk.params, [tuple(point[:3]) for point in chunk.points])
+
+    with transaction.atomic():
+        rows = store(outcome.results)
+        chunk.points = [remaining[point_id] for point_id in outcome.failed]
+        chunk.stored += len(outcome.results)
+        chunk.cells += sum(remaining[point_id][3] for point_id in outcome.results)
+        chunk.rows += rows
+        chunk.requests += outcome.requests
+        chunk.bytes += outcome.bytes
+        chunk.attempts += 1
+        chunk.seconds += time.monotonic() - started
+        chunk.status = "pending" if chunk.points else "done"
+        chunk.error = f"{len(chunk.points)} grid points failed" if chunk.points else ""
+        chunk.save()
+    return not chunk.points
+
+
+def give_up(chunk, error=None):
+    """
+    Marks a chunk failed once its retries are spent; its remaining points stay recorded.
+    """
+    chunk.status = "failed"
+    if error is not None:
+        chunk.error = repr(error)
+    chunk.save(update_fields=["status", "error", "updated_at"])
+    logger.error("Gave up on chunk %s of run %s: %s", chunk.index, chunk.run_id, chunk.error)
+
+
+# -------------------------------
+# Summary
+# -------------------------------
+def _archive_savings(run):
+    """
+    Trims the daily series to the retention window and compares what the run fetched with
+    re-downloading the whole window for every point.
+    """
+    today = run.started_at.date()
+    keep_from = today - timedelta(days=climate_series.RETENTION_DAYS)
+    window = (today - keep_from).days + 1
+    fetched_days = sum(
+        ((date.fromisoformat(params["end_date"]) - date.fromisoformat(params["start_date"])).days + 1) * planned
+        for params, planned in run.chunks.values_list("params", "planned")
+    )
+    full_days = window * run.grid_points
+    return {
+        "trimmed": climate_series.trim_archive(keep_from),
+        "days_fetched": fetched_days,
+        "days_saved": full_days - fetched_days,
+        "requests_saved": math.ceil(run.grid_points / open_meteo.BATCH_SIZE) - run.requests,
+        # Scaled from this run's bytes per point-day; None when nothing was fetched
+        "bytes_saved": round(run.bytes * (full_days - fetched_days) / fetched_days) if fetched_days and run.bytes else None,
+    }
+
+
+def finish(run):
+    """
+    Fills in the run's totals, coverage and latency from its chunks, sets its status
+    (complete, partial or failed) and returns its summary. Archive runs also trim the
+    retention window and report what fetching incrementally saved.
+    """
+    totals = run.chunks.aggregate(
+        stored=Sum("stored"), cells=Sum("cells"), rows=Sum("rows"), requests=Sum("requests"), bytes=Sum("bytes"),
+        chunks=Count("pk"), failed=Count("pk", filter=Q(status="failed")), attempts=Sum("attempts"),
+    )
+    seconds = list(run.chunks.values_list("seconds", flat=True))
+
+    run.points_stored = totals["stored"] or 0
+    run.cells_covered = totals["cells"] or 0
+    run.rows = totals["rows"] or 0
+    run.requests = totals["requests"] or 0
+    run.bytes = totals["bytes"] or 0
+    run.finished_at = timezone.now()
+    run.duration_seconds = (run.finished_at - run.started_at).total_seconds()
+    if run.points_stored == run.points_planned:
+        run.status = "complete"
+    else:
+        run.status = "partial" if run.points_stored else "failed"
+
+    summary = {
+        "chunks": totals["chunks"],
+        "chunks_failed": totals["failed"],
+        "attempts": totals["attempts"] or 0,
+        "coverage": round(run.points_stored / run.points_planned, 4) if run.points_planned else 1.0,
+        "cell_coverage": round(run.cells_covered / run.cells, 4) if run.cells else 1.0,
+        "chunk_seconds_p50": round(statistics.median(seconds), 3) if seconds else None,
+        "chunk_seconds_max": round(max(seconds), 3) if seconds else None,
+    }
+    if run.kind == "archive":
+        summary.update(_archive_savings(run))
+    run.summary = summary
+    run.save()
+
+    logger.info(
+        f"✅ {run.get_kind_display()} run {run.pk} {run.status}: {run.points_stored}/{run.points_planned} grid points "
+        f"({run.cells_covered}/{run.cells} cells, {run.rows} rows) in {run.requests} requests "
+        f"({run.bytes / 1024:.1f} KiB), {run.duration_seconds:.1f}s"
+        + (f", {totals['failed']} chunks failed" if totals["failed"] else "")
+    )
+    return {
+        "run": str(run.pk), "status": run.status, "grid_points": run.grid_points, "points_planned": run.points_planned,
+        "stored": run.points_stored, "cells": run.cells_covered, "rows": run.rows,
+        "requests": run.requests, "bytes": run.bytes, "duration_seconds": run.duration_seconds, **summary,
+    }
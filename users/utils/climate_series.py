@@ -0,0 +1,255 @@
+"""
+Normalised climate series of the weather grid points.
+
+Forecast and archive responses are stored as rows: one per grid point and hour
+(GridHourlyForecast) or per grid point and day (GridDailyClimate). Windows are sliced with
+indexed range queries, and series are aggregated across cells in SQL:
+
+    climate_series.area_summary("sector", start, end)       # rainfall per sector
+    climate_series.archive_document(point, start, end)      # one point's daily window
+
+The Open-Meteo shaped documents the cell climate API returns are rebuilt from the rows
+by forecast_document() / archive_document().
+"""
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Avg, Count, Max, Sum
+from django.utils import timezone
+
+from report.models import CellClimateData, ClimateGridPoint, GridDailyClimate, GridHourlyForecast
+from users.utils import hierarchy
+
+# Open-Meteo variable -> row field
+HOURLY_VARIABLES = {"temperature_2m": "temperature", "precipitation": "precipitation"}
+DAILY_VARIABLES = {
+    "temperature_2m_max": "temperature_max",
+    "temperature_2m_min": "temperature_min",
+    "precipitation_sum": "precipitation_sum",
+}
+UNITS = {
+    "time": "iso8601",
+    "temperature_2m": "°C", "precipitation": "mm",
+    "temperature_2m_max": "°C", "temperature_2m_min": "°C", "precipitation_sum": "mm",
+}
+RETENTION_DAYS = 90
+AREA_FIELDS = {
+    "cell": "cell_id",
+    "sector": "cell__sector_id",
+    "district": "cell__sector__district_id",
+}
+
+
+# -------------------------------
+# Parsing responses
+# -------------------------------
+def _offset(payload):
+    return dt_timezone(timedelta(seconds=payload.get("utc_offset_seconds") or 0))
+
+
+def _block_values(payload, block_name, variables, parse_time):
+    block = payload.get(block_name) or {}
+    columns = {field: block.get(variable) or [] for variable, field in variables.items()}
+    return [
+        (parse_time(value), {field: column[i] if i < len(column) else None for field, column in columns.items()})
+        for i, value in enumerate(block.get("time") or [])
+    ]
+
+
+def _to_db(value):
+    """
+    An aware datetime as the DateTimeField stores it: naive in TIME_ZONE unless USE_TZ.
+    """
+    return value if settings.USE_TZ else timezone.make_naive(value, timezone.get_default_timezone())
+
+
+def _from_db(value):
+    return value if timezone.is_aware(value) else timezone.make_aware(value, timezone.get_default_timezone())
+
+
+def hourly_values(payload):
+    """
+    [(datetime, {field: value}), ...] of a forecast response's hourly block. Times are
+    local to the point (timezone=auto): read with its utc_offset_seconds, returned as the
+    database stores them.
+    """
+    offset = _offset(payload)
+    return _block_values(
+        payload, "hourly", HOURLY_VARIABLES, lambda value: _to_db(datetime.fromisoformat(value).replace(tzinfo=offset)),
+    )
+
+
+def daily_values(payload):
+    """
+    [(date, {field: value}), ...] of an archive response's daily block.
+    """
+    return _block_values(payload, "daily", DAILY_VARIABLES, date.fromisoformat)
+
+
+# -------------------------------
+# Storing
+# -------------------------------
+def _stamp(results, stamp_field):
+    """
+    Records the provider's metadata and the fetch time on the points of `results`.
+    """
+    now = timezone.now()
+    points = ClimateGridPoint.objects.in_bulk(list(results))
+    for point_id, payload in results.items():
+        point = points[point_id]
+        point.elevation = payload.get("elevation")
+        point.timezone = payload.get("timezone") or ""
+        point.utc_offset_seconds = payload.get("utc_offset_seconds") or 0
+        setattr(point, stamp_field, now)
+    ClimateGridPoint.objects.bulk_update(
+        points.values(), ["elevation", "timezone", "utc_offset_seconds", stamp_field], batch_size=500,
+    )
+
+
+def store_forecast(results):
+    """
+    Replaces the hourly forecast of the points in {point_id: forecast response}. Returns
+    the number of rows written.
+    """
+    rows = [
+        GridHourlyForecast(grid_point_id=point_id, time=time, **values)
+        for point_id, payload in results.items()
+        for time, values in hourly_values(payload)
+    ]
+    with transaction.atomic():
+        GridHourlyForecast.objects.filter(grid_point_id__in=list(results)).delete()
+        GridHourlyForecast.objects.bulk_create(rows, batch_size=1000)
+        _stamp(results, "forecast_fetched_at")
+    return len(rows)
+
+
+def store_archive(results):
+    """
+    Upserts the daily rows of {point_id: archive response}. Returns the number of rows written.
+    """
+    rows = [
+        GridDailyClimate(grid_point_id=point_id, date=day, **values)
+        for point_id, payload in results.items()
+        for day, values in daily_values(payload)
+    ]
+    with transaction.atomic():
+        GridDailyClimate.objects.bulk_create(
+            rows, batch_size=1000,
+            update_conflicts=True, unique_fields=["grid_point", "date"], update_fields=list(DAILY_VARIABLES.values()),
+        )
+        _stamp(results, "historical_fetched_at")
+    return len(rows)
+
+
+def trim_archive(keep_from):
+    """
+    Deletes the daily rows older than `keep_from`; returns how many.
+    """
+    return GridDailyClimate.objects.filter(date__lt=keep_from).delete()[0]
+
+
+def missing_ranges(point_ids, keep_from, end):
+    """
+    Groups the points by the first day missing from their daily series: the day after
+    their last complete row, or `keep_from` when they have none in the window. The archive
+    publishes the latest days with null values first, so those count as missing and are
+    fetched again. Returns {first_day: [point_ids]}, leaving out points already up to `end`.
+    """
+    last = dict(
+        GridDailyClimate.objects.filter(
+            grid_point_id__in=list(point_ids), date__gte=keep_from,
+            temperature_max__isnull=False, precipitation_sum__isnull=False,
+        )
+        .values("grid_point_id").annotate(last=Max("date")).order_by()
+        .values_list("grid_point_id", "last")
+    )
+    ranges = {}
+    for point_id in point_ids:
+        first = last[point_id] + timedelta(days=1) if point_id in last else keep_from
+        if first <= end:
+            ranges.setdefault(first, []).append(point_id)
+    return ranges
+
+
+# -------------------------------
+# Reading
+# -------------------------------
+def _document(point, block_name, variables, rows, format_time):
+    if not rows:
+        return None
+    fields = list(variables.values())
+    return {
+        "latitude": float(point.latitude),
+        "longitude": float(point.longitude),
+        "elevation": point.elevation,
+        "timezone": point.timezone,
+        "utc_offset_seconds": point.utc_offset_seconds,
+        f"{block_name}_units": {name: UNITS[name] for name in ("time", *variables)},
+        block_name: {
+            "time": [format_time(row[0]) for row in rows],
+            **{variable: [row[1 + fields.index(field)] for row in rows] for variable, field in variables.items()},
+        },
+    }
+
+
+def forecast_document(point):
+    """
+    The point's hourly forecast in the shape of an Open-Meteo response, or None.
+    """
+    offset = dt_timezone(timedelta(seconds=point.utc_offset_seconds))
+    rows = list(point.hourly.order_by("time").values_list("time", *HOURLY_VARIABLES.values()))
+    return _document(point, "hourly", HOURLY_VARIABLES, rows, lambda time: _from_db(time).astimezone(offset).strftime("%Y-%m-%dT%H:%M"))
+
+
+def archive_document(point, start=None, end=None):
+    """
+    The point's daily series between `start` and `end` (inclusive, both optional) in the
+    shape of an Open-Meteo archive response, or None when the window is empty.
+    """
+    rows = point.daily.order_by("date")
+    if start:
+        rows = rows.filter(date__gte=start)
+    if end:
+        rows = rows.filter(date__lte=end)
+    rows = list(rows.values_list("date", *DAILY_VARIABLES.values()))
+    return _document(point, "daily", DAILY_VARIABLES, rows, date.isoformat)
+
+
+def area_summary(level, start, end, within=None):
+    """
+    Daily climate of [start, end] aggregated per cell, sector or district, in one query:
+    the mean rainfall total of the area's cells and the mean daily extremes. `within` is
+    an optional (level, id) the areas must lie in, e.g. ("district", 3).
+    """
+    field = AREA_FIELDS[level]
+    rows = CellClimateData.objects.filter(grid_point__daily__date__range=(start, end))
+    if within:
+        rows = rows.filter(**{AREA_FIELDS[within[0]]: within[1]})
+    rows = (
+        rows.values(field)
+        .annotate(
+            cells=Count("cell", distinct=True),
+            days=Count("grid_point__daily__date", distinct=True),
+            precipitation=Sum("grid_point__daily__precipitation_sum"),
+            temperature_max=Avg("grid_point__daily__temperature_max"),
+            temperature_min=Avg("grid_point__daily__temperature_min"),
+        )
+        .order_by(field)
+    )
+
+    snapshot = hierarchy.current()
+    summary = []
+    for row in rows:
+        entry = snapshot.entry(f"{level}s", row[field])
+        summary.append({
+            "id": row[field],
+            "name": entry[0] if entry else None,
+            "cells": row["cells"],
+            "days": row["days"],
+            # Every cell contributes its grid point's rainfall once
+            "precipitation_mm": round((row["precipitation"] or 0) / row["cells"], 1),
+            "temperature_max_avg": None if row["temperature_max"] is None else round(row["temperature_max"], 1),
+            "temperature_min_avg": None if row["temperature_min"] is None else round(row["temperature_min"], 1),
+        })
+    return summary
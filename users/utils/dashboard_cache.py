@@ -0,0 +1,208 @@
+"""
+Per-scope cache of the RoleAwareDashboard payload.
+
+Every officer of the same district/sector/cell (and every super admin) shares one entry;
+citizens get one entry each. Entries are invalidated through generation tokens: a scope
+depends on a few named generations (its own geography, plus shared ones) and a write bumps
+the generations of the geography it touched, so only the affected dashboards are rebuilt.
+
+With DASHBOARD_CACHE_STALE_WHILE_REVALIDATE > 0, an outdated entry is still served for that
+many seconds while a background task rebuilds it.
+"""
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from users.models.addresses import Sector, Cell
+from report.models import GeoRollup
+
+logger = logging.getLogger(__name__)
+
+# Shared generations: catalog-level data (products) and the unscoped inventory/cell request
+# sections that citizens see
+GLOBAL = "global"
+CITIZENS = "citizens"
+
+
+def _timeout():
+    return getattr(settings, "DASHBOARD_CACHE_TIMEOUT", 300)
+
+
+def _stale_window():
+    return getattr(settings, "DASHBOARD_CACHE_STALE_WHILE_REVALIDATE", 0)
+
+
+def _data_key(key, variant=None):
+    return f"dashboard:data:{key}|{variant}" if variant else f"dashboard:data:{key}"
+
+
+def _generation_key(name):
+    return f"dashboard:gen:{name}"
+
+
+def _lock_key(key, variant=None):
+    return f"dashboard:lock:{key}|{variant}" if variant else f"dashboard:lock:{key}"
+
+
+def owner_key(owner_id):
+    return f"owner:{owner_id}"
+
+
+def scope_key(scope):
+    """
+    Returns the cache key of a dashboard scope dict (see RoleAwareDashboard._scope).
+    """
+    if scope["level"] == "super_admin":
+        return GeoRollup.key_for("national")
+    if scope["owner"]:
+        return owner_key(scope["owner"].pk)
+    if scope["cell"]:
+        return GeoRollup.key_for("cell", scope["cell"].pk)
+    if scope["sector"]:
+        return GeoRollup.key_for("sector", scope["sector"].pk)
+    if scope["district"]:
+        return GeoRollup.key_for("district", scope["district"].pk)
+    # Unassigned officers see an empty scope (see users/utils/scope.py)
+    return f"unassigned:{scope['level']}"
+
+
+def dependencies(scope):
+    """
+    Returns the generation names whose bump makes the scope's entry outdated.
+    """
+    key = scope_key(scope)
+    if scope["owner"]:
+        return [GLOBAL, CITIZENS, key]
+    if key.startswith("unassigned:"):
+        return [GLOBAL]
+    return [GLOBAL, key]
+
+
+def _current_tokens(names):
+    tokens = cache.get_many([_generation_key(name) for name in names])
+    missing = [name for name in names if _generation_key(name) not in tokens]
+    if missing:
+        now = time.time()
+        for name in missing:
+            cache.add(_generation_key(name), now, timeout=None)
+        tokens.update(cache.get_many([_generation_key(name) for name in missing]))
+    return {name: tokens.get(_generation_key(name)) for name in names}
+
+
+def _meta(status, generated_at):
+    return {
+        "status": status,
+        "age": max(int(time.time() - generated_at), 0),
+        "generated_at": generated_at,
+    }
+
+
+def store(scope, build, variant=None):
+    """
+    Builds the payload for `scope` and caches it. Tokens are read before building, so a
+    write that lands while the payload is being computed still marks it outdated.
+    `variant` separates payloads of the same scope (e.g. different ?sections=).
+    """
+    key = scope_key(scope)
+    tokens = _current_tokens(dependencies(scope))
+    payload = build(scope)
+    entry = {"payload": payload, "generated_at": time.time(), "tokens": tokens}
+    cache.set(_data_key(key, variant), entry, timeout=_timeout() + _stale_window())
+    cache.delete(_lock_key(key, variant))
+    return entry
+
+
+def fetch(scope, build, revalidate=None, variant=None):
+    """
+    Returns (payload, meta) for `scope`, where meta describes the cache entry used:
+    {"status": "hit" | "stale" | "miss", "age": seconds, "generated_at": epoch seconds}.
+
+    `build(scope)` computes the payload on a miss; `revalidate()` schedules a background
+    rebuild when a stale entry is served.
+    """
+    key = scope_key(scope)
+    entry = cache.get(_data_key(key, variant))
+
+    if entry is not None:
+        now = time.time()
+        tokens = _current_tokens(list(entry["tokens"]))
+        expires_at = entry["generated_at"] + _timeout()
+        changed = [t for name, t in tokens.items() if t != entry["tokens"][name]]
+
+        if not changed and now < expires_at:
+            return entry["payload"], _meta("hit", entry["generated_at"])
+
+        # Outdated since the earliest of expiry and the first invalidation after it was built
+        stale_since = min([expires_at] + [t for t in changed if t is not None])
+        if revalidate is not None and now - stale_since < _stale_window():
+            if cache.add(_lock_key(key, variant), True, timeout=_stale_window()):
+                try:
+                    revalidate()
+                except Exception:
+                    logger.exception("Failed to schedule dashboard refresh for %s", key)
+                    cache.delete(_lock_key(key, variant))
+            return entry["payload"], _meta("stale", entry["generated_at"])
+
+    entry = store(scope, build, variant)
+    return entry["payload"], _meta("miss", entry["generated_at"])
+
+
+# -------------------------------
+# Invalidation
+# -------------------------------
+def invalidate(*names):
+    now = time.time()
+    cache.set_many({_generation_key(name): now for name in names}, timeout=None)
+
+
+def invalidate_cells(cell_ids):
+    """
+    Outdates the dashboards of the given cells and of every sector/district above them.
+    """
+    cell_ids = {cid for cid in cell_ids if cid}
+    if not cell_ids:
+        return
+    names = {GeoRollup.key_for("national")}
+    for cell_id, sector_id, district_id in Cell.objects.filter(id__in=cell_ids).values_list(
+        "id", "sector_id", "sector__district_id"
+    ):
+        names.update({
+            GeoRollup.key_for("cell", cell_id),
+            GeoRollup.key_for("sector", sector_id),
+            GeoRollup.key_for("district", district_id),
+        })
+    invalidate(*names)
+
+
+def invalidate_district_areas(district_ids):
+    """
+    Outdates the dashboards of the given districts and of every sector and cell in them,
+    e.g. after a change to the user counts of the whole district.
+    """
+    district_ids = {did for did in district_ids if did}
+    if not district_ids:
+        return
+    names = {GeoRollup.key_for("national"), *(GeoRollup.key_for("district", did) for did in district_ids)}
+    names.update(
+        GeoRollup.key_for("sector", sector_id)
+        for sector_id in Sector.objects.filter(district_id__in=district_ids).values_list("id", flat=True)
+    )
+    names.update(
+        GeoRollup.key_for("cell", cell_id)
+        for cell_id in Cell.objects.filter(sector__district_id__in=district_ids).values_list("id", flat=True)
+    )
+    invalidate(*names)
+
+
+def invalidate_districts(district_ids):
+    district_ids = {did for did in district_ids if did}
+    if district_ids:
+        invalidate(GeoRollup.key_for("national"), *(GeoRollup.key_for("district", did) for did in district_ids))
+
+
+def invalidate_owners(owner_ids):
+    owner_ids = {oid for oid in owner_ids if oid}
+    if owner_ids:
+        invalidate(*(owner_key(oid) for oid in owner_ids))
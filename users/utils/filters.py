@@ -1,39 +1,21 @@
-def filter_by_role_and_location(qs, user):
+def filter_by_remaining(qs, params):
     """
-    Filters a queryset based on user role and location.
-    Works for both dashboard widgets and viewsets.
+    Applies the inventory stock query params to a queryset annotated with `remaining`
+    (see InventoryQuerySet.with_remaining):
+      - low_stock=<threshold>  keeps rows with remaining <= threshold
+      - ordering=remaining | -remaining
     """
+    from decimal import Decimal, InvalidOperation
+    from rest_framework.exceptions import ValidationError
 
-    if getattr(user, "is_super_admin", False):
-        return qs
+    threshold = params.get("low_stock")
+    if threshold not in (None, ""):
+        try:
+            qs = qs.filter(remaining__lte=Decimal(threshold))
+        except InvalidOperation:
+            raise ValidationError({"low_stock": "Must be a number."})
 
-    if hasattr(user, "managed_cell") and user.managed_cell:
-        # Detect if queryset is HarvestReport or LivestockProduction to filter correctly
-        model = qs.model
-        if model.__name__ == "HarvestReport":
-            return qs.filter(land__cell=user.managed_cell)
-        elif model.__name__ == "LivestockProduction":
-            return qs.filter(location__cell=user.managed_cell)
-        else:
-            return qs.filter(cell=user.managed_cell)
-
-    elif hasattr(user, "managed_sector") and user.managed_sector:
-        model = qs.model
-        if model.__name__ == "HarvestReport":
-            return qs.filter(land__sector=user.managed_sector)
-        elif model.__name__ == "LivestockProduction":
-            return qs.filter(location__sector=user.managed_sector)
-        else:
-            return qs.filter(sector=user.managed_sector)
-
-    elif hasattr(user, "managed_district") and user.managed_district:
-        model = qs.model
-        if model.__name__ == "HarvestReport":
-            return qs.filter(land__district=user.managed_district)
-        elif model.__name__ == "LivestockProduction":
-            return qs.filter(location__district=user.managed_district)
-        else:
-            return qs.filter(district=user.managed_district)
-
-    else:
-        return qs.filter(farmer=user)
+    ordering = params.get("ordering")
+    if ordering in ("remaining", "-remaining"):
+        qs = qs.order_by(ordering)
+    return qs
@@ -0,0 +1,241 @@
+"""
+Per-district offline bundles of the administrative map, for field devices that download
+the geography once and keep it.
+
+`manage.py export_geo_bundles` writes one gzipped bundle per district to the default
+storage (geo_bundles/district-<id>-<hash>.json.gz) with the district's sectors, cells and
+villages, their centroids and, where imported, their simplified boundaries. Coordinates
+are stored as integers and boundary rings as deltas between consecutive vertices, which
+compresses to a fraction of the GeoJSON:
+
+    {"format": 1, "district": {"id", "name", "province": {"id", "name"}},
+     "centroid_precision": 6, "boundary_precision": 5,
+     "sectors": [[id, name, district_id, lat, lon], ...], "cells": [...], "villages": [...],
+     "boundaries": [["cell" | "village", id, [[x0, y0, dx1, dy1, ...], ...] per polygon], ...]}
+
+A bundle's hash is the SHA-256 of its canonical JSON, so an unchanged district keeps its
+file and hash across exports. manifest.json lists the current hash of every district;
+devices ask /api/geo/bundles/?district=<id>&hash=<hash> whether theirs is current.
+
+Web processes cache the manifest for MANIFEST_TTL seconds, so they may still point at the
+bundles of the previous export for that long. A replaced bundle is therefore only listed
+as `retired` in the new manifest and deleted by the export after it.
+"""
+import gzip
+import hashlib
+import json
+import logging
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+from users.models.addresses import Boundary
+from users.utils import boundaries, hierarchy
+
+logger = logging.getLogger(__name__)
+
+FORMAT = 1
+DIRECTORY = "geo_bundles"
+MANIFEST_PATH = f"{DIRECTORY}/manifest.json"
+MANIFEST_KEY = "geo_bundles:manifest"
+# Seconds a process serves its cached manifest before reading the published one again
+MANIFEST_TTL = 60
+# 6 decimals (~0.1 m) for centroids, 5 (~1 m) for boundaries simplified to ~11 m
+CENTROID_PRECISION = 6
+BOUNDARY_PRECISION = 5
+
+
+# -------------------------------
+# Encoding
+# -------------------------------
+def _fixed(value, precision):
+    return None if value is None else round(value * 10 ** precision)
+
+
+def encode_ring(ring, precision=BOUNDARY_PRECISION):
+    """
+    Flattens [[lon, lat], ...] to [x0, y0, dx1, dy1, ...] in units of 10**-precision degrees.
+    """
+    flat, previous = [], (0, 0)
+    for lon, lat in ring:
+        point = (_fixed(lon, precision), _fixed(lat, precision))
+        flat += [point[0] - previous[0], point[1] - previous[1]]
+        previous = point
+    return flat
+
+
+def decode_ring(flat, precision=BOUNDARY_PRECISION):
+    ring, x, y = [], 0, 0
+    for i in range(0, len(flat), 2):
+        x, y = x + flat[i], y + flat[i + 1]
+        ring.append([x / 10 ** precision, y / 10 ** precision])
+    return ring
+
+
+def _places(snapshot, level, parent_ids):
+    parent = hierarchy.LEVELS[level][1]
+    return [
+        [row["id"], row["name"], row[f"{parent}_id"],
+         _fixed(row["latitude"], CENTROID_PRECISION), _fixed(row["longitude"], CENTROID_PRECISION)]
+        for row in snapshot.rows[level]
+        if row[f"{parent}_id"] in parent_ids
+    ]
+
+
+def build(snapshot, district_id, boundary_rows=(), tolerance=0):
+    """
+    Returns the bundle payload of one district. `boundary_rows` are the district's Boundary
+    values (level, cell_id, village_id, polygons); `tolerance` simplifies them further.
+    """
+    name, province_id = snapshot.entry("districts", district_id)[:2]
+    sectors = _places(snapshot, "sectors", {district_id})
+    cells = _places(snapshot, "cells", {row[0] for row in sectors})
+    villages = _places(snapshot, "villages", {row[0] for row in cells})
+
+    shapes = []
+    for row in boundary_rows:
+        polygons = [
+            [encode_ring(boundaries.simplify_ring(ring, tolerance) if tolerance else ring) for ring in polygon]
+            for polygon in row["polygons"]
+        ]
+        place_id = row["village_id"] if row["level"] == "village" else row["cell_id"]
+        shapes.append([row["level"], place_id, polygons])
+    shapes.sort(key=lambda shape: (shape[0], shape[1]))
+
+    return {
+        "format": FORMAT,
+        "district": {
+            "id": district_id,
+            "name": name,
+            "province": {"id": province_id, "name": snapshot.entry("provinces", province_id)[0]},
+        },
+        "centroid_precision": CENTROID_PRECISION,
+        "boundary_precision": BOUNDARY_PRECISION,
+        "sectors": sectors,
+        "cells": cells,
+        "villages": villages,
+        "boundaries": shapes,
+    }
+
+
+def encode(payload):
+    """
+    Returns (gzipped bytes, hash) of a payload. Both only depend on its content.
+    """
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode()
+    return gzip.compress(canonical, mtime=0), hashlib.sha256(canonical).hexdigest()
+
+
+# -------------------------------
+# Export
+# -------------------------------
+def _district_boundaries(snapshot, district_ids):
+    """
+    {district_id: [boundary values]} of the boundaries matched to a cell of the districts.
+    """
+    district_of = {}
+    for cell_id, (_, sector_id, _, _) in snapshot.index["cells"].items():
+        district_of[cell_id] = snapshot.entry("sectors", sector_id)[1]
+    grouped = {}
+    rows = Boundary.objects.filter(cell__isnull=False).values("level", "cell_id", "village_id", "polygons")
+    for row in rows.iterator(chunk_size=500):
+        district_id = district_of.get(row["cell_id"])
+        if district_id in district_ids:
+            grouped.setdefault(district_id, []).append(row)
+    return grouped
+
+
+def bundle_path(district_id, digest):
+    return f"{DIRECTORY}/district-{district_id}-{digest[:16]}.json.gz"
+
+
+def export(district_ids=None, tolerance=0, storage=None):
+    """
+    Writes the bundles of the given districts (every district by default) and the manifest.
+    Bundles whose hash did not change are left in place; the ones replaced or removed are
+    retired, and deleted by the next export. Returns counts: written, unchanged, removed,
+    deleted (retired files of the previous export), bytes (size of the bundles written).
+    """
+    storage = storage or default_storage
+    snapshot = hierarchy.current()
+    everything = district_ids is None
+    district_ids = set(snapshot.index["districts"]) if everything else set(district_ids)
+    unknown = district_ids - set(snapshot.index["districts"])
+    if unknown:
+        raise ValueError(f"Unknown district ids: {', '.join(map(str, sorted(unknown)))}")
+
+    previous = read_manifest(storage) or {"districts": {}}
+    entries = dict(previous["districts"])
+    retired = []
+    stats = {"written": 0, "unchanged": 0, "removed": 0, "deleted": 0, "bytes": 0}
+    shapes = _district_boundaries(snapshot, district_ids)
+
+    for district_id in sorted(district_ids):
+        data, digest = encode(build(snapshot, district_id, shapes.get(district_id, ()), tolerance))
+        path = bundle_path(district_id, digest)
+        old = entries.get(str(district_id))
+        if old and old["hash"] == digest and storage.exists(path):
+            stats["unchanged"] += 1
+            continue
+        if not storage.exists(path):
+            storage.save(path, ContentFile(data))
+        if old and old["path"] != path:
+            retired.append(old["path"])
+        entries[str(district_id)] = {
+            "name": snapshot.entry("districts", district_id)[0],
+            "hash": digest,
+            "path": path,
+            "size": len(data),
+        }
+        stats["written"] += 1
+        stats["bytes"] += len(data)
+
+    if everything:
+        # Districts no longer in the hierarchy
+        for key in [key for key in entries if int(key) not in district_ids]:
+            retired.append(entries.pop(key)["path"])
+            stats["removed"] += 1
+
+    manifest = {
+        "format": FORMAT,
+        "hierarchy_version": snapshot.version,
+        "districts": dict(sorted(entries.items(), key=lambda item: int(item[0]))),
+        "retired": sorted(retired),
+    }
+    if storage.exists(MANIFEST_PATH):
+        storage.delete(MANIFEST_PATH)
+    storage.save(MANIFEST_PATH, ContentFile(json.dumps(manifest, indent=1).encode()))
+    cache.set(MANIFEST_KEY, manifest, timeout=MANIFEST_TTL)
+
+    # Retired by the previous export: no manifest a process may still serve lists them
+    current = {entry["path"] for entry in entries.values()} | set(retired)
+    for path in previous.get("retired", ()):
+        if path not in current and storage.exists(path):
+            storage.delete(path)
+            stats["deleted"] += 1
+    logger.info("Exported geo bundles: %s", stats)
+    return stats
+
+
+# -------------------------------
+# Manifest
+# -------------------------------
+def read_manifest(storage=None):
+    storage = storage or default_storage
+    if not storage.exists(MANIFEST_PATH):
+        return None
+    with storage.open(MANIFEST_PATH) as fh:
+        return json.load(fh)
+
+
+def manifest():
+    """
+    The current manifest, cached for MANIFEST_TTL seconds, or None when nothing was exported.
+    """
+    value = cache.get(MANIFEST_KEY)
+    if value is None:
+        value = read_manifest()
+        if value is not None:
+            cache.set(MANIFEST_KEY, value, timeout=MANIFEST_TTL)
+    return value
@@ -0,0 +1,213 @@
+"""
+Bulk import of province/district/sector/cell/village centroids from geoBoundaries CSVs.
+
+Rows (X, Y, shapeName, shapeType) are matched to the hierarchy by name in memory. Names
+repeat (hundreds of villages are called "Kabeza"), so a name with several candidates is
+resolved to the candidate whose parent centroid is nearest, with the distances of every
+(row, candidate) pair computed in one vectorized haversine. Levels are processed from
+provinces down, so freshly imported parents disambiguate their children. An optional
+`parents` column ("Sector/District", nearest first) pins a row to one candidate; such rows
+win over name-only rows for the same target (see geo_corrections.csv).
+
+Results are written with bulk_update in batches; with dry_run nothing is written and only
+the report is produced.
+"""
+import csv
+import logging
+from collections import Counter
+from dataclasses import dataclass, field
+from decimal import Decimal
+
+import numpy as np
+from django.db import transaction
+
+from users.utils import hierarchy
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_KM = 6371.0088
+SHAPE_LEVELS = {"ADM1": "provinces", "ADM2": "districts", "ADM3": "sectors", "ADM4": "cells", "ADM5": "villages"}
+LEVEL_ORDER = list(hierarchy.LEVELS)
+
+# Row outcomes
+MATCHED = "matched"            # the only candidate with that name
+RESOLVED = "resolved"          # nearest of several candidates
+AMBIGUOUS = "ambiguous"        # several candidates and no clear nearest one
+UNMATCHED = "unmatched"        # no candidate with that name (and parents)
+DUPLICATE = "duplicate"        # another row claimed the same target
+OUTCOMES = (MATCHED, RESOLVED, AMBIGUOUS, UNMATCHED, DUPLICATE)
+
+
+@dataclass
+class LevelReport:
+    level: str
+    rows: int = 0
+    outcomes: Counter = field(default_factory=Counter)
+    updated: int = 0
+    unchanged: int = 0
+    problems: list = field(default_factory=list)
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """
+    Element-wise great-circle distance in km between arrays of points in degrees.
+    """
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(a, dtype=float)) for a in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def read_rows(paths):
+    """
+    Returns {level: [(name, lat, lon, parents), ...]} from geoBoundaries CSV files.
+    """
+    rows = {}
+    for path in paths:
+        with open(path, newline="", encoding="utf-8") as fh:
+            for row in csv.DictReader(fh):
+                level = SHAPE_LEVELS.get((row.get("shapeType") or "").strip())
+                if level is None:
+                    raise ValueError(f"{path}: unknown shapeType {row.get('shapeType')!r}")
+                parents = tuple(p.strip().lower() for p in (row.get("parents") or "").split("/") if p.strip())
+                rows.setdefault(level, []).append(
+                    (row["shapeName"].strip(), float(row["Y"]), float(row["X"]), parents)
+                )
+    return rows
+
+
+class _Level:
+    """
+    The rows of one hierarchy level as arrays, with their parent's current centroid.
+    """
+
+    def __init__(self, snapshot, level, coordinates):
+        position = LEVEL_ORDER.index(level)
+        parent_level = LEVEL_ORDER[position - 1] if position else None
+        rows = snapshot.rows[level]
+        self.level = level
+        self.ids = np.array([row["id"] for row in rows], dtype=np.int64)
+        self.current = [(row["latitude"], row["longitude"]) for row in rows]
+        self.by_name = {}
+        for index, row in enumerate(rows):
+            self.by_name.setdefault(row["name"].strip().lower(), []).append(index)
+
+        parent_ids = [row[f"{parent_level[:-1]}_id"] for row in rows] if parent_level else [None] * len(rows)
+        parent_coordinates = coordinates.get(parent_level, {})
+        self.parent_lat = np.array([parent_coordinates.get(pid, (np.nan, np.nan))[0] for pid in parent_ids], dtype=float)
+        self.parent_lon = np.array([parent_coordinates.get(pid, (np.nan, np.nan))[1] for pid in parent_ids], dtype=float)
+        # Ancestor names, nearest first, for rows pinned with `parents`
+        self.ancestors = [
+            tuple(entry["name"].strip().lower() for entry in list(snapshot.lineage(level, row["id"]).values())[1:])
+            for row in rows
+        ]
+
+
+def match_level(level_rows, table, margin_km=0.5):
+    """
+    Matches CSV rows to the indices of `table` rows. Returns (targets, outcomes, distances)
+    arrays aligned with `level_rows`; targets is -1 where nothing was assigned.
+    """
+    count = len(level_rows)
+    lat = np.array([row[1] for row in level_rows], dtype=float)
+    lon = np.array([row[2] for row in level_rows], dtype=float)
+    pinned = np.array([bool(row[3]) for row in level_rows])
+
+    pair_row, pair_candidate = [], []
+    for i, (name, _, _, parents) in enumerate(level_rows):
+        for candidate in table.by_name.get(name.lower(), ()):
+            if parents and table.ancestors[candidate][:len(parents)] != parents:
+                continue
+            pair_row.append(i)
+            pair_candidate.append(candidate)
+    pair_row = np.array(pair_row, dtype=np.int64)
+    pair_candidate = np.array(pair_candidate, dtype=np.int64)
+
+    targets = np.full(count, -1, dtype=np.int64)
+    distances = np.full(count, np.inf)
+    outcomes = np.array([UNMATCHED] * count, dtype=object)
+    if not len(pair_row):
+        return targets, outcomes, distances
+
+    # Distance of every (row, candidate) pair to the candidate's parent centroid
+    pair_distance = haversine_km(lat[pair_row], lon[pair_row], table.parent_lat[pair_candidate], table.parent_lon[pair_candidate])
+    pair_distance = np.where(np.isnan(pair_distance), np.inf, pair_distance)
+
+    order = np.lexsort((pair_distance, pair_row))
+    pair_row, pair_candidate, pair_distance = pair_row[order], pair_candidate[order], pair_distance[order]
+    starts = np.flatnonzero(np.r_[True, pair_row[1:] != pair_row[:-1]])
+    sizes = np.diff(np.r_[starts, len(pair_row)])
+    rows_with_pairs = pair_row[starts]
+    best = pair_distance[starts]
+    second = np.where(sizes > 1, pair_distance[np.minimum(starts + 1, len(pair_row) - 1)], np.inf)
+
+    single = sizes == 1
+    with np.errstate(invalid="ignore"):  # inf - inf where no candidate's parent has coordinates
+        clear = ~single & np.isfinite(best) & (second - best >= margin_km)
+    targets[rows_with_pairs[single | clear]] = pair_candidate[starts[single | clear]]
+    distances[rows_with_pairs] = best
+    outcomes[rows_with_pairs[single]] = MATCHED
+    outcomes[rows_with_pairs[clear]] = RESOLVED
+    outcomes[rows_with_pairs[~single & ~clear]] = AMBIGUOUS
+
+    # One row per target: pinned rows first, then the nearest
+    assigned = np.flatnonzero(targets >= 0)
+    claim_order = assigned[np.lexsort((distances[assigned], ~pinned[assigned], targets[assigned]))]
+    first_claim = np.r_[True, targets[claim_order][1:] != targets[claim_order][:-1]]
+    losers = claim_order[~first_claim]
+    outcomes[losers] = DUPLICATE
+    targets[losers] = -1
+    return targets, outcomes, distances
+
+
+def _decimal(value):
+    return Decimal(f"{value:.6f}")
+
+
+def run(paths, *, dry_run=False, only_missing=False, margin_km=0.5, batch_size=250):
+    """
+    Imports the CSV files and returns {level: LevelReport}, coarsest level first.
+    """
+    rows = read_rows(paths)
+    snapshot = hierarchy.current()
+    # Centroids as they will be after the import, for disambiguating the next level
+    coordinates = {
+        level: {row["id"]: (row["latitude"], row["longitude"]) for row in snapshot.rows[level] if row["latitude"] is not None}
+        for level in LEVEL_ORDER
+    }
+
+    reports, updates = {}, {}
+    for level in LEVEL_ORDER:
+        level_rows = rows.get(level, [])
+        if not level_rows:
+            continue
+        table = _Level(snapshot, level, coordinates)
+        targets, outcomes, distances = match_level(level_rows, table, margin_km=margin_km)
+
+        report = LevelReport(level=level, rows=len(level_rows), outcomes=Counter(outcomes.tolist()))
+        model = hierarchy.LEVELS[level][0]
+        changed = []
+        for i, target in enumerate(targets.tolist()):
+            name, lat, lon, _ = level_rows[i]
+            if target < 0:
+                candidates = len(table.by_name.get(name.lower(), ()))
+                report.problems.append((level, name, outcomes[i], candidates, lat, lon))
+                continue
+            current = table.current[target]
+            new = (float(_decimal(lat)), float(_decimal(lon)))
+            if current == new or (only_missing and current[0] is not None):
+                report.unchanged += 1
+                continue
+            coordinates[level][int(table.ids[target])] = new
+            changed.append(model(pk=int(table.ids[target]), latitude=_decimal(lat), longitude=_decimal(lon)))
+        report.updated = len(changed)
+        updates[model] = changed
+        reports[level] = report
+
+    if not dry_run and any(updates.values()):
+        with transaction.atomic():
+            for model, objects in updates.items():
+                model.objects.bulk_update(objects, ["latitude", "longitude"], batch_size=batch_size)
+            # bulk_update sends no signals: invalidate the hierarchy snapshot explicitly
+            transaction.on_commit(hierarchy.bump)
+        logger.info("Imported coordinates: %s", {level: r.updated for level, r in reports.items()})
+    return reports
@@ -0,0 +1,144 @@
+"""
+Nearest-point lookups over the administrative centroids.
+
+GridIndex buckets points into a uniform grid of square tiles (in degrees, with longitudes
+scaled by cos(latitude) so tiles are roughly square on the ground) and searches outward
+ring by ring from the query's tile. Over Rwanda's ~17,000 cell and village centroids a
+lookup inspects a handful of tiles.
+
+The index of the current hierarchy lives on the hierarchy snapshot (Snapshot.cell_index),
+so it is rebuilt whenever a centroid changes:
+
+    match = geo_index.nearest_cell(-1.944, 30.061)
+    if match:
+        cell_id, distance_m = match
+"""
+import math
+
+from django.conf import settings
+
+from users.utils import hierarchy
+
+EARTH_RADIUS_M = 6_371_008.8
+# Ground length of one degree of latitude (and of one projected unit)
+METRES_PER_DEGREE = math.pi * EARTH_RADIUS_M / 180
+# About 2.2 km: a couple of cells per tile
+DEFAULT_TILE_DEGREES = 0.02
+
+
+def haversine_m(lat1, lon1, lat2, lon2):
+    """
+    Great-circle distance in metres between two points given in degrees.
+    """
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
+
+
+def valid_point(lat, lon):
+    """
+    Whether (lat, lon) are finite degrees within [-90, 90] and [-180, 180].
+    """
+    return math.isfinite(lat) and math.isfinite(lon) and -90 <= lat <= 90 and -180 <= lon <= 180
+
+
+class GridIndex:
+    """
+    Uniform-grid index over (latitude, longitude, payload) points; points without
+    coordinates are skipped. Immutable once built.
+    """
+
+    def __init__(self, points, tile_degrees=DEFAULT_TILE_DEGREES):
+        points = [(lat, lon, payload) for lat, lon, payload in points if lat is not None and lon is not None]
+        self.tile = tile_degrees
+        self.size = len(points)
+        # Longitudes are scaled at the mean latitude of the points
+        mean_lat = sum(lat for lat, _, _ in points) / len(points) if points else 0.0
+        self.lon_scale = math.cos(math.radians(mean_lat))
+
+        tiles = {}
+        for lat, lon, payload in points:
+            x, y = self._project(lat, lon)
+            tiles.setdefault(self._tile_of(x, y), []).append((x, y, lat, lon, payload))
+        self.tiles = {key: tuple(bucket) for key, bucket in tiles.items()}
+        if tiles:
+            columns = [i for i, _ in tiles]
+            rows = [j for _, j in tiles]
+            self.bounds = (min(columns), max(columns), min(rows), max(rows))
+
+    def __len__(self):
+        return self.size
+
+    def _project(self, lat, lon):
+        return lon * self.lon_scale, lat
+
+    def _tile_of(self, x, y):
+        return math.floor(x / self.tile), math.floor(y / self.tile)
+
+    def _ring(self, ci, cj, radius):
+        if radius == 0:
+            yield ci, cj
+            return
+        for i in range(ci - radius, ci + radius + 1):
+            yield i, cj - radius
+            yield i, cj + radius
+        for j in range(cj - radius + 1, cj + radius):
+            yield ci - radius, j
+            yield ci + radius, j
+
+    def _min_radius(self, ci, cj):
+        # Rings closer than this hold no tile of the index
+        min_i, max_i, min_j, max_j = self.bounds
+        return max(0, min_i - ci, ci - max_i, min_j - cj, cj - max_j)
+
+    def _max_radius(self, ci, cj):
+        min_i, max_i, min_j, max_j = self.bounds
+        return max(abs(ci - min_i), abs(ci - max_i), abs(cj - min_j), abs(cj - max_j))
+
+    def nearest(self, lat, lon, max_distance_m=None):
+        """
+        Returns (payload, distance in metres) of the point nearest to (lat, lon), or None
+        when the index is empty or nothing lies within `max_distance_m`. The search stops
+        at the rings beyond `max_distance_m`, so far-away queries cost a few tiles.
+        """
+        if not self.tiles or not (math.isfinite(lat) and math.isfinite(lon)):
+            return None
+        x, y = self._project(lat, lon)
+        ci, cj = self._tile_of(x, y)
+
+        best, best_d2 = None, math.inf
+        for radius in range(self._min_radius(ci, cj), self._max_radius(ci, cj) + 1):
+            # Every point in this ring or beyond is at least (radius - 1) tiles away
+            if best is not None and (radius - 1) * self.tile > math.sqrt(best_d2):
+                break
+            if max_distance_m is not None and (radius - 1) * self.tile * METRES_PER_DEGREE > max_distance_m:
+                break
+            for key in self._ring(ci, cj, radius):
+                for px, py, plat, plon, payload in self.tiles.get(key, ()):
+                    d2 = (px - x) ** 2 + (py - y) ** 2
+                    if d2 < best_d2:
+                        best, best_d2 = (plat, plon, payload), d2
+
+        if best is None:
+            return None
+        distance = haversine_m(lat, lon, best[0], best[1])
+        if max_distance_m is not None and distance > max_distance_m:
+            return None
+        return best[2], distance
+
+
+def _max_distance():
+    return getattr(settings, "CELL_LOOKUP_MAX_DISTANCE_M", 10_000)
+
+
+def nearest_cell(lat, lon, max_distance_m=None):
+    """
+    Returns (cell_id, distance in metres) of the cell whose centroid, or one of whose
+    village centroids, is nearest to (lat, lon); None when none is within
+    `max_distance_m` (settings.CELL_LOOKUP_MAX_DISTANCE_M by default).
+    """
+    if max_distance_m is None:
+        max_distance_m = _max_distance()
+    return hierarchy.current().cell_index.nearest(lat, lon, max_distance_m=max_distance_m)
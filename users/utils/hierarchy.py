@@ -0,0 +1,211 @@
+"""
+Process-wide snapshot of the administrative hierarchy (provinces down to villages).
+
+The hierarchy changes a few times a year, so the ajax dropdown endpoints are served from
+an immutable in-memory snapshot instead of the database. The snapshot is loaded lazily and
+versioned by a counter in the shared cache: any write to a Province/District/Sector/Cell/
+Village bumps the counter (users/signals/hierarchy.py), and every process reloads its
+snapshot the next time it notices a newer version. That needs a cache shared by every
+process (see settings.CACHES); with a process-local one, a bump made by a management
+command never reaches the web workers (is_shared()).
+
+The snapshot also carries the centroids, and the nearest-cell index built from them
+(users/utils/geo_index.py), so coordinate edits invalidate both together.
+"""
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from functools import cached_property
+from types import MappingProxyType
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+
+from users.models.addresses import Province, District, Sector, Cell, Village
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = "hierarchy:version"
+# Cache backends whose entries other processes cannot see
+LOCAL_CACHE_BACKENDS = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+# level -> (model, parent level or None)
+LEVELS = {
+    "provinces": (Province, None),
+    "districts": (District, "province"),
+    "sectors": (Sector, "district"),
+    "cells": (Cell, "sector"),
+    "villages": (Village, "cell"),
+}
+MODEL_LEVELS = {model: level for level, (model, _) in LEVELS.items()}
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """
+    One immutable load of the hierarchy. `rows[level]` holds every row of the level as
+    {"id", "name", "<parent>_id", "latitude", "longitude"} dicts ordered by id;
+    `children[level][parent_id]` the {"id", "name"} rows under one parent.
+    """
+    version: int
+    rows: MappingProxyType
+    children: MappingProxyType
+    index: MappingProxyType
+
+    def children_of(self, level, parent_id):
+        return self.children[level].get(parent_id, ())
+
+    def entry(self, level, pk):
+        """
+        Returns (name, parent_id, latitude, longitude) of one row, or None when it is not
+        in the snapshot (see identity()).
+        """
+        return self.index[level].get(pk)
+
+    def lineage(self, level, pk):
+        """
+        Returns {"province": {"id", "name"}, ..., level: {...}} for a row and its ancestors.
+        """
+        levels = list(LEVELS)
+        position = levels.index(level)
+        result = {}
+        while pk is not None and position >= 0:
+            entry = self.entry(levels[position], pk)
+            if entry is None:
+                break
+            result[levels[position][:-1]] = {"id": pk, "name": entry[0]}
+            pk = entry[1]
+            position -= 1
+        return result
+
+    def as_dict(self):
+        return {"version": self.version, **{level: [dict(row) for row in rows] for level, rows in self.rows.items()}}
+
+    @cached_property
+    def bundle(self):
+        """
+        as_dict() encoded once per snapshot, for the bulk /ajax/hierarchy/ download.
+        """
+        return json.dumps(self.as_dict(), cls=DjangoJSONEncoder).encode()
+
+    @cached_property
+    def cell_index(self):
+        """
+        Nearest-cell index over the cell and village centroids; villages resolve to their cell.
+        """
+        from users.utils.geo_index import GridIndex
+
+        points = [(row["latitude"], row["longitude"], row["id"]) for row in self.rows["cells"]]
+        points += [(row["latitude"], row["longitude"], row["cell_id"]) for row in self.rows["villages"]]
+        return GridIndex(points)
+
+
+_lock = threading.Lock()
+_snapshot = None
+
+
+def version():
+    """
+    Returns the current hierarchy version, starting the counter when it is missing. The
+    counter starts from the clock so a flushed cache never reuses an old version.
+    """
+    value = cache.get(VERSION_KEY)
+    if value is None:
+        cache.add(VERSION_KEY, int(time.time()), timeout=None)
+        value = cache.get(VERSION_KEY)
+    return value
+
+
+def bump():
+    """
+    Marks every loaded snapshot as outdated.
+    """
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.add(VERSION_KEY, int(time.time()), timeout=None)
+
+
+def is_shared():
+    """
+    Whether bump() reaches the other processes, i.e. the default cache is not process-local.
+    """
+    return settings.CACHES["default"]["BACKEND"] not in LOCAL_CACHE_BACKENDS
+
+
+def _coordinate(value):
+    return None if value is None else float(value)
+
+
+def identity(level, instance):
+    """
+    The (name, parent_id, latitude, longitude) of a model instance, as stored in Snapshot.index.
+    """
+    parent = LEVELS[level][1]
+    return (
+        instance.name,
+        getattr(instance, f"{parent}_id") if parent else None,
+        _coordinate(instance.latitude),
+        _coordinate(instance.longitude),
+    )
+
+
+def load(at_version):
+    rows, children, index = {}, {}, {}
+    for level, (model, parent) in LEVELS.items():
+        fields = ["id", "name"] + ([f"{parent}_id"] if parent else []) + ["latitude", "longitude"]
+        level_rows = tuple(
+            MappingProxyType({
+                **row, "latitude": _coordinate(row["latitude"]), "longitude": _coordinate(row["longitude"]),
+            })
+            for row in model.objects.order_by("id").values(*fields)
+        )
+        grouped, entries = {}, {}
+        for row in level_rows:
+            parent_id = row[f"{parent}_id"] if parent else None
+            grouped.setdefault(parent_id, []).append(MappingProxyType({"id": row["id"], "name": row["name"]}))
+            entries[row["id"]] = (row["name"], parent_id, row["latitude"], row["longitude"])
+        rows[level] = level_rows
+        children[level] = MappingProxyType({key: tuple(value) for key, value in grouped.items()})
+        index[level] = MappingProxyType(entries)
+    logger.info("Loaded administrative hierarchy v%s (%s villages)", at_version, len(rows["villages"]))
+    return Snapshot(
+        version=at_version,
+        rows=MappingProxyType(rows),
+        children=MappingProxyType(children),
+        index=MappingProxyType(index),
+    )
+
+
+def current():
+    """
+    Returns the up-to-date snapshot, reloading it when the version counter moved.
+    """
+    global _snapshot
+    at_version = version()
+    snapshot = _snapshot
+    if snapshot is not None and snapshot.version == at_version:
+        return snapshot
+    with _lock:
+        if _snapshot is None or _snapshot.version != at_version:
+            _snapshot = load(at_version)
+        return _snapshot
+
+
+def loaded():
+    """
+    Returns the snapshot held by this process without checking the version, or None.
+    """
+    return _snapshot
+
+
+def reset():
+    global _snapshot
+    with _lock:
+        _snapshot = None
@@ -0,0 +1,72 @@
+"""
+Keyset (seek) pagination over a fixed descending ordering.
+
+Instead of OFFSET, each page filters on the last row of the previous one:
+(a, b) < (last_a, last_b), so with an index on the ordering columns every page costs
+the same as the first.
+"""
+import base64
+import json
+from datetime import datetime
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+
+
+def encode_cursor(values):
+    raw = json.dumps([v.isoformat() if isinstance(v, datetime) else str(v) for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """
+    Returns the list of strings encoded by encode_cursor(); anything else is a 400.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except (ValueError, UnicodeDecodeError):
+        raise ValidationError({"cursor": "Invalid cursor."})
+    if not isinstance(values, list) or not all(isinstance(value, str) for value in values):
+        raise ValidationError({"cursor": "Invalid cursor."})
+    return values
+
+
+def _after(fields, values):
+    """
+    Q for rows strictly after `values` in descending (fields) order:
+    f1 < v1 OR (f1 = v1 AND f2 < v2) OR ...
+    """
+    q = Q()
+    for i, field in enumerate(fields):
+        step = Q(**{f"{field}__lt": values[i]})
+        for prev_field, prev_value in zip(fields[:i], values[:i]):
+            step &= Q(**{prev_field: prev_value})
+        q |= step
+    return q
+
+
+def keyset_page(qs, fields, *, cursor=None, limit=20):
+    """
+    Returns (rows, next_cursor) for `qs` ordered by `fields` descending.
+    `qs` may be a values() queryset; every field in `fields` must be selected.
+    next_cursor is None on the last page.
+    """
+    if cursor:
+        values = decode_cursor(cursor)
+        if len(values) != len(fields):
+            raise ValidationError({"cursor": "Invalid cursor."})
+        try:
+            values = [qs.model._meta.get_field(f).to_python(v) for f, v in zip(fields, values)]
+        except DjangoValidationError:
+            raise ValidationError({"cursor": "Invalid cursor."})
+        qs = qs.filter(_after(fields, values))
+
+    rows = list(qs.order_by(*(f"-{field}" for field in fields))[:limit + 1])
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    get = last.get if isinstance(last, dict) else lambda f: getattr(last, f)
+    return rows, encode_cursor([get(field) for field in fields])
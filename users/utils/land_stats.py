@@ -0,0 +1,134 @@
+"""
+Maintenance of the CellLandStats rows behind the cell quota math.
+
+Every Land write moves its land count and hectares between the stats of the cells it
+leaves and enters, with F() updates inside the writing transaction. A cell without a row
+is computed exactly the first time it is touched or read, and `reconcile` rebuilds every
+row nightly to absorb any drift (bulk updates and deletes send no signals).
+
+    allocation = land_stats.allocation(cell, product)
+    allocation.hectares, allocation.planned, allocation.recommended
+"""
+import logging
+from dataclasses import dataclass
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import Greatest
+
+from users.models.products import RecommendedQuantity
+from report.models import Land, CellLandStats
+
+logger = logging.getLogger(__name__)
+
+ZERO = Decimal("0.00")
+
+
+# -------------------------------
+# Exact computation
+# -------------------------------
+def compute(cell_ids=None):
+    """
+    Returns {cell_id: (lands, hectares)} of the given cells (every cell with land by default).
+    """
+    lands = Land.objects.all() if cell_ids is None else Land.objects.filter(cell_id__in=cell_ids)
+    rows = lands.values("cell_id").annotate(lands=Count("id"), hectares=Sum("size_hectares")).order_by()
+    return {row["cell_id"]: (row["lands"], row["hectares"] or ZERO) for row in rows}
+
+
+def refresh_cell(cell_id):
+    lands, hectares = compute([cell_id]).get(cell_id, (0, ZERO))
+    stats, _ = CellLandStats.objects.update_or_create(cell_id=cell_id, defaults={"lands": lands, "hectares": hectares})
+    return stats
+
+
+def reconcile():
+    """
+    Rebuilds every row; returns the number of rows that had drifted.
+    """
+    exact = compute()
+    current = {stats.cell_id: stats for stats in CellLandStats.objects.all()}
+    changed, created = [], []
+    for cell_id, (lands, hectares) in exact.items():
+        stats = current.pop(cell_id, None)
+        if stats is None:
+            created.append(CellLandStats(cell_id=cell_id, lands=lands, hectares=hectares))
+        elif (stats.lands, stats.hectares) != (lands, hectares):
+            stats.lands, stats.hectares = lands, hectares
+            changed.append(stats)
+    # Rows left over belong to cells whose last land is gone
+    emptied = [stats for stats in current.values() if stats.lands or stats.hectares]
+    for stats in emptied:
+        stats.lands, stats.hectares = 0, ZERO
+    with transaction.atomic():
+        CellLandStats.objects.bulk_create(created, batch_size=1000)
+        CellLandStats.objects.bulk_update(changed + emptied, ["lands", "hectares"], batch_size=1000)
+    drifted = len(created) + len(changed) + len(emptied)
+    logger.info("Reconciled cell land stats: %s row(s) corrected", drifted)
+    return drifted
+
+
+# -------------------------------
+# Incremental maintenance
+# -------------------------------
+def _apply(cell_id, lands, hectares):
+    updated = CellLandStats.objects.filter(cell_id=cell_id).update(
+        lands=Greatest(F("lands") + lands, 0),
+        hectares=Greatest(F("hectares") + hectares, ZERO),
+    )
+    if not updated:
+        # First write seen for the cell: compute it exactly (this write included)
+        refresh_cell(cell_id)
+
+
+def record_land_change(before, after):
+    """
+    Applies a Land write to the stats. `before` and `after` are (cell_id, size_hectares) of
+    the row before and after the write, None when it did not exist. Call after the write,
+    in the same transaction.
+    """
+    if before == after:
+        return
+    if before and after and before[0] == after[0]:
+        _apply(after[0], 0, (after[1] or ZERO) - (before[1] or ZERO))
+        return
+    if before:
+        _apply(before[0], -1, -(before[1] or ZERO))
+    if after:
+        _apply(after[0], 1, after[1] or ZERO)
+
+
+# -------------------------------
+# Reading
+# -------------------------------
+def stats_for(cell_id):
+    stats = CellLandStats.objects.filter(cell_id=cell_id).first()
+    return stats if stats is not None else refresh_cell(cell_id)
+
+
+@dataclass(frozen=True)
+class Allocation:
+    """
+    What a cell may receive of a product: its registered hectares, whether the product is
+    the cell's planned crop, and the recommended quantity per hectare (None when the
+    product has no recommendation).
+    """
+    hectares: Decimal
+    planned: bool
+    per_hectare: Decimal = None
+
+    @property
+    def recommended(self):
+        if self.per_hectare is None:
+            return ZERO
+        return Decimal(self.hectares) * self.per_hectare
+
+
+def allocation(cell, product):
+    recommended = RecommendedQuantity.objects.filter(product=product, crop_name=product.name).first()
+    return Allocation(
+        hectares=stats_for(cell.pk).hectares,
+        planned=cell.planned_crop_id is not None and cell.planned_crop_id == product.pk,
+        per_hectare=recommended.quantity_per_hectare if recommended else None,
+    )
@@ -0,0 +1,142 @@
+"""
+Web-Mercator grid keys for the map clusters.
+
+Every Land, LivestockLocation and FarmerIssue with coordinates stores the quadkey of the
+level-18 tile it lies in (`grid_key`, ~150 m tiles; stamped by report/signals/map_grid.py).
+Each character picks one quadrant of the parent tile, so the tile of any coarser level is
+a prefix of the key:
+
+    quadkey(-1.944, 30.061)    -> "300101030330000223"
+    level 10 tile of the point -> "3001010303", i.e. grid_key >= "3001010303" and < "30010103034"
+
+A viewport is covered by a handful of tiles at the map zoom (index range scans on
+grid_key), and the rows inside are grouped by the key prefix a few levels deeper, which
+gives clusters about 32 px wide on screen.
+"""
+import math
+
+from django.db.models import Avg, Count, Q
+from django.db.models.functions import Substr
+
+GRID_LEVEL = 18
+# Clusters are this many levels below the zoom: 256 px tiles / 2**3 = 32 px clusters
+CLUSTER_DETAIL = 3
+MAX_COVER_TILES = 64
+MAX_LATITUDE = 85.05112878
+# Sorts right after "3": the exclusive upper bound of a tile's keys
+RANGE_END = "4"
+
+
+def grid_key(lat, lon):
+    """
+    Level-GRID_LEVEL quadkey of a point, or "" when a coordinate is missing.
+    """
+    if lat is None or lon is None:
+        return ""
+    return quadkey(float(lat), float(lon))
+
+
+def tile_of(lat, lon, level):
+    lat = max(-MAX_LATITUDE, min(MAX_LATITUDE, lat))
+    size = 1 << level
+    x = (lon + 180.0) / 360.0
+    sin_lat = math.sin(math.radians(lat))
+    y = 0.5 - math.log((1 + sin_lat) / (1 - sin_lat)) / (4 * math.pi)
+    return min(size - 1, max(0, int(x * size))), min(size - 1, max(0, int(y * size)))
+
+
+def tile_key(x, y, level):
+    digits = []
+    for bit in range(level - 1, -1, -1):
+        mask = 1 << bit
+        digits.append(str((1 if x & mask else 0) + (2 if y & mask else 0)))
+    return "".join(digits)
+
+
+def quadkey(lat, lon, level=GRID_LEVEL):
+    return tile_key(*tile_of(lat, lon, level), level)
+
+
+def tile_bounds(key):
+    """
+    (min_lon, min_lat, max_lon, max_lat) of a quadkey's tile.
+    """
+    x = y = 0
+    for digit in key:
+        x, y = x * 2 + (int(digit) & 1), y * 2 + (int(digit) >> 1)
+    size = 1 << len(key)
+
+    def lat_of(row):
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * row / size))))
+
+    return x / size * 360.0 - 180.0, lat_of(y + 1), (x + 1) / size * 360.0 - 180.0, lat_of(y)
+
+
+def parse_bbox(text):
+    """
+    Parses "min_lon,min_lat,max_lon,max_lat"; raises ValueError when malformed.
+    """
+    parts = [float(part) for part in (text or "").split(",")]
+    if len(parts) != 4:
+        raise ValueError("bbox must be min_lon,min_lat,max_lon,max_lat.")
+    min_lon, min_lat, max_lon, max_lat = parts
+    if not (-180 <= min_lon < max_lon <= 180 and -90 <= min_lat < max_lat <= 90):
+        raise ValueError("bbox corners are out of range or inverted.")
+    return min_lon, min_lat, max_lon, max_lat
+
+
+def cover(bbox, level):
+    """
+    Returns the quadkeys of the tiles covering `bbox`, at `level` or at the deepest
+    coarser level needing at most MAX_COVER_TILES tiles.
+    """
+    min_lon, min_lat, max_lon, max_lat = bbox
+    level = max(0, min(level, GRID_LEVEL))
+    while True:
+        x0, y0 = tile_of(max_lat, min_lon, level)
+        x1, y1 = tile_of(min_lat, max_lon, level)
+        if level == 0 or (x1 - x0 + 1) * (y1 - y0 + 1) <= MAX_COVER_TILES:
+            return [tile_key(x, y, level) for x in range(x0, x1 + 1) for y in range(y0, y1 + 1)]
+        level -= 1
+
+
+def range_q(field, key):
+    """
+    Q matching every grid key inside the tile `key`.
+    """
+    if not key:
+        return Q(**{f"{field}__gt": ""})
+    return Q(**{f"{field}__gte": key, f"{field}__lt": key + RANGE_END})
+
+
+def cluster_level(zoom):
+    return max(0, min(GRID_LEVEL, zoom + CLUSTER_DETAIL))
+
+
+def in_viewport(queryset, bbox, zoom, field="grid_key"):
+    """
+    Narrows `queryset` to the rows inside `bbox`: tile ranges on the indexed grid key,
+    then the exact coordinates.
+    """
+    min_lon, min_lat, max_lon, max_lat = bbox
+    tiles = Q()
+    for key in cover(bbox, zoom):
+        tiles |= range_q(field, key)
+    return queryset.filter(tiles).filter(
+        latitude__gte=min_lat, latitude__lte=max_lat, longitude__gte=min_lon, longitude__lte=max_lon,
+    )
+
+
+def cluster_rows(queryset, zoom, *, group_by=(), field="grid_key", **aggregates):
+    """
+    Groups `queryset` by the cluster tile of each row at `zoom`; yields value dicts with
+    "tile", "count", "latitude", "longitude" (the members' mean), the `group_by` fields
+    and the extra `aggregates`.
+    """
+    level = cluster_level(zoom)
+    return (
+        queryset.annotate(tile=Substr(field, 1, level))
+        .values("tile", *group_by)
+        .annotate(count=Count("pk"), latitude=Avg("latitude"), longitude=Avg("longitude"), **aggregates)
+        .order_by()
+    )
@@ -0,0 +1,121 @@
+"""
+Batched, concurrent Open-Meteo client for the climate tasks.
+
+Open-Meteo answers many locations in one request: comma-separated latitude/longitude
+lists, one result object per location, in the same order. Locations are sent in batches
+of BATCH_SIZE coordinates, with at most CONCURRENCY batches in flight over one pooled
+httpx.AsyncClient. A batch failing with a network error, a 429 or a 5xx is retried with
+exponential backoff.
+
+    outcome = open_meteo.fetch(open_meteo.forecast_url(), open_meteo.FORECAST_PARAMS, open_meteo.cell_points())
+    outcome.results[cell_id], outcome.failed
+
+The URLs can be overridden with the OPEN_METEO_FORECAST_URL / OPEN_METEO_ARCHIVE_URL settings.
+"""
+import asyncio
+import logging
+from dataclasses import dataclass, field
+
+import httpx
+from django.conf import settings
+
+from users.models.addresses import Cell
+
+logger = logging.getLogger(__name__)
+
+FORECAST_URL = "https://api.open-meteo.com/v1/forecast"
+ARCHIVE_URL = "https://archive-api.open-meteo.com/v1/archive"
+FORECAST_PARAMS = {"hourly": "temperature_2m,precipitation", "forecast_days": 1, "timezone": "auto"}
+ARCHIVE_PARAMS = {"daily": "temperature_2m_max,temperature_2m_min,precipitation_sum", "timezone": "auto"}
+
+BATCH_SIZE = 50
+CONCURRENCY = 4
+ATTEMPTS = 3
+BACKOFF = 2.0
+TIMEOUT = 30.0
+
+
+def forecast_url():
+    return getattr(settings, "OPEN_METEO_FORECAST_URL", FORECAST_URL)
+
+
+def archive_url():
+    return getattr(settings, "OPEN_METEO_ARCHIVE_URL", ARCHIVE_URL)
+
+
+def cell_points():
+    """
+    (cell_id, latitude, longitude) of every cell with coordinates. Read from the database:
+    a worker's hierarchy snapshot may predate the last coordinate import.
+    """
+    rows = Cell.objects.filter(latitude__isnull=False, longitude__isnull=False).order_by("id")
+    return [(pk, float(lat), float(lon)) for pk, lat, lon in rows.values_list("id", "latitude", "longitude")]
+
+
+@dataclass
+class Outcome:
+    results: dict = field(default_factory=dict)   # point key -> location payload
+    failed: list = field(default_factory=list)    # keys of the points whose batch gave up
+    requests: int = 0
+    bytes: int = 0                                # response bodies received
+
+
+def _batches(points, size):
+    return [points[i:i + size] for i in range(0, len(points), size)]
+
+
+async def _fetch_batch(client, semaphore, url, params, batch, outcome, attempts, backoff):
+    query = {
+        **params,
+        "latitude": ",".join(f"{lat:.6f}" for _, lat, _ in batch),
+        "longitude": ",".join(f"{lon:.6f}" for _, _, lon in batch),
+    }
+    async with semaphore:
+        for attempt in range(1, attempts + 1):
+            outcome.requests += 1
+            retry = True
+            try:
+                response = await client.get(url, params=query)
+                outcome.bytes += len(response.content)
+                if response.status_code < 400:
+                    payload = response.json()
+                    # A single location comes back as an object rather than a list
+                    locations = payload if isinstance(payload, list) else [payload]
+                    if len(locations) == len(batch):
+                        outcome.results.update((key, location) for (key, _, _), location in zip(batch, locations))
+                        return
+                    error = f"{len(locations)} results for {len(batch)} locations"
+                else:
+                    error = f"HTTP {response.status_code}: {response.text[:200]}"
+                    retry = response.status_code == 429 or response.status_code >= 500
+            except (httpx.TransportError, ValueError) as exc:
+                error = repr(exc)
+            if not retry or attempt == attempts:
+                break
+            await asyncio.sleep(backoff * 2 ** (attempt - 1))
+
+    logger.error("Open-Meteo batch of %s locations failed after %s attempt(s): %s", len(batch), attempt, error)
+    outcome.failed.extend(key for key, _, _ in batch)
+
+
+async def fetch_async(url, params, points, *, batch_size=None, concurrency=None, attempts=None, backoff=None, timeout=None):
+    batch_size, concurrency = batch_size or BATCH_SIZE, concurrency or CONCURRENCY
+    attempts, backoff, timeout = attempts or ATTEMPTS, BACKOFF if backoff is None else backoff, timeout or TIMEOUT
+    outcome = Outcome()
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(timeout=timeout, limits=limits) as client:
+        await asyncio.gather(*(
+            _fetch_batch(client, semaphore, url, params, batch, outcome, attempts, backoff)
+            for batch in _batches(list(points), batch_size)
+        ))
+    return outcome
+
+
+def fetch(url, params, points, **options):
+    """
+    Fetches `params` for every (key, latitude, longitude) point and returns an Outcome keyed
+    the same way: cell ids, or grid point ids for the climate tasks.
+    """
+    return asyncio.run(fetch_async(url, params, points, **options))
+
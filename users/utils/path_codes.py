@@ -0,0 +1,101 @@
+"""
+Materialized path codes of the administrative hierarchy.
+
+Every Province/District/Sector/Cell/Village carries a `path_code` made of one fixed-width
+segment per level, e.g. "02.05.07.03.11" for the 11th village of the 3rd cell of ... (the
+layout of land UPIs). Fact rows carry the code of their village in `geo_path`, so "everything
+in this district" is the prefix match geo_path LIKE '02.05%'. Segments are fixed-width, so a
+prefix never matches a sibling ("02.05" cannot prefix "02.050..."), and unlike a range bound
+the match does not depend on the column collation: locale collations such as en_US.UTF-8
+compare digits before punctuation, so "02.05/" can sort before "02.05.07". On PostgreSQL the
+CharField indexes come with a varchar_pattern_ops twin that serves the LIKE.
+
+Segments are assigned once, in creation order under the parent, and only change when a row
+moves to another parent; the save hooks (users/signals/hierarchy.py and
+report/signals/geo_paths.py) then rewrite the codes below it.
+"""
+from django.db.models import Max, Q, Value
+from django.db.models.functions import Concat, Substr
+
+SEGMENT_WIDTH = 2
+SEPARATOR = "."
+MAX_LENGTH = 5 * (SEGMENT_WIDTH + 1) - 1
+
+
+def parent_field(model):
+    """
+    Returns the name of the FK to the parent level, or None for provinces.
+    """
+    from users.models.addresses import District, Sector, Cell, Village
+
+    return {District: "province", Sector: "district", Cell: "sector", Village: "cell"}.get(model)
+
+
+def segment(ordinal):
+    if not 0 < ordinal < 10 ** SEGMENT_WIDTH:
+        raise ValueError(f"Path code segment {ordinal} does not fit in {SEGMENT_WIDTH} digits.")
+    return str(ordinal).zfill(SEGMENT_WIDTH)
+
+
+def child_code(parent_code, ordinal):
+    return f"{parent_code}{SEPARATOR}{segment(ordinal)}" if parent_code else segment(ordinal)
+
+
+def next_code(model, parent_id, parent_code):
+    """
+    Returns the code for a new row under `parent_id`: one past the highest sibling segment.
+    """
+    field = parent_field(model)
+    siblings = model.objects.filter(**{field: parent_id}) if field else model.objects.all()
+    highest = siblings.filter(path_code__startswith=parent_code).exclude(path_code="").aggregate(
+        highest=Max("path_code")
+    )["highest"]
+    ordinal = int(highest.rsplit(SEPARATOR, 1)[-1]) + 1 if highest else 1
+    return child_code(parent_code, ordinal)
+
+
+def assign(instance):
+    """
+    Sets instance.path_code when the row is new or moved to another parent. Returns the
+    previous code when it changed, else None.
+    """
+    model = type(instance)
+    field = parent_field(model)
+    parent_id = getattr(instance, f"{field}_id") if field else None
+
+    previous = None
+    if not instance._state.adding:
+        row = model.objects.filter(pk=instance.pk).values("path_code", *([f"{field}_id"] if field else [])).first()
+        if row and row["path_code"] and (not field or row[f"{field}_id"] == parent_id):
+            instance.path_code = row["path_code"]
+            return None
+        previous = row["path_code"] if row else None
+
+    parent_code = ""
+    if field:
+        parent_model = model._meta.get_field(field).related_model
+        parent_code = parent_model.objects.filter(pk=parent_id).values_list("path_code", flat=True).first() or ""
+    instance.path_code = next_code(model, parent_id, parent_code)
+    return previous or None
+
+
+def range_q(field, code):
+    """
+    Q matching `code` and every code below it.
+    """
+    return Q(**{f"{field}__startswith": code})
+
+
+def in_range(value, code):
+    return value is not None and value.startswith(code)
+
+
+def rewrite_prefix(queryset, field, old, new):
+    """
+    Replaces the `old` prefix of `field` by `new` on every row of `queryset` below `old`.
+    """
+    if not old or old == new:
+        return 0
+    return queryset.filter(range_q(field, old)).update(
+        **{field: Concat(Value(new), Substr(field, len(old) + 1))}
+    )
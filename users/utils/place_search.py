@@ -0,0 +1,256 @@
+"""
+Name search over the administrative hierarchy (provinces down to ~15,000 villages).
+
+PlaceIndex keeps trigram posting lists and sorted name lists for prefix lookups, all in
+memory. Queries of one or two characters are prefix matches; longer ones also match any
+name sharing enough trigrams with the query. Results are ranked by match kind
+
+    exact name  >  name starting with the query  >  word starting with it  >  similar name
+
+then by trigram similarity, coarser level first and shorter name first. Names repeat
+heavily across cells, so every result carries its fully qualified path ("Amahoro, Rukiri,
+Remera, Gasabo, Kigali").
+
+The index follows the hierarchy snapshot: when a newer snapshot is loaded only the rows
+whose name was added, renamed or removed are re-indexed, into a copy of the index that is
+then swapped in, so searches never wait on a lock. Paths are read from the snapshot at
+query time, so renaming a district re-indexes one name, not the villages below it.
+
+    for place in place_search.search("kabez", limit=5):
+        place["path"], place["score"]
+"""
+import bisect
+import copy
+import re
+import threading
+import unicodedata
+
+import numpy as np
+
+from users.utils import hierarchy
+
+LEVEL_ORDER = list(hierarchy.LEVELS)
+# Lowest trigram similarity of a name that neither equals nor contains the query
+MIN_SIMILARITY = 0.3
+MAX_LIMIT = 50
+
+EXACT, PREFIX, WORD_PREFIX, FUZZY = 3, 2, 1, 0
+
+
+def normalize(name):
+    """
+    Lowercase ASCII with runs of punctuation and spaces folded to one space.
+    """
+    text = unicodedata.normalize("NFKD", name or "").encode("ascii", "ignore").decode()
+    return re.sub(r"[^a-z0-9]+", " ", text.lower()).strip()
+
+
+def trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class PlaceIndex:
+    """
+    Trigram and prefix index over the names of one hierarchy snapshot. Every (level, pk)
+    key gets an integer slot; posting lists are numpy arrays of slots, so scoring a query
+    is one bincount over the postings of its trigrams. sync() moves the index to a newer
+    snapshot in place: slots of renamed or removed rows are retired, new names appended.
+    An index that searches may be reading is only synced through copy().
+    """
+
+    def __init__(self):
+        self.snapshot = None
+        self.keys = []         # slot -> (level, pk), None once retired
+        self.names = []        # slot -> normalized name
+        self.grams = []        # slot -> number of trigrams of the name
+        self.slot_of = {}      # (level, pk) -> slot
+        self.postings = {}     # trigram -> set of slots
+        self._arrays = {}      # trigram -> np.array of its slots, rebuilt lazily
+        self._owned = None     # trigrams whose slot set is not shared with the copied index
+
+    def __len__(self):
+        return len(self.slot_of)
+
+    def copy(self):
+        """
+        Returns an index sharing this one's arrays and posting sets until it changes them.
+        """
+        other = copy.copy(self)
+        other.keys, other.names, other.grams = list(self.keys), list(self.names), list(self.grams)
+        other.slot_of = dict(self.slot_of)
+        other.postings = dict(self.postings)
+        other._arrays = dict(self._arrays)
+        other._owned = set()
+        return other
+
+    def _slots(self, gram):
+        """
+        The slot set of `gram`, copied first when it may be shared with another index.
+        """
+        if self._owned is not None and gram not in self._owned:
+            self._owned.add(gram)
+            self.postings[gram] = set(self.postings.get(gram, ()))
+        return self.postings.setdefault(gram, set())
+
+    def _add(self, key, name):
+        slot = len(self.keys)
+        self.keys.append(key)
+        self.names.append(name)
+        self.slot_of[key] = slot
+        grams = trigrams(name)
+        self.grams.append(len(grams))
+        for gram in grams:
+            self._slots(gram).add(slot)
+            self._arrays.pop(gram, None)
+
+    def _remove(self, key):
+        slot = self.slot_of.pop(key)
+        self.keys[slot] = None
+        for gram in trigrams(self.names[slot]):
+            slots = self._slots(gram)
+            slots.discard(slot)
+            self._arrays.pop(gram, None)
+            if not slots:
+                del self.postings[gram]
+
+    def _posting(self, gram):
+        array = self._arrays.get(gram)
+        if array is None:
+            array = self._arrays[gram] = np.fromiter(self.postings[gram], dtype=np.int64)
+        return array
+
+    def _refresh(self):
+        live = [slot for slot, key in enumerate(self.keys) if key is not None]
+        self.lengths = np.array([len(name) for name in self.names], dtype=np.int64)
+        self.sizes = np.array(self.grams, dtype=np.int64)
+        self.positions = np.array([LEVEL_ORDER.index(key[0]) if key else -1 for key in self.keys], dtype=np.int64)
+        self.pks = np.array([key[1] if key else 0 for key in self.keys], dtype=np.int64)
+
+        by_name = sorted((self.names[slot], slot) for slot in live)
+        self.sorted_names = [name for name, _ in by_name]
+        self.sorted_slots = np.array([slot for _, slot in by_name], dtype=np.int64)
+        # Every word of a name but the first, with the rest of the name, for word prefixes
+        by_word = sorted(
+            (" ".join(words[i:]), slot)
+            for slot in live
+            for words in [self.names[slot].split(" ")]
+            for i in range(1, len(words))
+        )
+        self.word_names = [name for name, _ in by_word]
+        self.word_slots = np.array([slot for _, slot in by_word], dtype=np.int64)
+
+    def sync(self, snapshot):
+        """
+        Re-indexes the names that differ between the indexed snapshot and `snapshot`.
+        Returns the number of keys added, changed or removed.
+        """
+        if self.snapshot is not None and self.snapshot.version == snapshot.version:
+            return 0
+        wanted = {
+            (level, pk): normalize(entry[0])
+            for level in LEVEL_ORDER
+            for pk, entry in snapshot.index[level].items()
+        }
+        changed = 0
+        for key in [key for key, slot in self.slot_of.items() if wanted.get(key) != self.names[slot]]:
+            self._remove(key)
+            changed += 1
+        for key, name in wanted.items():
+            if key not in self.slot_of:
+                self._add(key, name)
+                changed += 1
+        if changed or self.snapshot is None:
+            self._refresh()
+        self.snapshot = snapshot
+        return changed
+
+    @staticmethod
+    def _range(names, slots, query):
+        return slots[bisect.bisect_left(names, query):bisect.bisect_left(names, query + "\uffff")]
+
+    def search(self, query, limit=10, levels=None):
+        """
+        Returns up to `limit` (key, kind, similarity) matches for `query`, best first.
+        """
+        query = normalize(query)
+        if not query or self.snapshot is None:
+            return []
+        prefixed = self._range(self.sorted_names, self.sorted_slots, query)
+        if len(query) < 3:
+            candidates = prefixed
+            similarity = len(query) / self.lengths[candidates]
+            kind = np.where(self.lengths[candidates] == len(query), EXACT, PREFIX)
+        else:
+            grams = [gram for gram in trigrams(query) if gram in self.postings]
+            count = len(self.keys)
+            shared = np.bincount(np.concatenate([self._posting(gram) for gram in grams]), minlength=count) if grams else np.zeros(count, dtype=np.int64)
+            # Jaccard similarity of the two trigram sets
+            similarities = shared / (len(trigrams(query)) + self.sizes - shared)
+            kinds = np.full(count, FUZZY, dtype=np.int64)
+            kinds[self._range(self.word_names, self.word_slots, query)] = WORD_PREFIX
+            kinds[prefixed] = PREFIX
+            kinds[prefixed[self.lengths[prefixed] == len(query)]] = EXACT
+            candidates = np.flatnonzero((kinds > FUZZY) | (similarities >= MIN_SIMILARITY))
+            similarity, kind = similarities[candidates], kinds[candidates]
+
+        if levels:
+            wanted = np.isin(self.positions[candidates], [LEVEL_ORDER.index(level) for level in levels])
+            candidates, similarity, kind = candidates[wanted], similarity[wanted], kind[wanted]
+        order = np.lexsort((self.pks[candidates], self.lengths[candidates], self.positions[candidates], -similarity, -kind))[:limit]
+        return [(self.keys[candidates[i]], int(kind[i]), float(similarity[i])) for i in order]
+
+
+# Serializes rebuilds only; searches read whichever index is current
+_lock = threading.Lock()
+_index = PlaceIndex()
+
+
+def current():
+    """
+    Returns the index of the current hierarchy snapshot. A newer snapshot is synced into
+    a copy of the index, which then replaces it in one assignment.
+    """
+    global _index
+    snapshot = hierarchy.current()
+    index = _index
+    if index.snapshot is not None and index.snapshot.version == snapshot.version:
+        return index
+    with _lock:
+        if _index.snapshot is None or _index.snapshot.version != snapshot.version:
+            index = _index.copy()
+            index.sync(snapshot)
+            _index = index
+        return _index
+
+
+def search(query, limit=10, levels=None):
+    """
+    Searches the current hierarchy and returns result dicts with the level, id, name,
+    fully qualified path, lineage and score: the match kind (3 exact, 2 prefix, 1 word
+    prefix, 0 fuzzy) plus the trigram similarity.
+    """
+    limit = max(1, min(int(limit), MAX_LIMIT))
+    index = current()
+    snapshot = index.snapshot
+    matches = index.search(query, limit=limit, levels=levels)
+
+    results = []
+    for (level, pk), kind, similarity in matches:
+        lineage = snapshot.lineage(level, pk)
+        names = [entry["name"] for entry in lineage.values()]
+        results.append({
+            "level": level[:-1],
+            "id": pk,
+            "name": names[0],
+            "path": ", ".join(names),
+            "lineage": lineage,
+            "score": round(kind + similarity, 3),
+        })
+    return results
+
+
+def reset():
+    global _index
+    with _lock:
+        _index = PlaceIndex()
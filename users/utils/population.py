@@ -0,0 +1,337 @@
+"""
+Maintenance of the PopulationCounter rows behind the dashboard user counts.
+
+Land and livestock writes adjust the counters of the village, cell, sector and district
+they touch by +/-1 when an owner starts or stops being a resident there, inside the
+writing transaction. Officer assignments and user level changes rebuild the affected
+district exactly, and `reconcile` rebuilds everything nightly to absorb any drift
+(e.g. concurrent writes or officers removed by a bulk update).
+"""
+import logging
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import Greatest
+
+from users.models.addresses import District, Sector, Cell, Village
+from users.models.customuser import CustomUser
+from report.models import Land, LivestockLocation, GeoRollup, PopulationCounter
+
+logger = logging.getLogger(__name__)
+
+# Coarse to fine
+LEVELS = ("district", "sector", "cell", "village")
+COUNT_FIELDS = ("total_users", "residents", "citizens", "cell_officers", "sector_officers", "district_officers")
+AREA_FIELDS = tuple(f"{level}_id" for level in LEVELS)
+OFFICER_SLOTS = {"district_officer": "district", "sector_officer": "sector", "cell_officer": "cell"}
+NATIONAL = GeoRollup.key_for("national")
+
+
+def area_key(level, pk):
+    return GeoRollup.key_for(level, pk)
+
+
+def chain_of(obj):
+    """
+    {"district": id, "sector": id, "cell": id, "village": id} of a Land or LivestockLocation.
+    """
+    return {level: getattr(obj, f"{level}_id") for level in LEVELS}
+
+
+# -------------------------------
+# Exact computation
+# -------------------------------
+def _blank(level, chain):
+    row = {"level": level, **{f"{lvl}_id": chain.get(lvl) for lvl in LEVELS}}
+    row.update({field: 0 for field in COUNT_FIELDS})
+    return row
+
+
+def compute_district(district_id, *, level="district", pk=None):
+    """
+    Returns {scope_key: counter row dict} for one area of the district (the whole district
+    by default) and every area below it.
+    """
+    pk = pk or district_id
+    district = District.objects.filter(pk=district_id).values("id", "district_officer_id").first()
+    if district is None:
+        return {}
+    sectors = {
+        s["id"]: s for s in Sector.objects.filter(district_id=district_id).values("id", "sector_officer_id")
+    }
+    cells = {
+        c["id"]: c for c in Cell.objects.filter(sector__district_id=district_id).values("id", "sector_id", "cell_officer_id")
+    }
+    villages = {
+        v["id"]: v for v in Village.objects.filter(cell__sector__district_id=district_id).values("id", "cell_id")
+    }
+
+    def chain(area_level, area_id):
+        if area_level == "district":
+            return {"district": district_id}
+        if area_level == "sector":
+            return {"district": district_id, "sector": area_id}
+        if area_level == "cell":
+            return {"district": district_id, "sector": cells[area_id]["sector_id"], "cell": area_id}
+        cell_id = villages[area_id]["cell_id"]
+        return {"district": district_id, "sector": cells[cell_id]["sector_id"], "cell": cell_id, "village": area_id}
+
+    def inside(area_chain):
+        return area_chain.get(level) == pk
+
+    areas = [("district", district_id)] + [("sector", sid) for sid in sectors] \
+        + [("cell", cid) for cid in cells] + [("village", vid) for vid in villages]
+    areas = [(lvl, aid, chain(lvl, aid)) for lvl, aid in areas]
+    areas = [(lvl, aid, ch) for lvl, aid, ch in areas if inside(ch)]
+
+    # (slot, officer id, chain of the managed area) of every assigned officer
+    officers = [("district", district["district_officer_id"], chain("district", district_id))]
+    officers += [("sector", s["sector_officer_id"], chain("sector", sid)) for sid, s in sectors.items()]
+    officers += [("cell", c["cell_officer_id"], chain("cell", cid)) for cid, c in cells.items()]
+    officers = [officer for officer in officers if officer[1]]
+
+    # Residents by area
+    lookup = {level: pk}
+    owners = defaultdict(set)
+    for model in (Land, LivestockLocation):
+        for row in model.objects.filter(**lookup).values("owner_id", *[f"{lvl}_id" for lvl in LEVELS]).distinct():
+            for lvl in LEVELS:
+                if row[f"{lvl}_id"]:
+                    owners[(lvl, row[f"{lvl}_id"])].add(row["owner_id"])
+    user_levels = dict(
+        CustomUser.objects.filter(id__in=set().union(*owners.values())).values_list("id", "user_level")
+    ) if owners else {}
+
+    counters = {}
+    for area_level, area_id, area_chain in areas:
+        row = _blank(area_level, area_chain)
+        residents = owners.get((area_level, area_id), set())
+        responsible = set()
+        for slot, officer, slot_chain in officers:
+            if _responsible(slot, slot_chain, area_level, area_chain):
+                responsible.add(officer)
+                row[f"{slot}_officers"] += 1
+        row["residents"] = len(residents)
+        row["citizens"] = sum(1 for uid in residents if user_levels.get(uid) == "citizen")
+        row["total_users"] = len(residents | responsible)
+        counters[area_key(area_level, area_id)] = row
+    return counters
+
+
+def compute_national():
+    by_level = dict(CustomUser.objects.values_list("user_level").annotate(n=Count("id")).order_by())
+    row = _blank("national", {})
+    row.update(
+        total_users=sum(by_level.values()),
+        citizens=by_level.get("citizen", 0),
+        cell_officers=by_level.get("cell_officer", 0),
+        sector_officers=by_level.get("sector_officer", 0),
+        district_officers=by_level.get("district_officer", 0),
+    )
+    return {NATIONAL: row}
+
+
+def _responsible(slot, slot_chain, area_level, area_chain):
+    # An officer covers areas inside the one they manage and the areas containing it
+    common = LEVELS[min(LEVELS.index(slot), LEVELS.index(area_level))]
+    return slot_chain.get(common) is not None and slot_chain.get(common) == area_chain.get(common)
+
+
+def _store(counters, existing):
+    """
+    Writes `counters` over the `existing` queryset of rows they replace; returns the
+    number of rows whose counts (or areas, after a move in the hierarchy) changed.
+    """
+    fields = COUNT_FIELDS + AREA_FIELDS
+    current = {c.scope_key: c for c in existing}
+    changed, created = [], []
+    for key, values in counters.items():
+        counter = current.pop(key, None)
+        if counter is None:
+            created.append(PopulationCounter(scope_key=key, **values))
+        elif any(getattr(counter, f) != values[f] for f in fields):
+            for field in fields:
+                setattr(counter, field, values[field])
+            changed.append(counter)
+    with transaction.atomic():
+        PopulationCounter.objects.filter(pk__in=[c.pk for c in current.values()]).delete()
+        PopulationCounter.objects.bulk_create(created, batch_size=1000)
+        PopulationCounter.objects.bulk_update(changed, fields, batch_size=1000)
+    return len(changed) + len(created) + len(current)
+
+
+def refresh_district(district_id):
+    counters = compute_district(district_id)
+    # Rows of areas that just moved in from another district are still stamped with it
+    existing = PopulationCounter.objects.filter(
+        Q(district_id=district_id) | Q(scope_key__in=list(counters))
+    ).exclude(level="national")
+    return _store(counters, existing)
+
+
+def refresh_area(level, chain):
+    """
+    Recomputes one area (and the areas below it), e.g. to create its row on first use.
+    """
+    if not chain.get("district"):
+        return 0
+    counters = compute_district(chain["district"], level=level, pk=chain[level])
+    return _store(counters, PopulationCounter.objects.filter(scope_key__in=list(counters)))
+
+
+def reconcile(district_ids=None):
+    """
+    Rebuilds the counters of the given districts (all of them, plus the national row,
+    by default). Returns the number of rows that had drifted.
+    """
+    drifted = 0
+    if district_ids is None:
+        drifted += _store(compute_national(), PopulationCounter.objects.filter(scope_key=NATIONAL))
+        district_ids = District.objects.values_list("id", flat=True)
+        # Rows of deleted districts cascade away with them
+    for district_id in district_ids:
+        drifted += refresh_district(district_id)
+    logger.info("Reconciled population counters: %s row(s) corrected", drifted)
+    return drifted
+
+
+# -------------------------------
+# Incremental maintenance
+# -------------------------------
+def _managed_chain(user_id):
+    """
+    (user_level, slot, chain of the managed area) of a user; slot is None for non-officers
+    and unassigned officers.
+    """
+    row = CustomUser.objects.filter(pk=user_id).values(
+        "user_level",
+        "managed_district__id",
+        "managed_sector__id", "managed_sector__district_id",
+        "managed_cell__id", "managed_cell__sector_id", "managed_cell__sector__district_id",
+    ).first()
+    if row is None:
+        return None, None, {}
+    if row["managed_cell__id"]:
+        return row["user_level"], "cell", {
+            "district": row["managed_cell__sector__district_id"],
+            "sector": row["managed_cell__sector_id"],
+            "cell": row["managed_cell__id"],
+        }
+    if row["managed_sector__id"]:
+        return row["user_level"], "sector", {
+            "district": row["managed_sector__district_id"], "sector": row["managed_sector__id"],
+        }
+    if row["managed_district__id"]:
+        return row["user_level"], "district", {"district": row["managed_district__id"]}
+    return row["user_level"], None, {}
+
+
+def _holdings(user_id, level, area_id):
+    lookup = {"owner_id": user_id, f"{level}_id": area_id}
+    return Land.objects.filter(**lookup).count() + LivestockLocation.objects.filter(**lookup).count()
+
+
+def _bump(level, chain, user, delta):
+    user_level, slot, managed = user
+    fields = ["residents"]
+    if user_level == "citizen":
+        fields.append("citizens")
+    if not (slot and _responsible(slot, managed, level, chain)):
+        fields.append("total_users")
+    updated = PopulationCounter.objects.filter(scope_key=area_key(level, chain[level])).update(
+        **{field: Greatest(F(field) + delta, 0) for field in fields}
+    )
+    if not updated:
+        # First resident of the area: compute it exactly (this write included)
+        refresh_area(level, chain)
+
+
+def record_holding_change(before, after):
+    """
+    Applies a Land/LivestockLocation write to the counters. `before` and `after` are
+    (owner_id, chain) of the row before and after the write, None when it did not exist.
+    Call after the write, in the same transaction.
+    """
+    users = {}
+
+    def user(user_id):
+        if user_id not in users:
+            users[user_id] = _managed_chain(user_id)
+        return users[user_id]
+
+    # Finest first: creating a missing coarser row recomputes the finer rows below it exactly
+    for level in reversed(LEVELS):
+        old = (before[0], before[1].get(level)) if before else None
+        new = (after[0], after[1].get(level)) if after else None
+        if old == new:
+            continue
+        if old and old[1] and _holdings(old[0], level, old[1]) == 0:
+            _bump(level, before[1], user(old[0]), -1)
+        if new and new[1] and _holdings(new[0], level, new[1]) == 1:
+            _bump(level, after[1], user(new[0]), +1)
+
+
+def record_user_level_change(user_id, old_level, new_level):
+    """
+    Moves a user between the per-level totals; created users have old_level None,
+    deleted ones new_level None.
+    """
+    national = PopulationCounter.objects.filter(scope_key=NATIONAL)
+    if not national.exists():
+        _store(compute_national(), national)
+        return
+
+    field_of = {"citizen": "citizens", **{level: f"{slot}_officers" for level, slot in OFFICER_SLOTS.items()}}
+    deltas = defaultdict(int)
+    if old_level is None:
+        deltas["total_users"] += 1
+    if new_level is None:
+        deltas["total_users"] -= 1
+    if old_level in field_of:
+        deltas[field_of[old_level]] -= 1
+    if new_level in field_of:
+        deltas[field_of[new_level]] += 1
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if deltas:
+        national.update(**{field: Greatest(F(field) + delta, 0) for field, delta in deltas.items()})
+
+
+def districts_of_resident(user_id):
+    return set(Land.objects.filter(owner_id=user_id).values_list("district_id", flat=True)) | set(
+        LivestockLocation.objects.filter(owner_id=user_id).values_list("district_id", flat=True)
+    )
+
+
+# -------------------------------
+# Reading
+# -------------------------------
+def counts_for(scope):
+    """
+    Returns the dashboard user counts of a scope dict (see users/utils/scope.py), or None
+    for citizens and unassigned officers.
+    """
+    if scope["level"] == "super_admin":
+        key, level, chain = NATIONAL, "national", {}
+    else:
+        finest = next((lvl for lvl in ("cell", "sector", "district") if scope[lvl] is not None), None)
+        if finest is None or scope["owner"] is not None:
+            return None
+        chain = {lvl: scope[lvl].pk for lvl in ("district", "sector", "cell") if scope[lvl] is not None}
+        key, level = area_key(finest, chain[finest]), finest
+
+    counter = PopulationCounter.objects.filter(scope_key=key).values(*COUNT_FIELDS).first()
+    if counter is None:
+        if level == "national":
+            _store(compute_national(), PopulationCounter.objects.filter(scope_key=key))
+        else:
+            refresh_area(level, chain)
+        counter = PopulationCounter.objects.filter(scope_key=key).values(*COUNT_FIELDS).first() or {}
+
+    return {
+        "total_users": counter.get("total_users", 0),
+        "citizens": counter.get("citizens", 0),
+        "cell_officers": counter.get("cell_officers", 0),
+        "sector_officers": counter.get("sector_officers", 0),
+        "district_officers": counter.get("district_officers", 0),
+    }
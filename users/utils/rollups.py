@@ -0,0 +1,354 @@
+"""
+Maintenance of the GeoRollup summary tables read by the dashboard.
+
+Cell rows are computed from the fact tables (filtered to the cells being refreshed),
+sector/district/national rows are summed from the rows one level below, so a write
+only rescans the facts of a single cell.
+
+Summing from the level below is only right once every cell has a row, so the national
+row doubles as the "fully built" marker: until rebuild_all() has written it (the
+`rebuild_geo_rollups` command after a deploy, or the nightly task), writes skip the
+refresh and get_rollup() returns None so the dashboard counts live. A cache lock keeps
+a single rebuild running at a time.
+"""
+import logging
+from collections import defaultdict
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, FloatField, IntegerField, Q, Sum, DecimalField
+from django.db.models.functions import Coalesce
+
+from users.models.addresses import District, Sector, Cell
+from report.models import (
+    Land,
+    HarvestReport,
+    LivestockLocation,
+    LivestockAnimal,
+    LivestockProduction,
+    DistrictInventory,
+    CellInventory,
+    CellResourceRequest,
+    ResourceRequest,
+    ResourceRequestFeedback,
+    FarmerIssue,
+    GeoRollup,
+    district_remaining_expression,
+)
+
+logger = logging.getLogger(__name__)
+
+REQUEST_STATUSES = ["pending", "approved", "delivered", "rejected"]
+# In the order of the model choices, as the live by_status breakdowns
+REPORT_STATUSES = ["sold", "available"]
+ISSUE_STATUSES = ["pending", "resolved", "approved"]
+
+# Every numeric column of GeoRollup, summed when rolling a level up
+METRIC_FIELDS = [
+    f.name for f in GeoRollup._meta.get_fields()
+    if getattr(f, "concrete", False)
+    and f.name not in {"id", "scope_key", "level", "district", "sector", "cell", "refreshed_at"}
+]
+DISTRICT_ONLY_FIELDS = ["district_inventory_records", "district_inventory_added", "district_inventory_remaining"]
+
+REBUILD_LOCK_KEY = "rollups:rebuild"
+# Released when the rebuild ends; the timeout only frees it after a crashed worker
+REBUILD_LOCK_TIMEOUT = 60 * 60
+
+
+def _float_sum(field, **extra):
+    return Coalesce(Sum(field, **extra), 0.0, output_field=FloatField())
+
+
+def _int_sum(field, **extra):
+    return Coalesce(Sum(field, **extra), 0, output_field=IntegerField())
+
+
+def _decimal_sum(expression, **extra):
+    return Coalesce(Sum(expression, **extra), Decimal("0"), output_field=DecimalField(max_digits=16, decimal_places=2))
+
+
+def _grouped(qs, cell_path, cell_ids, **aggregates):
+    """
+    Runs one grouped aggregate query over `qs`, keyed by the cell reached through `cell_path`.
+    """
+    if cell_ids is not None:
+        qs = qs.filter(**{f"{cell_path}__in": cell_ids})
+    rows = qs.values(cell_path).order_by().annotate(**aggregates)
+    return {row.pop(cell_path): row for row in rows if row.get(cell_path) is not None}
+
+
+def compute_cell_totals(cell_ids=None):
+    """
+    Returns {cell_id: {metric: value}} computed from the fact tables.
+    `cell_ids=None` computes every cell in one pass per fact table.
+    """
+    totals = defaultdict(lambda: {name: 0 for name in METRIC_FIELDS if name not in DISTRICT_ONLY_FIELDS})
+
+    def merge(rows):
+        for cell_id, values in rows.items():
+            totals[cell_id].update(values)
+
+    merge(_grouped(
+        Land.objects.all(), "cell", cell_ids,
+        lands=Count("id"),
+        hectares=_decimal_sum("size_hectares"),
+    ))
+
+    merge(_grouped(
+        HarvestReport.objects.all(), "cell", cell_ids,
+        harvest_reports=Count("id"),
+        harvest_quantity=_float_sum("quantity"),
+        harvest_available_reports=Count("id", filter=Q(status="available")),
+        harvest_available_quantity=_float_sum("quantity", filter=Q(status="available")),
+        harvest_sold_reports=Count("id", filter=Q(status="sold")),
+        harvest_sold_quantity=_float_sum("quantity", filter=Q(status="sold")),
+    ))
+
+    merge(_grouped(
+        LivestockLocation.objects.all(), "cell", cell_ids,
+        livestock_locations=Count("id", distinct=True),
+        livestock_products=Count("products"),
+    ))
+
+    merge(_grouped(
+        LivestockAnimal.objects.all(), "livestock_location__cell", cell_ids,
+        livestock_animals=_int_sum("quantity"),
+    ))
+
+    merge(_grouped(
+        LivestockProduction.objects.all(), "cell", cell_ids,
+        livestock_productions=Count("id"),
+        livestock_production_quantity=_float_sum("quantity"),
+        livestock_available_productions=Count("id", filter=Q(status="available")),
+        livestock_available_quantity=_float_sum("quantity", filter=Q(status="available")),
+        livestock_sold_productions=Count("id", filter=Q(status="sold")),
+        livestock_sold_quantity=_float_sum("quantity", filter=Q(status="sold")),
+    ))
+
+    merge(_grouped(
+        CellInventory.objects.all(), "cell", cell_ids,
+        cell_inventory_records=Count("id"),
+        cell_inventory_available=_decimal_sum("quantity_available"),
+    ))
+
+    # Farmer requests belong to the cell of their land, or of their livestock location
+    merge(_grouped(
+        ResourceRequest.objects.all(), "cell", cell_ids,
+        **{f"requests_{s}": Count("id", filter=Q(status=s)) for s in REQUEST_STATUSES},
+    ))
+
+    merge(_grouped(
+        CellResourceRequest.objects.all(), "cell", cell_ids,
+        **{f"cell_requests_{s}": Count("id", filter=Q(status=s)) for s in REQUEST_STATUSES},
+    ))
+
+    merge(_grouped(
+        ResourceRequestFeedback.objects.all(), "cell", cell_ids,
+        feedback_count=Count("id"),
+        feedback_rating_sum=_int_sum("rating"),
+    ))
+
+    merge(_grouped(
+        FarmerIssue.objects.all(), "cell", cell_ids,
+        issues_total=Count("id", distinct=True),
+        issues_with_reply=Count("id", filter=Q(replies__isnull=False), distinct=True),
+        **{f"issues_{s}": Count("id", filter=Q(status__iexact=s), distinct=True) for s in ISSUE_STATUSES},
+    ))
+
+    if cell_ids is not None:
+        # Cells that lost all their facts still need a zeroed row
+        for cell_id in cell_ids:
+            totals[cell_id]
+    return totals
+
+
+def compute_district_inventory(district_ids=None):
+    qs = DistrictInventory.objects.all()
+    if district_ids is not None:
+        qs = qs.filter(district__in=district_ids)
+    rows = qs.values("district").order_by().annotate(
+        district_inventory_records=Count("id"),
+        district_inventory_added=_decimal_sum("quantity_added"),
+        district_inventory_remaining=_decimal_sum(district_remaining_expression()),
+    )
+    return {row.pop("district"): row for row in rows}
+
+
+def _upsert(level, pk, values, **geo):
+    GeoRollup.objects.update_or_create(
+        scope_key=GeoRollup.key_for(level, pk),
+        defaults={"level": level, **geo, **values},
+    )
+
+
+def _sum_rows(qs):
+    sums = qs.aggregate(**{name: Sum(name) for name in METRIC_FIELDS})
+    return {name: value or 0 for name, value in sums.items()}
+
+
+def is_built():
+    return GeoRollup.objects.filter(scope_key=GeoRollup.key_for("national")).exists()
+
+
+def refresh_cells(cell_ids):
+    """
+    Recomputes the rows of the given cells, then every ancestor row above them.
+    Like refresh_sectors() and refresh_districts(), does nothing while the table has
+    never been fully built.
+    """
+    cell_ids = {cid for cid in cell_ids if cid}
+    if cell_ids and is_built():
+        _refresh_cells(cell_ids)
+
+
+def refresh_sectors(sector_ids):
+    sector_ids = {sid for sid in sector_ids if sid}
+    if sector_ids and is_built():
+        _refresh_sectors(sector_ids)
+
+
+def refresh_districts(district_ids):
+    district_ids = {did for did in district_ids if did}
+    if district_ids and is_built():
+        _refresh_districts(district_ids)
+
+
+def _refresh_cells(cell_ids):
+    cells = {
+        c["id"]: c for c in Cell.objects.filter(id__in=cell_ids).values("id", "sector_id", "sector__district_id")
+    }
+    totals = compute_cell_totals(list(cells))
+    for cell_id, cell in cells.items():
+        _upsert(
+            "cell", cell_id, totals[cell_id],
+            cell_id=cell_id, sector_id=cell["sector_id"], district_id=cell["sector__district_id"],
+        )
+    _refresh_sectors({c["sector_id"] for c in cells.values()})
+
+
+def _refresh_sectors(sector_ids):
+    sectors = Sector.objects.filter(id__in=sector_ids).values("id", "district_id")
+    district_ids = set()
+    for sector in sectors:
+        district_ids.add(sector["district_id"])
+        cell_rows = GeoRollup.objects.filter(level="cell", sector_id=sector["id"])
+        if not cell_rows.exists():
+            # Its last cell moved away: no row, as after rebuild_all()
+            GeoRollup.objects.filter(scope_key=GeoRollup.key_for("sector", sector["id"])).delete()
+            continue
+        _upsert("sector", sector["id"], _sum_rows(cell_rows), sector_id=sector["id"], district_id=sector["district_id"])
+    _refresh_districts(district_ids)
+
+
+def _refresh_districts(district_ids):
+    inventory = compute_district_inventory(district_ids)
+    for district_id in District.objects.filter(id__in=district_ids).values_list("id", flat=True):
+        values = _sum_rows(GeoRollup.objects.filter(level="sector", district_id=district_id))
+        values.update({name: 0 for name in DISTRICT_ONLY_FIELDS})
+        values.update(inventory.get(district_id, {}))
+        _upsert("district", district_id, values, district_id=district_id)
+    refresh_national()
+
+
+def refresh_national():
+    _upsert("national", None, _sum_rows(GeoRollup.objects.filter(level="district")))
+
+
+def rebuild_all():
+    """
+    Recomputes every rollup row from scratch; used by the `rebuild_geo_rollups` command and
+    task. Returns False without doing anything when another rebuild holds the lock.
+    """
+    if not cache.add(REBUILD_LOCK_KEY, True, timeout=REBUILD_LOCK_TIMEOUT):
+        logger.info("Geo rollups are already being rebuilt; skipping")
+        return False
+    try:
+        _rebuild()
+    finally:
+        cache.delete(REBUILD_LOCK_KEY)
+    logger.info("Rebuilt geo rollups: %s rows", GeoRollup.objects.count())
+    return True
+
+
+def _rebuild():
+    with transaction.atomic():
+        GeoRollup.objects.all().delete()
+
+        cell_totals = compute_cell_totals()
+        cells = Cell.objects.values("id", "sector_id", "sector__district_id")
+        GeoRollup.objects.bulk_create([
+            GeoRollup(
+                scope_key=GeoRollup.key_for("cell", c["id"]), level="cell",
+                cell_id=c["id"], sector_id=c["sector_id"], district_id=c["sector__district_id"],
+                **cell_totals.get(c["id"], {}),
+            )
+            for c in cells
+        ], batch_size=500)
+
+        sector_rows = GeoRollup.objects.filter(level="cell").values("sector_id").order_by().annotate(
+            **{name: Sum(name) for name in METRIC_FIELDS}
+        )
+        sector_district = dict(Sector.objects.values_list("id", "district_id"))
+        GeoRollup.objects.bulk_create([
+            GeoRollup(
+                scope_key=GeoRollup.key_for("sector", row["sector_id"]), level="sector",
+                sector_id=row["sector_id"], district_id=sector_district.get(row["sector_id"]),
+                **{name: row[name] or 0 for name in METRIC_FIELDS},
+            )
+            for row in sector_rows
+        ], batch_size=500)
+
+        inventory = compute_district_inventory()
+        district_rows = {
+            row.pop("district_id"): row
+            for row in GeoRollup.objects.filter(level="sector").values("district_id").order_by().annotate(
+                **{name: Sum(name) for name in METRIC_FIELDS if name not in DISTRICT_ONLY_FIELDS}
+            )
+        }
+        GeoRollup.objects.bulk_create([
+            GeoRollup(
+                scope_key=GeoRollup.key_for("district", district_id), level="district",
+                district_id=district_id,
+                **{name: value or 0 for name, value in district_rows.get(district_id, {}).items()},
+                **inventory.get(district_id, {}),
+            )
+            for district_id in District.objects.values_list("id", flat=True)
+        ], batch_size=500)
+
+        refresh_national()
+
+
+def get_rollup(scope):
+    """
+    Returns the GeoRollup row matching a dashboard scope dict, or None when the scope
+    is not geographic (citizens, unassigned officers) or the rollups have not been fully
+    built yet.
+
+    District inventory is only kept on district rows; like the live path, sector and cell
+    scopes report the stock of their district, copied from the district row.
+    """
+    level = scope["level"]
+    district_key = GeoRollup.key_for("district", scope["district"].pk) if scope["district"] else None
+    if level == "super_admin":
+        key = GeoRollup.key_for("national")
+    elif scope["cell"]:
+        key = GeoRollup.key_for("cell", scope["cell"].pk)
+    elif scope["sector"]:
+        key = GeoRollup.key_for("sector", scope["sector"].pk)
+    elif scope["district"]:
+        key = district_key
+    else:
+        return None
+    national = GeoRollup.key_for("national")
+    rows = {
+        row.scope_key: row
+        for row in GeoRollup.objects.filter(scope_key__in={key, national, district_key} - {None})
+    }
+    rollup = rows.get(key) if national in rows else None
+    if rollup is not None and district_key not in (None, key):
+        district = rows.get(district_key)
+        for field in DISTRICT_ONLY_FIELDS:
+            setattr(rollup, field, getattr(district, field) if district else 0)
+    return rollup
@@ -0,0 +1,185 @@
+"""
+Role-based scoping of querysets.
+
+A scope (see resolve_scope) describes what a user may see: everything (super admins),
+one district/sector/cell (officers) or their own rows (citizens). Each scoped model
+declares in `scope_paths` how its rows reach that geography and owner, and
+`Model.objects.for_scope(scope)` compiles the filter from the declaration:
+
+    class HarvestReport(GeoStampedModel):
+        scope_paths = ScopePaths(district="district", sector="sector", cell="cell", owner="farmer", path="geo_path")
+        objects = ScopedQuerySet.as_manager()
+
+Models declaring a `path` (a column holding a hierarchy path code) are scoped with a prefix
+range on it, whatever the officer's level (see users/utils/path_codes.py).
+"""
+from dataclasses import dataclass
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import models
+from django.db.models import Q
+
+from users.utils import path_codes
+
+# Officer level -> the geography it manages, through the reverse one-to-one on CustomUser
+OFFICER_LEVELS = {
+    "district_officer": "district",
+    "sector_officer": "sector",
+    "cell_officer": "cell",
+}
+# Finest first: an officer's rows are matched on the finest level the model can express
+GEO_LEVELS = ("cell", "sector", "district")
+
+
+@dataclass(frozen=True)
+class ScopePaths:
+    """
+    ORM lookup paths from a model to the district, sector, cell and owner of its rows, and
+    optionally to the path code of its geography. `public` models (inventories and cell
+    requests) may be published to citizens as totals: only a caller asking for it with
+    `public=True` (the role-aware dashboard) gets every row for a citizen, everyone else
+    gets none.
+    """
+    district: str = None
+    sector: str = None
+    cell: str = None
+    owner: str = None
+    path: str = None
+    public: bool = False
+
+
+def resolve_scope(user):
+    """
+    Returns the scope dict of `user`, resolved with a single query and cached on the
+    user object for the rest of the request. Keys:
+      - district, sector, cell (instances or None)
+      - owner (CustomUser or None)  # citizens
+      - user, level, label
+    """
+    cached = getattr(user, "_resolved_scope", None)
+    if cached is not None:
+        return cached
+
+    from users.models.addresses import District, Sector, Cell
+
+    level = user.user_level
+    scope = {"district": None, "sector": None, "cell": None, "owner": None,
+             "user": user, "level": level, "label": "All"}
+
+    if level == "district_officer":
+        district = District.objects.filter(district_officer=user).first()
+        if district:
+            scope.update(district=district, label=f"District: {district.name}")
+    elif level == "sector_officer":
+        sector = Sector.objects.select_related("district").filter(sector_officer=user).first()
+        if sector:
+            scope.update(sector=sector, district=sector.district, label=f"Sector: {sector.name}")
+    elif level == "cell_officer":
+        cell = Cell.objects.select_related("sector__district").filter(cell_officer=user).first()
+        if cell:
+            scope.update(cell=cell, sector=cell.sector, district=cell.sector.district, label=f"Cell: {cell.name}")
+    elif level != "super_admin":
+        # citizen (or any other user level defaults to own data)
+        scope.update(owner=user, label=f"My data ({user.get_full_name()})")
+
+    if level in OFFICER_LEVELS and scope[OFFICER_LEVELS[level]] is None:
+        # Unassigned officer: empty scope, but labelled
+        scope["label"] = f"Unassigned {OFFICER_LEVELS[level]}"
+
+    user._resolved_scope = scope
+    return scope
+
+
+def is_unassigned(scope):
+    return scope["level"] in OFFICER_LEVELS and scope[OFFICER_LEVELS[scope["level"]]] is None
+
+
+def _paths(model):
+    paths = getattr(model, "scope_paths", None)
+    if paths is None:
+        raise ImproperlyConfigured(f"{model.__name__} does not declare scope_paths.")
+    return paths
+
+
+def scope_condition(model, scope, *, public=False):
+    """
+    Returns the Q selecting the rows of `model` visible in `scope`, or None when none are.
+    """
+    paths = _paths(model)
+    if scope["level"] == "super_admin":
+        return Q()
+
+    if scope["owner"] is not None:
+        if public and paths.public:
+            return Q()
+        return Q(**{paths.owner: scope["owner"].pk}) if paths.owner else None
+
+    for level in GEO_LEVELS:
+        area = scope[level]
+        if area is None:
+            continue
+        if paths.path and area.path_code:
+            return path_codes.range_q(paths.path, area.path_code)
+        path = getattr(paths, level)
+        if path:
+            return Q(**{path: area.pk})
+    # Unassigned officers, or a geography the model cannot be placed in
+    return None
+
+
+def apply_scope(qs, scope, *, include_owned=False, public=False):
+    """
+    Filters `qs` down to the rows visible in `scope`. With `include_owned`, officers also
+    see the rows they own themselves (e.g. their own land outside their jurisdiction).
+    With `public`, citizens see every row of a public model (see ScopePaths).
+    """
+    condition = scope_condition(qs.model, scope, public=public)
+    owner_path = _paths(qs.model).owner
+    if include_owned and owner_path and scope["owner"] is None and condition != Q():
+        owned = Q(**{owner_path: scope["user"].pk})
+        condition = owned if condition is None else condition | owned
+    if condition is None:
+        return qs.none()
+    return qs.filter(condition) if condition else qs
+
+
+def _value_at(obj, path):
+    *hops, last = path.split("__")
+    for hop in hops:
+        obj = getattr(obj, hop, None)
+        if obj is None:
+            return None
+    return getattr(obj, obj._meta.get_field(last).attname)
+
+
+def in_scope(obj, scope, *, include_owned=False):
+    """
+    Object-level counterpart of apply_scope, evaluated on a loaded instance.
+    """
+    paths = _paths(type(obj))
+    if include_owned and paths.owner and _value_at(obj, paths.owner) == scope["user"].pk:
+        return True
+    condition = scope_condition(type(obj), scope)
+    if condition is None:
+        return False
+    for lookup, value in condition.children:
+        path, _, operator = lookup.rpartition("__")
+        if operator != "startswith":
+            path, operator = lookup, "exact"
+        actual = _value_at(obj, path)
+        if operator == "exact":
+            matched = actual == value
+        else:
+            matched = path_codes.in_range(actual, value)
+        if not matched:
+            return False
+    return True
+
+
+class ScopedQuerySet(models.QuerySet):
+
+    def for_scope(self, scope, *, include_owned=False, public=False):
+        return apply_scope(self, scope, include_owned=include_owned, public=public)
+
+    def for_user(self, user, *, include_owned=False, public=False):
+        return apply_scope(self, resolve_scope(user), include_owned=include_owned, public=public)
@@ -0,0 +1,82 @@
+"""
+Selection and concurrent evaluation of dashboard sections.
+
+Sections are independent queries, so they run on one process-wide thread pool of
+DASHBOARD_SECTION_WORKERS threads: a request then takes about as long as its slowest
+section, and the pool caps the extra database connections across all requests.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+from rest_framework.exceptions import ValidationError
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def parse_sections(raw, available):
+    """
+    Parses `?sections=a,b` into a tuple ordered like `available`; empty means all.
+    """
+    if not raw:
+        return tuple(available)
+    requested = {name.strip() for name in raw.split(",") if name.strip()}
+    unknown = requested - set(available)
+    if unknown:
+        raise ValidationError({
+            "sections": f"Unknown sections: {', '.join(sorted(unknown))}. "
+                        f"Available: {', '.join(available)}."
+        })
+    return tuple(name for name in available if name in requested)
+
+
+def _pool():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.DASHBOARD_SECTION_WORKERS,
+                thread_name_prefix="dashboard-section",
+            )
+        return _executor
+
+
+def _in_worker(fn):
+    # Worker threads own their connections; release them per CONN_MAX_AGE like a request would
+    close_old_connections()
+    try:
+        return fn()
+    finally:
+        close_old_connections()
+
+
+def run_sections(tasks):
+    """
+    Runs {name: callable} and returns ({name: result}, {name: milliseconds}).
+
+    Falls back to running inline with a single worker, or when the caller is inside a
+    transaction, since other threads' connections would not see its uncommitted rows.
+    """
+    timings = {}
+
+    def timed(name, fn):
+        started = time.perf_counter()
+        try:
+            return fn()
+        finally:
+            timings[name] = round((time.perf_counter() - started) * 1000, 1)
+
+    if settings.DASHBOARD_SECTION_WORKERS <= 1 or len(tasks) <= 1 or connection.in_atomic_block:
+        results = {name: timed(name, fn) for name, fn in tasks.items()}
+    else:
+        pool = _pool()
+        futures = {
+            name: pool.submit(_in_worker, lambda name=name, fn=fn: timed(name, fn))
+            for name, fn in tasks.items()
+        }
+        results = {name: future.result() for name, future in futures.items()}
+
+    return results, {name: timings[name] for name in tasks}
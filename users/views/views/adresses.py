@@ -1,30 +1,152 @@
-from django.http import JsonResponse
-from users.models.addresses import Province, District, Sector, Cell, Village
+from django.core.files.storage import default_storage
+from django.http import HttpResponse, JsonResponse
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition, require_GET
+from users.models.addresses import District, Cell
+from users.utils import boundaries, geo_bundles, geo_index, hierarchy, place_search
 
-# Existing endpoints remain unchanged
+
+# Dropdown endpoints are served from the in-memory hierarchy snapshot (users/utils/hierarchy.py).
+# The ETag is the snapshot version, so clients revalidate with If-None-Match and get a 304
+# until the hierarchy changes.
+def _snapshot(request):
+    if not hasattr(request, "_hierarchy"):
+        request._hierarchy = hierarchy.current()
+    return request._hierarchy
+
+
+def _etag(request, *args, **kwargs):
+    return f'"hierarchy-{_snapshot(request).version}"'
+
+
+def _parent_id(request, name):
+    try:
+        return int(request.GET.get(name))
+    except (TypeError, ValueError):
+        return None
+
+
+def _respond(payload):
+    response = JsonResponse(payload) if isinstance(payload, dict) else HttpResponse(payload, content_type="application/json")
+    patch_cache_control(response, no_cache=True)
+    return response
+
+
+def _children(request, level, parent_param):
+    rows = _snapshot(request).children_of(level, _parent_id(request, parent_param))
+    return _respond({level: [dict(row) for row in rows]})
+
+
+@require_GET
+@condition(etag_func=_etag)
 def get_provinces(request):
-    provinces = Province.objects.all().values('id', 'name')
-    return JsonResponse({'provinces': list(provinces)})
+    return _children(request, "provinces", None)
 
+@require_GET
+@condition(etag_func=_etag)
 def get_districts(request):
-    province_id = request.GET.get('province_id')
-    districts = District.objects.filter(province_id=province_id).values('id', 'name')
-    return JsonResponse({'districts': list(districts)})
+    return _children(request, "districts", "province_id")
 
+@require_GET
+@condition(etag_func=_etag)
 def get_sectors(request):
-    district_id = request.GET.get('district_id')
-    sectors = Sector.objects.filter(district_id=district_id).values('id', 'name')
-    return JsonResponse({'sectors': list(sectors)})
+    return _children(request, "sectors", "district_id")
 
+@require_GET
+@condition(etag_func=_etag)
 def get_cells(request):
-    sector_id = request.GET.get('sector_id')
-    cells = Cell.objects.filter(sector_id=sector_id).values('id', 'name')
-    return JsonResponse({'cells': list(cells)})
+    return _children(request, "cells", "sector_id")
 
+@require_GET
+@condition(etag_func=_etag)
 def get_villages(request):
-    cell_id = request.GET.get('cell_id')
-    villages = Village.objects.filter(cell_id=cell_id).values('id', 'name')
-    return JsonResponse({'villages': list(villages)})
+    return _children(request, "villages", "cell_id")
+
+@require_GET
+@condition(etag_func=_etag)
+def get_hierarchy(request):
+    """
+    The whole hierarchy in one download, as flat lists with parent ids, for offline caching.
+    """
+    return _respond(_snapshot(request).bundle)
+
+@require_GET
+def locate_point(request):
+    """
+    Returns the village and cell containing ?lat=&lon=, with their ancestors. Uses the
+    imported boundary polygons, falling back to the nearest cell centroid where none
+    covers the point.
+    """
+    try:
+        lat, lon = float(request.GET["lat"]), float(request.GET["lon"])
+    except (KeyError, ValueError):
+        return JsonResponse({"detail": "lat and lon are required numbers."}, status=400)
+    if not geo_index.valid_point(lat, lon):
+        return JsonResponse({"detail": "lat and lon must be finite, within [-90, 90] and [-180, 180]."}, status=400)
+
+    payload = {"method": "polygon"}
+    location = boundaries.locate(lat, lon)
+    if location is None:
+        match = geo_index.nearest_cell(lat, lon)
+        if match is None:
+            return JsonResponse({"detail": "No cell found for this location."}, status=404)
+        location = boundaries.Location(match[0], None)
+        payload.update(method="centroid", distance_m=round(match[1], 1))
+
+    snapshot = hierarchy.current()
+    if location.village_id:
+        payload.update(snapshot.lineage("villages", location.village_id))
+    else:
+        payload.update(snapshot.lineage("cells", location.cell_id), village=None)
+    return JsonResponse(payload)
+
+@require_GET
+def search_places(request):
+    """
+    Ranked name search over every level, ?q=<name>[&level=village][&limit=10], returning
+    fully qualified paths (users/utils/place_search.py).
+    """
+    query = request.GET.get("q", "").strip()
+    level = request.GET.get("level")
+    if level and f"{level}s" not in hierarchy.LEVELS:
+        return JsonResponse({"detail": f"Unknown level {level!r}."}, status=400)
+    try:
+        limit = int(request.GET.get("limit", 10))
+    except ValueError:
+        return JsonResponse({"detail": "limit must be a number."}, status=400)
+
+    results = place_search.search(query, limit=limit, levels={f"{level}s"} if level else None) if query else []
+    return _respond({"query": query, "results": results})
+
+@require_GET
+def geo_bundle_status(request):
+    """
+    The offline bundle manifest, or with ?district=<id>&hash=<hash> whether a device's
+    bundle of that district is current (users/utils/geo_bundles.py).
+    """
+    manifest = geo_bundles.manifest()
+    if manifest is None:
+        return JsonResponse({"detail": "No geo bundles have been exported."}, status=404)
+    district = request.GET.get("district")
+    if district is None:
+        return _respond({
+            "hierarchy_version": manifest["hierarchy_version"],
+            "districts": {
+                key: {**entry, "url": default_storage.url(entry["path"])} for key, entry in manifest["districts"].items()
+            },
+        })
+
+    entry = manifest["districts"].get(district)
+    if entry is None:
+        return JsonResponse({"detail": f"No bundle for district {district!r}."}, status=404)
+    return _respond({
+        "district": int(district),
+        "current": request.GET.get("hash") == entry["hash"],
+        "hash": entry["hash"],
+        "size": entry["size"],
+        "url": default_storage.url(entry["path"]),
+    })
+
 
 # --- NEW ENDPOINTS ---
 
@@ -18,22 +18,7 @@ class ResourceRequestStatusViewSet(viewsets.GenericViewSet):
         return ResourceRequestDetailSerializer
 
     def get_queryset(self):
-        user = self.request.user
-
-        if user.user_level == "super_admin":
-            return self.queryset
-
-        if user.user_level == "district_officer":
-            return self.queryset.filter(
-                land__cell__sector__district=user.managed_district
-            )
-
-        if user.user_level == "cell_officer":
-            return self.queryset.filter(
-                land__cell=user.managed_cell
-            )
-
-        return self.queryset.filter(farmer=user)
+        return self.queryset.for_user(self.request.user)
 
     def partial_update(self, request, pk=None):
         user = request.user
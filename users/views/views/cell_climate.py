@@ -1,10 +1,16 @@
+from datetime import date, timedelta
 from rest_framework import viewsets, status
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
+from rest_framework.views import APIView
+from django.db.models import Q
 from django.utils import timezone
+from django.utils.dateparse import parse_date
 from report.models import CellClimateData, Cell
 from users.serializer.climate_data import CellClimateDataSerializer
 from users.utils.cell_data import fetch_live_data  # your live API call function
 from users.models import UserProfile 
+from users.utils import climate_series, geo_index
 
 class CellClimateDataViewSet(viewsets.ViewSet):
     """
@@ -13,25 +19,22 @@ class CellClimateDataViewSet(viewsets.ViewSet):
     """
     permission_classes = []
 
-    def get_cell_by_location(self, lat, lon, precision=5):
+    def get_cell_by_location(self, lat, lon):
         """
-        Try to match a cell approximately by latitude and longitude.
-        Precision: number of decimal points to match.
+        Returns (cell, distance in metres) of the cell nearest to latitude/longitude,
+        or None when no cell centroid is close enough (see users/utils/geo_index.py).
         """
-        factor = 10 ** precision
-        return Cell.objects.filter(
-            latitude__gte=(lat - 1/factor),
-            latitude__lte=(lat + 1/factor),
-            longitude__gte=(lon - 1/factor),
-            longitude__lte=(lon + 1/factor)
-        ).first()
-
-     # make sure this points to your actual profile model
+        match = geo_index.nearest_cell(lat, lon)
+        if match is None:
+            return None
+        cell_id, distance = match
+        cell = Cell.objects.filter(pk=cell_id).first()
+        return (cell, distance) if cell else None
 
     def get_cell(self, request):
         """
         Determine which cell to use based on:
-        1. Lat/Lon from frontend
+        1. Lat/Lon from frontend (nearest cell)
         2. Authenticated user's profile
         3. Explicit cell_id query param
         """
@@ -44,11 +47,12 @@ class CellClimateDataViewSet(viewsets.ViewSet):
                 lon = float(lon)
             except ValueError:
                 return None
-            # Try precision 5 → 4 → 3
-            for precision in [5, 4, 3]:
-                cell = self.get_cell_by_location(lat, lon, precision)
-                if cell:
-                    return cell
+            if not geo_index.valid_point(lat, lon):
+                raise ValidationError({"detail": "lat and lon must be finite, within [-90, 90] and [-180, 180]."})
+            match = self.get_cell_by_location(lat, lon)
+            if match:
+                cell, request.cell_distance_m = match
+                return cell
 
         # 2. Authenticated user fallback
         if request.user.is_authenticated:
@@ -79,11 +83,16 @@ class CellClimateDataViewSet(viewsets.ViewSet):
         if not cell:
             return Response({"detail": "Cell not found"}, status=status.HTTP_404_NOT_FOUND)
 
-        # Retrieve stored data
-        data_obj = CellClimateData.objects.filter(cell=cell).first()
+        # Retrieve stored data (the series of the cell's weather grid point, once fetched)
+        data_obj = CellClimateData.objects.select_related("cell", "grid_point").filter(cell=cell).filter(
+            Q(grid_point__forecast_fetched_at__isnull=False) | Q(grid_point__historical_fetched_at__isnull=False)
+        ).first()
         if data_obj:
-            serializer = CellClimateDataSerializer(data_obj)
-            return Response(serializer.data)
+            data = CellClimateDataSerializer(data_obj).data
+            distance = getattr(request, "cell_distance_m", None)
+            if distance is not None:
+                data["distance_m"] = round(distance, 1)
+            return Response(data)
 
         # Fallback to live API
         lat = request.query_params.get("lat")
@@ -93,3 +102,76 @@ class CellClimateDataViewSet(viewsets.ViewSet):
             return Response(live_data)
 
         return Response({"detail": "Data not found"}, status=status.HTTP_404_NOT_FOUND)
+
+
+def _date_window(params, default_days=30):
+    """
+    (start, end) from ?start=&end= (YYYY-MM-DD), ending today and spanning `default_days` by default.
+    """
+    window = {}
+    for name in ("start", "end"):
+        value = params.get(name)
+        if value:
+            try:
+                window[name] = parse_date(value)
+            except ValueError:
+                window[name] = None
+            if window[name] is None:
+                raise ValidationError({name: "Must be a date (YYYY-MM-DD)."})
+    end = window.get("end") or date.today()
+    start = window.get("start") or end - timedelta(days=default_days - 1)
+    if start > end:
+        raise ValidationError({"start": "Must not be after end."})
+    return start, end
+
+
+class CellClimateSeriesView(APIView):
+    """
+    A window of a cell's daily climate series.
+    GET /climate/daily/?cell_id=<id>&start=YYYY-MM-DD&end=YYYY-MM-DD
+    """
+    permission_classes = []
+
+    def get(self, request):
+        cell_id = request.query_params.get("cell_id", "")
+        if not cell_id.isdigit():
+            raise ValidationError({"cell_id": "Must be a number."})
+        start, end = _date_window(request.query_params)
+        data_obj = CellClimateData.objects.select_related("grid_point").filter(cell_id=cell_id, grid_point__isnull=False).first()
+        if data_obj is None:
+            return Response({"detail": "Cell not found"}, status=status.HTTP_404_NOT_FOUND)
+        return Response({
+            "cell_id": data_obj.cell_id,
+            "start": start,
+            "end": end,
+            "series": climate_series.archive_document(data_obj.grid_point, start, end),
+        })
+
+
+class ClimateAreaSummaryView(APIView):
+    """
+    Rainfall totals and mean daily extremes per cell, sector or district over a window.
+    GET /climate/summary/?group_by=sector&start=&end=[&district_id=|&sector_id=]
+    """
+    permission_classes = []
+
+    def get(self, request):
+        params = request.query_params
+        level = params.get("group_by", "sector")
+        if level not in climate_series.AREA_FIELDS:
+            raise ValidationError({"group_by": f"Must be one of {', '.join(climate_series.AREA_FIELDS)}."})
+        start, end = _date_window(params)
+        within = None
+        for parent in ("sector", "district"):
+            value = params.get(f"{parent}_id")
+            if value:
+                if not value.isdigit():
+                    raise ValidationError({f"{parent}_id": "Must be a number."})
+                within = (parent, int(value))
+                break
+        return Response({
+            "group_by": level,
+            "start": start,
+            "end": end,
+            "areas": climate_series.area_summary(level, start, end, within=within),
+        })
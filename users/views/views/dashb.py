@@ -1,6 +1,6 @@
 # dashboards/views.py
 from decimal import Decimal
-from django.db.models import Count, Sum, Q
+from django.db.models import Count, Sum, Q, DecimalField, IntegerField
 from django.db.models.functions import Coalesce
 from rest_framework.views import APIView
 from rest_framework.response import Response
@@ -10,6 +10,9 @@ from rest_framework.permissions import IsAuthenticated
 from users.models.customuser import CustomUser
 from users.models.addresses import District, Sector, Cell
 from users.models.products import Product  # ProductPrice/RecommendedQuantity not needed here
+from users.utils.aggregation import build_section
+from users.utils.scope import resolve_scope
+from users.utils import population
 
 # If these are in a different app, update paths accordingly
 from report.models import (
@@ -25,269 +28,21 @@ from report.models import (
     ResourceRequest,
     ResourceRequestFeedback,
     LandSeasonalAssignment,
+    district_remaining_expression,
 )
 
 class RoleAwareDashboard(APIView):
     permission_classes = [IsAuthenticated]
 
-    # ------------- helpers -------------
-
-    def _scope(self, user):
-        """
-        Returns a dict describing the geographic/ownership scope for queries.
-        Keys used:
-          - district (District or None)
-          - sector   (Sector or None)
-          - cell     (Cell or None)
-          - owner    (CustomUser or None)  # for citizens
-          - level    (str)                 # user_level
-          - label    (str)                 # human-readable scope
-        """
-        level = user.user_level
-        scope = {"district": None, "sector": None, "cell": None, "owner": None, "level": level, "label": "All"}
-
-        if level == "super_admin":
-            scope["label"] = "All"
-            return scope
-
-        if level == "district_officer":
-            district = getattr(user, "managed_district", None)
-            if not district:
-                # Unassigned officer: show empty scope but label it
-                scope["label"] = "Unassigned district"
-                return scope
-            scope.update(district=district, label=f"District: {district.name}")
-            return scope
-
-        if level == "sector_officer":
-            sector = getattr(user, "managed_sector", None)
-            if not sector:
-                scope["label"] = "Unassigned sector"
-                return scope
-            scope.update(sector=sector, district=sector.district, label=f"Sector: {sector.name}")
-            return scope
-
-        if level == "cell_officer":
-            cell = getattr(user, "managed_cell", None)
-            if not cell:
-                scope["label"] = "Unassigned cell"
-                return scope
-            scope.update(cell=cell, sector=cell.sector, district=cell.sector.district, label=f"Cell: {cell.name}")
-            return scope
-
-        # citizen (or any other user level defaults to own data)
-        scope.update(owner=user, label=f"My data ({user.get_full_name()})")
-        return scope
-
-    def _apply_scope(self, qs, scope, *, model):
-        """
-        Applies the scope to a queryset based on model type.
-        """
-        level = scope["level"]
-        district = scope["district"]
-        sector = scope["sector"]
-        cell = scope["cell"]
-        owner = scope["owner"]
-
-        # super_admin → no filter
-        if level == "super_admin":
-            return qs
-
-        # citizens → owner/farmer filters
-        if owner:
-            if model is Land:
-                return qs.filter(owner=owner)
-            if model is HarvestReport:
-                return qs.filter(farmer=owner)
-            if model is LivestockLocation:
-                return qs.filter(owner=owner)
-            if model is LivestockAnimal:
-                return qs.filter(livestock_location__owner=owner)
-            if model is LivestockProduction:
-                return qs.filter(farmer=owner)
-            if model is SeasonalCropPlan:
-                # citizen doesn't manage cells; show none
-                return qs.none()
-            if model is DistrictInventory:
-                return qs.none()
-            if model is CellInventory:
-                return qs.none()
-            if model is ResourceRequest:
-                return qs.filter(farmer=owner)
-            if model is CellResourceRequest:
-                return qs.none()
-            if model is ResourceRequestFeedback:
-                return qs.filter(farmer=owner)
-            if model is LandSeasonalAssignment:
-                return qs.filter(land__owner=owner)
-            return qs
-
-        # geography for officers
-        if district:
-            # district_officer scope (and also sector/cell officers inherit a district)
-            if model is Land:
-                qs = qs.filter(district=district)
-            elif model is HarvestReport:
-                qs = qs.filter(land__district=district)
-            elif model is LivestockLocation:
-                qs = qs.filter(district=district)
-            elif model is LivestockAnimal:
-                qs = qs.filter(livestock_location__district=district)
-            elif model is LivestockProduction:
-                qs = qs.filter(location__district=district)
-            elif model is SeasonalCropPlan:
-                qs = qs.filter(cell__sector__district=district)
-            elif model is DistrictInventory:
-                qs = qs.filter(district=district)
-            elif model is CellInventory:
-                qs = qs.filter(district=district)
-            elif model is ResourceRequest:
-                qs = qs.filter(land__district=district)
-            elif model is CellResourceRequest:
-                qs = qs.filter(cell__sector__district=district)
-            elif model is ResourceRequestFeedback:
-                qs = qs.filter(request__land__district=district)
-            elif model is LandSeasonalAssignment:
-                qs = qs.filter(land__district=district)
-
-        if sector:
-            # narrow to sector
-            if model is Land:
-                qs = qs.filter(sector=sector)
-            elif model is HarvestReport:
-                qs = qs.filter(land__sector=sector)
-            elif model is LivestockLocation:
-                qs = qs.filter(sector=sector)
-            elif model is LivestockAnimal:
-                qs = qs.filter(livestock_location__sector=sector)
-            elif model is LivestockProduction:
-                qs = qs.filter(location__sector=sector)
-            elif model is SeasonalCropPlan:
-                qs = qs.filter(cell__sector=sector)
-            elif model is CellInventory:
-                qs = qs.filter(sector=sector)
-            elif model is ResourceRequest:
-                qs = qs.filter(land__sector=sector)
-            elif model is CellResourceRequest:
-                qs = qs.filter(cell__sector=sector)
-            elif model is ResourceRequestFeedback:
-                qs = qs.filter(request__land__sector=sector)
-            elif model is LandSeasonalAssignment:
-                qs = qs.filter(land__sector=sector)
-
-        if cell:
-            # narrow to cell
-            if model is Land:
-                qs = qs.filter(cell=cell)
-            elif model is HarvestReport:
-                qs = qs.filter(land__cell=cell)
-            elif model is LivestockLocation:
-                qs = qs.filter(cell=cell)
-            elif model is LivestockAnimal:
-                qs = qs.filter(livestock_location__cell=cell)
-            elif model is LivestockProduction:
-                qs = qs.filter(location__cell=cell)
-            elif model is SeasonalCropPlan:
-                qs = qs.filter(cell=cell)
-            elif model is CellInventory:
-                qs = qs.filter(cell=cell)
-            elif model is ResourceRequest:
-                qs = qs.filter(land__cell=cell)
-            elif model is CellResourceRequest:
-                qs = qs.filter(cell=cell)
-            elif model is ResourceRequestFeedback:
-                qs = qs.filter(request__land__cell=cell)
-            elif model is LandSeasonalAssignment:
-                qs = qs.filter(land__cell=cell)
-
-        return qs
-
     # ------------- main -------------
 
     def get(self, request):
         user = request.user
-        scope = self._scope(user)
+        scope = resolve_scope(user)
 
-        # Users (role-scoped)
-        if user.user_level == "super_admin":
-            user_counts = {
-                "total_users": CustomUser.objects.count(),
-                "citizens": CustomUser.objects.filter(user_level="citizen").count(),
-                "cell_officers": CustomUser.objects.filter(user_level="cell_officer").count(),
-                "sector_officers": CustomUser.objects.filter(user_level="sector_officer").count(),
-                "district_officers": CustomUser.objects.filter(user_level="district_officer").count(),
-            }
-        elif user.user_level == "district_officer" and scope["district"]:
-            d = scope["district"]
-            user_counts = {
-                "total_users": CustomUser.objects.filter(
-                    Q(lands__district=d) |
-                    Q(livestock_locations__district=d) |
-                    Q(managed_cell__sector__district=d) |
-                    Q(managed_sector__district=d) |
-                    Q(managed_district=d)
-                ).distinct().count(),
-                "citizens": CustomUser.objects.filter(
-                    user_level="citizen",
-                    lands__district=d
-                ).distinct().count(),
-                "cell_officers": CustomUser.objects.filter(
-                    user_level="cell_officer",
-                    managed_cell__sector__district=d
-                ).distinct().count(),
-                "sector_officers": CustomUser.objects.filter(
-                    user_level="sector_officer",
-                    managed_sector__district=d
-                ).distinct().count(),
-                "district_officers": CustomUser.objects.filter(
-                    user_level="district_officer",
-                    managed_district=d
-                ).distinct().count(),
-            }
-        elif user.user_level == "sector_officer" and scope["sector"]:
-            s = scope["sector"]
-            user_counts = {
-                "total_users": CustomUser.objects.filter(
-                    Q(lands__sector=s) |
-                    Q(livestock_locations__sector=s) |
-                    Q(managed_cell__sector=s) |
-                    Q(managed_sector=s) |
-                    Q(managed_district=s.district)
-                ).distinct().count(),
-                "citizens": CustomUser.objects.filter(
-                    user_level="citizen", lands__sector=s
-                ).distinct().count(),
-                "cell_officers": CustomUser.objects.filter(
-                    user_level="cell_officer", managed_cell__sector=s
-                ).distinct().count(),
-                "sector_officers": CustomUser.objects.filter(
-                    user_level="sector_officer", managed_sector=s
-                ).distinct().count(),
-                "district_officers": CustomUser.objects.filter(
-                    user_level="district_officer", managed_district=s.district
-                ).distinct().count(),
-            }
-        elif user.user_level == "cell_officer" and scope["cell"]:
-            c = scope["cell"]
-            # citizens = owners with any Land or LivestockLocation in the cell
-            citizens_q = CustomUser.objects.filter(
-                user_level="citizen"
-            ).filter(
-                Q(lands__cell=c) | Q(livestock_locations__cell=c)
-            ).distinct()
-            user_counts = {
-                "total_users": CustomUser.objects.filter(
-                    Q(lands__cell=c) | Q(livestock_locations__cell=c) |
-                    Q(managed_cell=c) | Q(managed_sector=c.sector) | Q(managed_district=c.sector.district)
-                ).distinct().count(),
-                "citizens": citizens_q.count(),
-                "cell_officers": 1 if c.cell_officer_id else 0,
-                "sector_officers": 1 if c.sector.sector_officer_id else 0,
-                "district_officers": 1 if c.sector.district.district_officer_id else 0,
-            }
-        else:
-            # citizen or unassigned officer → user counts not meaningful
-            user_counts = None
+        # Users (role-scoped), from the maintained population counters;
+        # None for citizens and unassigned officers
+        user_counts = population.counts_for(scope)
 
         # Products by category (catalog-level — not geo-scoped)
         products_by_category = list(
@@ -296,70 +51,71 @@ class RoleAwareDashboard(APIView):
         total_products = sum(row["count"] for row in products_by_category)
 
         # Lands
-        land_qs = self._apply_scope(Land.objects.all(), scope, model=Land)
-        total_lands = land_qs.count()
-        total_hectares = land_qs.aggregate(
-            ha=Coalesce(Sum("size_hectares"), 0)
-        )["ha"]
+        land_qs = Land.objects.for_scope(scope)
+        land = build_section(land_qs, statuses=[], extra={"ha": Coalesce(Sum("size_hectares"), 0, output_field=DecimalField())})
+        total_lands = land["total"]
+        total_hectares = land["ha"]
 
         # Harvest reports
-        harvest_qs = self._apply_scope(HarvestReport.objects.all(), scope, model=HarvestReport)
-        harvest_total = harvest_qs.count()
-        harvest_qty = harvest_qs.aggregate(q=Coalesce(Sum("quantity"), 0.0))["q"]
-        harvest_by_status = list(
-            harvest_qs.values("stutus").annotate(count=Count("id"), quantity=Coalesce(Sum("quantity"), 0.0))
-        )
+        harvest_qs = HarvestReport.objects.for_scope(scope)
+        harvest = build_section(harvest_qs, quantity_field="quantity")
+        harvest_total = harvest["total"]
+        harvest_qty = harvest["total_quantity"]
+        harvest_by_status = harvest["by_status"]
 
         # Livestock
-        livestock_loc_qs = self._apply_scope(LivestockLocation.objects.all(), scope, model=LivestockLocation)
+        livestock_loc_qs = LivestockLocation.objects.for_scope(scope)
         livestock_locations = livestock_loc_qs.count()
 
-        livestock_animals_qs = self._apply_scope(LivestockAnimal.objects.all(), scope, model=LivestockAnimal)
-        livestock_animal_records = livestock_animals_qs.count()
-        livestock_total_animals = livestock_animals_qs.aggregate(
-            qty=Coalesce(Sum("quantity"), 0)
-        )["qty"]
+        livestock_animals_qs = LivestockAnimal.objects.for_scope(scope)
+        livestock_animals = build_section(livestock_animals_qs, statuses=[], extra={"qty": Coalesce(Sum("quantity"), 0, output_field=IntegerField())})
+        livestock_animal_records = livestock_animals["total"]
+        livestock_total_animals = livestock_animals["qty"]
 
-        livestock_prod_qs = self._apply_scope(LivestockProduction.objects.all(), scope, model=LivestockProduction)
-        livestock_productions = livestock_prod_qs.count()
-        livestock_production_qty = livestock_prod_qs.aggregate(
-            q=Coalesce(Sum("quantity"), 0.0)
-        )["q"]
-        livestock_prod_by_status = list(
-            livestock_prod_qs.values("status").annotate(count=Count("id"), quantity=Coalesce(Sum("quantity"), 0.0))
-        )
+        livestock_prod_qs = LivestockProduction.objects.for_scope(scope)
+        livestock_prod = build_section(livestock_prod_qs, quantity_field="quantity")
+        livestock_productions = livestock_prod["total"]
+        livestock_production_qty = livestock_prod["total_quantity"]
+        livestock_prod_by_status = livestock_prod["by_status"]
 
         # Seasonal planning
-        plans_qs = self._apply_scope(SeasonalCropPlan.objects.all(), scope, model=SeasonalCropPlan)
+        plans_qs = SeasonalCropPlan.objects.for_scope(scope)
         seasonal_plans = plans_qs.count()
 
-        land_assign_qs = self._apply_scope(LandSeasonalAssignment.objects.all(), scope, model=LandSeasonalAssignment)
+        land_assign_qs = LandSeasonalAssignment.objects.for_scope(scope)
         land_assignments = land_assign_qs.count()
 
         # Inventories
-        dist_inv_qs = self._apply_scope(DistrictInventory.objects.all(), scope, model=DistrictInventory)
-        district_inventories = dist_inv_qs.count()
-        district_inv_added = dist_inv_qs.aggregate(val=Coalesce(Sum("quantity_added"), 0))["val"]
-        # sum remaining via Python because it's a property
-        district_inv_remaining = sum((obj.quantity_remaining for obj in dist_inv_qs), 0.0)
+        dist_inv_qs = DistrictInventory.objects.for_scope(scope)
+        district_inventory = build_section(dist_inv_qs, statuses=[], extra={
+            "added": Coalesce(Sum("quantity_added"), 0, output_field=IntegerField()),
+            "remaining": Coalesce(Sum(district_remaining_expression()), Decimal(0), output_field=DecimalField()),
+        })
+        district_inventories = district_inventory["total"]
+        district_inv_added = district_inventory["added"]
+        district_inv_remaining = district_inventory["remaining"]
 
-        cell_inv_qs = self._apply_scope(CellInventory.objects.all(), scope, model=CellInventory)
-        cell_inventories = cell_inv_qs.count()
-        cell_inv_available = cell_inv_qs.aggregate(val=Coalesce(Sum("quantity_available"), 0))["val"]
+        cell_inv_qs = CellInventory.objects.for_scope(scope)
+        cell_inventory = build_section(cell_inv_qs, statuses=[], extra={"val": Coalesce(Sum("quantity_available"), 0, output_field=DecimalField())})
+        cell_inventories = cell_inventory["total"]
+        cell_inv_available = cell_inventory["val"]
 
         # Resource requests (farmer) + CellResourceRequest (cell)
-        rr_qs = self._apply_scope(ResourceRequest.objects.all(), scope, model=ResourceRequest)
-        rr_total = rr_qs.count()
-        rr_by_status = list(rr_qs.values("status").annotate(count=Count("id")))
+        rr_qs = ResourceRequest.objects.for_scope(scope)
+        farmer_requests = build_section(rr_qs)
+        rr_total = farmer_requests["total"]
+        rr_by_status = farmer_requests["by_status"]
 
-        crr_qs = self._apply_scope(CellResourceRequest.objects.all(), scope, model=CellResourceRequest)
-        crr_total = crr_qs.count()
-        crr_by_status = list(crr_qs.values("status").annotate(count=Count("id")))
+        crr_qs = CellResourceRequest.objects.for_scope(scope)
+        cell_requests = build_section(crr_qs)
+        crr_total = cell_requests["total"]
+        crr_by_status = cell_requests["by_status"]
 
         # Feedback
-        fb_qs = self._apply_scope(ResourceRequestFeedback.objects.all(), scope, model=ResourceRequestFeedback)
-        feedback_total = fb_qs.count()
-        feedback_avg = fb_qs.aggregate(avg=Coalesce(Sum("rating"), 0))["avg"]
+        fb_qs = ResourceRequestFeedback.objects.for_scope(scope)
+        feedback = build_section(fb_qs, statuses=[], extra={"avg": Coalesce(Sum("rating"), 0, output_field=IntegerField())})
+        feedback_total = feedback["total"]
+        feedback_avg = feedback["avg"]
         if feedback_total:
             feedback_avg = float(feedback_avg) / float(feedback_total)
         else:
@@ -384,7 +140,7 @@ class RoleAwareDashboard(APIView):
             "harvest_reports": {
                 "total": harvest_total,
                 "total_quantity": harvest_qty,
-                "by_status": harvest_by_status,   # [{'stutus': 'available', 'count': n, 'quantity': q}, ...]
+                "by_status": harvest_by_status,   # [{'status': 'available', 'count': n, 'quantity': q}, ...]
             },
 
             "livestock": {
@@ -1,17 +1,28 @@
 # dashboards/views.py
+import uuid
 from decimal import Decimal
-from django.db.models import  Q
+from datetime import date
+from functools import partial
+from django.conf import settings
+from django.db.models import Q, Sum, Count, DecimalField, FloatField, IntegerField
 from django.db.models.functions import Coalesce
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from rest_framework.exceptions import ValidationError, PermissionDenied
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Sum, Count, DecimalField, FloatField, IntegerField
-from django.db.models.functions import Coalesce
-from users.models.addresses import District, Sector, Cell
-from report.models import FarmerIssue, FarmerIssueReply
-
-from users.models.customuser import CustomUser
-from users.models.products import Product  
+from users.models.addresses import Cell
+from report.models import FarmerIssue, DailyActivityBucket
+from users.utils.rollups import get_rollup, REQUEST_STATUSES, REPORT_STATUSES, ISSUE_STATUSES
+from users.utils.aggregation import build_section
+from users.utils.keyset import keyset_page
+from users.utils import activity
+from users.utils.sections import parse_sections, run_sections
+from users.utils.scope import resolve_scope
+from users.utils import dashboard_cache
+from users.utils import population
+from users.tasks.dashboard_cache import refresh_dashboard_cache
+
+from users.models.products import Product
 # If these are in a different app, update paths accordingly
 from report.models import (
     Land,
@@ -19,261 +30,105 @@ from report.models import (
     LivestockLocation,
     LivestockAnimal,
     LivestockProduction,
-    SeasonalCropPlan,
     DistrictInventory,
     CellInventory,
     CellResourceRequest,
     ResourceRequest,
     ResourceRequestFeedback,
-    LandSeasonalAssignment,
+    district_remaining_expression,
+)
+
+# Response blocks, in payload order; ?sections= selects a subset
+DASHBOARD_SECTIONS = (
+    "user_counts",
+    "products",
+    "land",
+    "harvest_reports",
+    "livestock",
+    "livestock_productions",
+    "seasonal_planning",
+    "inventories",
+    "farmer_issues",
+    "resource_requests",
+)
+# Sections served from the GeoRollup row when the scope has one
+STAT_SECTIONS = (
+    "land",
+    "harvest_reports",
+    "livestock",
+    "livestock_productions",
+    "inventories",
+    "farmer_issues",
+    "resource_requests",
 )
 
+
 class RoleAwareDashboard(APIView):
     permission_classes = [IsAuthenticated]
 
-    # ------------- helpers -------------
+    # ------------- main -------------
 
-    def _scope(self, user):
-        """
-        Returns a dict describing the geographic/ownership scope for queries.
-        Keys used:
-          - district (District or None)
-          - sector   (Sector or None)
-          - cell     (Cell or None)
-          - owner    (CustomUser or None)  # for citizens
-          - level    (str)                 # user_level
-          - label    (str)                 # human-readable scope
-        """
-        level = user.user_level
-        scope = {"district": None, "sector": None, "cell": None, "owner": None, "level": level, "label": "All"}
-
-        if level == "super_admin":
-            scope["label"] = "All"
-            return scope
-
-        if level == "district_officer":
-            district = getattr(user, "managed_district", None)
-            if not district:
-                # Unassigned officer: show empty scope but label it
-                scope["label"] = "Unassigned district"
-                return scope
-            scope.update(district=district, label=f"District: {district.name}")
-            return scope
-
-        if level == "sector_officer":
-            sector = getattr(user, "managed_sector", None)
-            if not sector:
-                scope["label"] = "Unassigned sector"
-                return scope
-            scope.update(sector=sector, district=sector.district, label=f"Sector: {sector.name}")
-            return scope
-
-        if level == "cell_officer":
-            cell = getattr(user, "managed_cell", None)
-            if not cell:
-                scope["label"] = "Unassigned cell"
-                return scope
-            scope.update(cell=cell, sector=cell.sector, district=cell.sector.district, label=f"Cell: {cell.name}")
-            return scope
-
-        # citizen (or any other user level defaults to own data)
-        scope.update(owner=user, label=f"My data ({user.get_full_name()})")
-        return scope
-
-    def _apply_scope(self, qs, scope, *, model):
+    def get(self, request):
+        user = request.user
+        scope = resolve_scope(user)
+        sections = parse_sections(request.query_params.get("sections"), DASHBOARD_SECTIONS)
+
+        payload, cache_meta = dashboard_cache.fetch(
+            scope,
+            lambda s: self.build_payload(s, sections),
+            revalidate=lambda: refresh_dashboard_cache.delay(user.pk, sections),
+            variant=",".join(sections),
+        )
+        response = Response({**payload, "cache": cache_meta})
+        response["Age"] = str(cache_meta["age"])
+        return response
+
+    def build_payload(self, scope, sections=DASHBOARD_SECTIONS):
         """
-        Applies the scope to a queryset based on model type.
+        Computes the requested dashboard sections for a scope, concurrently on the shared
+        section pool (see users/utils/sections.py). Cached per scope and section set by
+        users/utils/dashboard_cache.py.
         """
-        level = scope["level"]
-        district = scope["district"]
-        sector = scope["sector"]
-        cell = scope["cell"]
-        owner = scope["owner"]
-
-        # super_admin → no filter
-        if level == "super_admin":
-            return qs
-
-        # citizens → owner/farmer filters
-        if owner:
-            if model is Land:
-                return qs.filter(owner=owner)
-            if model is HarvestReport:
-                return qs.filter(farmer=owner)
-            if model is LivestockLocation:
-                return qs.filter(owner=owner)
-            if model is LivestockAnimal:
-                return qs.filter(livestock_location__owner=owner)
-            if model is LivestockProduction:
-                return qs.filter(farmer=owner)
-            if model is Cell:  # seasonal planning is now on Cell
-                return qs.none()
-            if model is ResourceRequest:
-                return qs.filter(farmer=owner)
-            if model is ResourceRequestFeedback:
-                return qs.filter(farmer=owner)
-            if model is FarmerIssue:
-                return qs.filter(farmer=owner)
-            if model is FarmerIssueReply:
-                return qs.filter(issue__farmer=owner)
-            return qs
-
-        # geography for officers
-        if district:
-            if model is Land:
-                qs = qs.filter(district=district)
-            elif model is HarvestReport:
-                qs = qs.filter(land__district=district)
-            elif model is LivestockLocation:
-                qs = qs.filter(district=district)
-            elif model is LivestockAnimal:
-                qs = qs.filter(livestock_location__district=district)
-            elif model is LivestockProduction:
-                qs = qs.filter(location__district=district)
-            elif model is Cell:
-                qs = qs.filter(sector__district=district)
-            elif model is ResourceRequest:
-                qs = qs.filter(land__district=district)
-            elif model is ResourceRequestFeedback:
-                qs = qs.filter(request__land__district=district)
-            elif model is FarmerIssue:
-                qs = qs.filter(district=district)
-            elif model is FarmerIssueReply:
-                qs = qs.filter(issue__district=district)
-
-        if sector:
-            if model is Land:
-                qs = qs.filter(sector=sector)
-            elif model is HarvestReport:
-                qs = qs.filter(land__sector=sector)
-            elif model is LivestockLocation:
-                qs = qs.filter(sector=sector)
-            elif model is LivestockAnimal:
-                qs = qs.filter(livestock_location__sector=sector)
-            elif model is LivestockProduction:
-                qs = qs.filter(location__sector=sector)
-            elif model is Cell:
-                qs = qs.filter(sector=sector)
-            elif model is ResourceRequest:
-                qs = qs.filter(land__sector=sector)
-            elif model is ResourceRequestFeedback:
-                qs = qs.filter(request__land__sector=sector)
-            elif model is FarmerIssue:
-                qs = qs.filter(sector=sector)
-            elif model is FarmerIssueReply:
-                qs = qs.filter(issue__sector=sector)
-
-        if cell:
-            if model is Land:
-                qs = qs.filter(cell=cell)
-            elif model is HarvestReport:
-                qs = qs.filter(land__cell=cell)
-            elif model is LivestockLocation:
-                qs = qs.filter(cell=cell)
-            elif model is LivestockAnimal:
-                qs = qs.filter(livestock_location__cell=cell)
-            elif model is LivestockProduction:
-                qs = qs.filter(location__cell=cell)
-            elif model is Cell:
-                qs = qs.filter(id=cell.id if hasattr(cell, "id") else cell)
-            elif model is ResourceRequest:
-                qs = qs.filter(land__cell=cell)
-            elif model is ResourceRequestFeedback:
-                qs = qs.filter(request__land__cell=cell)
-            elif model is FarmerIssue:
-                qs = qs.filter(cell=cell)
-            elif model is FarmerIssueReply:
-                qs = qs.filter(issue__cell=cell)
-
-        return qs
+        # Aggregates: one precomputed row for geographic scopes, live queries otherwise
+        rollup = get_rollup(scope) if set(sections) & set(STAT_SECTIONS) else None
 
-    # ------------- main -------------
+        results, timings = run_sections({
+            name: partial(self._section, name, scope, rollup) for name in sections
+        })
+        return {
+            "scope": scope["label"],
+            "user_level": scope["level"],
+            **results,
+            "section_timings_ms": timings,
+        }
 
-    def get(self, request):
-        user = request.user
-        scope = self._scope(user)
-
-        # Users (role-scoped)
-        if user.user_level == "super_admin":
-            user_counts = {
-                "total_users": CustomUser.objects.count(),
-                "citizens": CustomUser.objects.filter(user_level="citizen").count(),
-                "cell_officers": CustomUser.objects.filter(user_level="cell_officer").count(),
-                "sector_officers": CustomUser.objects.filter(user_level="sector_officer").count(),
-                "district_officers": CustomUser.objects.filter(user_level="district_officer").count(),
-            }
-        elif user.user_level == "district_officer" and scope["district"]:
-            d = scope["district"]
-            user_counts = {
-                "total_users": CustomUser.objects.filter(
-                    Q(lands__district=d) |
-                    Q(livestock_locations__district=d) |
-                    Q(managed_cell__sector__district=d) |
-                    Q(managed_sector__district=d) |
-                    Q(managed_district=d)
-                ).distinct().count(),
-                "citizens": CustomUser.objects.filter(
-                    user_level="citizen",
-                    lands__district=d
-                ).distinct().count(),
-                "cell_officers": CustomUser.objects.filter(
-                    user_level="cell_officer",
-                    managed_cell__sector__district=d
-                ).distinct().count(),
-                "sector_officers": CustomUser.objects.filter(
-                    user_level="sector_officer",
-                    managed_sector__district=d
-                ).distinct().count(),
-                "district_officers": CustomUser.objects.filter(
-                    user_level="district_officer",
-                    managed_district=d
-                ).distinct().count(),
-            }
-        elif user.user_level == "sector_officer" and scope["sector"]:
-            s = scope["sector"]
-            user_counts = {
-                "total_users": CustomUser.objects.filter(
-                    Q(lands__sector=s) |
-                    Q(livestock_locations__sector=s) |
-                    Q(managed_cell__sector=s) |
-                    Q(managed_sector=s) |
-                    Q(managed_district=s.district)
-                ).distinct().count(),
-                "citizens": CustomUser.objects.filter(
-                    user_level="citizen", lands__sector=s
-                ).distinct().count(),
-                "cell_officers": CustomUser.objects.filter(
-                    user_level="cell_officer", managed_cell__sector=s
-                ).distinct().count(),
-                "sector_officers": CustomUser.objects.filter(
-                    user_level="sector_officer", managed_sector=s
-                ).distinct().count(),
-                "district_officers": CustomUser.objects.filter(
-                    user_level="district_officer", managed_district=s.district
-                ).distinct().count(),
-            }
-        elif user.user_level == "cell_officer" and scope["cell"]:
-            c = scope["cell"]
-            # citizens = owners with any Land or LivestockLocation in the cell
-            citizens_q = CustomUser.objects.filter(
-                user_level="citizen"
-            ).filter(
-                Q(lands__cell=c) | Q(livestock_locations__cell=c)
-            ).distinct()
-            user_counts = {
-                "total_users": CustomUser.objects.filter(
-                    Q(lands__cell=c) | Q(livestock_locations__cell=c) |
-                    Q(managed_cell=c) | Q(managed_sector=c.sector) | Q(managed_district=c.sector.district)
-                ).distinct().count(),
-                "citizens": citizens_q.count(),
-                "cell_officers": 1 if c.cell_officer_id else 0,
-                "sector_officers": 1 if c.sector.sector_officer_id else 0,
-                "district_officers": 1 if c.sector.district.district_officer_id else 0,
-            }
+    def _section(self, name, scope, rollup):
+        if name not in STAT_SECTIONS:
+            return getattr(self, f"_{name}")(scope)
+
+        if rollup is not None:
+            section = self._rollup_stats(rollup)[name]
         else:
-            # citizen or unassigned officer → user counts not meaningful
-            user_counts = None
+            section = getattr(self, f"_live_{name}")(scope)
+
+        if name == "farmer_issues":
+            # Most recent issues only; the rest is paged through /dashboard/issues/?cursor=
+            issues_details, issues_next_cursor = self.issues_page(scope, limit=settings.DASHBOARD_ISSUES_LIMIT)
+            section = {
+                **section,
+                "issues_details": issues_details,  # Optional for table display
+                "issues_next_cursor": issues_next_cursor,
+            }
+        return section
 
+    # ------------- sections -------------
+
+    def _user_counts(self, scope):
+        # Users (role-scoped), from the maintained population counters (users/utils/population.py);
+        # None for citizens and unassigned officers
+        return population.counts_for(scope)
+
+    def _products(self, scope):
         # Products by category (catalog-level — not geo-scoped)
         products_by_category = list(
             Product.objects.values("category")
@@ -286,101 +141,22 @@ class RoleAwareDashboard(APIView):
 
         total_products = sum(row["total"] for row in products_by_category)
 
-
-        
-
-        # Lands
-        land_qs = self._apply_scope(Land.objects.all(), scope, model=Land)
-        total_lands = land_qs.count()
-        total_hectares = land_qs.aggregate(
-            ha=Coalesce(Sum("size_hectares"), 0, output_field=DecimalField())
-        )["ha"]
-
-        # Harvest reports
-        harvest_qs = self._apply_scope(HarvestReport.objects.all(), scope, model=HarvestReport)
-        harvest_total = harvest_qs.count()
-        harvest_qty = harvest_qs.aggregate(
-            q=Coalesce(Sum("quantity"), 0.0, output_field=FloatField())
-        )["q"]
-        harvest_by_status = list(
-            harvest_qs.values("status").annotate(
-                count=Count("id"),
-                quantity=Coalesce(Sum("quantity"), 0.0, output_field=FloatField())
-            )
-        )
-
-        # ----------------------------
-        # LIVESTOCK SUMMARY
-        # ----------------------------
-        livestock_location_qs = self._apply_scope(
-            LivestockLocation.objects.all(),
-            scope,
-            model=LivestockLocation
-        )
-        livestock_total_locations = livestock_location_qs.count()
-
-        livestock_total_animals = LivestockAnimal.objects.filter(
-            livestock_location__in=livestock_location_qs
-        ).aggregate(
-            total=Coalesce(Sum("quantity"), 0, output_field=IntegerField())
-        )["total"]
-
-        # Optional: total products per location
-        livestock_total_products = livestock_location_qs.annotate(
-            product_count=Count("products")
-        ).aggregate(
-            total=Coalesce(Sum("product_count"), 0, output_field=IntegerField())
-        )["total"]
-
-        livestock_summary = {
-            "total": livestock_total_locations,
-            "total_animals": livestock_total_animals,
-            "total_products(If_any)": livestock_total_products
+        return {
+            "total": total_products,
+            "by_category": products_by_category,
         }
 
-        # ----------------------------
-        # LIVESTOCK PRODUCTIONS
-        # ----------------------------
-        livestock_prod_qs = self._apply_scope(
-            LivestockProduction.objects.all(),
-            scope,
-            model=LivestockProduction
-        )
-
-        livestock_productions_total = livestock_prod_qs.count()
-        livestock_productions_qty = livestock_prod_qs.aggregate(
-            q=Coalesce(Sum("quantity"), 0.0, output_field=FloatField())
-        )["q"]
-
-        livestock_productions_by_status = list(
-            livestock_prod_qs.values("status").annotate(
-                count=Count("id"),
-                quantity=Coalesce(Sum("quantity"), 0.0, output_field=FloatField())
-            )
-        )
-
-        livestock_productions_data = {
-            "total": livestock_productions_total,
-            "total_quantity": livestock_productions_qty,
-            "by_status": livestock_productions_by_status
-        }
-
-        
-
+    def _seasonal_planning(self, scope):
         # Seasonal planning
         current_season = Cell.get_current_season()
         current_year = Cell.get_current_season_year()
 
         # Cells with seasonal plans (with crop info)
-        seasonal_plans_qs = self._apply_scope(
-            Cell.objects.filter(
+        seasonal_plans_qs = Cell.objects.filter(
                 season=current_season,
                 season_year=current_year,
                 planned_crop__isnull=False
-            ).select_related("planned_crop"),
-            scope,
-            model=Cell
-        )
+            ).select_related("planned_crop").for_scope(scope)
 
         # Count of plans
         seasonal_plans = seasonal_plans_qs.count()
@@ -396,155 +172,297 @@ class RoleAwareDashboard(APIView):
         ))
 
         # Lands in those cells
-        land_qs = self._apply_scope(
-            Land.objects.filter(cell__in=seasonal_plans_qs),
-            scope,
-            model=Land
-        )
+        land_qs = Land.objects.filter(cell__in=seasonal_plans_qs).for_scope(scope)
 
         land_assignments = land_qs.count()
         land_total_hectares = land_qs.aggregate(
             total_hectares=Sum("size_hectares")
         )["total_hectares"] or 0
-        # Inventories
-        dist_inv_qs = self._apply_scope(DistrictInventory.objects.all(), scope, model=DistrictInventory)
-        district_inventories = dist_inv_qs.count()
-        district_inv_added = dist_inv_qs.aggregate(
-            val=Coalesce(Sum("quantity_added"), 0.0, output_field=FloatField())
-        )["val"]
-
-        district_inv_remaining = sum((obj.quantity_remaining for obj in dist_inv_qs), Decimal(0))
-
-        cell_inv_qs = self._apply_scope(CellInventory.objects.all(), scope, model=CellInventory)
-        cell_inventories = cell_inv_qs.count()
-        cell_inv_available = cell_inv_qs.aggregate(
-            val=Coalesce(Sum("quantity_available"), 0.0, output_field=FloatField())
-        )["val"]
-
-        # Resource requests
-        rr_qs = self._apply_scope(ResourceRequest.objects.all(), scope, model=ResourceRequest)
-        rr_total = rr_qs.count()
-        rr_by_status = list(rr_qs.values("status").annotate(count=Count("id")))
-
-        crr_qs = self._apply_scope(CellResourceRequest.objects.all(), scope, model=CellResourceRequest)
-        crr_total = crr_qs.count()
-        crr_by_status = list(crr_qs.values("status").annotate(count=Count("id")))
-
-        # Feedback
-        fb_qs = self._apply_scope(ResourceRequestFeedback.objects.all(), scope, model=ResourceRequestFeedback)
-        feedback_total = fb_qs.count()
-        feedback_avg = fb_qs.aggregate(
-            avg=Coalesce(Sum("rating"), 0.0, output_field=FloatField())
-        )["avg"]
-
-        if feedback_total:
-            feedback_avg = float(feedback_avg) / float(feedback_total)
-        else:
-            feedback_avg = None
-
-
-        
-        #ISSUES
 
-        # Filter issues with your scope logic
-        issues_qs = self._apply_scope(
-            FarmerIssue.objects.all(),
-            scope,
-            model=FarmerIssue
-        )
-
-        # Status counts
-        status_counts = issues_qs.aggregate(
-            pending=Count("id", filter=Q(status__iexact="Pending")),
-            resolved=Count("id", filter=Q(status__iexact="Resolved")),
-            approved=Count("id", filter=Q(status__iexact="Approved")),
-        )
-
-        # Reply counts
-        replied_counts = issues_qs.annotate(reply_count=Count("replies")).aggregate(
-            with_reply=Count("id", filter=Q(reply_count__gt=0)),
-            without_reply=Count("id", filter=Q(reply_count=0)),
-        )
+        return {
+            "season": current_season,
+            "season_year": current_year,
+            "seasonal_plans": seasonal_plans,
+            "seasonal_plan_details": seasonal_plan_details,
+            "land_assignments": land_assignments,
+            "total_land_hectares": float(land_total_hectares) if isinstance(land_total_hectares, Decimal) else land_total_hectares,
+        }
 
-        # Optional: detailed list if needed
-        issues_details = list(
-            issues_qs.values(
-                "id",
-                "issue_type",
-                "status",
-                "farmer__full_names",
-                "reported_at",
-            )
+    def issues_page(self, scope, *, cursor=None, limit):
+        """
+        Returns (issues, next_cursor): a page of the scope's issues, newest first,
+        keyset-paginated on (reported_at, id).
+        """
+        issues_qs = FarmerIssue.objects.for_scope(scope).values(
+            "id",
+            "issue_type",
+            "status",
+            "farmer__full_names",
+            "reported_at",
         )
+        return keyset_page(issues_qs, ("reported_at", "id"), cursor=cursor, limit=limit)
 
+    # ------------- aggregates -------------
 
-
-        return Response({
-            "scope": scope["label"],
-            "user_level": scope["level"],
-
-            "user_counts": user_counts,
-
-            "products": {
-                "total": total_products,
-                "by_category": products_by_category,
-            },
-
+    def _rollup_stats(self, rollup):
+        """
+        Builds the aggregate sections from a precomputed GeoRollup row (see users/utils/rollups.py).
+        """
+        def by_status(prefix, count_suffix):
+            # [{'status': 'available', 'count': n, 'quantity': q}, ...] like the live values('status') query
+            rows = []
+            for status in REPORT_STATUSES:
+                count = getattr(rollup, f"{prefix}_{status}_{count_suffix}")
+                if count:
+                    rows.append({
+                        "status": status,
+                        "count": count,
+                        "quantity": getattr(rollup, f"{prefix}_{status}_quantity"),
+                    })
+            return rows
+
+        request_counts = {s: getattr(rollup, f"requests_{s}") for s in REQUEST_STATUSES}
+        cell_request_counts = {s: getattr(rollup, f"cell_requests_{s}") for s in REQUEST_STATUSES}
+        status_counts = {s: getattr(rollup, f"issues_{s}") for s in ISSUE_STATUSES}
+
+        return {
             "land": {
-                "total_parcels": total_lands,
-                "total_hectares": float(total_hectares) if isinstance(total_hectares, Decimal) else total_hectares,
+                "total_parcels": rollup.lands,
+                "total_hectares": float(rollup.hectares),
             },
-
             "harvest_reports": {
-                "total": harvest_total,
-                "total_quantity": harvest_qty,
-                "by_status": harvest_by_status,   # [{'status': 'available', 'count': n, 'quantity': q}, ...]
+                "total": rollup.harvest_reports,
+                "total_quantity": rollup.harvest_quantity,
+                "by_status": by_status("harvest", "reports"),
             },
-
-            
-            "livestock": livestock_summary,
-            "livestock_productions": livestock_productions_data,
-        
-            "seasonal_planning": {
-                "season": current_season,
-                "season_year": current_year,
-                "seasonal_plans": seasonal_plans,
-                "seasonal_plan_details": seasonal_plan_details,
-                "land_assignments": land_assignments,
-                "total_land_hectares": float(land_total_hectares) if isinstance(land_total_hectares, Decimal) else land_total_hectares,
+            "livestock": {
+                "total": rollup.livestock_locations,
+                "total_animals": rollup.livestock_animals,
+                "total_products(If_any)": rollup.livestock_products,
+            },
+            "livestock_productions": {
+                "total": rollup.livestock_productions,
+                "total_quantity": rollup.livestock_production_quantity,
+                "by_status": by_status("livestock", "productions"),
             },
-
             "inventories": {
                 "district": {
-                    "records": district_inventories,
-                    "quantity_added_total": district_inv_added,
-                    "quantity_remaining_total": district_inv_remaining,
+                    "records": rollup.district_inventory_records,
+                    "quantity_added_total": float(rollup.district_inventory_added),
+                    "quantity_remaining_total": rollup.district_inventory_remaining,
                 },
                 "cell": {
-                    "records": cell_inventories,
-                    "quantity_available_total": float(cell_inv_available) if isinstance(cell_inv_available, Decimal) else cell_inv_available,
+                    "records": rollup.cell_inventory_records,
+                    "quantity_available_total": float(rollup.cell_inventory_available),
                 }
             },
             "farmer_issues": {
-                "total_issues": issues_qs.count(),
+                "total_issues": rollup.issues_total,
                 "status_counts": status_counts,
-                "reply_counts": replied_counts,
+                "reply_counts": {
+                    "with_reply": rollup.issues_with_reply,
+                    "without_reply": rollup.issues_total - rollup.issues_with_reply,
+                },
                 "approved_issues": status_counts["approved"],
-                "issues_details": issues_details,  # Optional for table display
             },
-
             "resource_requests": {
                 "farmer_requests": {
-                    "total": rr_total,
-                    "by_status": rr_by_status,
+                    "total": sum(request_counts.values()),
+                    "by_status": [{"status": s, "count": c} for s, c in request_counts.items() if c],
                 },
                 "cell_requests": {
-                    "total": crr_total,
-                    "by_status": crr_by_status,
+                    "total": sum(cell_request_counts.values()),
+                    "by_status": [{"status": s, "count": c} for s, c in cell_request_counts.items() if c],
                 },
                 "feedback": {
-                    "total": feedback_total,
-                    "avg_rating": feedback_avg,
+                    "total": rollup.feedback_count,
+                    "avg_rating": rollup.feedback_rating_sum / rollup.feedback_count if rollup.feedback_count else None,
                 }
             },
+        }
+
+    # Live computation straight from the fact tables (citizens and unassigned officers).
+    # Each fact table is scanned once: totals, sums and per-status counts come from a single aggregate().
+
+    def _live_land(self, scope):
+        land_qs = Land.objects.for_scope(scope)
+        land = build_section(land_qs, statuses=[], extra={
+            "hectares": Coalesce(Sum("size_hectares"), 0, output_field=DecimalField()),
+        })
+        return {
+            "total_parcels": land["total"],
+            "total_hectares": float(land["hectares"]) if isinstance(land["hectares"], Decimal) else land["hectares"],
+        }
+
+    def _live_harvest_reports(self, scope):
+        harvest_qs = HarvestReport.objects.for_scope(scope)
+        harvest = build_section(harvest_qs, quantity_field="quantity")
+        return {
+            "total": harvest["total"],
+            "total_quantity": harvest["total_quantity"],
+            "by_status": harvest["by_status"],   # [{'status': 'available', 'count': n, 'quantity': q}, ...]
+        }
+
+    def _live_livestock(self, scope):
+        livestock_location_qs = LivestockLocation.objects.for_scope(scope)
+        livestock_locations = build_section(livestock_location_qs, statuses=[], distinct=True, extra={
+            "products": Count("products"),
+        })
+
+        livestock_total_animals = LivestockAnimal.objects.filter(
+            livestock_location__in=livestock_location_qs
+        ).aggregate(
+            total=Coalesce(Sum("quantity"), 0, output_field=IntegerField())
+        )["total"]
+
+        return {
+            "total": livestock_locations["total"],
+            "total_animals": livestock_total_animals,
+            "total_products(If_any)": livestock_locations["products"]
+        }
+
+    def _live_livestock_productions(self, scope):
+        livestock_prod_qs = LivestockProduction.objects.for_scope(scope)
+        livestock_productions = build_section(livestock_prod_qs, quantity_field="quantity")
+        return {
+            "total": livestock_productions["total"],
+            "total_quantity": livestock_productions["total_quantity"],
+            "by_status": livestock_productions["by_status"],
+        }
+
+    def _live_inventories(self, scope):
+        dist_inv_qs = DistrictInventory.objects.for_scope(scope, public=True)
+        district_inventory = build_section(dist_inv_qs, statuses=[], extra={
+            "added": Coalesce(Sum("quantity_added"), 0.0, output_field=FloatField()),
+            "remaining": Coalesce(Sum(district_remaining_expression()), Decimal(0), output_field=DecimalField()),
+        })
+
+        cell_inv_qs = CellInventory.objects.for_scope(scope, public=True)
+        cell_inventory = build_section(cell_inv_qs, statuses=[], extra={
+            "available": Coalesce(Sum("quantity_available"), 0.0, output_field=FloatField()),
+        })
+
+        return {
+            "district": {
+                "records": district_inventory["total"],
+                "quantity_added_total": district_inventory["added"],
+                "quantity_remaining_total": district_inventory["remaining"],
+            },
+            "cell": {
+                "records": cell_inventory["total"],
+                "quantity_available_total": cell_inventory["available"],
+            }
+        }
+
+    def _live_farmer_issues(self, scope):
+        issues_qs = FarmerIssue.objects.for_scope(scope)
+
+        # Status and reply counts (distinct because the reply filter joins replies)
+        issues = build_section(issues_qs, statuses=ISSUE_STATUSES, iexact=True, distinct=True, extra={
+            "with_reply": Count("pk", filter=Q(replies__isnull=False), distinct=True),
+        })
+        status_counts = issues["status_counts"]
+
+        return {
+            "total_issues": issues["total"],
+            "status_counts": status_counts,
+            "reply_counts": {
+                "with_reply": issues["with_reply"],
+                "without_reply": issues["total"] - issues["with_reply"],
+            },
+            "approved_issues": status_counts["approved"],
+        }
+
+    def _live_resource_requests(self, scope):
+        rr_qs = ResourceRequest.objects.for_scope(scope)
+        farmer_requests = build_section(rr_qs)
+
+        crr_qs = CellResourceRequest.objects.for_scope(scope, public=True)
+        cell_requests = build_section(crr_qs)
+
+        # Feedback
+        fb_qs = ResourceRequestFeedback.objects.for_scope(scope)
+        feedback = build_section(fb_qs, statuses=[], extra={
+            "rating_sum": Coalesce(Sum("rating"), 0.0, output_field=FloatField()),
+        })
+        feedback_total = feedback["total"]
+        feedback_avg = float(feedback["rating_sum"]) / float(feedback_total) if feedback_total else None
+
+        return {
+            "farmer_requests": {
+                "total": farmer_requests["total"],
+                "by_status": farmer_requests["by_status"],
+            },
+            "cell_requests": {
+                "total": cell_requests["total"],
+                "by_status": cell_requests["by_status"],
+            },
+            "feedback": {
+                "total": feedback_total,
+                "avg_rating": feedback_avg,
+            }
+        }
+
+
+class DashboardIssuesView(APIView):
+    """
+    Full, keyset-paginated table behind the dashboard's issues_details.
+    GET /dashboard/issues/?cursor=<next_cursor>&limit=<n>
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        try:
+            limit = int(request.query_params.get("limit", settings.DASHBOARD_ISSUES_LIMIT))
+        except ValueError:
+            raise ValidationError({"limit": "Must be an integer."})
+        limit = max(1, min(limit, settings.DASHBOARD_ISSUES_MAX_LIMIT))
+
+        scope = resolve_scope(request.user)
+        issues, next_cursor = RoleAwareDashboard().issues_page(
+            scope, cursor=request.query_params.get("cursor"), limit=limit
+        )
+        return Response({
+            "scope": scope["label"],
+            "results": issues,
+            "next_cursor": next_cursor,
+        })
+
+
+class DashboardTimeseriesView(APIView):
+    """
+    Trend series for the officer's scope, rolled up from the daily activity buckets.
+    GET /dashboard/timeseries/?interval=day|week|month|season&start=YYYY-MM-DD&end=YYYY-MM-DD&product=<id>
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        params = request.query_params
+        interval = params.get("interval", "month")
+        if interval not in activity.INTERVALS:
+            raise ValidationError({"interval": f"Must be one of: {', '.join(activity.INTERVALS)}."})
+
+        scope = resolve_scope(request.user)
+        if scope["owner"]:
+            raise PermissionDenied("Trend charts are available to officers only.")
+
+        qs = DailyActivityBucket.objects.for_scope(scope)
+
+        try:
+            if params.get("start"):
+                qs = qs.filter(day__gte=date.fromisoformat(params["start"]))
+            if params.get("end"):
+                qs = qs.filter(day__lte=date.fromisoformat(params["end"]))
+        except ValueError:
+            raise ValidationError({"date": "start and end must be YYYY-MM-DD."})
+        if params.get("product"):
+            try:
+                qs = qs.filter(product=uuid.UUID(params["product"]))
+            except ValueError:
+                raise ValidationError({"product": "Must be a product id."})
+
+        return Response({
+            "scope": scope["label"],
+            "interval": interval,
+            "series": activity.rollup_series(qs, interval),
         })
@@ -4,7 +4,8 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from django.db.models import Sum
 from decimal import Decimal, InvalidOperation
-from report.models import FarmerInventory
+from report.models import FarmerInventory, farmer_remaining_expression
+from users.utils.filters import filter_by_remaining
 from users.serializer.farmer_inventory import FarmerInventorySerializer
 
 class FarmerInventoryViewSet(viewsets.ModelViewSet):
@@ -13,12 +14,13 @@ class FarmerInventoryViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         user = self.request.user
+        qs = filter_by_remaining(FarmerInventory.objects.with_remaining(), self.request.query_params)
 
         # Citizens only see their own inventory
         if getattr(user, 'user_level', None) == 'citizen':
-            return FarmerInventory.objects.filter(farmer=user)
+            return qs.filter(farmer=user)
         # Staff/admin can see all
-        return FarmerInventory.objects.all()
+        return qs
 
     def get_permissions(self):
         """
@@ -96,17 +98,8 @@ class FarmerInventoryViewSet(viewsets.ModelViewSet):
                            quantity_added=Sum('quantity_added'),
                            quantity_allocated=Sum('quantity_allocated'),
                            quantity_deducted=Sum('quantity_deducted'),
-                       )
-
-        results = []
-        for item in aggregated:
-            remaining = float(item['quantity_added'] or 0) - float(item['quantity_allocated'] or 0) - float(item['quantity_deducted'] or 0)
-            results.append({
-                'farmer': item['farmer'],
-                'product': item['product'],
-                'quantity_added': item['quantity_added'],
-                'quantity_allocated': item['quantity_allocated'],
-                'quantity_deducted': item['quantity_deducted'],
-                'quantity_remaining': remaining,
-            })
-        return Response(results, status=status.HTTP_200_OK)
+                           quantity_remaining=Sum(farmer_remaining_expression()),
+                       ) \
+                       .order_by('farmer', 'product')
+
+        return Response(list(aggregated), status=status.HTTP_200_OK)
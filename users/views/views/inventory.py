@@ -6,6 +6,7 @@ from report.models import DistrictInventory, CellInventory, CellResourceRequest
 from users.models.addresses import Cell, Sector, District
 from users.models.products import Product
 from users.serializer.inventory import DistrictInventorySerializer, CellInventorySerializer
+from users.utils.filters import filter_by_remaining
 
 
 class IsSuperAdminSafeOnly(permissions.BasePermission):
@@ -38,18 +39,10 @@ class DistrictInventoryViewSets(viewsets.ModelViewSet):
 
     def get_queryset(self):
         user = self.request.user
-        qs = super().get_queryset()
-
-        if user.user_level == 'super_admin':
-            return qs
-
-        if user.user_level == 'district_officer':
-            managed_district = getattr(user, 'managed_district', None)
-            if not managed_district:
-                return qs.none()
-            return qs.filter(district=managed_district)
-
-        return qs.none()
+        if user.user_level not in ('super_admin', 'district_officer'):
+            return DistrictInventory.objects.none()
+        qs = filter_by_remaining(super().get_queryset().with_remaining(), self.request.query_params)
+        return qs.for_user(user)
 
     def perform_create(self, serializer):
         user = self.request.user
@@ -81,25 +74,7 @@ class CellInventoryViewSets(viewsets.ReadOnlyModelViewSet):
     filterset_fields = ['district', 'sector', 'cell', 'product']
 
     def get_queryset(self):
-        user = self.request.user
-        qs = super().get_queryset()
-
-        if user.user_level == 'super_admin':
-            return qs  # all
-
-        if user.user_level == 'district_officer':
-            managed_district = getattr(user, 'managed_district', None)
-            if not managed_district:
-                return qs.none()
-            return qs.filter(district=managed_district)
-
-        if user.user_level == 'cell_officer':
-            user_cell = getattr(user, 'managed_cell', None)
-            if user_cell:
-                return qs.filter(cell=user_cell)
-            return qs.none()
-
-        return qs.none()
+        return super().get_queryset().for_user(self.request.user)
 
 class CellResourceRequestSerializer(serializers.ModelSerializer):
     cell = serializers.PrimaryKeyRelatedField(read_only=True)  # cell is read-only
@@ -146,36 +121,4 @@ class CellResourceRequestListView(generics.ListAPIView):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        user = self.request.user
-        qs = CellResourceRequest.objects.all()
-
-        if user.user_level == 'super_admin':
-            return qs
-
-        if user.user_level == 'district_officer':
-            managed_district = getattr(user, 'managed_district', None)
-            if managed_district is None:
-                return qs.none()
-
-            if isinstance(managed_district, str):
-                try:
-                    managed_district = District.objects.get(name=managed_district)
-                except District.DoesNotExist:
-                    return qs.none()
-
-            return qs.filter(cell__sector__district=managed_district)
-
-        if user.user_level == 'cell_officer':
-            user_cell = getattr(user, 'managed_cell', None)
-            if user_cell is None:
-                return qs.none()
-
-            if isinstance(user_cell, str):
-                try:
-                    user_cell = Cell.objects.get(name=user_cell)
-                except Cell.DoesNotExist:
-                    return qs.none()
-
-            return qs.filter(cell=user_cell)
-
-        return qs.none()
\ No newline at end of file
+        return CellResourceRequest.objects.for_user(self.request.user)
\ No newline at end of file
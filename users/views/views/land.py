@@ -4,6 +4,7 @@ from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from report.models import Land, LivestockLocation
 from users.serializer.land import LandSerializer, LivestockLocationSerializer
+from users.utils.scope import resolve_scope, in_scope
 
 logger = logging.getLogger(__name__)
 
@@ -24,33 +25,10 @@ class LandPermission(permissions.BasePermission):
         user = request.user
         logger.debug(f"[OBJECT PERMISSION] Checking user={user} level={getattr(user, 'user_level', None)} for land={obj.id}")
 
-        # 1. Owners can view their own
-        if user == obj.owner:
-            logger.debug(f"[ALLOW] User {user} is owner of land {obj.id}")
-            return True
-
-        # 2. Superadmin
-        if getattr(user, "user_level", None) == "super_admin":
-            logger.debug(f"[ALLOW] User {user} is super_admin")
-            return True
-
-        # 3. District officer
-        if getattr(user, "user_level", None) == "district_officer" and hasattr(user, "managed_district"):
-            logger.debug(f"[CHECK] District officer={user.managed_district} vs Land district={obj.district}")
-            return obj.district == user.managed_district
-
-        # 4. Sector officer
-        if getattr(user, "user_level", None) == "sector_officer" and hasattr(user, "managed_sector"):
-            logger.debug(f"[CHECK] Sector officer={user.managed_sector} vs Land sector={obj.sector}")
-            return obj.sector == user.managed_sector
-
-        # 5. Cell officer
-        if getattr(user, "user_level", None) == "cell_officer" and hasattr(user, "managed_cell"):
-            logger.debug(f"[CHECK] Cell officer={user.managed_cell} vs Land cell={obj.cell}")
-            return obj.cell == user.managed_cell
-
-        logger.debug(f"[DENY] User {user} has no permission for land {obj.id}")
-        return False
+        # Owners, superadmins, and officers whose district/sector/cell contains the land
+        allowed = in_scope(obj, resolve_scope(user), include_owned=True)
+        logger.debug(f"[{'ALLOW' if allowed else 'DENY'}] User {user} for land {obj.id}")
+        return allowed
 
 
 # ---------------- ViewSets ----------------
@@ -65,34 +43,12 @@ class LandViewSet(viewsets.ModelViewSet):
         user = self.request.user
         logger.debug(f"[LAND-GET-QUERYSET] User={user}, Level={getattr(user, 'user_level', None)}")
 
-        qs = Land.objects.none()
-
         if not user.is_authenticated:
             logger.debug("[LAND-GET-QUERYSET] User not authenticated → empty queryset")
-            return qs
-
-        base_qs = Land.objects.all()
-        qs = Land.objects.filter(owner=user)
-        logger.debug(f"[LAND-GET-QUERYSET] User owns {qs.count()} lands")
-
-        if getattr(user, "user_level", None) == "super_admin":
-            logger.debug("[LAND-GET-QUERYSET] Superadmin → all lands")
-            qs = base_qs
-
-        elif getattr(user, "user_level", None) == "district_officer" and hasattr(user, "managed_district"):
-            logger.debug(f"[LAND-GET-QUERYSET] District officer for {user.managed_district}")
-            qs = qs | base_qs.filter(district=user.managed_district)
-
-        elif getattr(user, "user_level", None) == "sector_officer" and hasattr(user, "managed_sector"):
-            logger.debug(f"[LAND-GET-QUERYSET] Sector officer for {user.managed_sector}")
-            qs = qs | base_qs.filter(sector=user.managed_sector)
-
-        elif getattr(user, "user_level", None) == "cell_officer" and hasattr(user, "managed_cell"):
-            logger.debug(f"[LAND-GET-QUERYSET] Cell officer for {user.managed_cell}")
-            qs = qs | base_qs.filter(cell=user.managed_cell)
+            return Land.objects.none()
 
-        logger.debug(f"[LAND-GET-QUERYSET] Returning {qs.distinct().count()} lands total")
-        return qs.distinct()
+        # Own lands plus the officer's jurisdiction
+        return Land.objects.for_user(user, include_owned=True)
 
     def perform_create(self, serializer):
         logger.debug(f"[LAND-CREATE] User {self.request.user} creating land with data={self.request.data}")
@@ -117,21 +73,7 @@ class LivestockLocationViewSet(viewsets.ModelViewSet):
             logger.debug("[LIVESTOCK-GET-QUERYSET] User not authenticated → empty queryset")
             return LivestockLocation.objects.none()
 
-        base_qs = LivestockLocation.objects.all()
-        qs = LivestockLocation.objects.filter(owner=user)
-
-        user_level = getattr(user, "user_level", None)
-        if user_level == "super_admin":
-            qs = base_qs
-        elif user_level == "district_officer" and hasattr(user, "managed_district"):
-            qs = qs | base_qs.filter(district=user.managed_district)
-        elif user_level == "sector_officer" and hasattr(user, "managed_sector"):
-            qs = qs | base_qs.filter(sector=user.managed_sector)
-        elif user_level == "cell_officer" and hasattr(user, "managed_cell"):
-            qs = qs | base_qs.filter(cell=user.managed_cell)
-
-        logger.debug(f"[LIVESTOCK-GET-QUERYSET] Returning {qs.distinct().count()} locations total")
-        return qs.distinct()
+        return LivestockLocation.objects.for_user(user, include_owned=True)
 
     def create(self, request, *args, **kwargs):
         logger.debug(f"[LIVESTOCK-CREATE] User {request.user} creating livestock with data={request.data}")
@@ -0,0 +1,77 @@
+from django.db.models import Sum
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from report.models import Land, LivestockLocation, FarmerIssue
+from users.utils import map_grid
+from users.utils.scope import resolve_scope
+
+# layer -> (model, extra sums per cluster, field broken down per cluster)
+LAYERS = {
+    "lands": (Land, {"hectares": Sum("size_hectares")}, None),
+    "livestock": (LivestockLocation, {"animals": Sum("number_of_products")}, None),
+    "issues": (FarmerIssue, {}, "issue_type"),
+}
+DEFAULT_ZOOM = 10
+
+
+class MapClustersView(APIView):
+    """
+    Grid clusters of lands, livestock locations and issues inside a map viewport, limited
+    to what the caller may see (their jurisdiction plus what they own).
+    GET /map/clusters/?bbox=min_lon,min_lat,max_lon,max_lat&zoom=<0-18>&layers=lands,livestock,issues
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        params = request.query_params
+        try:
+            bbox = map_grid.parse_bbox(params.get("bbox"))
+        except ValueError as exc:
+            raise ValidationError({"bbox": str(exc)})
+        try:
+            zoom = int(params.get("zoom", DEFAULT_ZOOM))
+        except ValueError:
+            raise ValidationError({"zoom": "Must be an integer."})
+        zoom = max(0, min(zoom, map_grid.GRID_LEVEL))
+
+        layers = [name for name in params.get("layers", ",".join(LAYERS)).split(",") if name]
+        unknown = [name for name in layers if name not in LAYERS]
+        if unknown:
+            raise ValidationError({"layers": f"Unknown layers: {', '.join(unknown)}. Available: {', '.join(LAYERS)}."})
+
+        scope = resolve_scope(request.user)
+        return Response({
+            "scope": scope["label"],
+            "zoom": zoom,
+            "layers": {name: self.clusters(name, scope, bbox, zoom) for name in layers},
+        })
+
+    def clusters(self, layer, scope, bbox, zoom):
+        model, sums, breakdown = LAYERS[layer]
+        qs = map_grid.in_viewport(model.objects.for_scope(scope, include_owned=True), bbox, zoom)
+        rows = map_grid.cluster_rows(qs, zoom, group_by=(breakdown,) if breakdown else (), **sums)
+
+        clusters = {}
+        for row in rows:
+            cluster = clusters.get(row["tile"])
+            if cluster is None:
+                cluster = clusters[row["tile"]] = {"key": row["tile"], "count": 0, "latitude": 0.0, "longitude": 0.0}
+                cluster.update({field: 0 for field in sums})
+                if breakdown:
+                    cluster[f"{breakdown}s"] = {}
+            # Members' mean position, across the breakdown rows of the tile
+            total = cluster["count"] + row["count"]
+            for axis in ("latitude", "longitude"):
+                cluster[axis] += (float(row[axis]) - cluster[axis]) * row["count"] / total
+            cluster["count"] = total
+            for field in sums:
+                cluster[field] += row[field] or 0
+            if breakdown:
+                cluster[f"{breakdown}s"][row[breakdown]] = row["count"]
+
+        for cluster in clusters.values():
+            cluster["latitude"], cluster["longitude"] = round(cluster["latitude"], 6), round(cluster["longitude"], 6)
+        return sorted(clusters.values(), key=lambda cluster: -cluster["count"])
@@ -34,7 +34,6 @@ class RoleBasedPermission(BasePermission):
 # views.py
 from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated
-from users.utils.filters import filter_by_role_and_location
 from users.models import Product, ProductPrice, RecommendedQuantity
 from report.models import HarvestReport, LivestockProduction
 from users.serializer.products import (
@@ -80,10 +79,7 @@ class HarvestReportViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated, RoleBasedPermission]
 
     def get_queryset(self):
-        queryset = filter_by_role_and_location(
-            HarvestReport.objects.all(),
-            self.request.user
-        )
+        queryset = HarvestReport.objects.for_user(self.request.user)
 
         # Filters
         year = self.request.query_params.get("year")
@@ -147,10 +143,7 @@ class LivestockProductionViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated, RoleBasedPermission]
 
     def get_queryset(self):
-        queryset = filter_by_role_and_location(
-            LivestockProduction.objects.all(),
-            self.request.user
-        )
+        queryset = LivestockProduction.objects.for_user(self.request.user)
 
         year = self.request.query_params.get("year")
         month = self.request.query_params.get("month")
@@ -25,20 +25,7 @@ class DistrictInventoryViewSet(viewsets.ModelViewSet):
     ordering_fields = ['updated_at', 'quantity_available']
 
     def get_queryset(self):
-        user = self.request.user
-        qs = super().get_queryset()
-
-        if hasattr(user, 'user_level'):
-            if user.user_level == 'district_officer' and hasattr(user, 'managed_district'):
-                if user.managed_district:
-                    qs = qs.filter(district=user.managed_district)
-            elif user.user_level == 'cell_officer' and hasattr(user, 'managed_cell'):
-                if user.managed_cell:
-                    qs = qs.filter(district=user.managed_cell.sector.district)
-            elif user.user_level == 'farmer':
-                # Farmers typically shouldn't access district inventory
-                qs = qs.none()
-        return qs
+        return super().get_queryset().for_user(self.request.user)
 
 class CellInventoryViewSet(viewsets.ModelViewSet):
     queryset = CellInventory.objects.all()
@@ -49,20 +36,7 @@ class CellInventoryViewSet(viewsets.ModelViewSet):
     ordering_fields = ['updated_at', 'quantity_available']
 
     def get_queryset(self):
-        user = self.request.user
-        qs = super().get_queryset()
-
-        if hasattr(user, 'user_level'):
-            if user.user_level == 'cell_officer' and hasattr(user, 'managed_cell'):
-                if user.managed_cell:
-                    qs = qs.filter(cell=user.managed_cell)
-            elif user.user_level == 'district_officer' and hasattr(user, 'managed_district'):
-                if user.managed_district:
-                    qs = qs.filter(district=user.managed_district)
-            elif user.user_level == 'farmer':
-                # Farmers typically shouldn't access cell inventory
-                qs = qs.none()
-        return qs
+        return super().get_queryset().for_user(self.request.user)
 
 class ResourceRequestViewSet(viewsets.ModelViewSet):
     queryset = ResourceRequest.objects.all()
@@ -73,20 +47,7 @@ class ResourceRequestViewSet(viewsets.ModelViewSet):
     ordering_fields = ['request_date', 'status']
 
     def get_queryset(self):
-        user = self.request.user
-        qs = super().get_queryset()
-
-        if hasattr(user, 'user_level'):
-            if user.user_level == 'farmer':
-                qs = qs.filter(farmer=user)
-            elif user.user_level == 'cell_officer' and hasattr(user, 'managed_cell'):
-                if user.managed_cell:
-                    qs = qs.filter(land__cell=user.managed_cell)
-            elif user.user_level == 'district_officer' and hasattr(user, 'managed_district'):
-                if user.managed_district:
-                    qs = qs.filter(land__cell__sector__district=user.managed_district)
-            # Admin or other roles see all
-        return qs
+        return super().get_queryset().for_user(self.request.user)
 
 class ResourceRequestFeedbackViewSet(viewsets.ModelViewSet):
     queryset = ResourceRequestFeedback.objects.all()
@@ -97,11 +58,4 @@ class ResourceRequestFeedbackViewSet(viewsets.ModelViewSet):
     ordering_fields = ['submitted_at']
 
     def get_queryset(self):
-        user = self.request.user
-        qs = super().get_queryset()
-
-        if hasattr(user, 'user_level'):
-            if user.user_level == 'farmer':
-                qs = qs.filter(farmer=user)
-            # Officers and admins see all
-        return qs
+        return super().get_queryset().for_user(self.request.user)